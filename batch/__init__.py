@@ -0,0 +1,5 @@
+"""Docstring for the __init__.py module.
+A batch runner of the pipeline over many dataset directories (e.g. one per legislative session).
+Run it with `python -m batch 'sessions/*' --output-root output --workers 4`.
+"""
+from .runner import DatasetRun, batch_summary, expand_datasets, output_dirs, run_batch
@@ -0,0 +1,65 @@
+"""
+This script runs the pipeline over many dataset directories on a pool of warm worker processes.
+
+Each dataset directory holds the input files of one session (`bills.csv`, `legislators.csv`,
+`votes.csv`, `vote_results.csv`, in any supported format). A failing directory is reported and
+skipped; the other directories keep running, and the exit status is 1 if any directory failed.
+
+Output:
+    - <output-root>/<dataset>/: The reports of each dataset (or <dataset>/output without `--output-root`).
+    - <summary>: A JSON summary of the batch: the outcome and stage timings of each dataset, and the
+      timings of each stage summed over the batch (default: batch-summary.json in the output root, or
+      in the current directory without `--output-root`).
+
+Usage:
+    python -m batch DATASET [DATASET ...] [--output-root DIR] [--workers N] [--summary PATH]
+    [--engine {python,numpy,query}] [--no-cache] [--gzip] [--lazy] [--top K]
+
+Example:
+    python -m batch 'sessions/*' input --output-root output/sessions --workers 4 --top 10
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from pipeline import PipelineOptions
+from utils import add_pipeline_arguments, positive_int
+
+from .runner import batch_summary, expand_datasets, run_batch
+
+SUMMARY_NAME = 'batch-summary.json'
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('datasets', nargs='+', metavar='DATASET',
+                        help="Dataset directories or glob patterns (quote them to expand them here).")
+    parser.add_argument('--output-root', metavar='DIR',
+                        help="Directory for the reports of each dataset (default: an output directory per dataset).")
+    parser.add_argument('--workers', type=positive_int, help="Number of worker processes (default: one per CPU).")
+    parser.add_argument('--summary', metavar='PATH', help=f"JSON summary of the batch (default: {SUMMARY_NAME}).")
+    add_pipeline_arguments(parser, 'engine', 'no-cache', 'gzip', 'lazy', 'top', engines=('python', 'numpy', 'query'))
+    args = parser.parse_args()
+    datasets = expand_datasets(args.datasets)
+    if not datasets:
+        parser.error("no dataset directory matches the given patterns")
+
+    start = time.perf_counter()
+    runs = run_batch(datasets, output_root=args.output_root, workers=args.workers, options=PipelineOptions(
+        engine=args.engine, use_cache=not args.no_cache, compress=args.gzip, loader='serial', lazy=args.lazy,
+        top=args.top,
+    ))
+    summary = batch_summary(runs, time.perf_counter() - start)
+
+    summary_path = args.summary or os.path.join(args.output_root or '', SUMMARY_NAME)
+    if os.path.dirname(summary_path):
+        os.makedirs(os.path.dirname(summary_path), exist_ok=True)
+    with open(summary_path, 'w', encoding='utf-8') as file:
+        json.dump(summary, file, indent=2)
+    for run in runs:
+        if not run.ok:
+            print(f"{run.input_dir}: {run.error}", file=sys.stderr)
+    print(f"{summary['succeeded']}/{summary['datasets']} datasets processed in {summary['wall_seconds']:.2f}s, "
+          f"summary written to {summary_path}")
+    sys.exit(1 if summary['failed'] else 0)
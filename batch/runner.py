@@ -0,0 +1,265 @@
+"""
+This module runs the pipeline over many dataset directories on a pool of warm worker processes.
+
+Each dataset directory holds the four input tables of one legislative session. Running
+`pipeline.py` once per directory starts an interpreter, imports the handlers and builds the
+converter plans of every table each time; `run_batch` instead schedules the directories on a
+`ProcessPoolExecutor` whose workers are warmed once (see `_warm_worker`) and then reused for every
+directory they are given:
+    - The converter plans of the input tables are built from the headers of the first dataset, and
+      cached for the lifetime of the worker (`utils.warm_converter_plan`).
+    - The numpy module is imported up front when the numpy engine is used.
+
+A failing directory (missing or malformed files, unknown IDs, ...) doesn't stop the batch: its
+error is recorded in its `DatasetRun`, and the other directories keep running. A worker process
+dying during a run is isolated the same way (see `run_batch`). Every run records
+the timings of its stages, which `batch_summary` aggregates over the whole batch.
+"""
+import glob
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
+from typing import Iterable, Optional, Sequence
+
+from models import VOTE_RESULT_COLUMNS, Bills, Legislators, VoteResults, Votes
+from pipeline import PipelineOptions, run_pipeline
+from utils import StageRecorder, find_input_file, warm_converter_plan
+
+OUTPUT_NAME = 'output'
+
+# The tables parsed by a pipeline run, with the columns they are parsed with
+_WARM_TABLES = (
+    ('bills', Bills, None),
+    ('legislators', Legislators, None),
+    ('votes', Votes, None),
+    ('vote_results', VoteResults, VOTE_RESULT_COLUMNS),
+)
+
+
+@dataclass
+class DatasetRun:
+    """
+    Represents the outcome of the pipeline run over one dataset directory.
+
+    Attributes:
+        input_dir (str): The dataset directory.
+        output_dir (str): The directory its reports were written to.
+        ok (bool): Whether the run completed.
+        error (str | None): The exception that stopped the run, if any, as `Type: message`.
+        wall_seconds (float): The elapsed wall-clock time of the run, in its worker.
+        stages (list[dict]): The measures of each stage of the run (see `utils.StageRecorder`).
+    """
+    input_dir: str
+    output_dir: str
+    ok: bool
+    error: Optional[str] = None
+    wall_seconds: float = 0.0
+    stages: list[dict] = field(default_factory=list)
+
+
+def expand_datasets(patterns: Iterable[str]) -> list[str]:
+    """
+    Expands a list of dataset directories and glob patterns.
+
+    Args:
+        patterns (Iterable[str]): Directories (kept as given, so that a missing one fails on its own)
+            and glob patterns such as `sessions/2021-*` (expanded to the directories they match, sorted).
+
+    Returns:
+        list[str]: The dataset directories, in order and without duplicates.
+    """
+    datasets = {}
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(path for path in glob.glob(pattern) if os.path.isdir(path))
+        else:
+            matches = [pattern]
+        for path in matches:
+            datasets.setdefault(os.path.normpath(path), None)
+    return list(datasets)
+
+
+def output_dirs(datasets: Sequence[str], output_root: Optional[str] = None) -> list[str]:
+    """
+    Returns the output directory of each dataset.
+
+    Args:
+        datasets (Sequence[str]): The dataset directories.
+        output_root (str | None): If given, each dataset writes to a subdirectory of this directory,
+            named after the dataset (or after its path relative to the common parent of the datasets, when
+            two datasets share a name); otherwise to an `output` subdirectory of the dataset itself.
+
+    Returns:
+        list[str]: The output directories, in the order of `datasets`.
+    """
+    if output_root is None:
+        return [os.path.join(dataset, OUTPUT_NAME) for dataset in datasets]
+    names = [os.path.basename(os.path.abspath(dataset)) for dataset in datasets]
+    if len(set(names)) < len(names):
+        parent = os.path.commonpath([os.path.abspath(dataset) for dataset in datasets])
+        names = [os.path.relpath(os.path.abspath(dataset), parent) for dataset in datasets]
+    return [os.path.join(output_root, name) for name in names]
+
+
+def _warm_worker(sample_dir: Optional[str], engine: str):
+    """
+    Initializes a worker process before it runs its first dataset.
+
+    Args:
+        sample_dir (str | None): A dataset directory whose headers the converter plans are built from.
+        engine (str): The pipeline engine, to import numpy up front if needed.
+    """
+    if engine == 'numpy':
+        import numpy  # pylint: disable=import-outside-toplevel,unused-import
+    if sample_dir is None:
+        return
+    for name, cls, columns in _WARM_TABLES:
+        try:
+            warm_converter_plan(find_input_file(sample_dir, name), cls, ',', columns=columns)
+        except (OSError, ValueError):  # The sample dataset itself may be broken; its run reports it
+            pass
+
+
+def _error_text(exc: BaseException) -> str:
+    """Formats an exception as `Type: message`."""
+    return f"{type(exc).__name__}: {exc}"
+
+
+def _run_dataset(input_dir: str, output_dir: str, options: PipelineOptions) -> DatasetRun:
+    """
+    Runs the pipeline over one dataset directory, in a worker process.
+
+    Returns:
+        DatasetRun: The outcome of the run; an exception raised by the run is recorded, not raised.
+    """
+    recorder = StageRecorder(enabled=True, trace_memory=False)
+    start = time.perf_counter()
+    error = None
+    try:
+        if not os.path.isdir(input_dir):
+            raise FileNotFoundError(f"Dataset directory not found: {input_dir}")
+        os.makedirs(output_dir, exist_ok=True)
+        run_pipeline(input_dir, output_dir, options, recorder)
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        error = _error_text(exc)
+    return DatasetRun(input_dir=input_dir, output_dir=output_dir, ok=error is None, error=error,
+                      wall_seconds=round(time.perf_counter() - start, 6), stages=recorder.report()['stages'])
+
+
+def _run_on_pool(
+    targets: list[tuple[str, str]],
+    queue: deque,
+    runs: dict[int, DatasetRun],
+    options: PipelineOptions,
+    workers: int
+) -> list[int]:
+    """
+    Runs the queued datasets on a new pool until the queue is empty or a worker process dies.
+
+    At most `workers` datasets are submitted at a time, so that when a worker dies, only the datasets
+    that were running are suspected; the datasets left in the queue were never started.
+
+    Args:
+        targets (list[tuple[str, str]]): The input and output directories of every dataset.
+        queue (deque): The indexes of the datasets to run, consumed from the left.
+        runs (dict[int, DatasetRun]): The outcomes, by dataset index, updated in place.
+        options (PipelineOptions): The options of every run.
+        workers (int): The number of worker processes.
+
+    Returns:
+        list[int]: The indexes of the datasets that were running when a worker died; empty if none did.
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker,
+                             initargs=(targets[0][0], options.engine)) as executor:
+        running = {}
+        while queue or running:
+            while queue and len(running) < workers:
+                index = queue.popleft()
+                running[executor.submit(_run_dataset, *targets[index], options)] = index
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            broken = []
+            for future in done:
+                index = running.pop(future)
+                try:
+                    runs[index] = future.result()
+                except BrokenProcessPool:
+                    broken.append(index)
+                except Exception as exc:  # pylint: disable=broad-exception-caught
+                    runs[index] = DatasetRun(*targets[index], ok=False, error=_error_text(exc))
+            if broken:
+                return broken + list(running.values())
+    return []
+
+
+def run_batch(
+    datasets: Sequence[str],
+    output_root: Optional[str] = None,
+    options: Optional[PipelineOptions] = None,
+    workers: Optional[int] = None
+) -> list[DatasetRun]:
+    """
+    Runs the pipeline over every dataset directory on a pool of warm worker processes.
+
+    When a worker process dies (e.g. killed for memory), the datasets it may have been running are run
+    again one at a time on a single worker, so that the crash is pinned on its own dataset, while the
+    other datasets go on with a new pool.
+
+    Args:
+        datasets (Sequence[str]): The dataset directories (see `expand_datasets`).
+        output_root (str | None): Where the reports are written (see `output_dirs`).
+        options (PipelineOptions | None): The options of every run (default: `PipelineOptions()` with the
+            serial loader, the datasets themselves being run in parallel).
+        workers (int | None): The number of worker processes (default: one per CPU, at most one per dataset).
+
+    Returns:
+        list[DatasetRun]: The outcome of each dataset, in the order of `datasets`. A dataset whose worker
+            still dies when it runs alone is recorded as failed with a `BrokenProcessPool` error.
+    """
+    options = options or PipelineOptions(loader='serial')
+    targets = list(zip(datasets, output_dirs(datasets, output_root)))
+    workers = min(workers or os.cpu_count() or 1, len(datasets))
+    runs: dict[int, DatasetRun] = {}
+    queue = deque(range(len(targets)))
+    while queue:
+        for index in _run_on_pool(targets, queue, runs, options, workers):
+            if _run_on_pool(targets, deque([index]), runs, options, 1):
+                runs[index] = DatasetRun(*targets[index], ok=False, error=_error_text(BrokenProcessPool(
+                    "A worker process died while running this dataset"
+                )))
+    return [runs[index] for index in range(len(targets))]
+
+
+def batch_summary(runs: Sequence[DatasetRun], wall_seconds: float) -> dict:
+    """
+    Aggregates the outcomes and timings of a batch.
+
+    Args:
+        runs (Sequence[DatasetRun]): The outcome of each dataset.
+        wall_seconds (float): The elapsed wall-clock time of the whole batch.
+
+    Returns:
+        dict: The number of datasets, succeeded and failed runs, the batch wall time, the wall time summed
+            over the runs, the wall time and rows of each stage summed over the runs, and every run.
+    """
+    stage_seconds = Counter()
+    stage_rows = Counter()
+    for run in runs:
+        for stage in run.stages:
+            stage_seconds[stage['name']] += stage['wall_seconds']
+            stage_rows[stage['name']] += stage['rows'] or 0
+    succeeded = sum(run.ok for run in runs)
+    return {
+        'datasets': len(runs),
+        'succeeded': succeeded,
+        'failed': len(runs) - succeeded,
+        'wall_seconds': round(wall_seconds, 6),
+        'dataset_wall_seconds': round(sum(run.wall_seconds for run in runs), 6),
+        'stages': {
+            name: {'wall_seconds': round(seconds, 6), 'rows': stage_rows[name]}
+            for name, seconds in stage_seconds.items()
+        },
+        'runs': [asdict(run) for run in runs],
+    }
@@ -0,0 +1,104 @@
+"""
+This module contains test cases for `batch.run_batch`, which runs the pipeline over many dataset directories.
+
+Test functions include:
+- `test_batch_isolates_failing_datasets`: Tests that a broken dataset fails alone and the others match single runs.
+- `test_worker_crash_fails_only_its_dataset`: Tests that a worker process dying only fails the dataset it was running.
+- `test_expand_datasets_and_output_dirs`: Tests the expansion of glob patterns and the naming of output directories.
+"""
+import multiprocessing
+import os
+
+import pytest
+
+from batch import batch_summary, expand_datasets, output_dirs, run_batch, runner
+from pipeline import BILLS_OUTPUT, LEGISLATORS_OUTPUT, PipelineOptions, run_pipeline
+
+TABLES = {
+    "bills": "id,title,sponsor_id\n101,Education Reform Act,1\n102,Healthcare Reform Act,2\n",
+    "legislators": "id,name\n1,Alice\n2,Bob\n",
+    "votes": "id,bill_id\n201,101\n202,102\n",
+    "vote_results": "id,legislator_id,vote_id,vote_type\n1,1,201,1\n2,2,201,2\n3,1,202,1\n",
+}
+
+
+def _write_dataset(directory, **overrides):
+    """Writes the four input tables to a dataset directory, with some tables replaced."""
+    directory.mkdir(parents=True)
+    for name, text in {**TABLES, **overrides}.items():
+        (directory / f"{name}.csv").write_text(text, encoding="utf-8")
+    return str(directory)
+
+
+def test_batch_isolates_failing_datasets(tmp_path):
+    """
+    Test case where one of three datasets references an unknown vote, and another doesn't exist.
+
+    Simulates:
+    - Two healthy sessions, one whose vote results reference vote 999, and a missing directory, run on 2 workers.
+    """
+    healthy = [_write_dataset(tmp_path / "sessions" / name) for name in ("2021", "2022")]
+    broken = _write_dataset(tmp_path / "sessions" / "2023",
+                            vote_results=TABLES["vote_results"] + "4,2,999,1\n")
+    missing = str(tmp_path / "sessions" / "2024")
+    options = PipelineOptions(use_cache=False, loader='serial')
+    run_pipeline(healthy[0], str(tmp_path), options)
+
+    runs = run_batch([*healthy, broken, missing], output_root=str(tmp_path / "out"), options=options, workers=2)
+    summary = batch_summary(runs, wall_seconds=1.0)
+
+    assert [run.ok for run in runs] == [True, True, False, False]
+    assert runs[2].error.startswith("KeyError") and runs[3].error.startswith("FileNotFoundError")
+    for output_name in (BILLS_OUTPUT, LEGISLATORS_OUTPUT):
+        expected = (tmp_path / output_name).read_text(encoding="utf-8")
+        for year in ("2021", "2022"):
+            assert (tmp_path / "out" / year / output_name).read_text(encoding="utf-8") == expected
+    assert (summary["datasets"], summary["succeeded"], summary["failed"]) == (4, 2, 2)
+    assert summary["stages"]["write:bills"]["rows"] == 4
+    assert summary["runs"][0]["input_dir"] == healthy[0]
+
+
+def _crashing_pipeline(input_dir, output_dir, options, recorder):
+    """Runs the pipeline, except over a dataset named `crash`, where the worker process exits abruptly."""
+    if os.path.basename(input_dir) == "crash":
+        os._exit(1)  # pylint: disable=protected-access
+    run_pipeline(input_dir, output_dir, options, recorder)
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="workers must inherit the patched pipeline")
+def test_worker_crash_fails_only_its_dataset(tmp_path, monkeypatch):
+    """
+    Test case where a worker process dies in the middle of a batch.
+
+    Simulates:
+    - Four datasets on 2 workers, the second one killing its worker, as when it is killed for memory.
+    """
+    monkeypatch.setattr(runner, "run_pipeline", _crashing_pipeline)
+    datasets = [_write_dataset(tmp_path / name) for name in ("2021", "crash", "2022", "2023")]
+
+    runs = run_batch(datasets, output_root=str(tmp_path / "out"), options=PipelineOptions(use_cache=False), workers=2)
+
+    assert [run.ok for run in runs] == [True, False, True, True]
+    assert runs[1].error.startswith("BrokenProcessPool")
+    assert all((tmp_path / "out" / year / BILLS_OUTPUT).exists() for year in ("2021", "2022", "2023"))
+
+
+def test_expand_datasets_and_output_dirs(tmp_path):
+    """
+    Test case where datasets are given as a mix of patterns and directories, two of them sharing a name.
+
+    Simulates:
+    - `sessions/*`, a session listed again, a file matched by the pattern, and two `input` directories.
+    """
+    for name in ("2022", "2021"):
+        (tmp_path / "sessions" / name).mkdir(parents=True)
+    (tmp_path / "sessions" / "notes.txt").write_text("", encoding="utf-8")
+    sessions = str(tmp_path / "sessions")
+
+    datasets = expand_datasets([os.path.join(sessions, "*"), os.path.join(sessions, "2021") + "/"])
+
+    assert datasets == [os.path.join(sessions, "2021"), os.path.join(sessions, "2022")]
+    assert output_dirs(datasets) == [os.path.join(dataset, "output") for dataset in datasets]
+    assert output_dirs(datasets, "out") == [os.path.join("out", "2021"), os.path.join("out", "2022")]
+    assert output_dirs(["a/input", "b/input"], "out") == [os.path.join("out", "a", "input"),
+                                                          os.path.join("out", "b", "input")]
@@ -0,0 +1,4 @@
+"""Docstring for the __init__.py module.
+Performance benchmarks for the models, handlers and CSV utilities. Run them from the repository
+root as modules, e.g. `python -m benchmarks.model_memory`.
+"""
@@ -0,0 +1,172 @@
+"""
+This script generates a synthetic input dataset with the same layout as the real one.
+
+It writes `bills.csv`, `legislators.csv`, `votes.csv` and `vote_results.csv` to a directory, at a
+configurable scale and from a fixed seed, so that the same arguments always produce byte-identical
+files. The data is shaped like the real input:
+    - Legislators have names such as `Rep. Jane Doe (D-NY-16)` and belong to one of two parties.
+    - Bills have `H.R.`/`S.` titles and are sponsored by a legislator; a small share of sponsors
+      are unknown ids, which must be reported as `Unknown`.
+    - Votes are spread over the bills; each vote is cast by a random subset of the legislators,
+      who mostly follow their party's position on that vote.
+
+Rows are written in chunks, so the generator runs in constant memory (apart from the legislator
+ids) even for tens of millions of vote results.
+
+Usage:
+    python -m benchmarks.generate_data OUTPUT_DIR [--legislators 1000] [--bills 100000] [--votes N]
+    [--vote-results 1000000] [--seed 0]
+"""
+import argparse
+import csv
+import os
+import random
+from itertools import islice
+from typing import Iterable, Iterator
+
+from models import VoteType
+
+FIRST_NAMES = (
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen",
+)
+LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+)
+STATES = ("AL", "AZ", "CA", "CO", "FL", "GA", "IL", "MI", "NC", "NE", "NY", "OH", "PA", "TX", "VA", "WA")
+PARTIES = ("D", "R")
+BILL_SUBJECTS = (
+    "Infrastructure Investment", "Education Reform", "Clean Energy", "Veterans Health Care",
+    "Small Business Relief", "Water Resources Development", "Consumer Protection", "Broadband Access",
+    "Public Safety", "Agricultural Research",
+)
+BILL_KINDS = ("Act", "Act of 2021", "Reauthorization Act", "Improvement Act")
+
+# Share of bills whose sponsor is not in `legislators.csv`
+UNKNOWN_SPONSOR_RATE = 0.02
+# Probability that a legislator votes with their party's position on a vote
+PARTY_LOYALTY = 0.9
+# Number of rows written per `writerows` call
+CHUNK_SIZE = 10_000
+
+# First id of each table, so ids of different tables never collide (as in the real input)
+LEGISLATOR_ID_START = 400_000
+BILL_ID_START = 2_000_000
+VOTE_ID_START = 3_000_000
+VOTE_RESULT_ID_START = 90_000_000
+
+
+def _write_rows(path: str, header: list[str], rows: Iterable[tuple]):
+    """Writes a header and the given rows to a CSV file, in chunks."""
+    rows = iter(rows)
+    with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(header)
+        while chunk := list(islice(rows, CHUNK_SIZE)):
+            writer.writerows(chunk)
+
+
+def _legislator_rows(rng: random.Random, count: int) -> Iterator[tuple[int, str, str]]:
+    """Yields `(id, name, party)` for each legislator."""
+    for i in range(count):
+        party = PARTIES[i % len(PARTIES)]
+        chamber, seat = ("Sen.", "") if rng.random() < 0.2 else ("Rep.", f"-{rng.randint(1, 30)}")
+        name = f"{chamber} {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} ({party}-{rng.choice(STATES)}{seat})"
+        yield LEGISLATOR_ID_START + i, name, party
+
+
+def _bill_rows(rng: random.Random, count: int, legislator_ids: list[int]) -> Iterator[tuple[int, str, int]]:
+    """Yields `(id, title, sponsor_id)` for each bill."""
+    for i in range(count):
+        prefix = "H.R." if rng.random() < 0.7 else "S."
+        title = f"{prefix} {i + 1}: {rng.choice(BILL_SUBJECTS)} {rng.choice(BILL_KINDS)}"
+        if rng.random() < UNKNOWN_SPONSOR_RATE:
+            sponsor_id = LEGISLATOR_ID_START - 1 - rng.randrange(1000)
+        else:
+            sponsor_id = rng.choice(legislator_ids)
+        yield BILL_ID_START + i, title, sponsor_id
+
+
+def _vote_result_rows(
+    rng: random.Random,
+    vote_count: int,
+    vote_result_count: int,
+    legislators: list[tuple[int, str]]
+) -> Iterator[tuple[int, int, int, int]]:
+    """Yields `(id, legislator_id, vote_id, vote_type)`, spreading the results evenly over the votes."""
+    result_id = VOTE_RESULT_ID_START
+    per_vote, remainder = divmod(vote_result_count, vote_count)
+    for i in range(vote_count):
+        party_position = {party: rng.choice((VoteType.FOR, VoteType.AGAINST)) for party in PARTIES}
+        for legislator_id, party in rng.sample(legislators, per_vote + (i < remainder)):
+            vote_type = party_position[party]
+            if rng.random() > PARTY_LOYALTY:
+                vote_type = VoteType.AGAINST if vote_type == VoteType.FOR else VoteType.FOR
+            yield result_id, legislator_id, VOTE_ID_START + i, vote_type.value
+            result_id += 1
+
+
+def generate_dataset(  # pylint: disable=too-many-arguments
+    output_dir: str,
+    *,
+    legislators: int = 1000,
+    bills: int = 100_000,
+    votes: int = 0,
+    vote_results: int = 1_000_000,
+    seed: int = 0
+) -> dict[str, int]:
+    """
+    Writes the four input CSV files of a synthetic dataset.
+
+    Args:
+        output_dir (str): The directory to write the files to; it is created if needed.
+        legislators (int): The number of legislators.
+        bills (int): The number of bills.
+        votes (int): The number of votes, spread round-robin over the bills (default: one per bill).
+        vote_results (int): The number of vote results, spread evenly over the votes.
+        seed (int): The seed of the random generator.
+
+    Returns:
+        dict[str, int]: The number of rows written to each file, keyed by table name.
+    """
+    votes = votes or bills
+    if min(legislators, bills, votes) < 1:
+        raise ValueError("There must be at least one legislator, bill and vote")
+    if vote_results > votes * legislators:
+        raise ValueError("Each legislator votes at most once per vote: increase --legislators or --votes")
+
+    rng = random.Random(seed)
+    os.makedirs(output_dir, exist_ok=True)
+
+    legislator_rows = list(_legislator_rows(rng, legislators))
+    _write_rows(os.path.join(output_dir, 'legislators.csv'), ['id', 'name'],
+                ((legislator_id, name) for legislator_id, name, _ in legislator_rows))
+    legislator_parties = [(legislator_id, party) for legislator_id, _, party in legislator_rows]
+    legislator_ids = [legislator_id for legislator_id, _ in legislator_parties]
+    del legislator_rows
+
+    _write_rows(os.path.join(output_dir, 'bills.csv'), ['id', 'title', 'sponsor_id'],
+                _bill_rows(rng, bills, legislator_ids))
+    _write_rows(os.path.join(output_dir, 'votes.csv'), ['id', 'bill_id'],
+                ((VOTE_ID_START + i, BILL_ID_START + i % bills) for i in range(votes)))
+    _write_rows(os.path.join(output_dir, 'vote_results.csv'), ['id', 'legislator_id', 'vote_id', 'vote_type'],
+                _vote_result_rows(rng, votes, vote_results, legislator_parties))
+
+    return {'legislators': legislators, 'bills': bills, 'votes': votes, 'vote_results': vote_results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('output_dir', help="Directory to write the CSV files to.")
+    parser.add_argument('--legislators', type=int, default=1000, help="Number of legislators (default: 1000).")
+    parser.add_argument('--bills', type=int, default=100_000, help="Number of bills (default: 100000).")
+    parser.add_argument('--votes', type=int, default=0, help="Number of votes (default: one per bill).")
+    parser.add_argument('--vote-results', type=int, default=1_000_000,
+                        help="Number of vote results (default: 1000000).")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the random generator (default: 0).")
+    args = parser.parse_args()
+
+    counts = generate_dataset(args.output_dir, legislators=args.legislators, bills=args.bills, votes=args.votes,
+                              vote_results=args.vote_results, seed=args.seed)
+    print(", ".join(f"{count} {table}" for table, count in counts.items()), "written to", args.output_dir)
@@ -0,0 +1,120 @@
+"""
+This benchmark reports the memory used by the model classes for a large synthetic load.
+
+For every model (`Bills`, `Legislators`, `Votes`, `VoteResults`), it builds the same synthetic
+rows twice: once with a dict-based twin of the model (a plain `@dataclass`, as the models used
+to be) and once with the slotted model itself. It reports the per-instance size (including the
+instance `__dict__`, if any) and the total memory allocated for all instances, as measured by
+`tracemalloc`.
+
+Usage:
+    python -m benchmarks.model_memory [--rows 5000000] [--models VoteResults Bills]
+"""
+import argparse
+import dataclasses
+import gc
+import sys
+import tracemalloc
+from typing import Callable
+
+from models import Bills, Legislators, VoteResults, Votes, VoteType
+
+MODELS = {cls.__name__: cls for cls in (Bills, Legislators, Votes, VoteResults)}
+
+# Synthetic field values for row `i`. Strings are shared between rows so that the
+# measures isolate the per-instance overhead of each variant.
+ROW_FACTORIES: dict[str, Callable[[int], tuple]] = {
+    'Bills': lambda i: (i, "Synthetic Bill Title", i % 1000),
+    'Legislators': lambda i: (i, "Synthetic Legislator"),
+    'Votes': lambda i: (i, i // 10),
+    'VoteResults': lambda i: (i, i % 1000, i // 400, VoteType.FOR if i % 2 else VoteType.AGAINST),
+}
+
+
+def dict_based_twin(cls: type) -> type:
+    """
+    Builds a non-slotted copy of a model dataclass, with the same fields and defaults.
+
+    Args:
+        cls (type): The model dataclass.
+
+    Returns:
+        type: A plain `@dataclass` whose instances carry a `__dict__`.
+    """
+    return dataclasses.make_dataclass(
+        f"{cls.__name__}WithDict",
+        [(f.name, f.type, f.default) if f.default is not dataclasses.MISSING else (f.name, f.type)
+         for f in dataclasses.fields(cls)],
+    )
+
+
+def instance_size(obj: object) -> int:
+    """Returns the size of an instance plus its `__dict__`, excluding the field values."""
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def measure(cls: type, make_row: Callable[[int], tuple], rows: int) -> dict:
+    """
+    Builds `rows` instances of a class and measures their memory.
+
+    Args:
+        cls (type): The class to instantiate.
+        make_row (Callable[[int], tuple]): Returns the constructor arguments of row `i`.
+        rows (int): The number of instances to build.
+
+    Returns:
+        dict: The per-instance size and the total allocated bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    instances = [cls(*make_row(i)) for i in range(rows)]
+    total, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result = {'instance_bytes': instance_size(instances[0]), 'total_bytes': total}
+    del instances
+    return result
+
+
+def run(rows: int, model_names: list[str]) -> list[dict]:
+    """
+    Measures the dict-based and the slotted variant of each requested model.
+
+    Args:
+        rows (int): The number of synthetic rows per model.
+        model_names (list[str]): The names of the models to measure.
+
+    Returns:
+        list[dict]: One result per model, with the `before` (dict-based) and `after` (slotted) measures.
+    """
+    results = []
+    for name in model_names:
+        cls = MODELS[name]
+        before = measure(dict_based_twin(cls), ROW_FACTORIES[name], rows)
+        after = measure(cls, ROW_FACTORIES[name], rows)
+        results.append({'model': name, 'rows': rows, 'before': before, 'after': after})
+    return results
+
+
+def print_report(results: list[dict]):
+    """Prints the measures as a table."""
+    print(f"{'model':<12} {'rows':>10} {'bytes/inst before':>18} {'bytes/inst after':>17} "
+          f"{'total MB before':>16} {'total MB after':>15} {'saved':>7}")
+    for result in results:
+        before, after = result['before'], result['after']
+        saved = 1 - after['total_bytes'] / before['total_bytes']
+        print(f"{result['model']:<12} {result['rows']:>10} {before['instance_bytes']:>18} "
+              f"{after['instance_bytes']:>17} {before['total_bytes'] / 1e6:>16.1f} "
+              f"{after['total_bytes'] / 1e6:>15.1f} {saved:>7.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5_000_000, help="Synthetic rows per model (default: 5000000).")
+    parser.add_argument('--models', nargs='+', choices=sorted(MODELS), default=list(MODELS),
+                        help="Models to measure (default: all).")
+    args = parser.parse_args()
+
+    print_report(run(args.rows, args.models))
@@ -0,0 +1,167 @@
+"""
+This benchmark measures the latency of the query service under concurrent clients.
+
+Each client keeps one HTTP/1.1 connection open and sends its requests one after the other; all
+clients run concurrently. Requests are drawn, from a fixed seed, over `/bills/{id}`,
+`/legislators/{id}` and `/legislators/{id}/votes`, using IDs read from the input files. The
+benchmark reports the throughput and the p50, p90, p99 and maximum latencies.
+
+With `--spawn`, the service is started as a subprocess (`python -m service`) for the duration of
+the run; otherwise it must already be listening on `--host`/`--port`.
+
+Usage:
+    python -m benchmarks.service_load [--input-dir input] [--spawn] [--clients 50] [--requests 200]
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import Iterator
+
+from models import Bills, Legislators
+from utils import iter_csv_dataclasses
+
+
+async def _request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, path: str) -> int:
+    """Sends one GET request on an open connection, reads the whole response and returns its status."""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) not in (b'\r\n', b''):
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def _client(host: str, port: int, paths: list[str], latencies: list[float], errors: list[str]):
+    """Sends the given requests over one connection, recording the latency of each."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for path in paths:
+            start = time.perf_counter()
+            status = await _request(reader, writer, path)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(f"{path}: HTTP {status}")
+    finally:
+        writer.close()
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Returns the nearest-rank percentile of a sorted list."""
+    return sorted_values[min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))]
+
+
+def sample_paths(input_dir: str, count: int, seed: int = 0) -> list[str]:
+    """
+    Draws request paths over the bills and legislators of an input directory.
+
+    Args:
+        input_dir (str): The directory holding the input CSV files.
+        count (int): The number of paths.
+        seed (int): The seed of the random generator.
+
+    Returns:
+        list[str]: The request paths.
+    """
+    bill_ids = [row[0] for row in iter_csv_dataclasses(os.path.join(input_dir, 'bills.csv'), Bills, ',',
+                                                        as_tuples=True)]
+    legislator_ids = [row[0] for row in iter_csv_dataclasses(os.path.join(input_dir, 'legislators.csv'),
+                                                              Legislators, ',', as_tuples=True)]
+    rng = random.Random(seed)
+    templates = (
+        ('/bills/{}', bill_ids), ('/legislators/{}', legislator_ids), ('/legislators/{}/votes', legislator_ids)
+    )
+    paths = []
+    for _ in range(count):
+        template, ids = rng.choice(templates)
+        paths.append(template.format(rng.choice(ids)))
+    return paths
+
+
+async def run(host: str, port: int, paths: list[str], clients: int) -> dict:
+    """
+    Spreads the request paths over concurrent clients and measures their latencies.
+
+    Args:
+        host (str): The address of the service.
+        port (int): The port of the service.
+        paths (list[str]): The request paths, split round-robin between the clients.
+        clients (int): The number of concurrent connections.
+
+    Returns:
+        dict: The number of requests and errors, the throughput and the latency percentiles in milliseconds.
+    """
+    latencies: list[float] = []
+    errors: list[str] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, paths[i::clients], latencies, errors) for i in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'requests_per_second': len(latencies) / elapsed,
+        **{f'p{int(fraction * 100)}_ms': percentile(latencies, fraction) * 1000 for fraction in (0.5, 0.9, 0.99)},
+        'max_ms': latencies[-1] * 1000,
+    }
+
+
+async def _wait_until_listening(host: str, port: int, timeout: float = 60.0):
+    """Waits for a spawned service to accept connections."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            await _request(reader, writer, '/health')
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+@contextlib.contextmanager
+def _spawned_service(args: argparse.Namespace) -> Iterator[None]:
+    """Runs `python -m service` in a subprocess until the block exits."""
+    with subprocess.Popen([sys.executable, '-m', 'service', '--input-dir', args.input_dir, '--host', args.host,
+                           '--port', str(args.port), '--reload-interval', '0']) as process:
+        try:
+            asyncio.run(_wait_until_listening(args.host, args.port))
+            yield
+        finally:
+            process.terminate()
+
+
+def main():
+    """Parses the command line, optionally spawns the service, and prints the measures."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--input-dir', default='input', help="Directory with the input CSV files (default: input).")
+    parser.add_argument('--host', default='127.0.0.1', help="Address of the service (default: 127.0.0.1).")
+    parser.add_argument('--port', type=int, default=8080, help="Port of the service (default: 8080).")
+    parser.add_argument('--spawn', action='store_true', help="Start the service for the duration of the run.")
+    parser.add_argument('--clients', type=int, default=50, help="Concurrent connections (default: 50).")
+    parser.add_argument('--requests', type=int, default=200, help="Requests per connection (default: 200).")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the request mix (default: 0).")
+    args = parser.parse_args()
+
+    paths = sample_paths(args.input_dir, args.clients * args.requests, args.seed)
+    with _spawned_service(args) if args.spawn else contextlib.nullcontext():
+        result = asyncio.run(run(args.host, args.port, paths, args.clients))
+
+    print(f"{result['requests']} requests from {args.clients} clients, {result['errors']} errors, "
+          f"{result['requests_per_second']:.0f} requests/s")
+    print(f"latency p50 {result['p50_ms']:.3f} ms, p90 {result['p90_ms']:.3f} ms, "
+          f"p99 {result['p99_ms']:.3f} ms, max {result['max_ms']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+This benchmark compares the in-memory and SQLite backends of `pipeline.py` as the dataset grows.
+
+For each scale (a number of vote results), a synthetic dataset is generated with
+`benchmarks.generate_data` and `pipeline.py` is run in a child process in four modes:
+    - `memory`: the in-memory handlers, parsing every input file (`--no-cache`).
+    - `memory (cached)`: the in-memory handlers, with the reference tables read from the table cache.
+    - `sqlite (cold)`: the SQLite backend, loading every input file into a new database.
+    - `sqlite (warm)`: the SQLite backend over the database loaded by the cold run, as when the
+      inputs haven't changed since the previous run.
+
+Each run is timed, and its peak RSS is read from the resource usage of the child process, so runs
+don't inflate each other's peak. The outputs of every mode are checked against the `memory` mode.
+The crossover of a mode is the smallest scale from which it beats `memory` at every larger scale,
+for the wall time and for the peak RSS.
+
+Usage:
+    python -m benchmarks.sqlite_crossover [--scales 10000 100000 1000000] [--seed 0] [--work-dir PATH]
+"""
+import argparse
+import filecmp
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Optional
+
+from pipeline import BILLS_OUTPUT, LEGISLATORS_OUTPUT
+from .generate_data import generate_dataset
+
+PIPELINE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'pipeline.py')
+DEFAULT_SCALES = (10_000, 100_000, 1_000_000)
+REFERENCE_MODE = 'memory'
+# Each mode and its pipeline arguments; modes sharing a database run in this order
+MODES = {
+    'memory': ('--no-cache',),
+    'memory (cached)': (),
+    'sqlite (cold)': ('--backend', 'sqlite', '--no-cache'),
+    'sqlite (warm)': ('--backend', 'sqlite'),
+}
+
+
+def measure(command: list[str], cwd: str) -> tuple[float, Optional[int]]:
+    """
+    Runs a command in a child process.
+
+    Args:
+        command (list[str]): The command and its arguments.
+        cwd (str): The working directory of the child.
+
+    Returns:
+        tuple[float, int | None]: The wall time in seconds, and the peak RSS of the child in bytes,
+        or None if it can't be measured on this platform.
+
+    Raises:
+        subprocess.CalledProcessError: If the command fails.
+    """
+    start = time.perf_counter()
+    with subprocess.Popen(command, cwd=cwd) as process:
+        if hasattr(os, 'wait4'):
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            # Linux reports kilobytes, macOS reports bytes
+            max_rss = usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+        else:  # pragma: no cover - Windows
+            process.wait()
+            max_rss = None
+    seconds = time.perf_counter() - start
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, command)
+    return seconds, max_rss
+
+
+def run_scale(vote_results: int, work_dir: str, seed: int = 0) -> dict:
+    """
+    Generates one dataset and runs the pipeline over it in every mode.
+
+    Args:
+        vote_results (int): The number of vote results of the dataset.
+        work_dir (str): An empty directory for the dataset, the outputs, the caches and the database.
+        seed (int): The seed of the generated dataset.
+
+    Returns:
+        dict: The row counts of the dataset, and the `seconds` and `max_rss_bytes` of each mode.
+
+    Raises:
+        AssertionError: If the outputs of a mode differ from those of the `memory` mode.
+    """
+    input_dir = os.path.join(work_dir, 'input')
+    tables = generate_dataset(
+        input_dir, legislators=min(1000, max(10, vote_results // 100)), bills=max(1, vote_results // 10),
+        vote_results=vote_results, seed=seed,
+    )
+    # Fills the table cache of the `memory (cached)` mode, which is kept under the working directory
+    warm_up_dir = os.path.join(work_dir, 'warm_up')
+    os.makedirs(warm_up_dir)
+    measure([sys.executable, PIPELINE_PATH, '--input-dir', input_dir, '--output-dir', warm_up_dir], work_dir)
+
+    modes = {}
+    database_path = os.path.join(work_dir, 'tables.sqlite3')
+    for mode, mode_args in MODES.items():
+        output_dir = os.path.join(work_dir, mode.replace(' ', '_').strip('()'))
+        os.makedirs(output_dir)
+        command = [sys.executable, PIPELINE_PATH, '--input-dir', input_dir, '--output-dir', output_dir,
+                   '--database', database_path, *mode_args]
+        seconds, max_rss = measure(command, work_dir)
+        modes[mode] = {'seconds': round(seconds, 3), 'max_rss_bytes': max_rss, 'output_dir': output_dir}
+
+    _check_outputs(modes)
+    return {'tables': tables, 'modes': modes}
+
+
+def _check_outputs(modes: dict[str, dict]):
+    """Asserts that every mode wrote the same reports as the `memory` mode, and drops their directories."""
+    reference_dir = modes[REFERENCE_MODE]['output_dir']
+    for mode, measures in modes.items():
+        _, mismatches, errors = filecmp.cmpfiles(
+            reference_dir, measures.pop('output_dir'), [BILLS_OUTPUT, LEGISLATORS_OUTPUT], shallow=False
+        )
+        assert not mismatches and not errors, f"{mode} outputs differ from {REFERENCE_MODE}: {mismatches + errors}"
+
+
+def find_crossover(results: dict[int, dict], mode: str, measure_name: str) -> Optional[int]:
+    """
+    Finds the smallest scale from which a mode beats the `memory` mode at every larger scale.
+
+    Args:
+        results (dict[int, dict]): The result of `run_scale` for each scale.
+        mode (str): The mode compared with `memory`.
+        measure_name (str): `seconds` or `max_rss_bytes`.
+
+    Returns:
+        int | None: The crossover scale, or None if the mode doesn't beat `memory` at the largest scale.
+    """
+    crossover = None
+    for scale in sorted(results, reverse=True):
+        measures = results[scale]['modes']
+        value, reference = measures[mode][measure_name], measures[REFERENCE_MODE][measure_name]
+        if value is None or reference is None or value >= reference:
+            break
+        crossover = scale
+    return crossover
+
+
+def print_report(results: dict[int, dict]):
+    """Prints the measures of every mode at every scale, then the crossover of each mode."""
+    print(f"{'vote results':>12} {'mode':<16} {'seconds':>9} {'peak RSS MB':>12}")
+    for scale, result in sorted(results.items()):
+        for mode, measures in result['modes'].items():
+            rss = measures['max_rss_bytes']
+            print(f"{scale:>12} {mode:<16} {measures['seconds']:>9.3f} "
+                  f"{'' if rss is None else f'{rss / 1e6:.1f}':>12}")
+    for mode in MODES:
+        if mode == REFERENCE_MODE:
+            continue
+        for measure_name, label in (('seconds', 'is faster'), ('max_rss_bytes', 'has a smaller peak RSS')):
+            crossover = find_crossover(results, mode, measure_name)
+            where = "not at the measured scales" if crossover is None else f"from {crossover} vote results"
+            print(f"{mode} {label} than {REFERENCE_MODE}: {where}")
+
+
+def main():
+    """Parses the command line and runs every scale."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=list(DEFAULT_SCALES),
+                        help="Numbers of vote results to benchmark (default: 10000 100000 1000000).")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the generated datasets (default: 0).")
+    parser.add_argument('--work-dir', help="Directory for the datasets and outputs (default: a temporary directory).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.work_dir) as work_dir:
+        results = {}
+        for scale in args.scales:
+            scale_dir = os.path.join(work_dir, str(scale))
+            os.makedirs(scale_dir)
+            results[scale] = run_scale(scale, scale_dir, args.seed)
+    print_report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+This benchmark times each stage of the bill and legislator reports on a dataset.
+
+The stages are run one after the other, as in `bills_with_count.py` and `legislator_with_count.py`:
+    1. `parse_csv_to_dataclass_dict` for each of the four input tables.
+    2. `assign_bill_primary_sponsors`, `assign_bill_vote_counts` and `assign_legislator_vote_counts`.
+    3. `write_objects_to_csv` for both reports, and `write_dataclasses_to_csv` for the bills report.
+
+For every stage it records the wall time, the number of rows processed, the throughput in rows/s
+and the peak RSS of the process once the stage is done (the peak only grows, so it is the peak up
+to and including that stage). The results can be saved as a JSON baseline, and a later run can be
+compared against it: a stage regresses when its throughput drops, or its peak RSS grows, by more
+than the tolerance.
+
+Usage:
+    python -m benchmarks.generate_data /tmp/dataset --vote-results 5000000
+    python -m benchmarks.suite /tmp/dataset --save baseline.json
+    python -m benchmarks.suite /tmp/dataset --compare baseline.json [--tolerance 0.2]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Callable, Optional
+
+from handlers import assign_bill_primary_sponsors, assign_bill_vote_counts, assign_legislator_vote_counts
+from models import Bills, Legislators, VoteResults, Votes
+from utils import parse_csv_to_dataclass_dict, write_dataclasses_to_csv, write_objects_to_csv
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+DEFAULT_TOLERANCE = 0.2
+
+
+def max_rss_bytes() -> Optional[int]:
+    """Returns the peak resident set size of the process, in bytes, or None if it can't be measured."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def time_stage(results: dict, name: str, rows: int, func: Callable, *func_args):
+    """
+    Runs one stage and records its measures in `results`.
+
+    Args:
+        results (dict): The measures of the stages run so far, keyed by stage name.
+        name (str): The name of the stage.
+        rows (int): The number of rows the stage processes.
+        func (Callable): The stage.
+        *func_args: The arguments of `func`.
+
+    Returns:
+        Any: The value returned by `func`.
+    """
+    start = time.perf_counter()
+    value = func(*func_args)
+    seconds = time.perf_counter() - start
+    results[name] = {
+        'rows': rows,
+        'seconds': round(seconds, 6),
+        'rows_per_second': round(rows / seconds, 1) if seconds > 0 else None,
+        'max_rss_bytes': max_rss_bytes(),
+    }
+    return value
+
+
+def run(data_dir: str, output_dir: str) -> dict:
+    """
+    Runs every stage over the dataset in `data_dir`.
+
+    Args:
+        data_dir (str): Directory containing `bills.csv`, `legislators.csv`, `votes.csv` and `vote_results.csv`.
+        output_dir (str): Directory where the reports are written.
+
+    Returns:
+        dict: The environment, the size of each table and the measures of each stage.
+    """
+    stages = {}
+    tables = {}
+    for table, cls in (('legislators', Legislators), ('bills', Bills), ('votes', Votes),
+                       ('vote_results', VoteResults)):
+        path = os.path.join(data_dir, f'{table}.csv')
+        with open(path, 'rb') as csvfile:
+            row_count = sum(1 for _ in csvfile) - 1
+        tables[table] = time_stage(stages, f'parse:{table}', row_count, parse_csv_to_dataclass_dict, path, cls, ',')
+
+    bills, legislators = tables['bills'], tables['legislators']
+    votes, vote_results = tables['votes'], tables['vote_results']
+    time_stage(stages, 'assign_bill_primary_sponsors', len(bills), assign_bill_primary_sponsors, bills, legislators)
+    time_stage(stages, 'assign_bill_vote_counts', len(vote_results), assign_bill_vote_counts,
+               bills, votes, vote_results)
+    time_stage(stages, 'assign_legislator_vote_counts', len(vote_results), assign_legislator_vote_counts,
+               legislators, vote_results)
+
+    time_stage(stages, 'write_objects_to_csv:bills', len(bills), write_objects_to_csv,
+               os.path.join(output_dir, 'bills.csv'), list(bills.values()))
+    time_stage(stages, 'write_objects_to_csv:legislators', len(legislators), write_objects_to_csv,
+               os.path.join(output_dir, 'legislators-support-oppose-count.csv'), list(legislators.values()))
+    time_stage(stages, 'write_dataclasses_to_csv:bills', len(bills), write_dataclasses_to_csv,
+               os.path.join(output_dir, 'bills.csv'), bills.values(), Bills)
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'tables': {table: len(rows) for table, rows in tables.items()},
+        'stages': stages,
+    }
+
+
+def compare(baseline: dict, current: dict, tolerance: float = DEFAULT_TOLERANCE) -> list[str]:
+    """
+    Compares the measures of a run against a baseline.
+
+    Args:
+        baseline (dict): A result of `run`, loaded from the baseline file.
+        current (dict): The result of the current `run`.
+        tolerance (float): The relative throughput drop or peak RSS growth tolerated per stage.
+
+    Returns:
+        list[str]: A description of each regression; empty if there is none.
+    """
+    regressions = []
+    if baseline.get('tables') != current['tables']:
+        regressions.append(f"dataset differs from the baseline: {baseline.get('tables')} != {current['tables']}")
+    for name, measures in current['stages'].items():
+        reference = baseline.get('stages', {}).get(name)
+        if reference is None:
+            continue
+        if reference['rows_per_second'] and measures['rows_per_second'] is not None \
+                and measures['rows_per_second'] < reference['rows_per_second'] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {measures['rows_per_second']:.0f} rows/s "
+                               f"< baseline {reference['rows_per_second']:.0f} rows/s")
+        if reference['max_rss_bytes'] and measures['max_rss_bytes'] is not None \
+                and measures['max_rss_bytes'] > reference['max_rss_bytes'] * (1 + tolerance):
+            regressions.append(f"{name}: peak RSS {measures['max_rss_bytes'] / 1e6:.1f} MB "
+                               f"> baseline {reference['max_rss_bytes'] / 1e6:.1f} MB")
+    return regressions
+
+
+def print_report(result: dict, baseline: Optional[dict] = None):
+    """Prints the measures of each stage as a table, with the baseline throughput if given."""
+    print(f"{'stage':<34} {'rows':>10} {'seconds':>9} {'rows/s':>12} {'peak RSS MB':>12} {'baseline rows/s':>16}")
+    for name, measures in result['stages'].items():
+        reference = (baseline or {}).get('stages', {}).get(name, {}).get('rows_per_second')
+        rss = measures['max_rss_bytes']
+        print(f"{name:<34} {measures['rows']:>10} {measures['seconds']:>9.3f} "
+              f"{measures['rows_per_second'] or 0:>12.0f} {'' if rss is None else f'{rss / 1e6:.1f}':>12} "
+              f"{'' if reference is None else f'{reference:.0f}':>16}")
+
+
+def main():
+    """Parses the command line, runs the stages and saves or compares the measures."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('data_dir', help="Directory with the input CSV files, e.g. from benchmarks.generate_data.")
+    parser.add_argument('--output-dir', help="Directory for the reports (default: a temporary directory).")
+    parser.add_argument('--save', metavar='PATH', help="Write the measures to a JSON baseline file.")
+    parser.add_argument('--compare', metavar='PATH', help="Compare the measures against a JSON baseline file.")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Relative regression tolerated per stage (default: {DEFAULT_TOLERANCE}).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        measured = run(args.data_dir, args.output_dir or temp_dir)
+
+    reference = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as baseline_file:
+            reference = json.load(baseline_file)
+    print_report(measured, reference)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as baseline_file:
+            json.dump(measured, baseline_file, indent=2)
+
+    if reference is not None:
+        regressions = compare(reference, measured, args.tolerance)
+        for regression in regressions:
+            print("REGRESSION", regression)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
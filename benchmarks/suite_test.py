@@ -0,0 +1,86 @@
+"""
+This module contains test cases for the synthetic dataset generator and the benchmark suite.
+
+Test functions include:
+- `test_generate_dataset_is_reproducible`: Tests that the same seed writes identical, consistent files.
+- `test_suite_run_and_compare`: Tests a run of the suite and the regression check against a baseline.
+- `test_sqlite_crossover`: Tests one scale of the memory/SQLite crossover benchmark.
+"""
+import copy
+
+from benchmarks.generate_data import generate_dataset
+from benchmarks.sqlite_crossover import MODES, find_crossover, run_scale
+from benchmarks.suite import compare, run
+from models import Bills, Legislators, VoteResults, Votes
+from utils import parse_csv_to_dataclass_dict
+
+
+def test_generate_dataset_is_reproducible(tmp_path):
+    """
+    Test case for generating the same small dataset twice.
+
+    Simulates:
+    - 20 legislators, 30 bills, 60 votes and 500 vote results, generated twice with seed 7.
+    """
+    first, second = tmp_path / "first", tmp_path / "second"
+
+    counts = generate_dataset(str(first), legislators=20, bills=30, votes=60, vote_results=500, seed=7)
+    generate_dataset(str(second), legislators=20, bills=30, votes=60, vote_results=500, seed=7)
+
+    assert counts == {'legislators': 20, 'bills': 30, 'votes': 60, 'vote_results': 500}
+    for name in ("bills.csv", "legislators.csv", "votes.csv", "vote_results.csv"):
+        assert (first / name).read_bytes() == (second / name).read_bytes()
+
+    legislators = parse_csv_to_dataclass_dict(str(first / "legislators.csv"), Legislators, ",")
+    bills = parse_csv_to_dataclass_dict(str(first / "bills.csv"), Bills, ",")
+    votes = parse_csv_to_dataclass_dict(str(first / "votes.csv"), Votes, ",")
+    vote_results = parse_csv_to_dataclass_dict(str(first / "vote_results.csv"), VoteResults, ",")
+    assert len(vote_results) == 500
+    assert all(vote.bill_id in bills for vote in votes.values())
+    assert all(result.vote_id in votes and result.legislator_id in legislators for result in vote_results.values())
+    assert len({(result.legislator_id, result.vote_id) for result in vote_results.values()}) == 500
+
+
+def test_suite_run_and_compare(tmp_path):
+    """
+    Test case for running the suite and comparing the run against baselines.
+
+    Simulates:
+    - A tiny dataset, compared against itself and against a baseline twice as fast.
+    """
+    generate_dataset(str(tmp_path / "data"), legislators=10, bills=10, vote_results=50)
+    (tmp_path / "out").mkdir()
+
+    result = run(str(tmp_path / "data"), str(tmp_path / "out"))
+
+    assert result['tables'] == {'legislators': 10, 'bills': 10, 'votes': 10, 'vote_results': 50}
+    assert result['stages']['assign_bill_vote_counts']['rows'] == 50
+    assert (tmp_path / "out" / "bills.csv").exists()
+    assert not compare(result, result)
+
+    faster = copy.deepcopy(result)
+    faster['stages']['parse:bills']['rows_per_second'] = result['stages']['parse:bills']['rows_per_second'] * 2
+    regressions = compare(faster, result)
+    assert len(regressions) == 1 and regressions[0].startswith("parse:bills: throughput")
+
+
+def test_sqlite_crossover(tmp_path):
+    """
+    Test case for running every mode of the crossover benchmark on one tiny dataset.
+
+    Simulates:
+    - 200 vote results, whose outputs must match in every mode, then crossovers over made-up timings.
+    """
+    result = run_scale(200, str(tmp_path))
+
+    assert result['tables']['vote_results'] == 200
+    assert list(result['modes']) == list(MODES)
+    assert all(measures['seconds'] > 0 for measures in result['modes'].values())
+
+    def timings(memory, sqlite):
+        return {'modes': {'memory': {'seconds': memory}, 'sqlite (warm)': {'seconds': sqlite}}}
+
+    results = {10: timings(1.0, 2.0), 100: timings(2.0, 1.5), 1000: timings(9.0, 4.0)}
+    assert find_crossover(results, 'sqlite (warm)', 'seconds') == 100
+    results[1000] = timings(9.0, 9.5)
+    assert find_crossover(results, 'sqlite (warm)', 'seconds') is None
@@ -4,8 +4,11 @@ and counting how many legislators supported or opposed each bill.
 
 Steps:
     1. Reads data from input CSV files for bills, legislators, votes, and vote results.
+       The bills, legislators and votes tables are independent and loaded concurrently.
     2. Sets the `primary_sponsor` field of each bill using the sponsor's name.
     3. Increments the supporter or opposer count for each bill based on associated vote results.
+       Vote results are streamed from the CSV file instead of being loaded into memory, and only
+       their `vote_id` and `vote_type` columns are converted.
     4. Writes the updated bill information to an output CSV file.
 
 Input:
@@ -16,22 +19,125 @@ Input:
 
 Output:
     - output/bills.csv: Each bill with updated sponsor and vote count information.
+
+Usage:
+    python bills_with_count.py [--engine {python,numpy}] [--workers N] [--checkpoint PATH] [--no-cache]
+    [--report PATH] [--backend {memory,sqlite}] [--database PATH] [--loader {serial,thread,process}]
+    [--memory-budget MB] [--partitions N]
+
+    The `numpy` engine loads the vote results into a columnar table and counts them with
+    vectorized array operations; it requires numpy to be installed.
+    With `--workers N` (N > 1), the vote results file is split into shards that are parsed
+    and counted by N processes, and the partial counts are merged.
+    With `--checkpoint PATH`, counts are saved to PATH and later runs only parse the rows
+    appended to the vote results file since the previous run.
+    `--loader` picks how the bills, legislators and votes tables are loaded: `serial` (default),
+    `thread` or `process` (for large files parsed from scratch on several cores).
+    Parsed reference tables are cached in a binary form under `.cache/tables`, so unchanged
+    CSV files are not parsed again; `--no-cache` disables the cache.
+    With `--report PATH`, the wall time, CPU time, rows, rows/s and peak traced memory of each
+    stage (loads, joins, counting and writing) are written to PATH as a JSON run report. Memory
+    tracing makes the run several times slower, so compare timings between reports only.
+    With `--backend sqlite`, the input files are bulk-loaded into a SQLite database (default
+    `.cache/legislative.sqlite3`; files unchanged since the previous run are not loaded again) and
+    the counts are computed with SQL queries whose rows are streamed to the output file.
+    With `--memory-budget MB`, the bills are never all loaded: the vote results and bills are streamed,
+    and once their counters and rows exceed about MB megabytes they are spilled to N temporary files
+    hash-partitioned by bill ID (`--partitions`, default 16), aggregated one partition at a time and
+    merged back in the order of the bills file. Partitions still larger than the budget are split again
+    before they are loaded. The output is identical to the in-memory run.
 """
-from handlers import assign_bill_primary_sponsors, assign_bill_vote_counts
-from models import Bills, Legislators, VoteResults, Votes
-from utils import parse_csv_to_dataclass_dict, write_objects_to_csv
+import argparse
+
+from handlers import (
+    apply_vote_tally,
+    assign_bill_primary_sponsors,
+    assign_bill_vote_counts,
+    assign_bill_vote_counts_vectorized,
+    assign_vote_counts_incremental,
+    iter_bills_with_counts_sql,
+    read_vote_results,
+    tally_vote_results_parallel,
+    write_bill_report_spilling,
+)
+from models import Bills, Legislators, Votes
+from utils import (
+    DEFAULT_PARTITIONS,
+    StageRecorder,
+    TableLoad,
+    add_pipeline_arguments,
+    check_pipeline_arguments,
+    find_input_file,
+    load_csvs_into_sqlite,
+    load_tables,
+    open_sqlite_store,
+    positive_int,
+    write_dataclasses_to_csv,
+)
 
 if __name__ == "__main__":
-    bills = parse_csv_to_dataclass_dict(filepath='input/bills.csv', cls=Bills, delimiter=',')
-    legislators = parse_csv_to_dataclass_dict(filepath='input/legislators.csv', cls=Legislators, delimiter=',')
-    vote_results = parse_csv_to_dataclass_dict(filepath='input/vote_results.csv', cls=VoteResults, delimiter=',')
-    votes = parse_csv_to_dataclass_dict(filepath='input/votes.csv', cls=Votes, delimiter=',')
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_pipeline_arguments(parser, 'engine', 'workers', 'checkpoint', 'no-cache', 'report', 'loader', 'backend',
+                           'database')
+    parser.add_argument('--memory-budget', type=positive_int, metavar='MB',
+                        help="Stream the tables and spill to disk beyond about MB megabytes of counts and bills.")
+    parser.add_argument('--partitions', type=positive_int, default=DEFAULT_PARTITIONS,
+                        help=f"Number of spill files used with --memory-budget (default: {DEFAULT_PARTITIONS}).")
+    args = parser.parse_args()
+    check_pipeline_arguments(parser, args)
+    if args.memory_budget is not None and (args.backend != 'memory' or args.workers > 1 or args.engine != 'python'
+                                           or args.checkpoint):
+        parser.error("--memory-budget does not support --backend, --engine, --workers or --checkpoint")
+
+    recorder = StageRecorder(enabled=args.report is not None)
+    if args.memory_budget is not None:
+        # Stream, count and join within the budget, spilling to disk beyond it
+        with recorder.stage('write:bills'):
+            write_bill_report_spilling('input', 'output/bills.csv', memory_budget=args.memory_budget * 1024 ** 2,
+                                       partitions=args.partitions)
+    elif args.backend == 'sqlite':
+        connection = open_sqlite_store(args.database)
+        with recorder.stage('load:sqlite'):
+            load_csvs_into_sqlite(connection, 'input', tables=('bills', 'legislators', 'votes', 'vote_results'),
+                                  force=args.no_cache)
+
+        # Count with SQL and stream the result to a CSV file
+        with recorder.stage('write:bills') as stage:
+            write_dataclasses_to_csv('output/bills.csv', stage.count(iter_bills_with_counts_sql(connection)), Bills)
+        connection.close()
+    else:
+        vote_results_path = find_input_file('input', 'vote_results')
+        tables = load_tables({
+            'bills': TableLoad(find_input_file('input', 'bills'), Bills),
+            'legislators': TableLoad(find_input_file('input', 'legislators'), Legislators),
+            'votes': TableLoad(find_input_file('input', 'votes'), Votes),
+        }, executor=args.loader, use_cache=not args.no_cache, recorder=recorder)
+        bills, legislators, votes = tables['bills'], tables['legislators'], tables['votes']
+        vote_results = read_vote_results(vote_results_path, args.engine, ('vote_id', 'vote_type'), recorder)
+
+        # 1. Find primary sponsor
+        with recorder.stage('assign_bill_primary_sponsors', rows=len(bills)):
+            assign_bill_primary_sponsors(bills, legislators)
 
-    # 1. Find primary sponsor
-    assign_bill_primary_sponsors(bills, legislators)
+        # 2. Find voters for bills (streamed vote results are parsed during this stage)
+        with recorder.stage('assign_bill_vote_counts') as stage:
+            if args.checkpoint:
+                stage.rows = assign_vote_counts_incremental(
+                    vote_results_path, args.checkpoint, bills=bills, votes=votes
+                )
+            elif args.workers > 1:
+                apply_vote_tally(tally_vote_results_parallel(
+                    vote_results_path, votes=votes, delimiter=',', workers=args.workers
+                ), bills=bills)
+            elif args.engine == 'numpy':
+                stage.rows = len(vote_results)
+                assign_bill_vote_counts_vectorized(bills, votes, vote_results)
+            else:
+                assign_bill_vote_counts(bills, votes, stage.count(vote_results))
 
-    # 2. Find voters for bills
-    assign_bill_vote_counts(bills, votes, vote_results)
+        # 3. Write the result to a CSV file
+        with recorder.stage('write:bills', rows=len(bills)):
+            write_dataclasses_to_csv('output/bills.csv', bills.values(), Bills)
 
-    # 3. Write the result to a CSV file
-    write_objects_to_csv('output/bills.csv', bills.values())
+    if args.report:
+        recorder.write_report(args.report)
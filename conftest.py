@@ -0,0 +1,21 @@
+"""
+This module contains the fixtures shared by the tests of every package.
+
+Fixtures include:
+- `input_dir`: A directory with the four input CSV files of a small dataset.
+"""
+import pytest
+
+
+@pytest.fixture(name="input_dir")
+def fixture_input_dir(tmp_path):
+    """Writes two bills (102 sponsored by an unknown legislator), two legislators, two votes and three results."""
+    (tmp_path / "bills.csv").write_text(
+        "id,title,sponsor_id\n101,Education Reform Act,1\n102,Healthcare Reform Act,3\n", encoding="utf-8"
+    )
+    (tmp_path / "legislators.csv").write_text("id,name\n1,Alice\n2,Bob\n", encoding="utf-8")
+    (tmp_path / "votes.csv").write_text("id,bill_id\n201,101\n202,102\n", encoding="utf-8")
+    (tmp_path / "vote_results.csv").write_text(
+        "id,legislator_id,vote_id,vote_type\n1,1,201,1\n2,2,201,2\n3,2,202,1\n", encoding="utf-8"
+    )
+    return tmp_path
@@ -2,3 +2,35 @@
 """
 from .bill_handler import assign_bill_primary_sponsors, assign_bill_vote_counts
 from .legislator_handler import assign_legislator_vote_counts
+from .vectorized_handler import assign_bill_vote_counts_vectorized, assign_legislator_vote_counts_vectorized
+from .vote_count_handler import assign_vote_counts, read_vote_results
+from .parallel_handler import apply_vote_tally, tally_vote_results_parallel
+from .incremental_handler import assign_vote_counts_incremental
+from .index_handler import (
+    assign_bill_vote_counts_between,
+    assign_bill_vote_counts_indexed,
+    assign_legislator_vote_counts_between,
+    assign_legislator_vote_counts_indexed,
+)
+from .sqlite_handler import iter_bills_with_counts_sql, iter_legislators_with_counts_sql
+from .agreement_handler import AgreementMatrix, build_agreement_matrix, iter_most_similar_legislators
+from .report_handler import (
+    BILL_VOTE_COUNTS,
+    LEGISLATOR_VOTE_COUNTS,
+    SPONSOR_VOTE_COUNTS,
+    apply_report_counts,
+    assign_vote_counts_query,
+    build_report_engine,
+    iter_sponsor_vote_counts,
+    run_vote_reports,
+)
+from .spill_handler import write_bill_report_spilling
+from .ranking_handler import (
+    BILL_RANKINGS,
+    DEFAULT_TOP_K,
+    LEGISLATOR_RANKINGS,
+    bill_rankings,
+    iter_ranked_entries,
+    legislator_rankings,
+    write_ranking_reports,
+)
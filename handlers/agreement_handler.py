@@ -0,0 +1,215 @@
+"""
+This module computes how often each pair of legislators voted the same way.
+
+Comparing every pair of legislators over every vote is O(L² · V) in Python. Instead, the vote
+results are turned into a sparse legislator × vote matrix `M` holding +1 for FOR and -1 for
+AGAINST, and two L × L matrices are computed from sparse products:
+    - `shared = |M| · |M|ᵀ`: the number of votes both legislators took part in.
+    - `M · Mᵀ`: agreements minus disagreements, so `agreed = (shared + M · Mᵀ) / 2`.
+
+The products are computed vote by vote: a vote with `k` voters contributes its `k²` voter pairs,
+which are expanded with NumPy index arithmetic and summed with `np.bincount`. The cost is the sum
+of `k²` over the votes (the number of non-zero terms of the products), batched so the expanded
+pairs never exceed `max_pairs` at a time; the result takes O(L²) memory.
+
+NumPy is an optional dependency: it is only required when these functions are called.
+"""
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Union
+
+from models import LegislatorSimilarity, Legislators, VoteResults, VoteResultsTable, VoteType, vote_result_arrays
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only when numpy is missing
+    np = None
+
+DEFAULT_MAX_PAIRS = 1 << 24
+
+
+def _require_numpy():
+    """Raises an `ImportError` with an actionable message when NumPy is not installed."""
+    if np is None:
+        raise ImportError("The agreement matrix requires numpy. Install it with `pip install numpy`.")
+
+
+@dataclass(frozen=True)
+class AgreementMatrix:
+    """
+    Represents the pairwise co-voting counts of the legislators found in the vote results.
+
+    Attributes:
+        legislator_ids (np.ndarray): The legislator ID of each row and column, in increasing order.
+        shared (np.ndarray): `shared[i, j]` is the number of votes legislators `i` and `j` both voted on.
+        agreed (np.ndarray): `agreed[i, j]` is the number of those votes on which they voted the same way.
+    """
+    legislator_ids: 'np.ndarray'
+    shared: 'np.ndarray'
+    agreed: 'np.ndarray'
+
+    def agreement(self) -> 'np.ndarray':
+        """Returns the share of shared votes each pair agreed on, with NaN for pairs without shared votes."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.agreed / self.shared
+
+    def pair(self, legislator_id: int, other_id: int) -> tuple[int, int]:
+        """
+        Returns the `(shared_votes, agreed_votes)` of two legislators.
+
+        Raises:
+            KeyError: If either legislator has no vote results.
+        """
+        rows = []
+        for key in (legislator_id, other_id):
+            row = int(np.searchsorted(self.legislator_ids, key))
+            if row == len(self.legislator_ids) or self.legislator_ids[row] != key:
+                raise KeyError(key)
+            rows.append(row)
+        return int(self.shared[rows[0], rows[1]]), int(self.agreed[rows[0], rows[1]])
+
+
+def _vote_matrix(
+    vote_results: Union[VoteResultsTable, dict[int, VoteResults], Iterable[VoteResults]]
+) -> tuple['np.ndarray', 'np.ndarray', 'np.ndarray', 'np.ndarray']:
+    """
+    Builds the non-zero entries of the legislator × vote matrix, sorted by vote then legislator.
+
+    When a legislator has several results for the same vote, the last one is kept.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: The legislator IDs of the rows, then the
+            row, the vote column and the sign of each entry.
+    """
+    legislator_ids, vote_ids, vote_types = vote_result_arrays(vote_results)
+    signs = np.zeros(vote_types.size, dtype=np.int8)
+    signs[vote_types == VoteType.FOR.value] = 1
+    signs[vote_types == VoteType.AGAINST.value] = -1
+
+    row_ids, rows = np.unique(legislator_ids, return_inverse=True)
+    _, columns = np.unique(vote_ids, return_inverse=True)
+    cells = columns.astype(np.int64) * max(len(row_ids), 1) + rows
+    # np.unique keeps the first occurrence, so it runs over the reversed cells to keep the last one
+    _, last = np.unique(cells[::-1], return_index=True)
+    entries = cells.size - 1 - last
+    entries = entries[signs[entries] != 0]
+    return row_ids, rows[entries], columns[entries], signs[entries]
+
+
+def _vote_batches(sizes: 'np.ndarray', max_pairs: int) -> Iterator[tuple[int, int]]:
+    """Splits consecutive votes into `[start, stop)` ranges whose voter pairs stay within `max_pairs`."""
+    pairs = np.cumsum(sizes.astype(np.int64) ** 2)
+    start, done = 0, 0
+    while start < sizes.size:
+        # At least one vote per batch, even if it alone has more than `max_pairs` pairs
+        stop = max(int(np.searchsorted(pairs, done + max_pairs, side='right')), start + 1)
+        yield start, stop
+        done = int(pairs[stop - 1])
+        start = stop
+
+
+def _expand_pairs(sizes: 'np.ndarray', offsets: 'np.ndarray', start: int, stop: int):
+    """
+    Pairs each entry of the votes `[start, stop)` with every entry of the same vote, itself included.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The left and right entry of each pair.
+    """
+    batch_sizes = sizes[start:stop]
+    run_lengths = np.repeat(batch_sizes, batch_sizes)
+    left = np.repeat(np.arange(offsets[start], offsets[stop]), run_lengths)
+    run_starts = np.repeat(np.cumsum(run_lengths) - run_lengths, run_lengths)
+    vote_starts = np.repeat(np.repeat(offsets[start:stop], batch_sizes), run_lengths)
+    return left, vote_starts + np.arange(left.size) - run_starts
+
+
+def _iter_pair_batches(columns: 'np.ndarray', max_pairs: int) -> Iterator[tuple['np.ndarray', 'np.ndarray']]:
+    """Yields the `(left, right)` entry pairs of every vote, in batches of whole votes."""
+    sizes = np.bincount(columns, minlength=int(columns.max()) + 1 if columns.size else 0)
+    offsets = np.concatenate(([0], np.cumsum(sizes)))
+    for start, stop in _vote_batches(sizes, max_pairs):
+        yield _expand_pairs(sizes, offsets, start, stop)
+
+
+def build_agreement_matrix(
+    vote_results: Union[VoteResultsTable, dict[int, VoteResults], Iterable[VoteResults]],
+    max_pairs: int = DEFAULT_MAX_PAIRS
+) -> AgreementMatrix:
+    """
+    Counts, for every pair of legislators, the votes they shared and the votes they agreed on.
+
+    Args:
+        vote_results (VoteResultsTable | dict[int, VoteResults] | Iterable[VoteResults]): A columnar
+            table (used without copying), a dictionary of vote results keyed by result ID, or any
+            iterable of vote results.
+        max_pairs (int): The maximum number of voter pairs expanded at once, which bounds the
+            temporary memory of the products.
+
+    Returns:
+        AgreementMatrix: The shared and agreed counts of every pair of legislators with vote results.
+    """
+    _require_numpy()
+    legislator_ids, rows, columns, signs = _vote_matrix(vote_results)
+    size = len(legislator_ids)
+    shared = np.zeros(size * size, dtype=np.int64)
+    agreed = np.zeros(size * size, dtype=np.int64)
+
+    for left, right in _iter_pair_batches(columns, max_pairs):
+        pair_cells = rows[left].astype(np.int64) * size + rows[right]
+        shared += np.bincount(pair_cells, minlength=size * size)
+        agreed += np.bincount(pair_cells[signs[left] == signs[right]], minlength=size * size)
+
+    return AgreementMatrix(legislator_ids, shared.reshape(size, size), agreed.reshape(size, size))
+
+
+def _rank_row(matrix: AgreementMatrix, agreement: 'np.ndarray', row: int, top_k: int, min_shared_votes: int):
+    """Returns the `top_k` other rows most similar to `row`, by agreement, then shared votes, then ID."""
+    candidates = np.flatnonzero(matrix.shared[row] >= max(min_shared_votes, 1))
+    candidates = candidates[candidates != row]
+    # np.lexsort sorts by the last key first
+    order = np.lexsort((
+        matrix.legislator_ids[candidates], -matrix.shared[row, candidates], -agreement[row, candidates]
+    ))
+    return candidates[order][:top_k].tolist()
+
+
+def iter_most_similar_legislators(
+    matrix: AgreementMatrix,
+    legislators: dict[int, Legislators],
+    top_k: int = 5,
+    min_shared_votes: int = 1
+) -> Iterator[LegislatorSimilarity]:
+    """
+    Yields, for each legislator, the `top_k` other legislators who vote most like them.
+
+    Legislators are ranked by agreement, then by number of shared votes, then by ID.
+
+    Args:
+        matrix (AgreementMatrix): The result of `build_agreement_matrix`.
+        legislators (dict[int, Legislators]): Dictionary of legislators keyed by legislator ID, for the names.
+        top_k (int): The number of similar legislators per legislator.
+        min_shared_votes (int): The number of shared votes below which a pair is not ranked.
+
+    Yields:
+        LegislatorSimilarity: The similar legislators of each legislator, in the order of `legislators`,
+            then legislators with vote results missing from `legislators`, by ID.
+    """
+    ids = matrix.legislator_ids.tolist()
+    rows = {legislator_id: row for row, legislator_id in enumerate(ids)}
+    ordered = [legislator_id for legislator_id in legislators if legislator_id in rows]
+    ordered += [legislator_id for legislator_id in ids if legislator_id not in legislators]
+    names = {legislator_id: legislator.name for legislator_id, legislator in legislators.items()}
+    agreement = matrix.agreement()
+
+    for legislator_id in ordered:
+        row = rows[legislator_id]
+        for rank, other in enumerate(_rank_row(matrix, agreement, row, top_k, min_shared_votes), start=1):
+            yield LegislatorSimilarity(
+                legislator_id=legislator_id,
+                legislator_name=names.get(legislator_id, "Unknown"),
+                rank=rank,
+                similar_legislator_id=ids[other],
+                similar_legislator_name=names.get(ids[other], "Unknown"),
+                shared_votes=int(matrix.shared[row, other]),
+                agreed_votes=int(matrix.agreed[row, other]),
+                agreement=round(float(agreement[row, other]), 6),
+            )
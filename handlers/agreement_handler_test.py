@@ -0,0 +1,79 @@
+"""
+This module contains test cases for the co-voting agreement matrix.
+
+Test functions include:
+- `test_agreement_matrix_matches_pairwise_scan`: Tests the sparse products against a scan of every pair.
+- `test_most_similar_legislators`: Tests the ranking, the names and the minimum of shared votes.
+"""
+import random
+
+import pytest
+
+from handlers import build_agreement_matrix, iter_most_similar_legislators
+from models import Legislators, VoteResults, VoteResultsTable, VoteType
+
+pytest.importorskip("numpy")
+
+
+def test_agreement_matrix_matches_pairwise_scan():
+    """
+    Test case comparing the matrix with an O(L² · V) scan of the vote results.
+
+    Simulates:
+    - 12 legislators voting on 30 votes, with repeated results for a vote (the last one counts),
+      computed in one batch and with batches of at most 20 voter pairs.
+    """
+    rng = random.Random(3)
+    vote_results = [
+        VoteResults(id=index, legislator_id=rng.randrange(12) * 7 + 1, vote_id=rng.randrange(30) + 500,
+                    vote_type=rng.choice([VoteType.FOR, VoteType.AGAINST]))
+        for index in range(200)
+    ]
+    last_votes = {}
+    for vote_result in vote_results:
+        last_votes[vote_result.legislator_id, vote_result.vote_id] = vote_result.vote_type
+
+    for max_pairs in (20, 1 << 24):
+        matrix = build_agreement_matrix(VoteResultsTable.from_vote_results(vote_results), max_pairs=max_pairs)
+
+        for legislator_id in matrix.legislator_ids.tolist():
+            for other_id in matrix.legislator_ids.tolist():
+                shared = [(vote_type, last_votes[other_id, vote_id])
+                          for (voter_id, vote_id), vote_type in last_votes.items()
+                          if voter_id == legislator_id and (other_id, vote_id) in last_votes]
+                assert matrix.pair(legislator_id, other_id) == (len(shared), sum(a == b for a, b in shared))
+    with pytest.raises(KeyError):
+        matrix.pair(1, 2)
+
+
+def test_most_similar_legislators():
+    """
+    Test case for the top-2 similar legislators of four legislators.
+
+    Simulates:
+    - Alice and Bob always agreeing, Carol agreeing with them once out of two votes, and legislator 9,
+      missing from legislators.csv, sharing a single vote with Alice.
+    """
+    legislators = {
+        1: Legislators(id=1, name="Alice"),
+        2: Legislators(id=2, name="Bob"),
+        3: Legislators(id=3, name="Carol"),
+    }
+    votes = [(1, 201, VoteType.FOR), (2, 201, VoteType.FOR), (3, 201, VoteType.FOR),
+             (1, 202, VoteType.AGAINST), (2, 202, VoteType.AGAINST), (3, 202, VoteType.FOR),
+             (1, 203, VoteType.FOR), (9, 203, VoteType.AGAINST)]
+    matrix = build_agreement_matrix(
+        [VoteResults(id=index, legislator_id=legislator_id, vote_id=vote_id, vote_type=vote_type)
+         for index, (legislator_id, vote_id, vote_type) in enumerate(votes)]
+    )
+
+    rows = list(iter_most_similar_legislators(matrix, legislators, top_k=2))
+    ranked = [(row.legislator_id, row.rank, row.similar_legislator_id, row.agreement) for row in rows]
+
+    assert ranked == [(1, 1, 2, 1.0), (1, 2, 3, 0.5), (2, 1, 1, 1.0), (2, 2, 3, 0.5),
+                      (3, 1, 1, 0.5), (3, 2, 2, 0.5), (9, 1, 1, 0.0)]
+    assert (rows[0].legislator_name, rows[0].similar_legislator_name) == ("Alice", "Bob")
+    assert (rows[0].shared_votes, rows[0].agreed_votes) == (2, 2)
+    assert rows[-1].legislator_name == "Unknown"
+    assert [row.similar_legislator_id for row in iter_most_similar_legislators(
+        matrix, legislators, top_k=5, min_shared_votes=2) if row.legislator_id == 1] == [2, 3]
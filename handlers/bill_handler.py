@@ -3,20 +3,35 @@ This module contains helper functions for enriching bill data by:
 1. Assigning the primary sponsor's name to each bill based on legislator data.
 2. Counting the number of supporting and opposing votes for each bill.
 
-These functions operate on dictionaries of parsed dataclass instances.
+These functions operate on dictionaries of parsed dataclass instances. Vote results may also be
+passed as any iterable (e.g. the generator returned by `utils.iter_csv_dataclasses`), so they
+never have to be fully materialized in memory, or as a columnar `VoteResultsTable`.
 """
+from typing import Iterable, Union
 
-from models import VoteType, Bills, Legislators, Votes, VoteResults
+from models import VoteType, Bills, Legislators, Votes, VoteResults, VoteResultsTable, iter_vote_result_columns
+from utils import LazyTable
 
 
-def assign_bill_primary_sponsors(bills: dict[int, Bills], legislators: dict[int, Legislators]):
+def assign_bill_primary_sponsors(
+    bills: Union[dict[int, Bills], LazyTable],
+    legislators: Union[dict[int, Legislators], LazyTable]
+):
     """
     Assigns the name of the primary sponsor to each bill using the sponsor_id.
 
     Args:
-        bills (dict[int, Bills]): Dictionary of bills keyed by bill ID.
-        legislators (dict[int, Legislators]): Dictionary of legislators keyed by legislator ID.
+        bills (dict[int, Bills] | LazyTable): Dictionary or lazy table of bills keyed by bill ID. The sponsors
+            of a lazy table are read column-wise and assigned with `set_column`, without building its bills.
+        legislators (dict[int, Legislators] | LazyTable): Dictionary or lazy table of legislators keyed by
+            legislator ID; only the sponsors of a lazy table are built.
     """
+    if isinstance(bills, LazyTable):
+        bills.set_column('primary_sponsor', {
+            bill_id: legislators[sponsor_id].name
+            for bill_id, sponsor_id in bills.iter_columns('id', 'sponsor_id') if sponsor_id in legislators
+        })
+        return
     for bill in bills.values():
         if bill.sponsor_id in legislators:
             bill.primary_sponsor = legislators[bill.sponsor_id].name
@@ -25,7 +40,7 @@ def assign_bill_primary_sponsors(bills: dict[int, Bills], legislators: dict[int,
 def assign_bill_vote_counts(
     bills: dict[int, Bills],
     votes: dict[int, Votes],
-    vote_results: dict[int, VoteResults]
+    vote_results: Union[VoteResultsTable, dict[int, VoteResults], Iterable[VoteResults]]
 ):
     """
     Updates each bill's supporter and opposer count based on vote results.
@@ -33,13 +48,15 @@ def assign_bill_vote_counts(
     Args:
         bills (dict[int, Bills]): Dictionary of bills keyed by bill ID.
         votes (dict[int, Votes]): Dictionary of votes keyed by vote ID.
-        vote_results (dict[int, VoteResults]): Dictionary of vote results keyed by result ID.
+        vote_results (VoteResultsTable | dict[int, VoteResults] | Iterable[VoteResults]): A columnar
+            table, a dictionary of vote results keyed by result ID, or any iterable of vote results.
+            Iterables are consumed once. Only `vote_id` and `vote_type` are read.
     """
-    for vote_result in vote_results.values():
-        vote = votes[vote_result.vote_id]
+    for vote_id, vote_type in iter_vote_result_columns(vote_results, ('vote_id', 'vote_type')):
+        vote = votes[vote_id]
         bill = bills[vote.bill_id]
 
-        if vote_result.vote_type == VoteType.FOR:
+        if vote_type == VoteType.FOR.value:
             bill.supporter_count += 1
-        elif vote_result.vote_type == VoteType.AGAINST:
+        elif vote_type == VoteType.AGAINST.value:
             bill.opposer_count += 1
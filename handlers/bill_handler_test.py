@@ -9,9 +9,11 @@ Test functions include:
 - `test_assign_bill_primary_sponsors_unknown`: Tests the scenario where a bill's sponsor ID is not found in the list
 - `test_assign_bill_vote_counts`: Tests the correct update of supporter and opposer counts for each bill.
 - `test_no_votes_for_bill`: Tests the scenario where no votes are cast for a bill.
+- `test_assign_bill_vote_counts_from_iterable`: Tests that vote results can be streamed from any iterable.
+- `test_assign_bill_vote_counts_from_table`: Tests that vote results can be read from a `VoteResultsTable`.
 """
 from handlers import assign_bill_primary_sponsors, assign_bill_vote_counts
-from models import Legislators, Bills, Votes, VoteResults, VoteType
+from models import Legislators, Bills, Votes, VoteResults, VoteResultsTable, VoteType
 
 
 def test_assign_bill_primary_sponsors():
@@ -125,3 +127,64 @@ def test_no_votes_for_bill():
 
     assert bills[101].supporter_count == 0
     assert bills[101].opposer_count == 0
+
+
+def test_assign_bill_vote_counts_from_iterable():
+    """
+    Test case where vote results are given as a generator instead of a dictionary.
+    This test ensures that streamed vote results produce the same counts as a dictionary.
+
+    Simulates:
+    - "Education Reform Act" bill with 2 supporters and 1 opposer, streamed one result at a time.
+    """
+    bills = {
+        101: Bills(id=101, title="Education Reform Act", sponsor_id=1),
+    }
+
+    votes = {
+        201: Votes(id=201, bill_id=101),
+    }
+
+    vote_results = (
+        VoteResults(id=300 + legislator_id, legislator_id=legislator_id, vote_id=201, vote_type=vote_type)
+        for legislator_id, vote_type in ((1, VoteType.FOR), (2, VoteType.FOR), (3, VoteType.AGAINST))
+    )
+
+    assign_bill_vote_counts(bills, votes, vote_results)
+
+    assert bills[101].supporter_count == 2
+    assert bills[101].opposer_count == 1
+
+
+def test_assign_bill_vote_counts_from_table():
+    """
+    Test case where vote results are stored in a columnar `VoteResultsTable`.
+    This test ensures that the table gives the same counts as the equivalent dataclass instances.
+
+    Simulates:
+    - "Education Reform Act" bill with 1 supporter and 1 opposer.
+    - "Healthcare Reform Act" bill with 1 opposer and no supporters.
+    """
+    bills = {
+        101: Bills(id=101, title="Education Reform Act", sponsor_id=1),
+        102: Bills(id=102, title="Healthcare Reform Act", sponsor_id=2),
+    }
+
+    votes = {
+        201: Votes(id=201, bill_id=101),
+        202: Votes(id=202, bill_id=102),
+    }
+
+    vote_results = VoteResultsTable.from_vote_results({
+        301: VoteResults(id=301, legislator_id=1, vote_id=201, vote_type=VoteType.FOR),
+        302: VoteResults(id=302, legislator_id=2, vote_id=202, vote_type=VoteType.AGAINST),
+        303: VoteResults(id=303, legislator_id=3, vote_id=201, vote_type=VoteType.AGAINST),
+    })
+
+    assign_bill_vote_counts(bills, votes, vote_results)
+
+    assert len(vote_results) == 3
+    assert bills[101].supporter_count == 1
+    assert bills[101].opposer_count == 1
+    assert bills[102].supporter_count == 0
+    assert bills[102].opposer_count == 1
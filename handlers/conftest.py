@@ -0,0 +1,76 @@
+"""
+This module contains the fixtures shared by the handler tests.
+
+Each fixture builds new objects for every test, so tests can update their counts freely.
+
+Fixtures include:
+- `legislators`: Alice, Bob and Carol.
+- `bills`: The "Education Reform Act" sponsored by Alice and the "Healthcare Reform Act" sponsored by Bob.
+- `votes`: One vote on each bill.
+- `vote_results`: Alice supporting both bills, Bob opposing the "Healthcare Reform Act" and Carol opposing
+  the "Education Reform Act".
+- `memory_reports`: Computes the bill and legislator reports of an input directory with the in-memory handlers,
+  as a reference for the handlers reading from disk.
+"""
+import pytest
+
+from handlers import assign_bill_primary_sponsors, assign_bill_vote_counts, assign_legislator_vote_counts
+from models import Bills, Legislators, VoteResults, Votes, VoteType
+from utils import iter_csv_dataclasses, parse_csv_to_dataclass_dict
+
+
+@pytest.fixture(name="legislators")
+def fixture_legislators():
+    """Builds three legislators with all counts at zero."""
+    return {
+        1: Legislators(id=1, name="Alice"),
+        2: Legislators(id=2, name="Bob"),
+        3: Legislators(id=3, name="Carol"),
+    }
+
+
+@pytest.fixture(name="bills")
+def fixture_bills():
+    """Builds two bills with all counts at zero."""
+    return {
+        101: Bills(id=101, title="Education Reform Act", sponsor_id=1),
+        102: Bills(id=102, title="Healthcare Reform Act", sponsor_id=2),
+    }
+
+
+@pytest.fixture(name="votes")
+def fixture_votes():
+    """Builds one vote on each bill."""
+    return {
+        201: Votes(id=201, bill_id=101),
+        202: Votes(id=202, bill_id=102),
+    }
+
+
+@pytest.fixture(name="vote_results")
+def fixture_vote_results():
+    """Builds four vote results, keyed by ID, splitting each bill one FOR and one AGAINST."""
+    return {
+        301: VoteResults(id=301, legislator_id=1, vote_id=201, vote_type=VoteType.FOR),
+        302: VoteResults(id=302, legislator_id=2, vote_id=202, vote_type=VoteType.AGAINST),
+        303: VoteResults(id=303, legislator_id=3, vote_id=201, vote_type=VoteType.AGAINST),
+        304: VoteResults(id=304, legislator_id=1, vote_id=202, vote_type=VoteType.FOR),
+    }
+
+
+@pytest.fixture(name="memory_reports")
+def fixture_memory_reports():
+    """Returns a function computing the reports of an input directory with the in-memory handlers."""
+
+    def memory_reports(input_dir):
+        """Returns the bills and legislators of `input_dir` with their sponsors and vote counts assigned."""
+        bills = parse_csv_to_dataclass_dict(str(input_dir / "bills.csv"), Bills, ",")
+        legislators = parse_csv_to_dataclass_dict(str(input_dir / "legislators.csv"), Legislators, ",")
+        votes = parse_csv_to_dataclass_dict(str(input_dir / "votes.csv"), Votes, ",")
+        vote_results_path = str(input_dir / "vote_results.csv")
+        assign_bill_primary_sponsors(bills, legislators)
+        assign_bill_vote_counts(bills, votes, iter_csv_dataclasses(vote_results_path, VoteResults, ","))
+        assign_legislator_vote_counts(legislators, iter_csv_dataclasses(vote_results_path, VoteResults, ","))
+        return bills, legislators
+
+    return memory_reports
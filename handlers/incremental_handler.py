@@ -0,0 +1,218 @@
+"""
+This module provides incremental vote counting over an append-only vote results CSV file.
+
+Counts are checkpointed together with the byte offset and row count already consumed. On
+the next run, the checkpointed counts are restored onto the `Bills`/`Legislators` instances
+and only the rows appended since then are parsed and applied through the regular
+`assign_bill_vote_counts` / `assign_legislator_vote_counts` logic. If the consumed prefix
+of the file (or the vote -> bill mapping) changed, the counts are rebuilt from scratch. The whole
+prefix is hashed to check it, which reads the file but is much cheaper than parsing it again.
+
+Byte offsets are only meaningful in uncompressed CSV files: compressed and JSON Lines files are
+counted in full on every run, and the checkpoint is left untouched.
+"""
+import hashlib
+import os
+from typing import Any, Iterable, Iterator, Optional
+
+from models import Bills, Legislators, VoteResults, Votes
+from utils import (
+    VoteCountCheckpoint,
+    detect_input_format,
+    iter_csv_dataclasses,
+    iter_csv_shard,
+    load_checkpoint,
+    prefix_digest,
+    save_checkpoint,
+)
+
+from .bill_handler import assign_bill_vote_counts
+from .legislator_handler import assign_legislator_vote_counts
+from .vote_count_handler import assign_vote_counts
+
+
+def _votes_fingerprint(votes: Optional[dict[int, Votes]]) -> Optional[str]:
+    """Hashes the vote -> bill mapping, so bill counts are rebuilt if a vote is reassigned."""
+    if votes is None:
+        return None
+    digest = hashlib.sha256()
+    for vote_id, bill_id in sorted((vote.id, vote.bill_id) for vote in votes.values()):
+        digest.update(f"{vote_id}:{bill_id};".encode())
+    return digest.hexdigest()
+
+
+def _data_bounds(filepath: str) -> tuple[int, int]:
+    """
+    Returns the byte offset of the first data row and the end of the last complete row.
+
+    A trailing row without a line break may still be being written, so it is left for the next run.
+
+    Args:
+        filepath (str): The path to the CSV file.
+
+    Returns:
+        tuple[int, int]: The `(data_start, complete_end)` byte offsets.
+    """
+    with open(filepath, 'rb') as csvfile:
+        csvfile.readline()
+        data_start = csvfile.tell()
+        end = os.path.getsize(filepath)
+        while end > data_start:
+            csvfile.seek(max(data_start, end - 4096))
+            chunk = csvfile.read(end - csvfile.tell())
+            newline = chunk.rfind(b'\n')
+            if newline != -1:
+                return data_start, end - len(chunk) + newline + 1
+            end -= len(chunk)
+        return data_start, data_start
+
+
+def _restore_counts(
+    checkpoint: VoteCountCheckpoint,
+    bills: Optional[dict[int, Bills]],
+    legislators: Optional[dict[int, Legislators]]
+):
+    """Sets the counts stored in a checkpoint on the bills and legislators that still exist."""
+    if bills is not None:
+        for bill_id, (supporter_count, opposer_count) in checkpoint.bill_counts.items():
+            if bill_id in bills:
+                bills[bill_id].supporter_count = supporter_count
+                bills[bill_id].opposer_count = opposer_count
+    if legislators is not None:
+        for legislator_id, (num_supported, num_opposed) in checkpoint.legislator_counts.items():
+            if legislator_id in legislators:
+                legislators[legislator_id].num_supported_bills = num_supported
+                legislators[legislator_id].num_opposed_bills = num_opposed
+
+
+def _resumable_digest(
+    checkpoint: Optional[VoteCountCheckpoint],
+    filepath: str,
+    votes_fingerprint: Optional[str],
+    bills: Optional[dict[int, Bills]],
+    legislators: Optional[dict[int, Legislators]]
+) -> Optional[Any]:
+    """
+    Checks that a checkpoint holds every requested count and that its prefix is unchanged.
+
+    Returns:
+        hashlib._Hash | None: The digest of the checkpointed prefix, or None if the counts must be rebuilt.
+    """
+    if checkpoint is None:
+        return None
+    if bills is not None and (checkpoint.bill_counts is None or checkpoint.votes_fingerprint != votes_fingerprint):
+        return None
+    if legislators is not None and checkpoint.legislator_counts is None:
+        return None
+    return checkpoint.verify_prefix(filepath)
+
+
+def _assign_counts(
+    bills: Optional[dict[int, Bills]],
+    votes: Optional[dict[int, Votes]],
+    legislators: Optional[dict[int, Legislators]],
+    vote_results: Iterable[VoteResults]
+):
+    """Applies vote results to the bills and/or legislators that are given, in one pass."""
+    if bills is not None and legislators is not None:
+        assign_vote_counts(bills, legislators, votes, vote_results)
+    elif bills is not None:
+        assign_bill_vote_counts(bills, votes, vote_results)
+    else:
+        assign_legislator_vote_counts(legislators, vote_results)
+
+
+def _count_all(  # pylint: disable=too-many-arguments
+    vote_results_path: str,
+    delimiter: str,
+    bills: Optional[dict[int, Bills]],
+    votes: Optional[dict[int, Votes]],
+    legislators: Optional[dict[int, Legislators]]
+) -> int:
+    """Counts every vote result of a file that can't be resumed from a byte offset, and returns the rows."""
+    row_count = 0
+
+    def rows() -> Iterator[VoteResults]:
+        nonlocal row_count
+        for vote_result in iter_csv_dataclasses(vote_results_path, VoteResults, delimiter):
+            row_count += 1
+            yield vote_result
+
+    _assign_counts(bills, votes, legislators, rows())
+    return row_count
+
+
+def assign_vote_counts_incremental(  # pylint: disable=too-many-arguments
+    vote_results_path: str,
+    checkpoint_path: str,
+    *,
+    bills: Optional[dict[int, Bills]] = None,
+    votes: Optional[dict[int, Votes]] = None,
+    legislators: Optional[dict[int, Legislators]] = None,
+    delimiter: str = ','
+) -> int:
+    """
+    Updates bill and/or legislator vote counts, parsing only the rows appended since the last checkpoint.
+
+    Args:
+        vote_results_path (str): The path to the append-only vote results CSV file.
+        checkpoint_path (str): The path to the checkpoint JSON file; it is created or updated.
+        bills (dict[int, Bills] | None): Dictionary of bills keyed by bill ID, or None to skip bill counts.
+        votes (dict[int, Votes] | None): Dictionary of votes keyed by vote ID; required when `bills` is given.
+        legislators (dict[int, Legislators] | None): Dictionary of legislators keyed by legislator ID,
+            or None to skip legislator counts.
+        delimiter (str): The delimiter used in the CSV file.
+
+    Returns:
+        int: The number of vote result rows parsed during this call.
+
+    Notes:
+        - The Bills and Legislators objects must be freshly parsed (all counts at zero).
+        - Modifies the Bills and Legislators objects in-place.
+    """
+    if bills is None and legislators is None:
+        raise ValueError("At least one of bills or legislators must be given")
+    if bills is not None and votes is None:
+        raise ValueError("votes are required to count bill votes")
+
+    if not detect_input_format(vote_results_path).seekable:
+        return _count_all(vote_results_path, delimiter, bills, votes, legislators)
+
+    votes_fingerprint = _votes_fingerprint(votes) if bills is not None else None
+    checkpoint = load_checkpoint(checkpoint_path)
+    data_start, complete_end = _data_bounds(vote_results_path)
+
+    digest = _resumable_digest(checkpoint, vote_results_path, votes_fingerprint, bills, legislators)
+    if digest is not None:
+        _restore_counts(checkpoint, bills, legislators)
+        start, row_count = checkpoint.offset, checkpoint.row_count
+    else:
+        start, row_count = data_start, 0
+        digest = prefix_digest(vote_results_path, data_start)
+
+    new_rows = 0
+
+    def tail() -> Iterator[VoteResults]:
+        nonlocal new_rows
+        for vote_result in iter_csv_shard(vote_results_path, VoteResults, delimiter, (start, complete_end)):
+            new_rows += 1
+            yield vote_result
+
+    if start < complete_end:
+        _assign_counts(bills, votes, legislators, tail())
+
+    save_checkpoint(checkpoint_path, VoteCountCheckpoint(
+        offset=max(start, complete_end),
+        row_count=row_count + new_rows,
+        prefix_fingerprint=prefix_digest(vote_results_path, complete_end, digest, start).hexdigest(),
+        votes_fingerprint=votes_fingerprint,
+        bill_counts=None if bills is None else {
+            bill.id: [bill.supporter_count, bill.opposer_count]
+            for bill in bills.values() if bill.supporter_count or bill.opposer_count
+        },
+        legislator_counts=None if legislators is None else {
+            legislator.id: [legislator.num_supported_bills, legislator.num_opposed_bills]
+            for legislator in legislators.values() if legislator.num_supported_bills or legislator.num_opposed_bills
+        },
+    ))
+    return new_rows
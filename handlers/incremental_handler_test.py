@@ -0,0 +1,141 @@
+"""
+This module contains test cases for `assign_vote_counts_incremental`, which only parses the
+vote results appended since the previous checkpoint.
+
+Test functions include:
+- `test_incremental_run_parses_only_appended_rows`: Tests that a second run only parses the new tail.
+- `test_changed_prefix_triggers_full_rebuild`: Tests the fallback when the consumed prefix changed.
+- `test_edit_in_the_middle_of_a_long_prefix_is_detected`: Tests that every consumed byte is fingerprinted.
+- `test_incomplete_trailing_row_is_deferred`: Tests that a row still being written is left for later.
+- `test_compressed_file_is_counted_in_full`: Tests the fallback for files without meaningful byte offsets.
+"""
+import copy
+import gzip
+
+import pytest
+
+from handlers import assign_vote_counts_incremental
+
+HEADER = "id,legislator_id,vote_id,vote_type\n"
+
+
+@pytest.fixture(name="run")
+def fixture_run(bills, votes, legislators):
+    """Returns a function running an incremental count on fresh copies of the shared tables."""
+
+    def run(vote_results_path, checkpoint_path):
+        """Runs an incremental count and returns the number of parsed rows with the updated tables."""
+        run_bills, run_votes, run_legislators = copy.deepcopy((bills, votes, legislators))
+        parsed = assign_vote_counts_incremental(
+            str(vote_results_path), str(checkpoint_path), bills=run_bills, votes=run_votes, legislators=run_legislators
+        )
+        return parsed, run_bills, run_legislators
+
+    return run
+
+
+@pytest.fixture(name="paths")
+def fixture_paths(tmp_path):
+    """Returns the vote results and checkpoint paths inside a temporary directory."""
+    return tmp_path / "vote_results.csv", tmp_path / "checkpoint.json"
+
+
+def test_incremental_run_parses_only_appended_rows(paths, run):
+    """
+    Test case where rows are appended to the vote results between two runs.
+
+    Simulates:
+    - A first run over 2 vote results, then a second run after 1 more is appended.
+    """
+    vote_results_path, checkpoint_path = paths
+    vote_results_path.write_text(HEADER + "1,1,201,1\n2,2,201,2\n", encoding="utf-8")
+    parsed, _, _ = run(vote_results_path, checkpoint_path)
+    assert parsed == 2
+
+    with open(vote_results_path, "a", encoding="utf-8") as file:
+        file.write("3,1,202,1\n")
+    parsed, bills, legislators = run(vote_results_path, checkpoint_path)
+
+    assert parsed == 1
+    assert (bills[101].supporter_count, bills[101].opposer_count) == (1, 1)
+    assert (bills[102].supporter_count, bills[102].opposer_count) == (1, 0)
+    assert (legislators[1].num_supported_bills, legislators[1].num_opposed_bills) == (2, 0)
+    assert (legislators[2].num_supported_bills, legislators[2].num_opposed_bills) == (0, 1)
+
+
+def test_changed_prefix_triggers_full_rebuild(paths, run):
+    """
+    Test case where an already consumed row is rewritten in place.
+
+    Simulates:
+    - Bob's vote changes from AGAINST to FOR after the first run.
+    """
+    vote_results_path, checkpoint_path = paths
+    vote_results_path.write_text(HEADER + "1,1,201,1\n2,2,201,2\n", encoding="utf-8")
+    run(vote_results_path, checkpoint_path)
+
+    vote_results_path.write_text(HEADER + "1,1,201,1\n2,2,201,1\n", encoding="utf-8")
+    parsed, bills, _ = run(vote_results_path, checkpoint_path)
+
+    assert parsed == 2
+    assert (bills[101].supporter_count, bills[101].opposer_count) == (2, 0)
+
+
+def test_edit_in_the_middle_of_a_long_prefix_is_detected(paths, run):
+    """
+    Test case where a row far from both ends of a long consumed prefix is rewritten in place.
+
+    Simulates:
+    - 20,000 vote results (about 300 KB), the 10,000th changing from AGAINST to FOR, then 1 appended row.
+    """
+    vote_results_path, checkpoint_path = paths
+    rows = [f"{i},{1 + i % 2},201,{1 + i % 2}\n" for i in range(20000)]
+    vote_results_path.write_text(HEADER + "".join(rows), encoding="utf-8")
+    run(vote_results_path, checkpoint_path)
+
+    rows[9999] = "9999,2,201,1\n"
+    vote_results_path.write_text(HEADER + "".join(rows) + "20000,1,202,1\n", encoding="utf-8")
+    parsed, bills, _ = run(vote_results_path, checkpoint_path)
+
+    assert parsed == 20001
+    assert (bills[101].supporter_count, bills[101].opposer_count) == (10001, 9999)
+
+
+def test_incomplete_trailing_row_is_deferred(paths, run):
+    """
+    Test case where the last row has no line break yet because it is still being written.
+
+    Simulates:
+    - A run while the third row is half written, then a run once it is complete.
+    """
+    vote_results_path, checkpoint_path = paths
+    vote_results_path.write_text(HEADER + "1,1,201,1\n2,2,201,2\n3,1,2", encoding="utf-8")
+    parsed, _, _ = run(vote_results_path, checkpoint_path)
+    assert parsed == 2
+
+    with open(vote_results_path, "a", encoding="utf-8") as file:
+        file.write("02,2\n")
+    parsed, bills, _ = run(vote_results_path, checkpoint_path)
+
+    assert parsed == 1
+    assert (bills[102].supporter_count, bills[102].opposer_count) == (0, 1)
+
+
+def test_compressed_file_is_counted_in_full(tmp_path, run):
+    """
+    Test case where the vote results file is gzip-compressed, so it can't be resumed from a byte offset.
+
+    Simulates:
+    - Two runs over the same compressed file: both parse every row and no checkpoint is written.
+    """
+    vote_results_path = tmp_path / "vote_results.csv.gz"
+    checkpoint_path = tmp_path / "checkpoint.json"
+    vote_results_path.write_bytes(gzip.compress((HEADER + "1,1,201,1\n2,2,201,2\n3,1,202,1\n").encode()))
+
+    for _ in range(2):
+        parsed, bills, legislators = run(vote_results_path, checkpoint_path)
+        assert parsed == 3
+
+    assert (bills[101].supporter_count, bills[101].opposer_count) == (1, 1)
+    assert (legislators[1].num_supported_bills, legislators[1].num_opposed_bills) == (2, 0)
+    assert not checkpoint_path.exists()
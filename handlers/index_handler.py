@@ -0,0 +1,99 @@
+"""
+This module provides vote counting functions driven by a `VoteIndex` instead of a scan of the vote results.
+
+`assign_bill_vote_counts` and `assign_legislator_vote_counts` read every vote result, whatever
+the number of bills or legislators to update. With a `VoteIndex`, each bill or legislator only
+reads its own vote results, so updating a subset (e.g. the bills of one sponsor) costs the sum of
+their degrees. Updating every bill or legislator gives the same counts as the scanning handlers.
+
+The `_between` variants count only the votes held within a date window, from a `VoteTimeIndex`:
+each bill or legislator costs two bisections of its own dates, whatever the window.
+"""
+import datetime
+from typing import Optional
+
+from models import Bills, Legislators, VoteIndex, VoteTimeIndex
+
+
+def assign_bill_vote_counts_indexed(bills: dict[int, Bills], vote_index: VoteIndex):
+    """
+    Updates each bill's supporter and opposer count from its vote results in the index.
+
+    Args:
+        bills (dict[int, Bills]): Dictionary of the bills to update, keyed by bill ID.
+        vote_index (VoteIndex): The index built over the votes and vote results.
+
+    Notes:
+        - Modifies the Bills objects in-place.
+    """
+    for bill_id, bill in bills.items():
+        supporter_count, opposer_count = vote_index.bill_vote_counts(bill_id)
+        bill.supporter_count += supporter_count
+        bill.opposer_count += opposer_count
+
+
+def assign_legislator_vote_counts_indexed(legislators: dict[int, Legislators], vote_index: VoteIndex):
+    """
+    Updates each legislator's supported and opposed bill counts from their vote results in the index.
+
+    Args:
+        legislators (dict[int, Legislators]): Dictionary of the legislators to update, keyed by legislator ID.
+        vote_index (VoteIndex): The index built over the votes and vote results.
+
+    Notes:
+        - Modifies the Legislators objects in-place.
+    """
+    for legislator_id, legislator in legislators.items():
+        num_supported, num_opposed = vote_index.legislator_vote_counts(legislator_id)
+        legislator.num_supported_bills += num_supported
+        legislator.num_opposed_bills += num_opposed
+
+
+def assign_bill_vote_counts_between(
+    bills: dict[int, Bills],
+    time_index: VoteTimeIndex,
+    start: Optional[datetime.date] = None,
+    end: Optional[datetime.date] = None
+):
+    """
+    Updates each bill's supporter and opposer count from its votes held between two dates.
+
+    Args:
+        bills (dict[int, Bills]): Dictionary of the bills to update, keyed by bill ID.
+        time_index (VoteTimeIndex): The index built over the dated votes and the vote results.
+        start (datetime.date | None): The first day of the window (inclusive), or None for no lower bound.
+        end (datetime.date | None): The last day of the window (inclusive), or None for no upper bound.
+
+    Notes:
+        - Modifies the Bills objects in-place.
+        - Votes without a date are not counted.
+    """
+    for bill_id, bill in bills.items():
+        supporter_count, opposer_count = time_index.bill_vote_counts(bill_id, start, end)
+        bill.supporter_count += supporter_count
+        bill.opposer_count += opposer_count
+
+
+def assign_legislator_vote_counts_between(
+    legislators: dict[int, Legislators],
+    time_index: VoteTimeIndex,
+    start: Optional[datetime.date] = None,
+    end: Optional[datetime.date] = None
+):
+    """
+    Updates each legislator's supported and opposed bill counts from their votes held between two dates.
+
+    Args:
+        legislators (dict[int, Legislators]): Dictionary of the legislators to update, keyed by legislator ID.
+        time_index (VoteTimeIndex): The index built over the dated votes and the vote results.
+        start (datetime.date | None): The first day of the window (inclusive), or None for no lower bound.
+        end (datetime.date | None): The last day of the window (inclusive), or None for no upper bound.
+
+    Notes:
+        - Modifies the Legislators objects in-place.
+        - Votes without a date are not counted.
+    """
+    for legislator_id, legislator in legislators.items():
+        num_supported, num_opposed = time_index.legislator_vote_counts(legislator_id, start, end)
+        legislator.num_supported_bills += num_supported
+        legislator.num_opposed_bills += num_opposed
@@ -0,0 +1,177 @@
+"""
+This module contains test cases for the `VoteIndex` adjacency indexes and the handlers built on them.
+
+Test functions include:
+- `test_vote_index_queries`: Tests the per-bill, per-vote and per-legislator lookups.
+- `test_legislator_votes_on_bill`: Tests "how did X vote on Y" from both sides of the index.
+- `test_indexed_handlers_match_scanning_handlers`: Tests equivalence with the scanning handlers.
+- `test_time_index_matches_window_scan`: Tests the date window counts against a scan of the vote results.
+- `test_windowed_handlers`: Tests the `_between` handlers, with undated votes left out.
+"""
+import copy
+import datetime
+import random
+
+import pytest
+
+from handlers import (
+    assign_bill_vote_counts,
+    assign_bill_vote_counts_between,
+    assign_bill_vote_counts_indexed,
+    assign_legislator_vote_counts,
+    assign_legislator_vote_counts_between,
+    assign_legislator_vote_counts_indexed,
+)
+from models import VoteIndex, VoteResults, Votes, VoteTimeIndex, VoteType
+
+
+@pytest.fixture(name="dataset")
+def fixture_dataset(bills, legislators, votes, vote_results):
+    """Extends the shared tables with a second vote on bill 101 and two vote results on it: six in all."""
+    votes[203] = Votes(id=203, bill_id=101)
+    vote_results[305] = VoteResults(id=305, legislator_id=1, vote_id=203, vote_type=VoteType.AGAINST)
+    vote_results[306] = VoteResults(id=306, legislator_id=2, vote_id=203, vote_type=VoteType.FOR)
+    return bills, legislators, votes, vote_results
+
+
+def test_vote_index_queries(dataset):
+    """
+    Test case for the lookups of a `VoteIndex`.
+
+    Simulates:
+    - Bill 101 with votes 201 and 203, Alice voting three times, and unknown IDs.
+    """
+    _, _, votes, vote_results = dataset
+
+    index = VoteIndex.build(votes, vote_results)
+
+    assert index.votes_for_bill(101) == [201, 203]
+    assert list(index.results_for_bill(101)) == [(1, 201, 1), (3, 201, 2), (1, 203, 2), (2, 203, 1)]
+    assert list(index.results_for_vote(202)) == [(2, 202, 2), (1, 202, 1)]
+    assert list(index.results_for_legislator(1)) == [(1, 201, 1), (1, 202, 1), (1, 203, 2)]
+    assert index.bill_id_of_vote(203) == 101
+    assert index.bill_vote_counts(101) == (2, 2)
+    assert index.legislator_vote_counts(2) == (1, 1)
+    assert index.votes_for_bill(999) == []
+    assert not list(index.results_for_legislator(999))
+    assert index.bill_id_of_vote(999) is None
+
+
+def test_legislator_votes_on_bill(dataset):
+    """
+    Test case for the votes of one legislator on one bill.
+
+    Simulates:
+    - Alice on bill 101 (walked from Alice's side), Carol on bill 101 (walked from the bill's side),
+      and Carol on bill 102, where she did not vote.
+    """
+    _, _, votes, vote_results = dataset
+    index = VoteIndex.build(votes, vote_results)
+
+    assert index.legislator_votes_on_bill(1, 101) == [(201, 1), (203, 2)]
+    assert index.legislator_votes_on_bill(3, 101) == [(201, 2)]
+    assert not index.legislator_votes_on_bill(3, 102)
+
+
+def test_indexed_handlers_match_scanning_handlers(dataset):
+    """
+    Test case comparing the indexed handlers with `assign_bill_vote_counts` and `assign_legislator_vote_counts`.
+
+    Simulates:
+    - The same dataset counted both ways.
+    """
+    bills, legislators, votes, vote_results = dataset
+    scanned_bills, scanned_legislators = copy.deepcopy(bills), copy.deepcopy(legislators)
+    assign_bill_vote_counts(scanned_bills, votes, vote_results)
+    assign_legislator_vote_counts(scanned_legislators, vote_results)
+
+    index = VoteIndex.build(votes, vote_results)
+    assign_bill_vote_counts_indexed(bills, index)
+    assign_legislator_vote_counts_indexed(legislators, index)
+
+    assert bills == scanned_bills
+    assert legislators == scanned_legislators
+
+
+def test_time_index_matches_window_scan():
+    """
+    Test case comparing `VoteTimeIndex` window counts with a scan of every vote result per window.
+
+    Simulates:
+    - 40 votes on 6 bills spread over 60 days (several on the same day, some undated), 300 vote results
+      of 8 legislators including abstentions and results for an unknown vote, and 50 random windows.
+    """
+    rng = random.Random(7)
+    first_day = datetime.date(2021, 1, 1)
+    votes = {
+        vote_id: Votes(id=vote_id, bill_id=rng.randrange(6) + 100,
+                       date=first_day + datetime.timedelta(days=rng.randrange(60)) if vote_id % 9 else None)
+        for vote_id in range(200, 240)
+    }
+    vote_results = [
+        VoteResults(id=index, legislator_id=rng.randrange(8) + 1, vote_id=rng.randrange(200, 242),
+                    vote_type=rng.choice(list(VoteType)))
+        for index in range(300)
+    ]
+
+    index = VoteTimeIndex.build(votes, vote_results)
+
+    def scan(matches, start, end):
+        counts = [0, 0]
+        for vote_result in vote_results:
+            vote = votes.get(vote_result.vote_id)
+            if vote is None or vote.date is None or not matches(vote_result, vote):
+                continue
+            if (start is None or vote.date >= start) and (end is None or vote.date <= end):
+                if vote_result.vote_type in (VoteType.FOR, VoteType.AGAINST):
+                    counts[vote_result.vote_type.value - 1] += 1
+        return tuple(counts)
+
+    windows = [(None, None)] + [
+        tuple(sorted(first_day + datetime.timedelta(days=rng.randrange(-5, 65)) for _ in range(2)))
+        for _ in range(50)
+    ]
+    for start, end in windows:
+        for bill_id in range(99, 107):
+            assert index.bill_vote_counts(bill_id, start, end) == scan(
+                lambda _, vote, bill_id=bill_id: vote.bill_id == bill_id, start, end)
+        for legislator_id in range(0, 10):
+            assert index.legislator_vote_counts(legislator_id, start, end) == scan(
+                lambda result, _, legislator_id=legislator_id: result.legislator_id == legislator_id, start, end)
+    assert index.skipped == sum(votes.get(result.vote_id, Votes(0, 0)).date is None for result in vote_results)
+    bill_dates = sorted(vote.date for vote in (votes.get(result.vote_id) for result in vote_results)
+                        if vote is not None and vote.date and vote.bill_id == 100)
+    assert index.by_bill.date_range(100) == (bill_dates[0], bill_dates[-1])
+    assert index.by_bill.date_range(99) is None
+
+
+def test_windowed_handlers(dataset):
+    """
+    Test case for counting the bills and legislators over a date window.
+
+    Simulates:
+    - Votes 201 and 202 held in 2021, vote 203 without a date: the full window matches the scanning
+      handlers without vote 203, and a window ending before vote 202 leaves bill 102 at zero.
+    """
+    bills, legislators, votes, vote_results = dataset
+    votes[201].date = datetime.date(2021, 3, 1)
+    votes[202].date = datetime.date(2021, 6, 1)
+    dated_results = {key: result for key, result in vote_results.items() if result.vote_id != 203}
+    scanned_bills, scanned_legislators = copy.deepcopy(bills), copy.deepcopy(legislators)
+    assign_bill_vote_counts(scanned_bills, votes, dated_results)
+    assign_legislator_vote_counts(scanned_legislators, dated_results)
+
+    index = VoteTimeIndex.build(votes, vote_results)
+    window_bills, window_legislators = copy.deepcopy(bills), copy.deepcopy(legislators)
+    assign_bill_vote_counts_between(bills, index)
+    assign_legislator_vote_counts_between(legislators, index)
+    assign_bill_vote_counts_between(window_bills, index, end=datetime.date(2021, 5, 31))
+    assign_legislator_vote_counts_between(window_legislators, index, start=datetime.date(2021, 3, 1),
+                                          end=datetime.date(2021, 5, 31))
+
+    assert bills == scanned_bills
+    assert legislators == scanned_legislators
+    assert [(bill.supporter_count, bill.opposer_count) for bill in window_bills.values()] == [(1, 1), (0, 0)]
+    assert [(legislator.num_supported_bills, legislator.num_opposed_bills)
+            for legislator in window_legislators.values()] == [(1, 0), (0, 0), (0, 1)]
+    assert index.skipped == 2
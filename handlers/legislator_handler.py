@@ -4,29 +4,34 @@ based on their recorded vote results.
 
 The function modifies `Legislators` dataclass instances in place, increasing the
 number of supported or opposed bills depending on the type of vote recorded.
+Vote results may be a dictionary or any iterable, so they can be streamed straight from the CSV reader,
+or a columnar `VoteResultsTable`.
 """
+from typing import Iterable, Union
 
-from models import VoteType, Legislators, VoteResults
+from models import VoteType, Legislators, VoteResults, VoteResultsTable, iter_vote_result_columns
 
 
 def assign_legislator_vote_counts(
     legislators: dict[int, Legislators],
-    vote_results: dict[int, VoteResults]
+    vote_results: Union[VoteResultsTable, dict[int, VoteResults], Iterable[VoteResults]]
 ):
     """
     Updates the support and opposition counts for each legislator based on vote results.
 
     Args:
         legislators (dict[int, Legislators]): Dictionary of legislators keyed by legislator ID.
-        vote_results (dict[int, VoteResults]): Dictionary of vote results keyed by result ID.
+        vote_results (VoteResultsTable | dict[int, VoteResults] | Iterable[VoteResults]): A columnar
+            table, a dictionary of vote results keyed by result ID, or any iterable of vote results.
+            Iterables are consumed once. Only `legislator_id` and `vote_type` are read.
 
     Notes:
         - Assumes all vote_result.legislator_id values exist in the legislators dictionary.
         - Modifies the Legislators objects in-place.
     """
-    for vote_result in vote_results.values():
-        legislator = legislators[vote_result.legislator_id]
-        if vote_result.vote_type == VoteType.FOR:
+    for legislator_id, vote_type in iter_vote_result_columns(vote_results, ('legislator_id', 'vote_type')):
+        legislator = legislators[legislator_id]
+        if vote_type == VoteType.FOR.value:
             legislator.num_supported_bills += 1
-        elif vote_result.vote_type == VoteType.AGAINST:
+        elif vote_type == VoteType.AGAINST.value:
             legislator.num_opposed_bills += 1
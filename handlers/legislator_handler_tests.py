@@ -7,10 +7,12 @@ The tests ensure that:
 - The vote counts are correctly updated when vote results exist for a legislator.
 - A legislator with no vote results has a count of zero for supported and opposed bills.
 - Multiple votes for the same legislator are handled correctly.
+- Vote results streamed from an iterable are counted like a dictionary.
+- Vote results stored in a columnar `VoteResultsTable` are counted like a dictionary.
 """
 
 from handlers import assign_legislator_vote_counts
-from models import Legislators, VoteResults, VoteType
+from models import Legislators, VoteResults, VoteResultsTable, VoteType
 
 
 def test_basic_vote_count_update():
@@ -84,3 +86,54 @@ def test_multiple_votes_same_legislator():
 
     assert legislators[1].num_supported_bills == 2
     assert legislators[1].num_opposed_bills == 1
+
+
+def test_vote_counts_from_iterable():
+    """
+    Test case where vote results are given as a list instead of a dictionary.
+    This test ensures that any iterable of vote results can be consumed by the handler.
+
+    The test simulates the following:
+    - Erin supports one bill and opposes two, passed as a plain list.
+    """
+    legislators = {
+        1: Legislators(id=1, name="Erin"),
+    }
+
+    vote_results = [
+        VoteResults(id=101, legislator_id=1, vote_id=201, vote_type=VoteType.FOR),
+        VoteResults(id=102, legislator_id=1, vote_id=202, vote_type=VoteType.AGAINST),
+        VoteResults(id=103, legislator_id=1, vote_id=203, vote_type=VoteType.AGAINST),
+    ]
+
+    assign_legislator_vote_counts(legislators, vote_results)
+
+    assert legislators[1].num_supported_bills == 1
+    assert legislators[1].num_opposed_bills == 2
+
+
+def test_vote_counts_from_table():
+    """
+    Test case where vote results are loaded into a `VoteResultsTable` from plain row tuples.
+    This test ensures that the handler aggregates directly over the packed columns.
+
+    The test simulates the following:
+    - Frank supports two bills and Grace opposes one.
+    """
+    legislators = {
+        1: Legislators(id=1, name="Frank"),
+        2: Legislators(id=2, name="Grace"),
+    }
+
+    vote_results = VoteResultsTable.from_rows([
+        (101, 1, 201, VoteType.FOR),
+        (102, 1, 202, VoteType.FOR),
+        (103, 2, 202, VoteType.AGAINST),
+    ])
+
+    assign_legislator_vote_counts(legislators, vote_results)
+
+    assert legislators[1].num_supported_bills == 2
+    assert legislators[1].num_opposed_bills == 0
+    assert legislators[2].num_supported_bills == 0
+    assert legislators[2].num_opposed_bills == 1
@@ -0,0 +1,129 @@
+"""
+This module provides a multiprocess, map-reduce version of the vote counting handlers.
+
+The vote results CSV file is split into byte-range shards aligned to line boundaries. Each
+worker of a `ProcessPoolExecutor` parses one shard and produces a partial `VoteTally` with
+per-bill and per-legislator FOR/AGAINST counters. The parent merges the partial tallies in
+shard order and applies the merged counts to the `Bills` and `Legislators` instances.
+
+The counts are identical to those produced by the serial `assign_*` functions. Compressed and
+JSON Lines files can't be split by byte offsets, so they are streamed and counted in the current
+process instead.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional
+
+from models import Bills, Legislators, VoteResults, Votes, VoteTally
+from utils import detect_input_format, iter_csv_dataclasses, iter_csv_shard, split_csv_into_shards
+
+# Vote id -> bill id mapping shared with the worker processes by `_init_worker`
+_VOTE_BILLS: Optional[dict[int, int]] = None
+
+
+def _init_worker(vote_bills: Optional[dict[int, int]]):
+    """Stores the vote id -> bill id mapping once per worker process."""
+    global _VOTE_BILLS  # pylint: disable=global-statement
+    _VOTE_BILLS = vote_bills
+
+
+def _tally_rows(rows: Iterable[tuple]) -> VoteTally:
+    """Counts the votes of vote result tuples, with the mapping stored by `_init_worker`."""
+    tally = VoteTally()
+    add = tally.add
+    vote_bills = _VOTE_BILLS
+    if vote_bills is None:
+        for _, legislator_id, _, vote_type in rows:
+            add(None, legislator_id, vote_type.value)
+    else:
+        for _, legislator_id, vote_id, vote_type in rows:
+            add(vote_bills[vote_id], legislator_id, vote_type.value)
+    return tally
+
+
+def _tally_shard(filepath: str, delimiter: str, shard: tuple[int, int]) -> VoteTally:
+    """
+    Parses one shard of the vote results file and counts its votes.
+
+    Args:
+        filepath (str): The path to the vote results CSV file.
+        delimiter (str): The delimiter used in the CSV file.
+        shard (tuple[int, int]): The byte range of the shard.
+
+    Returns:
+        VoteTally: The partial counts of the shard.
+    """
+    return _tally_rows(iter_csv_shard(filepath, VoteResults, delimiter, shard, as_tuples=True))
+
+
+def tally_vote_results_parallel(
+    filepath: str,
+    votes: Optional[dict[int, Votes]] = None,
+    delimiter: str = ',',
+    workers: Optional[int] = None
+) -> VoteTally:
+    """
+    Counts the vote results of a CSV file per bill and per legislator using several processes.
+
+    Args:
+        filepath (str): The path to the vote results CSV file.
+        votes (dict[int, Votes] | None): Dictionary of votes keyed by vote ID. When None, only the
+            per-legislator counters are computed.
+        delimiter (str): The delimiter used in the CSV file.
+        workers (int | None): Number of worker processes (default: `os.cpu_count()`).
+            With a single worker, or a compressed or JSON Lines file, the file is processed in the
+            current process.
+
+    Returns:
+        VoteTally: The merged counts of all shards.
+    """
+    workers = workers or os.cpu_count() or 1
+    vote_bills = {vote.id: vote.bill_id for vote in votes.values()} if votes is not None else None
+    if not detect_input_format(filepath).seekable:
+        _init_worker(vote_bills)
+        return _tally_rows(iter_csv_dataclasses(filepath, VoteResults, delimiter, as_tuples=True))
+    shards = split_csv_into_shards(filepath, num_shards=workers)
+
+    tally = VoteTally()
+    if workers == 1 or len(shards) <= 1:
+        _init_worker(vote_bills)
+        for shard in shards:
+            tally.merge(_tally_shard(filepath, delimiter, shard))
+        return tally
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(vote_bills,)) as executor:
+        futures = [executor.submit(_tally_shard, filepath, delimiter, shard) for shard in shards]
+        # Merge in shard order so the result never depends on worker scheduling
+        for future in futures:
+            tally.merge(future.result())
+    return tally
+
+
+def apply_vote_tally(
+    tally: VoteTally,
+    bills: Optional[dict[int, Bills]] = None,
+    legislators: Optional[dict[int, Legislators]] = None
+):
+    """
+    Adds the counts of a tally to bills and/or legislators.
+
+    Args:
+        tally (VoteTally): The counts to apply.
+        bills (dict[int, Bills] | None): Dictionary of bills keyed by bill ID, or None to skip bills.
+        legislators (dict[int, Legislators] | None): Dictionary of legislators keyed by legislator ID,
+            or None to skip legislators.
+
+    Notes:
+        - Like the serial handlers, raises a `KeyError` if a counted bill or legislator is unknown.
+        - Modifies the Bills and Legislators objects in-place.
+    """
+    if bills is not None:
+        for bill_id, count in tally.bill_supporters.items():
+            bills[bill_id].supporter_count += count
+        for bill_id, count in tally.bill_opposers.items():
+            bills[bill_id].opposer_count += count
+    if legislators is not None:
+        for legislator_id, count in tally.legislator_supported.items():
+            legislators[legislator_id].num_supported_bills += count
+        for legislator_id, count in tally.legislator_opposed.items():
+            legislators[legislator_id].num_opposed_bills += count
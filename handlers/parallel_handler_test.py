@@ -0,0 +1,112 @@
+"""
+This module contains test cases for the multiprocess vote counting in `handlers.parallel_handler`.
+Results are compared with the serial `assign_bill_vote_counts` and `assign_legislator_vote_counts`.
+
+Test functions include:
+- `test_shards_cover_every_row_once`: Tests that byte-range shards split the rows without overlap.
+- `test_parallel_counts_match_serial_handlers`: Tests that several workers give the serial results.
+- `test_parallel_legislator_counts_without_votes`: Tests the legislator-only mode.
+- `test_compressed_file_is_counted_in_process`: Tests the fallback for files that can't be sharded.
+"""
+import copy
+import gzip
+import random
+
+import pytest
+
+from handlers import (
+    apply_vote_tally,
+    assign_bill_vote_counts,
+    assign_legislator_vote_counts,
+    tally_vote_results_parallel,
+)
+from models import Bills, Legislators, VoteResults, Votes
+from utils import iter_csv_dataclasses, iter_csv_shard, split_csv_into_shards
+
+
+@pytest.fixture(name="dataset")
+def fixture_dataset(tmp_path):
+    """Writes 1000 random vote results to a CSV file and returns it with the matching tables."""
+    rng = random.Random(3)
+    legislators = {i: Legislators(id=i, name=f"Legislator {i}") for i in range(1, 31)}
+    bills = {i: Bills(id=i, title=f"Bill {i}", sponsor_id=rng.randint(1, 30)) for i in range(100, 120)}
+    votes = {i: Votes(id=i, bill_id=rng.randint(100, 119)) for i in range(500, 540)}
+
+    path = tmp_path / "vote_results.csv"
+    lines = ["id,legislator_id,vote_id,vote_type"]
+    lines += [f"{i},{rng.randint(1, 30)},{rng.randint(500, 539)},{rng.randint(1, 2)}" for i in range(1, 1001)]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path), bills, legislators, votes
+
+
+def test_shards_cover_every_row_once(dataset):
+    """
+    Test case for splitting the vote results file into line-aligned shards.
+
+    Simulates:
+    - 1000 vote results split into 7 shards, read back in shard order.
+    """
+    path = dataset[0]
+
+    shards = split_csv_into_shards(path, num_shards=7)
+    sharded = [row for shard in shards for row in iter_csv_shard(path, VoteResults, ",", shard)]
+
+    assert len(shards) == 7
+    assert sharded == list(iter_csv_dataclasses(path, VoteResults, ","))
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_parallel_counts_match_serial_handlers(dataset, workers):
+    """
+    Test case comparing the parallel map-reduce counts with the serial handlers.
+
+    Simulates:
+    - 1000 vote results counted in-process and by a pool of 3 worker processes.
+    """
+    path, bills, legislators, votes = dataset
+    expected_bills, expected_legislators = copy.deepcopy(bills), copy.deepcopy(legislators)
+    assign_bill_vote_counts(expected_bills, votes, iter_csv_dataclasses(path, VoteResults, ","))
+    assign_legislator_vote_counts(expected_legislators, iter_csv_dataclasses(path, VoteResults, ","))
+
+    tally = tally_vote_results_parallel(path, votes=votes, delimiter=",", workers=workers)
+    apply_vote_tally(tally, bills=bills, legislators=legislators)
+
+    assert bills == expected_bills
+    assert legislators == expected_legislators
+
+
+def test_parallel_legislator_counts_without_votes(dataset):
+    """
+    Test case where no votes are given, so only legislator counters are computed.
+
+    Simulates:
+    - 1000 vote results counted per legislator by 2 workers.
+    """
+    path, _, legislators, _ = dataset
+    expected = copy.deepcopy(legislators)
+    assign_legislator_vote_counts(expected, iter_csv_dataclasses(path, VoteResults, ","))
+
+    tally = tally_vote_results_parallel(path, delimiter=",", workers=2)
+    apply_vote_tally(tally, legislators=legislators)
+
+    assert not tally.bill_supporters and not tally.bill_opposers
+    assert legislators == expected
+
+
+def test_compressed_file_is_counted_in_process(dataset, tmp_path):
+    """
+    Test case where the vote results file is gzip-compressed, so it can't be split into byte ranges.
+
+    Simulates:
+    - The 1000 vote results compressed, counted with 3 workers requested.
+    """
+    path, bills, legislators, votes = dataset
+    compressed = tmp_path / "vote_results.csv.gz"
+    with open(path, "rb") as source:
+        compressed.write_bytes(gzip.compress(source.read()))
+
+    tally = tally_vote_results_parallel(str(compressed), votes=votes, delimiter=",", workers=3)
+
+    assert tally == tally_vote_results_parallel(path, votes=votes, delimiter=",", workers=1)
+    apply_vote_tally(tally, bills=bills, legislators=legislators)
+    assert sum(bill.supporter_count + bill.opposer_count for bill in bills.values()) == 1000
@@ -0,0 +1,110 @@
+"""
+This module declares the top-K ranking reports of bills and legislators, ranked by their vote counts.
+
+The rankings are scored from the counts the other handlers assign, so they are computed over
+bills and legislators as they are written (see `utils.TopK.feed`), with one bounded heap per
+ranking instead of a sort of every row:
+    - `BILL_RANKINGS`: most supported and most opposed bills, highest support ratio
+      (`supporters / (supporters + opposers)`, bills without votes left out) and widest margin
+      (`supporters - opposers`).
+    - `LEGISLATOR_RANKINGS`: legislators supporting and opposing the most bills, and most contrarian
+      legislators (share of opposed bills among the bills they voted on, legislators without votes
+      left out).
+
+Each ranking is written to its own small CSV file of `RankedEntry` rows, named after the ranking.
+"""
+import dataclasses
+import os
+from operator import attrgetter
+from typing import Any, Iterator, Optional
+
+from models import Bills, Legislators, RankedEntry
+from utils import Ranking, TopK, write_dataclasses_to_csv
+
+DEFAULT_TOP_K = 100
+
+
+def _share(part: int, other: int) -> Optional[float]:
+    """Returns `part / (part + other)`, or None when both are 0."""
+    total = part + other
+    return round(part / total, 6) if total else None
+
+
+def _support_ratio(bill: Bills) -> Optional[float]:
+    """Scores a bill by the share of its FOR votes among its FOR and AGAINST votes."""
+    return _share(bill.supporter_count, bill.opposer_count)
+
+
+def _margin(bill: Bills) -> int:
+    """Scores a bill by the difference between its FOR and AGAINST votes."""
+    return bill.supporter_count - bill.opposer_count
+
+
+def _contrarian_ratio(legislator: Legislators) -> Optional[float]:
+    """Scores a legislator by the share of opposed bills among the bills they voted on."""
+    return _share(legislator.num_opposed_bills, legislator.num_supported_bills)
+
+
+BILL_RANKINGS = (
+    Ranking('most-supported-bills', attrgetter('supporter_count')),
+    Ranking('most-opposed-bills', attrgetter('opposer_count')),
+    Ranking('highest-support-ratio-bills', _support_ratio),
+    Ranking('widest-margin-bills', _margin),
+)
+LEGISLATOR_RANKINGS = (
+    Ranking('most-supportive-legislators', attrgetter('num_supported_bills')),
+    Ranking('most-opposing-legislators', attrgetter('num_opposed_bills')),
+    Ranking('most-contrarian-legislators', _contrarian_ratio),
+)
+
+# The fields of each row type written as the name, supporting and opposing columns of its entries
+_BILL_FIELDS = attrgetter('title', 'supporter_count', 'opposer_count')
+_LEGISLATOR_FIELDS = attrgetter('name', 'num_supported_bills', 'num_opposed_bills')
+
+
+def bill_rankings(limit: int = DEFAULT_TOP_K) -> TopK:
+    """Returns empty heaps for the bill rankings, each keeping the top `limit` bills."""
+    return TopK([dataclasses.replace(ranking, limit=limit) for ranking in BILL_RANKINGS])
+
+
+def legislator_rankings(limit: int = DEFAULT_TOP_K) -> TopK:
+    """Returns empty heaps for the legislator rankings, each keeping the top `limit` legislators."""
+    return TopK([dataclasses.replace(ranking, limit=limit) for ranking in LEGISLATOR_RANKINGS])
+
+
+def iter_ranked_entries(ranked: list[tuple[float, Any]]) -> Iterator[RankedEntry]:
+    """
+    Yields the rows of a ranking report from the results of a `TopK`.
+
+    Args:
+        ranked (list[tuple[float, Any]]): The `(score, row)` pairs of a ranking, highest first, whose rows
+            are bills or legislators.
+
+    Yields:
+        RankedEntry: Each row with its rank, starting at 1.
+    """
+    for rank, (score, row) in enumerate(ranked, start=1):
+        fields = _BILL_FIELDS if isinstance(row, Bills) else _LEGISLATOR_FIELDS
+        name, supporting, opposing = fields(row)
+        yield RankedEntry(rank=rank, id=row.id, name=name, score=score, supporting=supporting, opposing=opposing)
+
+
+def write_ranking_reports(output_dir: str, *top_ks: TopK, suffix: str = '') -> list[str]:
+    """
+    Writes one CSV file per ranking of the given heaps, once every row has been added.
+
+    Args:
+        output_dir (str): The directory of the ranking files.
+        *top_ks (TopK): The filled heaps, e.g. from `bill_rankings` and `legislator_rankings`.
+        suffix (str): Appended to the `<ranking name>.csv` file names, e.g. `.gz` to compress them.
+
+    Returns:
+        list[str]: The paths of the written files.
+    """
+    paths = []
+    for top_k in top_ks:
+        for name, ranked in top_k.results().items():
+            path = os.path.join(output_dir, f'{name}.csv{suffix}')
+            write_dataclasses_to_csv(path, iter_ranked_entries(ranked), RankedEntry)
+            paths.append(path)
+    return paths
@@ -0,0 +1,46 @@
+"""
+This module contains test cases for the ranking reports of `handlers.ranking_handler`.
+
+Test functions include:
+- `test_ranking_reports_are_written`: Tests the ranked entries written for bills and legislators.
+"""
+import csv
+
+from handlers import bill_rankings, legislator_rankings, write_ranking_reports
+from models import Bills, Legislators
+
+
+def _read(path):
+    """Reads the rows of a ranking report as tuples of strings, without the header."""
+    with open(path, newline='', encoding='utf-8') as file:
+        return [tuple(row) for row in csv.reader(file)][1:]
+
+
+def test_ranking_reports_are_written(tmp_path):
+    """
+    Test case where three bills and three legislators are ranked, keeping the top 2 of each ranking.
+
+    Simulates:
+    - A bill and a legislator without votes, left out of the ratio rankings, and two tied bills.
+    """
+    bill_ranks, legislator_ranks = bill_rankings(2), legislator_rankings(2)
+    for bill in (Bills(id=1, title="Tax Act", sponsor_id=1, supporter_count=3, opposer_count=1),
+                 Bills(id=2, title="Farm Act", sponsor_id=1, supporter_count=3, opposer_count=0),
+                 Bills(id=3, title="Idle Act", sponsor_id=2)):
+        bill_ranks.add(bill)
+    for legislator in (Legislators(id=10, name="Alice", num_supported_bills=2, num_opposed_bills=1),
+                       Legislators(id=11, name="Bob", num_supported_bills=0, num_opposed_bills=2),
+                       Legislators(id=12, name="Carol")):
+        legislator_ranks.add(legislator)
+
+    paths = write_ranking_reports(str(tmp_path), bill_ranks, legislator_ranks)
+
+    assert len(paths) == 7
+    assert _read(tmp_path / "most-supported-bills.csv") == [
+        ("1", "1", "Tax Act", "3", "3", "1"), ("2", "2", "Farm Act", "3", "3", "0")]
+    assert _read(tmp_path / "highest-support-ratio-bills.csv") == [
+        ("1", "2", "Farm Act", "1.0", "3", "0"), ("2", "1", "Tax Act", "0.75", "3", "1")]
+    assert _read(tmp_path / "widest-margin-bills.csv") == [
+        ("1", "2", "Farm Act", "3", "3", "0"), ("2", "1", "Tax Act", "2", "3", "1")]
+    assert _read(tmp_path / "most-contrarian-legislators.csv") == [
+        ("1", "11", "Bob", "1.0", "0", "2"), ("2", "10", "Alice", "0.333333", "2", "1")]
@@ -0,0 +1,156 @@
+"""
+This module declares the vote count reports as aggregates of the `utils.query_engine` engine.
+
+Each report is a tuple of `Aggregate`s over the vote results, joined to the votes (for the bill of
+each vote result) and to the bills (for the sponsor of each bill):
+    - `BILL_VOTE_COUNTS`: supporters and opposers per bill, as `assign_bill_vote_counts`.
+    - `LEGISLATOR_VOTE_COUNTS`: supported and opposed bills per legislator, as `assign_legislator_vote_counts`.
+    - `SPONSOR_VOTE_COUNTS`: FOR and AGAINST votes received by the bills of each primary sponsor.
+
+Any combination of reports is computed in a single scan of the vote results, and the engine
+returned by `build_report_engine` keeps its join lookups between runs.
+"""
+from collections import Counter
+from typing import Any, Iterable, Iterator, Union
+
+from models import (
+    VOTE_RESULT_COLUMNS,
+    Bills,
+    Legislators,
+    SponsorVoteCounts,
+    VoteResults,
+    VoteResultsTable,
+    Votes,
+    VoteType,
+    iter_vote_result_columns,
+)
+from utils import Aggregate, Join, QueryEngine
+
+_FOR = (('vote_type', VoteType.FOR),)
+_AGAINST = (('vote_type', VoteType.AGAINST),)
+
+BILL_VOTE_COUNTS = (
+    Aggregate('supporter_count', group_by='votes.bill_id', where=_FOR),
+    Aggregate('opposer_count', group_by='votes.bill_id', where=_AGAINST),
+)
+LEGISLATOR_VOTE_COUNTS = (
+    Aggregate('num_supported_bills', group_by='legislator_id', where=_FOR),
+    Aggregate('num_opposed_bills', group_by='legislator_id', where=_AGAINST),
+)
+SPONSOR_VOTE_COUNTS = (
+    Aggregate('supporting_votes', group_by='bills.sponsor_id', where=_FOR),
+    Aggregate('opposing_votes', group_by='bills.sponsor_id', where=_AGAINST),
+)
+
+
+def build_report_engine(votes: dict[int, Votes], bills: dict[int, Bills]) -> QueryEngine:
+    """
+    Creates the query engine joining vote results to their votes and bills.
+
+    Args:
+        votes (dict[int, Votes]): Dictionary of votes keyed by vote ID, joined on `vote_id`.
+        bills (dict[int, Bills]): Dictionary of bills keyed by bill ID, joined on `votes.bill_id`.
+
+    Returns:
+        QueryEngine: The engine to pass to `run_vote_reports`.
+    """
+    return QueryEngine([Join('votes', on='vote_id', table=votes), Join('bills', on='votes.bill_id', table=bills)])
+
+
+def run_vote_reports(
+    engine: QueryEngine,
+    vote_results: Union[VoteResultsTable, dict[int, VoteResults], Iterable[VoteResults]],
+    *reports: tuple[Aggregate, ...]
+) -> dict[str, dict[int, int]]:
+    """
+    Computes the aggregates of every report in a single scan of the vote results.
+
+    Args:
+        engine (QueryEngine): The engine returned by `build_report_engine`.
+        vote_results (VoteResultsTable | dict[int, VoteResults] | Iterable[VoteResults]): A columnar
+            table, a dictionary of vote results keyed by result ID, or any iterable of vote results.
+            Iterables are consumed once.
+        *reports (tuple[Aggregate, ...]): The reports to compute, e.g. `BILL_VOTE_COUNTS`.
+
+    Returns:
+        dict[str, dict[int, int]]: The counts of each aggregate by name, keyed by bill, legislator or sponsor ID.
+    """
+    aggregates = [aggregate for report in reports for aggregate in report]
+    return engine.run(iter_vote_result_columns(vote_results), VOTE_RESULT_COLUMNS, aggregates)
+
+
+def apply_report_counts(objects: dict[int, Any], counts: dict[str, dict[int, int]], report: tuple[Aggregate, ...]):
+    """
+    Adds the counts of a report to the attributes of the same name of the objects they are keyed by.
+
+    Args:
+        objects (dict[int, Any]): The objects to update, e.g. bills keyed by bill ID for `BILL_VOTE_COUNTS`.
+        counts (dict[str, dict[int, int]]): The result of `run_vote_reports`.
+        report (tuple[Aggregate, ...]): The report whose counts are added.
+
+    Notes:
+        - Raises a `KeyError` if a count is keyed by an ID missing from `objects`.
+        - Modifies the objects in-place.
+    """
+    for aggregate in report:
+        for key, count in counts[aggregate.name].items():
+            target = objects[key]
+            setattr(target, aggregate.name, getattr(target, aggregate.name) + count)
+
+
+def assign_vote_counts_query(
+    bills: dict[int, Bills],
+    legislators: dict[int, Legislators],
+    votes: dict[int, Votes],
+    vote_results: Union[VoteResultsTable, dict[int, VoteResults], Iterable[VoteResults]]
+):
+    """
+    Updates bill and legislator vote counts with the declared reports, in one scan of the vote results.
+
+    Equivalent to `assign_vote_counts`.
+
+    Args:
+        bills (dict[int, Bills]): Dictionary of bills keyed by bill ID.
+        legislators (dict[int, Legislators]): Dictionary of legislators keyed by legislator ID.
+        votes (dict[int, Votes]): Dictionary of votes keyed by vote ID.
+        vote_results (VoteResultsTable | dict[int, VoteResults] | Iterable[VoteResults]): A columnar
+            table, a dictionary of vote results keyed by result ID, or any iterable of vote results.
+
+    Notes:
+        - Modifies the Bills and Legislators objects in-place.
+    """
+    counts = run_vote_reports(build_report_engine(votes, bills), vote_results, BILL_VOTE_COUNTS,
+                              LEGISLATOR_VOTE_COUNTS)
+    apply_report_counts(bills, counts, BILL_VOTE_COUNTS)
+    apply_report_counts(legislators, counts, LEGISLATOR_VOTE_COUNTS)
+
+
+def iter_sponsor_vote_counts(
+    counts: dict[str, dict[int, int]],
+    bills: dict[int, Bills],
+    legislators: dict[int, Legislators]
+) -> Iterator[SponsorVoteCounts]:
+    """
+    Yields the per-sponsor report from counts computed with `SPONSOR_VOTE_COUNTS`.
+
+    Args:
+        counts (dict[str, dict[int, int]]): The result of `run_vote_reports` including `SPONSOR_VOTE_COUNTS`.
+        bills (dict[int, Bills]): Dictionary of bills keyed by bill ID, for the number of sponsored bills.
+        legislators (dict[int, Legislators]): Dictionary of legislators keyed by legislator ID, for the names.
+
+    Yields:
+        SponsorVoteCounts: Each sponsor of at least one bill, in the order of `legislators`, then sponsors
+            missing from `legislators`, in the order of their first bill.
+    """
+    sponsored = Counter(bill.sponsor_id for bill in bills.values())
+    sponsors = [legislator_id for legislator_id in legislators if legislator_id in sponsored]
+    sponsors += [sponsor_id for sponsor_id in sponsored if sponsor_id not in legislators]
+    for sponsor_id in sponsors:
+        legislator = legislators.get(sponsor_id)
+        yield SponsorVoteCounts(
+            sponsor_id=sponsor_id,
+            sponsor_name=legislator.name if legislator else "Unknown",
+            sponsored_bills=sponsored[sponsor_id],
+            supporting_votes=counts['supporting_votes'].get(sponsor_id, 0),
+            opposing_votes=counts['opposing_votes'].get(sponsor_id, 0),
+        )
@@ -0,0 +1,78 @@
+"""
+This module contains test cases for the vote count reports declared in `handlers.report_handler`.
+
+Test functions include:
+- `test_query_reports_match_fused_handler`: Tests the bill and legislator reports against `assign_vote_counts`.
+- `test_sponsor_vote_counts`: Tests the per-sponsor report, computed in the same scan.
+"""
+import copy
+
+import pytest
+
+from handlers import (
+    BILL_VOTE_COUNTS,
+    LEGISLATOR_VOTE_COUNTS,
+    SPONSOR_VOTE_COUNTS,
+    assign_vote_counts,
+    assign_vote_counts_query,
+    build_report_engine,
+    iter_sponsor_vote_counts,
+    run_vote_reports,
+)
+from models import Bills, SponsorVoteCounts, VoteResults, VoteResultsTable, Votes, VoteType
+
+
+@pytest.fixture(name="dataset")
+def fixture_dataset(bills, legislators, votes):
+    """Builds three bills (one sponsored by an unknown legislator), three legislators and five vote results."""
+    bills[102].sponsor_id = 9
+    bills[103] = Bills(id=103, title="Transport Act", sponsor_id=1)
+    votes[203] = Votes(id=203, bill_id=103)
+    vote_results = [
+        VoteResults(id=301, legislator_id=1, vote_id=201, vote_type=VoteType.FOR),
+        VoteResults(id=302, legislator_id=2, vote_id=201, vote_type=VoteType.AGAINST),
+        VoteResults(id=303, legislator_id=3, vote_id=202, vote_type=VoteType.FOR),
+        VoteResults(id=304, legislator_id=2, vote_id=203, vote_type=VoteType.FOR),
+        VoteResults(id=305, legislator_id=1, vote_id=202, vote_type=VoteType.AGAINST),
+    ]
+    return bills, legislators, votes, vote_results
+
+
+def test_query_reports_match_fused_handler(dataset):
+    """
+    Test case comparing the declared bill and legislator reports with the hand-written fused handler.
+
+    Simulates:
+    - The same vote results counted from a list and from a columnar table.
+    """
+    bills, legislators, votes, vote_results = dataset
+    expected_bills, expected_legislators = copy.deepcopy(bills), copy.deepcopy(legislators)
+    assign_vote_counts(expected_bills, expected_legislators, votes, vote_results)
+
+    for source in (vote_results, VoteResultsTable.from_vote_results(vote_results)):
+        query_bills, query_legislators = copy.deepcopy(bills), copy.deepcopy(legislators)
+        assign_vote_counts_query(query_bills, query_legislators, votes, source)
+        assert query_bills == expected_bills
+        assert query_legislators == expected_legislators
+
+
+def test_sponsor_vote_counts(dataset):
+    """
+    Test case for the votes received by the bills of each sponsor.
+
+    Simulates:
+    - Alice sponsoring two bills and an unknown sponsor one, with the three reports run in one scan
+      by an engine whose join lookup is built once.
+    """
+    bills, legislators, votes, vote_results = dataset
+    engine = build_report_engine(votes, bills)
+
+    counts = run_vote_reports(engine, vote_results, BILL_VOTE_COUNTS, LEGISLATOR_VOTE_COUNTS, SPONSOR_VOTE_COUNTS)
+
+    assert list(iter_sponsor_vote_counts(counts, bills, legislators)) == [
+        SponsorVoteCounts(sponsor_id=1, sponsor_name="Alice", sponsored_bills=2, supporting_votes=2, opposing_votes=1),
+        SponsorVoteCounts(sponsor_id=9, sponsor_name="Unknown", sponsored_bills=1, supporting_votes=1,
+                          opposing_votes=1),
+    ]
+    assert counts['supporter_count'] == {101: 1, 102: 1, 103: 1}
+    assert engine.lookups_built == 1
@@ -0,0 +1,268 @@
+"""
+This module writes the bill report with a bounded amount of memory, spilling to disk when needed.
+
+`assign_bill_vote_counts` needs every `Bills` instance and every counter in memory at once. When
+bill IDs are sparse and span many sessions, that may not fit. `write_bill_report_spilling` never
+builds the dict of bills; it streams the input files and keeps its state in memory only while
+its estimated size stays within `memory_budget`:
+    1. The vote results are counted per bill. Once the counters exceed the budget, they are appended
+       to spill files hash-partitioned by bill ID, and counting starts again from empty counters.
+    2. The bills are read with their row number in `bills.csv`, under the same budget.
+    3. Without spill, the counts are joined to the bills in memory. Otherwise every partition is
+       aggregated and joined on its own, sorted by row number into a run file, and the runs are
+       merged with `heapq.merge` while the output CSV is written. The size of each partition is
+       estimated from its spilled rows first; a partition over the budget is split again into
+       about `size / memory_budget` partitions with another hash, until every partition loaded in
+       memory fits the budget, whatever the number of partitions the spill started with.
+
+The output is identical to `assign_bill_primary_sponsors` and `assign_bill_vote_counts` over the
+in-memory dicts: bills appear once, at the position of their first row, with the values of their
+last row. The vote -> bill mapping and the sponsor names stay in memory; they hold two integers or
+an integer and a name per vote or legislator, and are small next to the vote results.
+"""
+import heapq
+from typing import Iterator, Optional
+
+from models import Bills, Legislators, VoteType, Votes, VoteResults
+from utils import (
+    DEFAULT_MEMORY_BUDGET,
+    DEFAULT_PARTITIONS,
+    SpillPartitions,
+    find_input_file,
+    iter_csv_dataclasses,
+    write_dataclasses_to_csv,
+)
+
+# Estimated bytes of a counter entry (an int key and a list of two ints) and of a bill entry without its title
+_COUNTER_BYTES = 160
+_BILL_BYTES = 240
+
+_FOR, _AGAINST = VoteType.FOR.value, VoteType.AGAINST.value
+
+
+class _BudgetedState:
+    """
+    Represents the in-memory counters and bill rows of a report, spilled to partitions over the budget.
+
+    Attributes:
+        counts (dict[int, list[int]]): The `[supporters, opposers]` counted per bill since the last spill.
+        bills (dict[int, tuple]): The `(row, title, sponsor_id)` of each bill read since the last spill,
+            at the row of its first occurrence, with the values of its last.
+        spilled (bool): Whether any state was spilled.
+        memory_budget (int): The estimated bytes of counters and bill rows kept in memory before spilling.
+        count_spill (SpillPartitions): The partitions the counters are spilled to.
+        bill_spill (SpillPartitions): The partitions the bill rows are spilled to.
+    """
+
+    def __init__(self, memory_budget: int, count_spill: SpillPartitions, bill_spill: SpillPartitions):
+        self.counts: dict[int, list[int]] = {}
+        self.bills: dict[int, tuple] = {}
+        self.spilled = False
+        self.memory_budget = memory_budget
+        self.count_spill = count_spill
+        self.bill_spill = bill_spill
+        self._bill_bytes = 0
+
+    def over_budget(self) -> bool:
+        """Returns whether the estimated size of the state exceeds the budget."""
+        return len(self.counts) * _COUNTER_BYTES + self._bill_bytes > self.memory_budget
+
+    def add_bill(self, row: int, bill_id: int, title: str, sponsor_id: int):
+        """Stores a bill row, keeping the row number of the first occurrence of its ID."""
+        previous = self.bills.get(bill_id)
+        self.bills[bill_id] = (row if previous is None else previous[0], title, sponsor_id)
+        self._bill_bytes += _BILL_BYTES + len(title)
+
+    def spill(self):
+        """Appends the counters and bill rows to their partitions and empties them."""
+        for bill_id, (supporters, opposers) in self.counts.items():
+            self.count_spill.write(bill_id, (supporters, opposers))
+        for bill_id, (row, title, sponsor_id) in self.bills.items():
+            self.bill_spill.write(bill_id, (row, title, sponsor_id))
+        self.counts.clear()
+        self.bills.clear()
+        self._bill_bytes = 0
+        self.spilled = True
+
+
+def _count_vote_results(state: _BudgetedState, vote_results_path: str, vote_bills: dict[int, int]):
+    """Counts the supporters and opposers of each bill, spilling the counters over the budget."""
+    counts = state.counts
+    for vote_id, vote_type in iter_csv_dataclasses(vote_results_path, VoteResults, ',', as_tuples=True,
+                                                   columns=('vote_id', 'vote_type')):
+        bill_id = vote_bills[vote_id]
+        bill_counts = counts.get(bill_id)
+        if bill_counts is None:
+            if state.over_budget():
+                state.spill()
+            bill_counts = counts[bill_id] = [0, 0]
+        if vote_type == _FOR:
+            bill_counts[0] += 1
+        elif vote_type == _AGAINST:
+            bill_counts[1] += 1
+
+
+def _read_bills(state: _BudgetedState, bills_path: str):
+    """Reads the bills with their row number, spilling the bill rows over the budget."""
+    bill_rows = iter_csv_dataclasses(bills_path, Bills, ',', as_tuples=True, columns=('id', 'title', 'sponsor_id'))
+    for row, (bill_id, title, sponsor_id) in enumerate(bill_rows):
+        if bill_id not in state.bills and state.over_budget():
+            state.spill()
+        state.add_bill(row, bill_id, title, sponsor_id)
+
+
+def _join(
+    counts: dict[int, list[int]],
+    bills: dict[int, tuple],
+    sponsor_names: dict[int, str]
+) -> Iterator[tuple[int, Bills]]:
+    """
+    Joins counts to bills, yielding the row number and the finished bill of each bill.
+
+    Raises:
+        KeyError: If votes were counted for a bill missing from the bills.
+    """
+    missing = counts.keys() - bills.keys()
+    if missing:
+        raise KeyError(min(missing))
+    for bill_id, (row, title, sponsor_id) in bills.items():
+        supporters, opposers = counts.get(bill_id, (0, 0))
+        yield row, Bills(id=bill_id, title=title, sponsor_id=sponsor_id,
+                         primary_sponsor=sponsor_names.get(sponsor_id, "Unknown"),
+                         supporter_count=supporters, opposer_count=opposers)
+
+
+def _load_partition(count_spill: SpillPartitions, bill_spill: SpillPartitions, partition: int):
+    """Sums the spilled counters of a partition and deduplicates its spilled bill rows."""
+    counts: dict[int, list[int]] = {}
+    for bill_id, supporters, opposers in count_spill.read(partition):
+        bill_counts = counts.setdefault(int(bill_id), [0, 0])
+        bill_counts[0] += int(supporters)
+        bill_counts[1] += int(opposers)
+    bills: dict[int, tuple] = {}
+    for bill_id, row, title, sponsor_id in bill_spill.read(partition):
+        previous = bills.get(int(bill_id))
+        bills[int(bill_id)] = (int(row) if previous is None else previous[0], title, int(sponsor_id))
+    return counts, bills
+
+
+def _partition_bytes(count_spill: SpillPartitions, bill_spill: SpillPartitions, partition: int) -> int:
+    """
+    Estimates the memory of a partition once loaded, from its spilled rows.
+
+    Keys spilled several times are counted once per row, so this is an upper bound.
+    """
+    return (count_spill.partition_rows[partition] * _COUNTER_BYTES
+            + bill_spill.partition_rows[partition] * _BILL_BYTES + bill_spill.size(partition))
+
+
+def _iter_loaded_partitions(
+    count_spill: SpillPartitions,
+    bill_spill: SpillPartitions,
+    memory_budget: int,
+    spill_dir: Optional[str],
+    parent_rows: Optional[int] = None
+) -> Iterator[tuple[dict[int, list[int]], dict[int, tuple]]]:
+    """
+    Yields the counters and bill rows of every partition, re-partitioning the partitions over the budget.
+
+    A partition holding every row of the partition it was split from (a single key, or keys whose
+    salted hashes collide) is loaded as it is, since splitting it again wouldn't shrink it.
+    """
+    count_spill.finish()
+    bill_spill.finish()
+    for partition in range(bill_spill.partitions):
+        fanout = -(-_partition_bytes(count_spill, bill_spill, partition) // memory_budget)
+        rows = count_spill.partition_rows[partition] + bill_spill.partition_rows[partition]
+        if fanout < 2 or rows == parent_rows:
+            yield _load_partition(count_spill, bill_spill, partition)
+            continue
+        salt = bill_spill.salt + 1
+        with SpillPartitions('counts', fanout, spill_dir, salt) as counts, \
+                SpillPartitions('bills', fanout, spill_dir, salt) as bills:
+            for bill_id, *values in count_spill.read(partition):
+                counts.write(int(bill_id), values)
+            for bill_id, *values in bill_spill.read(partition):
+                bills.write(int(bill_id), values)
+            yield from _iter_loaded_partitions(counts, bills, memory_budget, spill_dir, rows)
+
+
+def _read_run(run_spill: SpillPartitions, partition: int) -> Iterator[tuple[int, Bills]]:
+    """Reads back a sorted run of finished bills."""
+    for row, bill_id, title, sponsor_id, primary_sponsor, supporters, opposers in run_spill.read(partition):
+        yield int(row), Bills(id=int(bill_id), title=title, sponsor_id=int(sponsor_id),
+                              primary_sponsor=primary_sponsor, supporter_count=int(supporters),
+                              opposer_count=int(opposers))
+
+
+def _merge_partitions(
+    state: _BudgetedState,
+    run_spill: SpillPartitions,
+    sponsor_names: dict[int, str],
+    spill_dir: Optional[str]
+) -> Iterator[Bills]:
+    """Joins every partition into a run sorted by row number, then merges the runs in row order."""
+    loaded = _iter_loaded_partitions(state.count_spill, state.bill_spill, state.memory_budget, spill_dir)
+    for run, (counts, bills) in enumerate(loaded):
+        if run == run_spill.partitions:
+            run_spill.add_partition()
+        for row, bill in sorted(_join(counts, bills, sponsor_names), key=lambda item: item[0]):
+            run_spill.append(run, (row, bill.id, bill.title, bill.sponsor_id, bill.primary_sponsor,
+                                   bill.supporter_count, bill.opposer_count))
+    run_spill.finish()
+    runs = [_read_run(run_spill, partition) for partition in range(run_spill.partitions)]
+    for _, bill in heapq.merge(*runs, key=lambda item: item[0]):
+        yield bill
+
+
+def write_bill_report_spilling(
+    input_dir: str,
+    output_path: str,
+    *,
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    partitions: int = DEFAULT_PARTITIONS,
+    spill_dir: Optional[str] = None
+) -> int:
+    """
+    Writes the bill report (primary sponsors and vote counts) within an estimated memory budget.
+
+    Args:
+        input_dir (str): Directory containing the bills, legislators, votes and vote results tables.
+        output_path (str): The path of the output CSV file.
+        memory_budget (int): The estimated bytes of counters and bill rows kept in memory before spilling.
+        partitions (int): The number of hash partitions the state is first spilled to. Each partition is
+            loaded in memory on its own, and the partitions estimated over the budget are split again,
+            so this only saves re-partitioning when it is about the total state divided by the budget.
+        spill_dir (str | None): Where to create the temporary spill files (default: the system temporary
+            directory).
+
+    Returns:
+        int: The number of rows written to spill files; 0 when everything fitted in the budget.
+
+    Raises:
+        ValueError: If `memory_budget` or `partitions` is less than 1.
+        KeyError: If a vote result references an unknown vote, or a vote an unknown bill.
+    """
+    if memory_budget < 1:
+        raise ValueError(f"memory_budget must be at least 1 byte, got {memory_budget}")
+    if partitions < 1:
+        raise ValueError(f"partitions must be at least 1, got {partitions}")
+    sponsor_names = dict(iter_csv_dataclasses(find_input_file(input_dir, 'legislators'), Legislators, ',',
+                                              as_tuples=True, columns=('id', 'name')))
+    vote_bills = dict(iter_csv_dataclasses(find_input_file(input_dir, 'votes'), Votes, ',', as_tuples=True,
+                                           columns=('id', 'bill_id')))
+
+    with SpillPartitions('counts', partitions, spill_dir) as count_spill, \
+            SpillPartitions('bills', partitions, spill_dir) as bill_spill, \
+            SpillPartitions('runs', 1, spill_dir) as run_spill:
+        state = _BudgetedState(memory_budget, count_spill, bill_spill)
+        _count_vote_results(state, find_input_file(input_dir, 'vote_results'), vote_bills)
+        _read_bills(state, find_input_file(input_dir, 'bills'))
+
+        if not state.spilled:
+            write_dataclasses_to_csv(output_path, (bill for _, bill in _join(state.counts, state.bills,
+                                                                              sponsor_names)), Bills)
+            return 0
+        state.spill()
+        write_dataclasses_to_csv(output_path, _merge_partitions(state, run_spill, sponsor_names, spill_dir), Bills)
+        return count_spill.rows + bill_spill.rows
@@ -0,0 +1,124 @@
+"""
+This module contains test cases for `write_bill_report_spilling`, which writes the bill report
+within a memory budget by spilling partial state to hash-partitioned files.
+
+Test functions include:
+- `test_spilled_report_matches_in_memory_report`: Tests that a spilled run writes the in-memory handlers' file.
+- `test_oversized_partitions_are_split_again`: Tests that partitions over the budget are re-partitioned before loading.
+- `test_report_within_budget_does_not_spill`: Tests that nothing is spilled when the state fits in the budget.
+- `test_unknown_vote_raises_key_error`: Tests that a vote result referencing an unknown vote raises a `KeyError`.
+- `test_invalid_budget_or_partitions_raises`: Tests that a budget or partition count below 1 raises a `ValueError`.
+"""
+import pytest
+
+from handlers import spill_handler, write_bill_report_spilling
+from models import Bills
+from utils import write_dataclasses_to_csv
+
+
+@pytest.fixture(name="input_dir")
+def fixture_input_dir(tmp_path):
+    """Writes 30 bills (one listed twice, one with an unknown sponsor) with votes and vote results."""
+    bills = ["id,title,sponsor_id"] + [f"{100 + i},Bill {i},{1 + i % 3}" for i in range(30)]
+    bills[5] = "104,Bill 4,9"
+    bills.append("110,Bill 10 amended,2")
+    votes = ["id,bill_id"] + [f"{200 + i},{100 + i}" for i in range(0, 30, 2)]
+    vote_results = ["id,legislator_id,vote_id,vote_type"] + [
+        f"{i},{1 + i % 3},{200 + (i * 2) % 30},{1 + i % 2}" for i in range(60)
+    ]
+    tables = {
+        "bills": bills,
+        "legislators": ["id,name", "1,Alice", "2,Bob", "3,Carol"],
+        "votes": votes,
+        "vote_results": vote_results,
+    }
+    for name, lines in tables.items():
+        (tmp_path / f"{name}.csv").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture(name="expected_report")
+def fixture_expected_report(input_dir, tmp_path, memory_reports):
+    """Writes the bill report of the input directory with the in-memory handlers and returns its text."""
+    bills, _ = memory_reports(input_dir)
+    write_dataclasses_to_csv(str(tmp_path / "expected.csv"), bills.values(), Bills)
+    return (tmp_path / "expected.csv").read_text(encoding="utf-8")
+
+
+def test_spilled_report_matches_in_memory_report(input_dir, tmp_path, expected_report):
+    """
+    Test case where the budget only holds a couple of bills, so the state is spilled many times.
+
+    Simulates:
+    - A run with a 500 byte budget over 4 partitions, compared with the in-memory handlers; the spill
+      files are removed afterwards.
+    """
+    spilled = write_bill_report_spilling(str(input_dir), str(tmp_path / "bills.csv"), memory_budget=500,
+                                         partitions=4, spill_dir=str(tmp_path))
+
+    assert spilled > 0
+    assert (tmp_path / "bills.csv").read_text(encoding="utf-8") == expected_report
+    assert not any(path.is_dir() for path in tmp_path.iterdir())
+
+
+def test_oversized_partitions_are_split_again(input_dir, tmp_path, expected_report, monkeypatch):
+    """
+    Test case where the state is spilled to a single partition, far larger than the budget.
+
+    Simulates:
+    - A run with a 500 byte budget over 1 partition, recording the bills of each partition loaded in memory.
+    """
+    loaded = []
+    load_partition = spill_handler._load_partition  # pylint: disable=protected-access
+
+    def recording_load_partition(*args):
+        counts, bills = load_partition(*args)
+        loaded.append(len(bills))
+        return counts, bills
+
+    monkeypatch.setattr(spill_handler, "_load_partition", recording_load_partition)
+    write_bill_report_spilling(str(input_dir), str(tmp_path / "bills.csv"), memory_budget=500, partitions=1,
+                               spill_dir=str(tmp_path))
+
+    assert (tmp_path / "bills.csv").read_text(encoding="utf-8") == expected_report
+    assert sum(loaded) == 30 and max(loaded) <= 2
+
+
+def test_report_within_budget_does_not_spill(input_dir, tmp_path, expected_report):
+    """
+    Test case where the whole state fits in the default budget.
+
+    Simulates:
+    - A run with the default budget, joined in memory without any spill file.
+    """
+    assert write_bill_report_spilling(str(input_dir), str(tmp_path / "bills.csv")) == 0
+    assert (tmp_path / "bills.csv").read_text(encoding="utf-8") == expected_report
+
+
+def test_unknown_vote_raises_key_error(input_dir):
+    """
+    Test case where a vote result references a vote missing from the votes table.
+
+    Simulates:
+    - A vote result for vote 999.
+    """
+    with open(input_dir / "vote_results.csv", "a", encoding="utf-8") as file:
+        file.write("999,1,999,1\n")
+
+    with pytest.raises(KeyError):
+        write_bill_report_spilling(str(input_dir), str(input_dir / "bills_out.csv"), memory_budget=500)
+
+
+def test_invalid_budget_or_partitions_raises(input_dir):
+    """
+    Test case where the memory budget or the number of partitions is not positive.
+
+    Simulates:
+    - A zero budget, a negative budget and zero partitions.
+    """
+    output_path = str(input_dir / "bills_out.csv")
+    for budget in (0, -1):
+        with pytest.raises(ValueError, match="memory_budget"):
+            write_bill_report_spilling(str(input_dir), output_path, memory_budget=budget)
+    with pytest.raises(ValueError, match="partitions"):
+        write_bill_report_spilling(str(input_dir), output_path, memory_budget=500, partitions=0)
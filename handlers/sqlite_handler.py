@@ -0,0 +1,100 @@
+"""
+This module computes the bill and legislator reports with SQL queries over the SQLite store.
+
+The tables are loaded by `utils.load_csvs_into_sqlite`. Vote results are first grouped by vote (or
+by legislator) over their covering index, then joined to the much smaller votes, bills and
+legislators tables. The reports are yielded row by row in the order of the input files, so they
+can be streamed to `utils.write_dataclasses_to_csv` and match the in-memory handlers exactly,
+including the `KeyError` raised for a vote result referencing an unknown vote, bill or legislator.
+"""
+import sqlite3
+from typing import Iterator
+
+from models import Bills, Legislators, VoteType
+
+_FOR, _AGAINST = VoteType.FOR.value, VoteType.AGAINST.value
+
+_VOTE_COUNTS = f"""
+    SELECT vote_id, SUM(vote_type = {_FOR}) AS supporters, SUM(vote_type = {_AGAINST}) AS opposers
+    FROM vote_results GROUP BY vote_id
+"""
+_BILL_REPORT = f"""
+    SELECT b.id, b.title, b.sponsor_id, COALESCE(l.name, 'Unknown'),
+           COALESCE(c.supporters, 0), COALESCE(c.opposers, 0)
+    FROM bills AS b
+    LEFT JOIN legislators AS l ON l.id = b.sponsor_id
+    LEFT JOIN (
+        SELECT v.bill_id, SUM(r.supporters) AS supporters, SUM(r.opposers) AS opposers
+        FROM ({_VOTE_COUNTS}) AS r JOIN votes AS v ON v.id = r.vote_id
+        GROUP BY v.bill_id
+    ) AS c ON c.bill_id = b.id
+    ORDER BY b.rowid
+"""
+_LEGISLATOR_REPORT = f"""
+    SELECT l.id, l.name, COALESCE(c.supported, 0), COALESCE(c.opposed, 0)
+    FROM legislators AS l
+    LEFT JOIN (
+        SELECT legislator_id, SUM(vote_type = {_FOR}) AS supported, SUM(vote_type = {_AGAINST}) AS opposed
+        FROM vote_results GROUP BY legislator_id
+    ) AS c ON c.legislator_id = l.id
+    ORDER BY l.rowid
+"""
+_UNKNOWN_VOTE = """
+    SELECT DISTINCT r.vote_id FROM vote_results AS r
+    WHERE NOT EXISTS (SELECT 1 FROM votes AS v WHERE v.id = r.vote_id) LIMIT 1
+"""
+_UNKNOWN_BILL = """
+    SELECT v.bill_id FROM votes AS v
+    WHERE EXISTS (SELECT 1 FROM vote_results AS r WHERE r.vote_id = v.id)
+      AND NOT EXISTS (SELECT 1 FROM bills AS b WHERE b.id = v.bill_id) LIMIT 1
+"""
+_UNKNOWN_LEGISLATOR = """
+    SELECT DISTINCT r.legislator_id FROM vote_results AS r
+    WHERE NOT EXISTS (SELECT 1 FROM legislators AS l WHERE l.id = r.legislator_id) LIMIT 1
+"""
+
+
+def _check_references(connection: sqlite3.Connection, *queries: str):
+    """Raises a `KeyError` with the first unknown ID found by any of the queries."""
+    for query in queries:
+        row = connection.execute(query).fetchone()
+        if row is not None:
+            raise KeyError(row[0])
+
+
+def iter_bills_with_counts_sql(connection: sqlite3.Connection) -> Iterator[Bills]:
+    """
+    Yields each bill with its primary sponsor and its supporter and opposer counts.
+
+    Args:
+        connection (sqlite3.Connection): A connection to a store with the bills, legislators, votes
+            and vote_results tables loaded.
+
+    Yields:
+        Bills: The bills, in the order of `bills.csv`.
+
+    Raises:
+        KeyError: If a vote result references an unknown vote, or a vote of an unknown bill.
+    """
+    _check_references(connection, _UNKNOWN_VOTE, _UNKNOWN_BILL)
+    for row in connection.execute(_BILL_REPORT):
+        yield Bills(*row)
+
+
+def iter_legislators_with_counts_sql(connection: sqlite3.Connection) -> Iterator[Legislators]:
+    """
+    Yields each legislator with the number of bills they supported and opposed.
+
+    Args:
+        connection (sqlite3.Connection): A connection to a store with the legislators and vote_results
+            tables loaded.
+
+    Yields:
+        Legislators: The legislators, in the order of `legislators.csv`.
+
+    Raises:
+        KeyError: If a vote result references an unknown legislator.
+    """
+    _check_references(connection, _UNKNOWN_LEGISLATOR)
+    for row in connection.execute(_LEGISLATOR_REPORT):
+        yield Legislators(*row)
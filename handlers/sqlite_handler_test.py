@@ -0,0 +1,97 @@
+"""
+This module contains test cases for the SQLite store and the SQL report queries.
+
+Test functions include:
+- `test_sql_reports_match_memory_handlers`: Tests that the SQL reports equal the in-memory handlers.
+- `test_load_skips_unchanged_tables`: Tests that only the tables whose file changed are loaded again.
+- `test_unknown_references_raise`: Tests the `KeyError` raised for dangling vote results.
+"""
+import os
+
+import pytest
+
+from handlers import iter_bills_with_counts_sql, iter_legislators_with_counts_sql
+from utils import load_csvs_into_sqlite, open_sqlite_store
+
+
+@pytest.fixture(name="input_dir")
+def fixture_input_dir(tmp_path):
+    """Writes a small dataset, with a repeated bill ID and an unknown sponsor, and returns its directory."""
+    (tmp_path / "bills.csv").write_text(
+        "id,title,sponsor_id\n102,Draft Act,1\n101,Education Reform Act,1\n102,Healthcare Reform Act,9\n"
+        "103,Tax Act,2\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "legislators.csv").write_text("id,name\n2,Bob\n1,Alice\n3,Carol\n", encoding="utf-8")
+    (tmp_path / "votes.csv").write_text("id,bill_id\n201,101\n202,102\n203,101\n", encoding="utf-8")
+    (tmp_path / "vote_results.csv").write_text(
+        "id,legislator_id,vote_id,vote_type\n1,1,201,1\n2,2,201,2\n3,2,202,1\n4,1,203,2\n5,2,203,1\n5,3,202,2\n",
+        encoding="utf-8",
+    )
+    return tmp_path
+
+
+def test_sql_reports_match_memory_handlers(input_dir, memory_reports):
+    """
+    Test case comparing the SQL reports with the in-memory handlers.
+
+    Simulates:
+    - Bill 102 listed twice (its last row wins at its first position), a sponsor that is not a legislator,
+      two votes on bill 101 and a repeated vote result ID, which is still counted.
+    """
+    bills, legislators = memory_reports(input_dir)
+
+    connection = open_sqlite_store(str(input_dir / "store.sqlite3"))
+    load_csvs_into_sqlite(connection, str(input_dir))
+
+    assert list(iter_bills_with_counts_sql(connection)) == list(bills.values())
+    assert list(iter_legislators_with_counts_sql(connection)) == list(legislators.values())
+    assert [bill.primary_sponsor for bill in bills.values()] == ["Unknown", "Alice", "Bob"]
+    connection.close()
+
+
+def test_load_skips_unchanged_tables(input_dir):
+    """
+    Test case for loading the same directory twice, then after a vote result is appended.
+
+    Simulates:
+    - A second run with unchanged files, a new vote for bill 103, and a forced reload.
+    """
+    connection = open_sqlite_store(str(input_dir / "store.sqlite3"))
+    assert load_csvs_into_sqlite(connection, str(input_dir)) == ['bills', 'legislators', 'votes', 'vote_results']
+    assert not load_csvs_into_sqlite(connection, str(input_dir))
+
+    with open(input_dir / "votes.csv", "a", encoding="utf-8") as file:
+        file.write("204,103\n")
+    with open(input_dir / "vote_results.csv", "a", encoding="utf-8") as file:
+        file.write("7,3,204,1\n")
+    assert load_csvs_into_sqlite(connection, str(input_dir)) == ['votes', 'vote_results']
+    assert [bill.supporter_count for bill in iter_bills_with_counts_sql(connection)] == [1, 2, 1]
+
+    assert load_csvs_into_sqlite(connection, str(input_dir), tables=['bills'], force=True) == ['bills']
+    connection.close()
+
+
+def test_unknown_references_raise(input_dir):
+    """
+    Test case for vote results referencing an unknown vote and an unknown legislator.
+
+    Simulates:
+    - A vote result for vote 299 cast by legislator 8, and a failed load that leaves the store unchanged.
+    """
+    with open(input_dir / "vote_results.csv", "a", encoding="utf-8") as file:
+        file.write("8,8,299,1\n")
+    connection = open_sqlite_store(os.path.join(input_dir, "store.sqlite3"))
+    load_csvs_into_sqlite(connection, str(input_dir))
+
+    with pytest.raises(KeyError):
+        list(iter_bills_with_counts_sql(connection))
+    with pytest.raises(KeyError):
+        list(iter_legislators_with_counts_sql(connection))
+
+    with open(input_dir / "vote_results.csv", "a", encoding="utf-8") as file:
+        file.write("9,1,201,not-a-vote-type\n")
+    with pytest.raises(ValueError):
+        load_csvs_into_sqlite(connection, str(input_dir))
+    assert connection.execute('SELECT COUNT(*) FROM vote_results').fetchone() == (7,)
+    connection.close()
@@ -0,0 +1,174 @@
+"""
+This module contains NumPy-vectorized equivalents of the vote counting handlers:
+1. `assign_bill_vote_counts_vectorized` mirrors `assign_bill_vote_counts`.
+2. `assign_legislator_vote_counts_vectorized` mirrors `assign_legislator_vote_counts`.
+
+Instead of incrementing dataclass counters one vote result at a time, the vote results are
+turned into integer arrays (zero-copy when a `VoteResultsTable` is given), ids are mapped to
+row positions through dense lookup arrays, and the FOR/AGAINST counts are computed with
+`np.bincount` over masked position arrays. The counts are then added to the dataclass
+instances, exactly like the pure Python handlers do.
+
+NumPy is an optional dependency: it is only required when these functions are called.
+"""
+from typing import Iterable, Union
+
+from models import VoteType, Bills, Legislators, Votes, VoteResults, VoteResultsTable, vote_result_arrays
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only when numpy is missing
+    np = None
+
+
+def _require_numpy():
+    """Raises an `ImportError` with an actionable message when NumPy is not installed."""
+    if np is None:
+        raise ImportError("The vectorized engine requires numpy. Install it with `pip install numpy`.")
+
+
+def _dense_lookup(keys: 'np.ndarray', values: 'np.ndarray') -> 'np.ndarray':
+    """
+    Builds a dense array where `lookup[key] == value`, and -1 marks unknown keys.
+
+    Args:
+        keys (np.ndarray): Non-negative integer ids.
+        values (np.ndarray): The value associated with each id.
+
+    Returns:
+        np.ndarray: The lookup array, indexed by id.
+    """
+    lookup = np.full(int(keys.max()) + 1 if keys.size else 0, -1, dtype=np.int64)
+    lookup[keys] = values
+    return lookup
+
+
+def _lookup(lookup: 'np.ndarray', keys: 'np.ndarray', strict: bool) -> 'np.ndarray':
+    """
+    Maps ids through a dense lookup array.
+
+    Args:
+        lookup (np.ndarray): The array built by `_dense_lookup`.
+        keys (np.ndarray): The ids to map.
+        strict (bool): If True, raises a `KeyError` for the first unknown id, like a dict lookup.
+            Values stored as -1 in the lookup are treated as unknown ids.
+
+    Returns:
+        np.ndarray: The mapped values, with -1 for unknown ids when `strict` is False.
+    """
+    keys = keys.astype(np.int64, copy=False)
+    in_range = (keys >= 0) & (keys < lookup.size)
+    mapped = np.full(keys.size, -1, dtype=np.int64)
+    mapped[in_range] = lookup[keys[in_range]]
+    if strict:
+        missing = np.flatnonzero(mapped == -1)
+        if missing.size:
+            raise KeyError(int(keys[missing[0]]))
+    return mapped
+
+
+def _positions(objects: list, attribute: str = 'id') -> 'np.ndarray':
+    """Returns the given integer attribute of every object as an int64 array."""
+    return np.fromiter((getattr(obj, attribute) for obj in objects), dtype=np.int64, count=len(objects))
+
+
+def _count_by_position(positions: 'np.ndarray', vote_types: 'np.ndarray', size: int):
+    """
+    Counts FOR and AGAINST votes per row position.
+
+    Args:
+        positions (np.ndarray): The row position each vote result is attributed to.
+        vote_types (np.ndarray): The `VoteType` value of each vote result.
+        size (int): The number of rows to count for.
+
+    Returns:
+        tuple[list[int], list[int]]: The FOR and AGAINST counts for every position.
+    """
+    for_counts = np.bincount(positions[vote_types == VoteType.FOR.value], minlength=size)
+    against_counts = np.bincount(positions[vote_types == VoteType.AGAINST.value], minlength=size)
+    return for_counts.tolist(), against_counts.tolist()
+
+
+def _bill_positions(bill_list: list[Bills], votes: dict[int, Votes], result_vote_ids: 'np.ndarray') -> 'np.ndarray':
+    """
+    Maps the vote id of every vote result to the position of its bill in `bill_list`.
+
+    Args:
+        bill_list (list[Bills]): The bills, in output order.
+        votes (dict[int, Votes]): Dictionary of votes keyed by vote ID.
+        result_vote_ids (np.ndarray): The `vote_id` column of the vote results.
+
+    Returns:
+        np.ndarray: The bill position of every vote result.
+    """
+    vote_list = list(votes.values())
+    bill_lookup = _dense_lookup(_positions(bill_list), np.arange(len(bill_list)))
+    vote_bill_positions = _lookup(bill_lookup, _positions(vote_list, 'bill_id'), strict=False)
+    # -2 marks votes whose bill is unknown, so they only fail if a vote result references them
+    vote_lookup = _dense_lookup(_positions(vote_list), np.where(vote_bill_positions < 0, -2, vote_bill_positions))
+
+    vote_positions = _lookup(vote_lookup, result_vote_ids, strict=True)
+    if vote_positions.size and vote_positions.min() < 0:
+        # The vote exists but points to a bill that doesn't
+        vote_id = int(result_vote_ids[np.flatnonzero(vote_positions < 0)[0]])
+        raise KeyError(votes[vote_id].bill_id)
+    return vote_positions
+
+
+def assign_bill_vote_counts_vectorized(
+    bills: dict[int, Bills],
+    votes: dict[int, Votes],
+    vote_results: Union[VoteResultsTable, dict[int, VoteResults], Iterable[VoteResults]]
+):
+    """
+    Updates each bill's supporter and opposer count based on vote results, using NumPy.
+
+    Produces the same counts as `assign_bill_vote_counts`, including raising a `KeyError`
+    when a vote result references an unknown vote or a vote references an unknown bill.
+
+    Args:
+        bills (dict[int, Bills]): Dictionary of bills keyed by bill ID.
+        votes (dict[int, Votes]): Dictionary of votes keyed by vote ID.
+        vote_results (VoteResultsTable | dict[int, VoteResults] | Iterable[VoteResults]): A columnar
+            table (used without copying), a dictionary of vote results keyed by result ID, or any
+            iterable of vote results.
+    """
+    _require_numpy()
+    _, result_vote_ids, vote_types = vote_result_arrays(vote_results)
+
+    bill_list = list(bills.values())
+    vote_positions = _bill_positions(bill_list, votes, result_vote_ids)
+
+    supporters, opposers = _count_by_position(vote_positions, vote_types, len(bill_list))
+    for bill, supporter_count, opposer_count in zip(bill_list, supporters, opposers):
+        bill.supporter_count += supporter_count
+        bill.opposer_count += opposer_count
+
+
+def assign_legislator_vote_counts_vectorized(
+    legislators: dict[int, Legislators],
+    vote_results: Union[VoteResultsTable, dict[int, VoteResults], Iterable[VoteResults]]
+):
+    """
+    Updates the support and opposition counts for each legislator based on vote results, using NumPy.
+
+    Produces the same counts as `assign_legislator_vote_counts`, including raising a `KeyError`
+    when a vote result references an unknown legislator.
+
+    Args:
+        legislators (dict[int, Legislators]): Dictionary of legislators keyed by legislator ID.
+        vote_results (VoteResultsTable | dict[int, VoteResults] | Iterable[VoteResults]): A columnar
+            table (used without copying), a dictionary of vote results keyed by result ID, or any
+            iterable of vote results.
+    """
+    _require_numpy()
+    result_legislator_ids, _, vote_types = vote_result_arrays(vote_results)
+
+    legislator_list = list(legislators.values())
+    legislator_lookup = _dense_lookup(_positions(legislator_list), np.arange(len(legislator_list)))
+    legislator_positions = _lookup(legislator_lookup, result_legislator_ids, strict=True)
+
+    supported, opposed = _count_by_position(legislator_positions, vote_types, len(legislator_list))
+    for legislator, num_supported, num_opposed in zip(legislator_list, supported, opposed):
+        legislator.num_supported_bills += num_supported
+        legislator.num_opposed_bills += num_opposed
@@ -0,0 +1,113 @@
+"""
+This module contains test cases for the NumPy-vectorized vote counting handlers.
+Each test runs the vectorized handler and the pure Python handler on the same data
+and checks that they produce identical results.
+
+Test functions include:
+- `test_bill_vote_counts_match_python_handler`: Tests bill counts on randomized data.
+- `test_legislator_vote_counts_match_python_handler`: Tests legislator counts on randomized data.
+- `test_vectorized_handlers_accept_dicts`: Tests that dictionaries of vote results are accepted.
+- `test_unknown_vote_raises_key_error`: Tests that unknown ids fail like the dict-based handlers.
+"""
+import copy
+import random
+
+import pytest
+
+from handlers import (
+    assign_bill_vote_counts,
+    assign_bill_vote_counts_vectorized,
+    assign_legislator_vote_counts,
+    assign_legislator_vote_counts_vectorized,
+)
+from models import Bills, Legislators, VoteResults, VoteResultsTable, Votes, VoteType
+
+pytest.importorskip("numpy")
+
+
+def _random_dataset(seed: int):
+    """Builds bills, legislators, votes and vote results with sparse, non-contiguous ids."""
+    rng = random.Random(seed)
+    legislators = {i: Legislators(id=i, name=f"Legislator {i}") for i in rng.sample(range(1, 5000), 40)}
+    bills = {i: Bills(id=i, title=f"Bill {i}", sponsor_id=rng.choice(list(legislators))) for i in
+             rng.sample(range(1, 90000), 25)}
+    votes = {i: Votes(id=i, bill_id=rng.choice(list(bills))) for i in rng.sample(range(1, 70000), 60)}
+    vote_results = {
+        i: VoteResults(id=i, legislator_id=rng.choice(list(legislators)), vote_id=rng.choice(list(votes)),
+                       vote_type=rng.choice(list(VoteType)))
+        for i in range(1, 2001)
+    }
+    return bills, legislators, votes, vote_results
+
+
+def test_bill_vote_counts_match_python_handler():
+    """
+    Test case comparing the vectorized and pure Python bill handlers.
+
+    Simulates:
+    - 2000 random vote results over 25 bills with sparse ids, stored in a `VoteResultsTable`.
+    """
+    bills, _, votes, vote_results = _random_dataset(seed=7)
+    expected = copy.deepcopy(bills)
+
+    assign_bill_vote_counts(expected, votes, vote_results)
+    assign_bill_vote_counts_vectorized(bills, votes, VoteResultsTable.from_vote_results(vote_results))
+
+    assert bills == expected
+
+
+def test_legislator_vote_counts_match_python_handler():
+    """
+    Test case comparing the vectorized and pure Python legislator handlers.
+
+    Simulates:
+    - 2000 random vote results over 40 legislators with sparse ids, stored in a `VoteResultsTable`.
+    """
+    _, legislators, _, vote_results = _random_dataset(seed=11)
+    expected = copy.deepcopy(legislators)
+
+    assign_legislator_vote_counts(expected, vote_results)
+    assign_legislator_vote_counts_vectorized(legislators, VoteResultsTable.from_vote_results(vote_results))
+
+    assert legislators == expected
+
+
+def test_vectorized_handlers_accept_dicts():
+    """
+    Test case where the vectorized handlers receive a dictionary of vote results.
+
+    Simulates:
+    - Alice supports the "Education Reform Act" bill and Bob opposes it.
+    """
+    legislators = {
+        1: Legislators(id=1, name="Alice"),
+        2: Legislators(id=2, name="Bob"),
+    }
+    bills = {101: Bills(id=101, title="Education Reform Act", sponsor_id=1)}
+    votes = {201: Votes(id=201, bill_id=101)}
+    vote_results = {
+        301: VoteResults(id=301, legislator_id=1, vote_id=201, vote_type=VoteType.FOR),
+        302: VoteResults(id=302, legislator_id=2, vote_id=201, vote_type=VoteType.AGAINST),
+    }
+
+    assign_bill_vote_counts_vectorized(bills, votes, vote_results)
+    assign_legislator_vote_counts_vectorized(legislators, vote_results)
+
+    assert (bills[101].supporter_count, bills[101].opposer_count) == (1, 1)
+    assert (legislators[1].num_supported_bills, legislators[1].num_opposed_bills) == (1, 0)
+    assert (legislators[2].num_supported_bills, legislators[2].num_opposed_bills) == (0, 1)
+
+
+def test_unknown_vote_raises_key_error():
+    """
+    Test case where a vote result references a vote that doesn't exist.
+
+    Simulates:
+    - A vote result for vote 999, which is missing from the votes dictionary.
+    """
+    bills = {101: Bills(id=101, title="Education Reform Act", sponsor_id=1)}
+    votes = {201: Votes(id=201, bill_id=101)}
+    vote_results = {301: VoteResults(id=301, legislator_id=1, vote_id=999, vote_type=VoteType.FOR)}
+
+    with pytest.raises(KeyError):
+        assign_bill_vote_counts_vectorized(bills, votes, vote_results)
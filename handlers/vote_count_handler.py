@@ -0,0 +1,80 @@
+"""
+This module provides a fused vote counting function that updates bills and legislators together.
+
+`assign_bill_vote_counts` and `assign_legislator_vote_counts` each scan every vote result.
+When both reports are needed, `assign_vote_counts` produces the same counts with a single
+scan, so the vote results can be streamed from disk once.
+
+`read_vote_results` opens the vote results the way each counting engine reads them.
+"""
+from typing import Iterable, Sequence, Union
+
+from models import VoteType, Bills, Legislators, Votes, VoteResults, VoteResultsTable, iter_vote_result_columns
+from utils import StageRecorder, iter_csv_dataclasses
+
+
+def read_vote_results(
+    filepath: str,
+    engine: str,
+    columns: Sequence[str],
+    recorder: StageRecorder
+) -> Union[VoteResultsTable, Iterable[VoteResults]]:
+    """
+    Reads the vote results for a counting engine.
+
+    Args:
+        filepath (str): The path to the vote results file.
+        engine (str): `numpy` to load a columnar table (recorded as the `load:vote_results` stage), or
+            `python` to stream the rows.
+        columns (Sequence[str]): With the python engine, the only fields converted.
+        recorder (StageRecorder): Records the `load:vote_results` stage of the numpy engine; streamed rows
+            are measured by the stage that consumes them.
+
+    Returns:
+        VoteResultsTable | Iterable[VoteResults]: The loaded table, or a lazy iterator of projected rows,
+            parsed by whichever stage consumes it.
+    """
+    if engine != 'numpy':
+        return iter_csv_dataclasses(filepath=filepath, cls=VoteResults, delimiter=',', columns=columns)
+    with recorder.stage('load:vote_results') as stage:
+        vote_results = VoteResultsTable.from_rows(
+            iter_csv_dataclasses(filepath=filepath, cls=VoteResults, delimiter=',', as_tuples=True)
+        )
+        stage.rows = len(vote_results)
+    return vote_results
+
+
+def assign_vote_counts(
+    bills: dict[int, Bills],
+    legislators: dict[int, Legislators],
+    votes: dict[int, Votes],
+    vote_results: Union[VoteResultsTable, dict[int, VoteResults], Iterable[VoteResults]]
+):
+    """
+    Updates bill supporter/opposer counts and legislator support/oppose counts in one pass.
+
+    Equivalent to calling `assign_bill_vote_counts` followed by `assign_legislator_vote_counts`
+    with the same vote results.
+
+    Args:
+        bills (dict[int, Bills]): Dictionary of bills keyed by bill ID.
+        legislators (dict[int, Legislators]): Dictionary of legislators keyed by legislator ID.
+        votes (dict[int, Votes]): Dictionary of votes keyed by vote ID.
+        vote_results (VoteResultsTable | dict[int, VoteResults] | Iterable[VoteResults]): A columnar
+            table, a dictionary of vote results keyed by result ID, or any iterable of vote results.
+            Iterables are consumed once.
+
+    Notes:
+        - Assumes every referenced vote, bill and legislator exists; a `KeyError` is raised otherwise.
+        - Modifies the Bills and Legislators objects in-place.
+    """
+    for legislator_id, vote_id, vote_type in iter_vote_result_columns(vote_results):
+        bill = bills[votes[vote_id].bill_id]
+        legislator = legislators[legislator_id]
+
+        if vote_type == VoteType.FOR.value:
+            bill.supporter_count += 1
+            legislator.num_supported_bills += 1
+        elif vote_type == VoteType.AGAINST.value:
+            bill.opposer_count += 1
+            legislator.num_opposed_bills += 1
@@ -0,0 +1,81 @@
+"""
+This module contains test cases for the fused `assign_vote_counts` function, which updates
+bill and legislator vote counts in a single pass over the vote results.
+
+Test functions include:
+- `test_assign_vote_counts`: Tests that bill and legislator counts are both updated.
+- `test_assign_vote_counts_matches_separate_handlers`: Tests equivalence with the two separate handlers.
+- `test_assign_vote_counts_streams_once`: Tests that a one-shot generator is enough for both reports.
+- `test_assign_vote_counts_with_int_vote_types`: Tests vote results built with plain integer vote types.
+"""
+import copy
+import dataclasses
+
+from handlers import assign_bill_vote_counts, assign_legislator_vote_counts, assign_vote_counts
+from models import VoteType
+
+
+def test_assign_vote_counts(bills, legislators, votes, vote_results):
+    """
+    Test case for updating both bill and legislator counts in one call.
+
+    Simulates:
+    - Alice supports both bills, Bob opposes the "Healthcare Reform Act" and Carol opposes the
+      "Education Reform Act".
+    """
+    assign_vote_counts(bills, legislators, votes, vote_results)
+
+    assert (bills[101].supporter_count, bills[101].opposer_count) == (1, 1)
+    assert (bills[102].supporter_count, bills[102].opposer_count) == (1, 1)
+    assert (legislators[1].num_supported_bills, legislators[1].num_opposed_bills) == (2, 0)
+    assert (legislators[2].num_supported_bills, legislators[2].num_opposed_bills) == (0, 1)
+    assert (legislators[3].num_supported_bills, legislators[3].num_opposed_bills) == (0, 1)
+
+
+def test_assign_vote_counts_matches_separate_handlers(bills, legislators, votes, vote_results):
+    """
+    Test case comparing the fused handler with `assign_bill_vote_counts` and `assign_legislator_vote_counts`.
+
+    Simulates:
+    - The shared dataset processed by the fused handler and by the two separate handlers.
+    """
+    expected_bills, expected_legislators = copy.deepcopy(bills), copy.deepcopy(legislators)
+
+    assign_bill_vote_counts(expected_bills, votes, vote_results)
+    assign_legislator_vote_counts(expected_legislators, vote_results)
+    assign_vote_counts(bills, legislators, votes, vote_results)
+
+    assert bills == expected_bills
+    assert legislators == expected_legislators
+
+
+def test_assign_vote_counts_streams_once(bills, legislators, votes, vote_results):
+    """
+    Test case where the vote results can only be iterated once, as when streaming from a CSV file.
+
+    Simulates:
+    - The dataset's vote results passed through a generator.
+    """
+    assign_vote_counts(bills, legislators, votes, (vote_result for vote_result in vote_results.values()))
+
+    assert sum(bill.supporter_count + bill.opposer_count for bill in bills.values()) == 4
+    assert sum(leg.num_supported_bills + leg.num_opposed_bills for leg in legislators.values()) == 4
+
+
+def test_assign_vote_counts_with_int_vote_types(bills, legislators, votes, vote_results):
+    """
+    Test case where the vote results hold the integer value of their vote type instead of a `VoteType`.
+
+    Simulates:
+    - The shared vote results rebuilt with `vote_type=1` or `vote_type=2`, as in the `VoteResults` example.
+    """
+    expected_bills, expected_legislators = copy.deepcopy(bills), copy.deepcopy(legislators)
+    assign_vote_counts(expected_bills, expected_legislators, votes, vote_results)
+    int_vote_results = [dataclasses.replace(vote_result, vote_type=int(vote_result.vote_type))
+                        for vote_result in vote_results.values()]
+
+    assign_vote_counts(bills, legislators, votes, int_vote_results)
+
+    assert not any(isinstance(vote_result.vote_type, VoteType) for vote_result in int_vote_results)
+    assert bills == expected_bills
+    assert legislators == expected_legislators
@@ -0,0 +1,61 @@
+"""
+This script ranks, for each legislator, the legislators who vote most like them.
+
+The agreement of two legislators is the share of the votes they both took part in on which they
+voted the same way. It is computed for every pair at once from sparse products of the
+legislator × vote matrix (see `handlers.agreement_handler`); it requires numpy.
+
+Steps:
+    1. Reads the legislators and loads the vote results into a columnar table.
+    2. Builds the shared-votes and agreed-votes matrices of every pair of legislators.
+    3. Writes the `--top-k` most similar legislators of each legislator.
+
+Input:
+    - input/legislators.csv
+    - input/vote_results.csv
+
+Output:
+    - output/legislator-similarity.csv: For each legislator, its most similar legislators by rank,
+      with their shared votes, agreed votes and agreement.
+
+Usage:
+    python legislator_similarity.py [--input-dir input] [--output output/legislator-similarity.csv]
+    [--top-k 5] [--min-shared-votes 1] [--no-cache]
+"""
+import argparse
+import os
+
+from handlers import build_agreement_matrix, iter_most_similar_legislators
+from models import LegislatorSimilarity, Legislators, VoteResults, VoteResultsTable
+from utils import (
+    add_pipeline_arguments,
+    find_input_file,
+    iter_csv_dataclasses,
+    parse_csv_to_dataclass_dict_cached,
+    write_dataclasses_to_csv,
+)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_pipeline_arguments(parser, 'input-dir')
+    parser.add_argument('--output', default=os.path.join('output', 'legislator-similarity.csv'),
+                        help="Output CSV file (default: output/legislator-similarity.csv).")
+    parser.add_argument('--top-k', type=int, default=5, help="Similar legislators per legislator (default: 5).")
+    parser.add_argument('--min-shared-votes', type=int, default=1,
+                        help="Shared votes needed to rank a pair of legislators (default: 1).")
+    add_pipeline_arguments(parser, 'no-cache')
+    args = parser.parse_args()
+    if args.top_k < 1:
+        parser.error("--top-k must be at least 1")
+
+    legislators = parse_csv_to_dataclass_dict_cached(
+        find_input_file(args.input_dir, 'legislators'), Legislators, delimiter=',', enabled=not args.no_cache
+    )
+    vote_results = VoteResultsTable.from_rows(iter_csv_dataclasses(
+        filepath=find_input_file(args.input_dir, 'vote_results'), cls=VoteResults, delimiter=',', as_tuples=True
+    ))
+
+    matrix = build_agreement_matrix(vote_results)
+    write_dataclasses_to_csv(args.output, iter_most_similar_legislators(
+        matrix, legislators, top_k=args.top_k, min_shared_votes=args.min_shared_votes
+    ), LegislatorSimilarity)
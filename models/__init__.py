@@ -5,3 +5,10 @@ from .legislators import Legislators
 from .vote_results import VoteResults
 from .votes import Votes
 from .vote_type import VoteType
+from .vote_results_table import VOTE_RESULT_COLUMNS, VoteResultsTable, iter_vote_result_columns, vote_result_arrays
+from .vote_tally import VoteTally
+from .vote_index import VoteIndex
+from .legislator_similarity import LegislatorSimilarity
+from .vote_time_index import VoteTimeIndex
+from .sponsor_vote_counts import SponsorVoteCounts
+from .ranked_entry import RankedEntry
@@ -7,7 +7,7 @@ attributes for the bill's identifier, title, and the sponsor's identifier.
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Bills:
     """
     Represents a bill with associated details.
@@ -0,0 +1,37 @@
+"""Module to define the LegislatorSimilarity class for representing how alike two legislators vote.
+
+This module contains a single class, `LegislatorSimilarity`, which represents one row of the
+"most similar legislators" report: a legislator, one of the legislators who vote most like them,
+and how often the two agreed on the votes they both took part in.
+"""
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class LegislatorSimilarity:  # pylint: disable=too-many-instance-attributes
+    """
+    Represents the co-voting agreement of a legislator with another legislator.
+
+    Attributes:
+        legislator_id (int): The identifier of the legislator.
+        legislator_name (str): The name of the legislator ("Unknown" if not in legislators.csv).
+        rank (int): The rank of the similar legislator, starting at 1 for the most similar.
+        similar_legislator_id (int): The identifier of the similar legislator.
+        similar_legislator_name (str): The name of the similar legislator ("Unknown" if not in legislators.csv).
+        shared_votes (int): The number of votes both legislators voted FOR or AGAINST.
+        agreed_votes (int): The number of shared votes on which they voted the same way.
+        agreement (float): `agreed_votes / shared_votes`.
+
+    Example:
+        similarity = LegislatorSimilarity(legislator_id=1, legislator_name="Alice", rank=1, similar_legislator_id=2,
+                                          similar_legislator_name="Bob", shared_votes=10, agreed_votes=9,
+                                          agreement=0.9)
+    """
+    legislator_id: int
+    legislator_name: str
+    rank: int
+    similar_legislator_id: int
+    similar_legislator_name: str
+    shared_votes: int
+    agreed_votes: int
+    agreement: float
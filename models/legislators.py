@@ -6,7 +6,7 @@ attributes for the legislator's identifier and name.
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Legislators:
     """
     Represents a legislator with basic information.
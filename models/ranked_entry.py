@@ -0,0 +1,32 @@
+"""Module to define the RankedEntry class for representing one row of a top-K ranking report.
+
+This module contains a single class, `RankedEntry`, which represents a bill or a legislator at a
+given rank of a ranking such as "most supported bills", with the score it was ranked by and the
+vote counts the score was computed from.
+"""
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class RankedEntry:
+    """
+    Represents a bill or legislator at a rank of a ranking report.
+
+    Attributes:
+        rank (int): The rank, starting at 1 for the highest score.
+        id (int): The identifier of the bill or legislator.
+        name (str): The title of the bill, or the name of the legislator.
+        score (float): The value the ranking is ordered by.
+        supporting (int): The supporters of the bill, or the bills the legislator supported.
+        opposing (int): The opposers of the bill, or the bills the legislator opposed.
+
+    Example:
+        entry = RankedEntry(rank=1, id=2952375, name="H.R. 5376: Build Back Better Act", score=6, supporting=6,
+                            opposing=0)
+    """
+    rank: int
+    id: int  # pylint: disable=invalid-name
+    name: str
+    score: float
+    supporting: int
+    opposing: int
@@ -0,0 +1,30 @@
+"""Module to define the SponsorVoteCounts class for representing the votes received by a sponsor's bills.
+
+This module contains a single class, `SponsorVoteCounts`, which represents one row of the
+per-sponsor report: a legislator sponsoring bills, how many bills they sponsor, and how many
+supporting and opposing votes those bills received.
+"""
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class SponsorVoteCounts:
+    """
+    Represents the votes received by the bills of a primary sponsor.
+
+    Attributes:
+        sponsor_id (int): The identifier of the sponsor.
+        sponsor_name (str): The name of the sponsor ("Unknown" if not in legislators.csv).
+        sponsored_bills (int): The number of bills the legislator is the primary sponsor of.
+        supporting_votes (int): The number of FOR votes on those bills.
+        opposing_votes (int): The number of AGAINST votes on those bills.
+
+    Example:
+        sponsor = SponsorVoteCounts(sponsor_id=1, sponsor_name="Alice", sponsored_bills=2, supporting_votes=10,
+                                    opposing_votes=3)
+    """
+    sponsor_id: int
+    sponsor_name: str
+    sponsored_bills: int = 0
+    supporting_votes: int = 0
+    opposing_votes: int = 0
@@ -0,0 +1,288 @@
+"""Module to define the VoteIndex class, compressed sparse row (CSR) adjacency indexes over votes.
+
+The models only link forward: `VoteResults.vote_id` -> `Votes.bill_id` -> `Bills.sponsor_id`.
+Answering "all votes cast by legislator X", "all vote results for bill Y" or "how did X vote on Y"
+from them takes a full scan of the vote results. `VoteIndex` groups the vote results once, so each
+of these questions only touches the rows it returns.
+
+Each relationship is an `Adjacency` in CSR form: the neighbours of node `i` are
+`items[offsets[i]:offsets[i + 1]]`. Nodes are dense row numbers assigned to the bill, vote and
+legislator IDs; items are vote rows, or positions of vote results in a `VoteResultsTable`. The
+groups are filled with a counting sort, which is linear in the number of rows and keeps every
+group in file order.
+"""
+from array import array
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional, Union
+
+from .vote_results import VoteResults
+from .vote_results_table import VoteResultsTable
+from .vote_type import VoteType
+from .votes import Votes
+
+# Bill row of a vote whose bill isn't known
+NO_BILL = -1
+
+
+@dataclass(frozen=True, slots=True)
+class Adjacency:
+    """
+    Represents a one-to-many relationship between dense row numbers, in CSR form.
+
+    Attributes:
+        offsets (array): `offsets[i]` is where the neighbours of node `i` start in `items`; it has one
+            more entry than there are nodes.
+        items (array): The neighbours of every node, grouped by node.
+    """
+    offsets: array
+    items: array
+
+    @classmethod
+    def group(cls, keys: array, size: int) -> 'Adjacency':
+        """
+        Groups the positions of `keys` by key with a stable counting sort.
+
+        Args:
+            keys (array): The node of each item, or a negative value to leave the item out.
+            size (int): The number of nodes.
+
+        Returns:
+            Adjacency: The items of each node, in increasing position order.
+        """
+        offsets = array('q', bytes(8 * (size + 1)))
+        for key in keys:
+            if key >= 0:
+                offsets[key + 1] += 1
+        for node in range(size):
+            offsets[node + 1] += offsets[node]
+
+        cursors = offsets[:-1]
+        items = array('q', bytes(8 * offsets[-1]))
+        for position, key in enumerate(keys):
+            if key >= 0:
+                items[cursors[key]] = position
+                cursors[key] += 1
+        return cls(offsets, items)
+
+    def neighbours(self, node: int) -> array:
+        """Returns the items of a node."""
+        return self.items[self.offsets[node]:self.offsets[node + 1]]
+
+    def degree(self, node: int) -> int:
+        """Returns the number of items of a node."""
+        return self.offsets[node + 1] - self.offsets[node]
+
+
+def _count_vote_types(results: Iterable[tuple[int, int, int]]) -> tuple[int, int]:
+    """Counts the `FOR` and `AGAINST` votes among `(legislator_id, vote_id, vote_type)` triples."""
+    for_count = against_count = 0
+    for _, _, vote_type in results:
+        if vote_type == VoteType.FOR.value:
+            for_count += 1
+        elif vote_type == VoteType.AGAINST.value:
+            against_count += 1
+    return for_count, against_count
+
+
+class VoteIndex:  # pylint: disable=too-many-instance-attributes
+    """
+    Represents CSR adjacency indexes from bills to votes to vote results, and from legislators to vote results.
+
+    Attributes:
+        vote_results (VoteResultsTable): The indexed vote results.
+        bill_rows (dict[int, int]): Dense row number of each bill ID referenced by a vote.
+        bill_ids (array): The bill ID of each bill row.
+        vote_rows (dict[int, int]): Dense row number of each vote ID, from the votes and the vote results.
+        vote_ids (array): The vote ID of each vote row.
+        vote_bill_rows (array): The bill row of each vote row, or `NO_BILL`.
+        legislator_rows (dict[int, int]): Dense row number of each legislator ID found in the vote results.
+        bill_votes (Adjacency): The vote rows of each bill row.
+        vote_results_by_vote (Adjacency): The vote result positions of each vote row.
+        vote_results_by_legislator (Adjacency): The vote result positions of each legislator row.
+
+    Example:
+        index = VoteIndex.build(votes, vote_results)
+        for legislator_id, vote_id, vote_type in index.results_for_bill(2952375):
+            ...
+    """
+
+    def __init__(self, votes: dict[int, Votes], vote_results: VoteResultsTable):
+        self.vote_results = vote_results
+        self.bill_rows: dict[int, int] = {}
+        self.bill_ids = array('q')
+        self.vote_rows: dict[int, int] = {}
+        self.vote_ids = array('q')
+        self.vote_bill_rows = array('q')
+        self.legislator_rows: dict[int, int] = {}
+
+        for vote in votes.values():
+            bill_row = self.bill_rows.get(vote.bill_id)
+            if bill_row is None:
+                bill_row = self.bill_rows[vote.bill_id] = len(self.bill_ids)
+                self.bill_ids.append(vote.bill_id)
+            self._add_vote(vote.id, bill_row)
+
+        result_vote_rows = array('q')
+        for vote_id in vote_results.vote_ids:
+            row = self.vote_rows.get(vote_id)
+            result_vote_rows.append(self._add_vote(vote_id, NO_BILL) if row is None else row)
+        legislator_rows = self.legislator_rows
+        result_legislator_rows = array('q', (
+            legislator_rows.setdefault(legislator_id, len(legislator_rows))
+            for legislator_id in vote_results.legislator_ids
+        ))
+
+        self.bill_votes = Adjacency.group(self.vote_bill_rows, len(self.bill_ids))
+        self.vote_results_by_vote = Adjacency.group(result_vote_rows, len(self.vote_ids))
+        self.vote_results_by_legislator = Adjacency.group(result_legislator_rows, len(legislator_rows))
+
+    def _add_vote(self, vote_id: int, bill_row: int) -> int:
+        """Assigns the next vote row to a vote ID and returns it."""
+        row = self.vote_rows[vote_id] = len(self.vote_ids)
+        self.vote_ids.append(vote_id)
+        self.vote_bill_rows.append(bill_row)
+        return row
+
+    @classmethod
+    def build(
+        cls,
+        votes: dict[int, Votes],
+        vote_results: Union[VoteResultsTable, dict[int, VoteResults], Iterable[VoteResults]]
+    ) -> 'VoteIndex':
+        """
+        Builds the indexes from the votes and any vote results source.
+
+        Args:
+            votes (dict[int, Votes]): Dictionary of votes keyed by vote ID.
+            vote_results (VoteResultsTable | dict[int, VoteResults] | Iterable[VoteResults]): A columnar
+                table, which is indexed as is, or vote results that are first copied into one.
+
+        Returns:
+            VoteIndex: The indexes.
+        """
+        if not isinstance(vote_results, VoteResultsTable):
+            vote_results = VoteResultsTable.from_vote_results(vote_results)
+        return cls(votes, vote_results)
+
+    def _results(self, positions: Iterable[int]) -> Iterator[tuple[int, int, int]]:
+        """Yields the `(legislator_id, vote_id, vote_type)` triples at the given positions."""
+        legislator_ids = self.vote_results.legislator_ids
+        vote_ids = self.vote_results.vote_ids
+        vote_types = self.vote_results.vote_types
+        for position in positions:
+            yield legislator_ids[position], vote_ids[position], vote_types[position]
+
+    def bill_id_of_vote(self, vote_id: int) -> Optional[int]:
+        """Returns the bill ID of a vote, or None if the vote or its bill is unknown."""
+        row = self.vote_rows.get(vote_id)
+        if row is None or self.vote_bill_rows[row] == NO_BILL:
+            return None
+        return self.bill_ids[self.vote_bill_rows[row]]
+
+    def votes_for_bill(self, bill_id: int) -> list[int]:
+        """
+        Returns the IDs of the votes held on a bill.
+
+        Args:
+            bill_id (int): The bill ID.
+
+        Returns:
+            list[int]: The vote IDs, in the order of the votes table; empty for an unknown bill.
+        """
+        row = self.bill_rows.get(bill_id)
+        if row is None:
+            return []
+        return [self.vote_ids[vote_row] for vote_row in self.bill_votes.neighbours(row)]
+
+    def results_for_vote(self, vote_id: int) -> Iterator[tuple[int, int, int]]:
+        """
+        Iterates over the results of one vote.
+
+        Args:
+            vote_id (int): The vote ID.
+
+        Returns:
+            Iterator[tuple[int, int, int]]: `(legislator_id, vote_id, vote_type)` triples, in file order.
+        """
+        row = self.vote_rows.get(vote_id)
+        if row is None:
+            return iter(())
+        return self._results(self.vote_results_by_vote.neighbours(row))
+
+    def results_for_bill(self, bill_id: int) -> Iterator[tuple[int, int, int]]:
+        """
+        Iterates over the results of every vote held on a bill.
+
+        Args:
+            bill_id (int): The bill ID.
+
+        Returns:
+            Iterator[tuple[int, int, int]]: `(legislator_id, vote_id, vote_type)` triples, vote by vote.
+        """
+        for vote_id in self.votes_for_bill(bill_id):
+            yield from self.results_for_vote(vote_id)
+
+    def results_for_legislator(self, legislator_id: int) -> Iterator[tuple[int, int, int]]:
+        """
+        Iterates over the votes cast by a legislator.
+
+        Args:
+            legislator_id (int): The legislator ID.
+
+        Returns:
+            Iterator[tuple[int, int, int]]: `(legislator_id, vote_id, vote_type)` triples, in file order.
+        """
+        row = self.legislator_rows.get(legislator_id)
+        if row is None:
+            return iter(())
+        return self._results(self.vote_results_by_legislator.neighbours(row))
+
+    def legislator_votes_on_bill(self, legislator_id: int, bill_id: int) -> list[tuple[int, int]]:
+        """
+        Returns how a legislator voted on a bill.
+
+        Walks whichever side has fewer vote results: the legislator's votes or the bill's results.
+
+        Args:
+            legislator_id (int): The legislator ID.
+            bill_id (int): The bill ID.
+
+        Returns:
+            list[tuple[int, int]]: `(vote_id, vote_type)` for each vote on the bill the legislator took part in.
+        """
+        bill_row = self.bill_rows.get(bill_id)
+        legislator_row = self.legislator_rows.get(legislator_id)
+        if bill_row is None or legislator_row is None:
+            return []
+        vote_degree = self.vote_results_by_vote.degree
+        bill_degree = sum(vote_degree(vote_row) for vote_row in self.bill_votes.neighbours(bill_row))
+        if self.vote_results_by_legislator.degree(legislator_row) <= bill_degree:
+            vote_rows, vote_bill_rows = self.vote_rows, self.vote_bill_rows
+            return [(vote_id, vote_type) for _, vote_id, vote_type in self.results_for_legislator(legislator_id)
+                    if vote_bill_rows[vote_rows[vote_id]] == bill_row]
+        return [(vote_id, vote_type) for voter_id, vote_id, vote_type in self.results_for_bill(bill_id)
+                if voter_id == legislator_id]
+
+    def bill_vote_counts(self, bill_id: int) -> tuple[int, int]:
+        """
+        Counts the supporters and opposers of a bill from its own vote results.
+
+        Args:
+            bill_id (int): The bill ID.
+
+        Returns:
+            tuple[int, int]: The `(supporter_count, opposer_count)` of the bill.
+        """
+        return _count_vote_types(self.results_for_bill(bill_id))
+
+    def legislator_vote_counts(self, legislator_id: int) -> tuple[int, int]:
+        """
+        Counts the bills a legislator supported and opposed from their own vote results.
+
+        Args:
+            legislator_id (int): The legislator ID.
+
+        Returns:
+            tuple[int, int]: The `(num_supported_bills, num_opposed_bills)` of the legislator.
+        """
+        return _count_vote_types(self.results_for_legislator(legislator_id))
@@ -3,12 +3,15 @@
 This module contains the `VoteResults` class, which represents the outcome of a vote
 cast by a legislator, including the vote's identifier, the legislator's ID, the vote ID,
 and the type of vote (e.g., for, against, abstain).
+
+Vote results are by far the largest table, so the class is slotted: instances carry no
+`__dict__`, and `vote_type` holds a `VoteType` member, which is a small int.
 """
 from dataclasses import dataclass
 from .vote_type import VoteType
 
 
-@dataclass
+@dataclass(slots=True)
 class VoteResults:
     """
     Represents the results of a vote cast by a legislator.
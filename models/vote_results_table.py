@@ -0,0 +1,181 @@
+"""Module to define the VoteResultsTable class, a columnar store for vote results.
+
+Keeping every vote result as a `VoteResults` dataclass instance costs a Python object, a
+`__dict__` and several boxed integers per row. `VoteResultsTable` instead packs the columns
+the handlers actually aggregate over (`legislator_id`, `vote_id` and `vote_type`) into typed
+arrays, using about 9 bytes per row.
+
+The module also exposes `iter_vote_result_columns`, which lets the handlers read
+`(legislator_id, vote_id, vote_type)` triples from a table, a dict, or any iterable of
+`VoteResults` without caring which representation they were given. Handlers that only need some
+of the columns ask for just those, so they also accept vote results parsed with a column projection
+(e.g. `utils.iter_csv_dataclasses(..., columns=('legislator_id', 'vote_type'))`).
+
+`vote_result_arrays` exposes the same three columns as NumPy arrays for the vectorized handlers,
+without copying them when given a table. NumPy is only required when it is called.
+"""
+from array import array
+from collections.abc import Mapping
+from operator import attrgetter
+from typing import Iterable, Iterator, Union
+
+from .vote_results import VoteResults
+from .vote_type import VoteType
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only when numpy is missing
+    np = None
+
+VOTE_RESULT_COLUMNS = ('legislator_id', 'vote_id', 'vote_type')
+
+
+class VoteResultsTable:
+    """
+    Represents a table of vote results stored as packed, typed columns.
+
+    Attributes:
+        legislator_ids (array): The legislator who cast each vote (`array('i')`).
+        vote_ids (array): The vote each result belongs to (`array('i')`).
+        vote_types (array): The `VoteType` value of each result (`array('b')`).
+
+    Example:
+        table = VoteResultsTable()
+        table.append(legislator_id=1001, vote_id=10, vote_type=VoteType.FOR)
+    """
+
+    def __init__(self):
+        self.legislator_ids = array('i')
+        self.vote_ids = array('i')
+        self.vote_types = array('b')
+
+    def __len__(self) -> int:
+        return len(self.vote_types)
+
+    def append(self, legislator_id: int, vote_id: int, vote_type: Union[VoteType, int]):
+        """
+        Appends a single vote result to the table.
+
+        Args:
+            legislator_id (int): The identifier of the legislator who cast the vote.
+            vote_id (int): The identifier of the vote.
+            vote_type (VoteType | int): The type of vote, as an enum member or its integer value.
+        """
+        self.legislator_ids.append(legislator_id)
+        self.vote_ids.append(vote_id)
+        self.vote_types.append(vote_type.value if isinstance(vote_type, VoteType) else vote_type)
+
+    def columns(self) -> Iterator[tuple[int, int, int]]:
+        """
+        Iterates over the table rows without materializing any `VoteResults` object.
+
+        Returns:
+            Iterator[tuple[int, int, int]]: `(legislator_id, vote_id, vote_type)` triples,
+                where `vote_type` is the integer value of the `VoteType`.
+        """
+        return zip(self.legislator_ids, self.vote_ids, self.vote_types)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple]) -> 'VoteResultsTable':
+        """
+        Builds a table from `(id, legislator_id, vote_id, vote_type)` tuples.
+
+        This is the shape produced by `utils.iter_csv_dataclasses(..., VoteResults, as_tuples=True)`,
+        so a CSV file can be loaded into a table without creating intermediate objects.
+
+        Args:
+            rows (Iterable[tuple]): The vote result rows, in `VoteResults` field order.
+
+        Returns:
+            VoteResultsTable: The populated table.
+        """
+        table = cls()
+        append = table.append
+        for _, legislator_id, vote_id, vote_type in rows:
+            append(legislator_id, vote_id, vote_type)
+        return table
+
+    @classmethod
+    def from_vote_results(
+        cls,
+        vote_results: Union[dict[int, VoteResults], Iterable[VoteResults]]
+    ) -> 'VoteResultsTable':
+        """
+        Builds a table from `VoteResults` instances.
+
+        Args:
+            vote_results (dict[int, VoteResults] | Iterable[VoteResults]): Vote results keyed by
+                result ID, or any iterable of vote results.
+
+        Returns:
+            VoteResultsTable: The populated table.
+        """
+        return cls.from_rows(
+            (None, vote_result.legislator_id, vote_result.vote_id, vote_result.vote_type)
+            for vote_result in iter_values(vote_results)
+        )
+
+
+def vote_result_arrays(
+    vote_results: Union[VoteResultsTable, dict[int, VoteResults], Iterable[VoteResults]]
+) -> tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+    """
+    Returns the legislator id, vote id and vote type columns of the vote results as NumPy arrays.
+
+    The arrays of a `VoteResultsTable` share its buffers; other vote results are packed into a table first.
+
+    Args:
+        vote_results (VoteResultsTable | dict[int, VoteResults] | Iterable[VoteResults]): The vote results.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: The `legislator_id`, `vote_id` and `vote_type` columns.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    if np is None:
+        raise ImportError("Vote result arrays require numpy. Install it with `pip install numpy`.")
+    if not isinstance(vote_results, VoteResultsTable):
+        vote_results = VoteResultsTable.from_vote_results(vote_results)
+    return (
+        np.frombuffer(vote_results.legislator_ids, dtype=np.int32),
+        np.frombuffer(vote_results.vote_ids, dtype=np.int32),
+        np.frombuffer(vote_results.vote_types, dtype=np.int8),
+    )
+
+
+def iter_values(vote_results: Union[dict[int, VoteResults], Iterable[VoteResults]]) -> Iterable[VoteResults]:
+    """
+    Returns the vote results of a dictionary, or the iterable itself.
+
+    Args:
+        vote_results (dict[int, VoteResults] | Iterable[VoteResults]): The vote results.
+
+    Returns:
+        Iterable[VoteResults]: An iterable over the `VoteResults` instances.
+    """
+    if isinstance(vote_results, Mapping):
+        return vote_results.values()
+    return vote_results
+
+
+def iter_vote_result_columns(
+    vote_results: Union[VoteResultsTable, dict[int, VoteResults], Iterable[VoteResults]],
+    columns: tuple[str, ...] = VOTE_RESULT_COLUMNS
+) -> Iterator[tuple]:
+    """
+    Iterates over `(legislator_id, vote_id, vote_type)` triples, or the given columns, from any vote results source.
+
+    Args:
+        vote_results (VoteResultsTable | dict[int, VoteResults] | Iterable[VoteResults]): A columnar
+            table, a dictionary keyed by result ID, or any iterable of vote results. The vote results
+            only need the attributes named in `columns`.
+        columns (tuple[str, ...]): Two or more of `legislator_id`, `vote_id` and `vote_type`.
+
+    Returns:
+        Iterator[tuple]: The values of the columns. `vote_type` is passed through as is, either a
+            `VoteType` (an `IntEnum`) or its plain integer value, which compare equal.
+    """
+    if isinstance(vote_results, VoteResultsTable):
+        return zip(*(getattr(vote_results, f'{column}s') for column in columns))
+    return map(attrgetter(*columns), iter_values(vote_results))
@@ -0,0 +1,66 @@
+"""Module to define the VoteTally class for accumulating vote counts outside of the models.
+
+A `VoteTally` holds FOR/AGAINST counters per bill and per legislator. Tallies computed over
+disjoint parts of the vote results (e.g. by parallel workers) can be merged, and the merged
+tally is then applied to the `Bills` and `Legislators` instances.
+"""
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .vote_type import VoteType
+
+
+@dataclass
+class VoteTally:
+    """
+    Represents partial vote counts per bill and per legislator.
+
+    Attributes:
+        bill_supporters (Counter): Number of FOR votes keyed by bill ID.
+        bill_opposers (Counter): Number of AGAINST votes keyed by bill ID.
+        legislator_supported (Counter): Number of FOR votes keyed by legislator ID.
+        legislator_opposed (Counter): Number of AGAINST votes keyed by legislator ID.
+
+    Example:
+        tally = VoteTally()
+        tally.add(bill_id=1001, legislator_id=1, vote_type=1)
+    """
+    bill_supporters: Counter = field(default_factory=Counter)
+    bill_opposers: Counter = field(default_factory=Counter)
+    legislator_supported: Counter = field(default_factory=Counter)
+    legislator_opposed: Counter = field(default_factory=Counter)
+
+    def add(self, bill_id: Optional[int], legislator_id: int, vote_type: int):
+        """
+        Counts a single vote result.
+
+        Args:
+            bill_id (int | None): The bill the vote was about, or None to only count the legislator.
+            legislator_id (int): The legislator who cast the vote.
+            vote_type (int): The integer value of the `VoteType`.
+        """
+        if vote_type == VoteType.FOR.value:
+            if bill_id is not None:
+                self.bill_supporters[bill_id] += 1
+            self.legislator_supported[legislator_id] += 1
+        elif vote_type == VoteType.AGAINST.value:
+            if bill_id is not None:
+                self.bill_opposers[bill_id] += 1
+            self.legislator_opposed[legislator_id] += 1
+
+    def merge(self, other: 'VoteTally') -> 'VoteTally':
+        """
+        Adds the counts of another tally to this one.
+
+        Args:
+            other (VoteTally): The tally to merge in.
+
+        Returns:
+            VoteTally: This tally, for chaining.
+        """
+        self.bill_supporters.update(other.bill_supporters)
+        self.bill_opposers.update(other.bill_opposers)
+        self.legislator_supported.update(other.legislator_supported)
+        self.legislator_opposed.update(other.legislator_opposed)
+        return self
@@ -0,0 +1,184 @@
+"""Module to define the VoteTimeIndex class, prefix-sum indexes over vote results ordered by date.
+
+Counting the supporters and opposers of a bill between two dates from the models takes a scan of
+every vote result, for every window. `VoteTimeIndex` sorts the vote results of dated votes by date
+once, groups them per bill and per legislator (in CSR form, as in `VoteIndex`), and keeps running
+totals of FOR and AGAINST votes along each grouping. The counts of a group over any date window
+are then two bisections of the group's dates and two subtractions of the running totals.
+
+Vote results whose vote is unknown or has no date are left out of the index.
+"""
+import bisect
+import datetime
+from array import array
+from itertools import accumulate, compress
+from typing import Iterable, Optional, Union
+
+from .vote_index import Adjacency
+from .vote_results import VoteResults
+from .vote_results_table import VoteResultsTable, iter_vote_result_columns
+from .vote_type import VoteType
+from .votes import Votes
+
+
+class DatePrefixIndex:
+    """
+    Represents vote results grouped by a key, ordered by date within each group, with running vote counts.
+
+    Attributes:
+        rows (dict[int, int]): The group row of each key.
+        offsets (array): `offsets[row]` is where the group of `row` starts in the other arrays; it has one
+            more entry than there are groups.
+        dates (array): The date ordinal of each vote result, in group then date order.
+        for_prefix (array): `for_prefix[i]` is the number of `FOR` votes among the first `i` vote results.
+        against_prefix (array): `against_prefix[i]` is the number of `AGAINST` votes among the first `i`.
+    """
+
+    def __init__(self, keys: list[int], dates: array, vote_types: array):
+        """
+        Groups vote results already sorted by date.
+
+        Args:
+            keys (list[int]): The group key (bill or legislator ID) of each vote result.
+            dates (array): The date ordinal of each vote result, in increasing order.
+            vote_types (array): The `VoteType` value of each vote result.
+        """
+        self.rows: dict[int, int] = {key: row for row, key in enumerate(dict.fromkeys(keys))}
+        groups = Adjacency.group(array('q', map(self.rows.__getitem__, keys)), len(self.rows))
+
+        self.offsets = groups.offsets
+        self.dates = array('q', map(dates.__getitem__, groups.items))
+        grouped_types = array('b', map(vote_types.__getitem__, groups.items))
+        self.for_prefix = array('q', accumulate(map(VoteType.FOR.value.__eq__, grouped_types), initial=0))
+        self.against_prefix = array('q', accumulate(map(VoteType.AGAINST.value.__eq__, grouped_types), initial=0))
+
+    def counts(
+        self,
+        key: int,
+        start: Optional[datetime.date] = None,
+        end: Optional[datetime.date] = None
+    ) -> tuple[int, int]:
+        """
+        Counts the `FOR` and `AGAINST` votes of a group between two dates.
+
+        Args:
+            key (int): The group key.
+            start (datetime.date | None): The first day of the window (inclusive), or None for no lower bound.
+            end (datetime.date | None): The last day of the window (inclusive), or None for no upper bound.
+
+        Returns:
+            tuple[int, int]: The `(for_count, against_count)` of the window; zeros for an unknown key.
+        """
+        row = self.rows.get(key)
+        if row is None:
+            return 0, 0
+        low, high = self.offsets[row], self.offsets[row + 1]
+        if start is not None:
+            low = bisect.bisect_left(self.dates, start.toordinal(), low, high)
+        if end is not None:
+            high = bisect.bisect_right(self.dates, end.toordinal(), low, high)
+        return (self.for_prefix[high] - self.for_prefix[low],
+                self.against_prefix[high] - self.against_prefix[low])
+
+    def date_range(self, key: int) -> Optional[tuple[datetime.date, datetime.date]]:
+        """Returns the dates of the first and last votes of a group, or None for an unknown key."""
+        row = self.rows.get(key)
+        if row is None:
+            return None
+        return (datetime.date.fromordinal(self.dates[self.offsets[row]]),
+                datetime.date.fromordinal(self.dates[self.offsets[row + 1] - 1]))
+
+
+class VoteTimeIndex:
+    """
+    Represents per-bill and per-legislator indexes of vote results ordered by the date of their vote.
+
+    Attributes:
+        by_bill (DatePrefixIndex): The vote results grouped by the bill of their vote.
+        by_legislator (DatePrefixIndex): The vote results grouped by legislator.
+        skipped (int): The number of vote results left out because their vote is unknown or undated.
+
+    Example:
+        index = VoteTimeIndex.build(votes, vote_results)
+        supporters, opposers = index.bill_vote_counts(2952375, start=datetime.date(2021, 1, 1))
+    """
+
+    def __init__(self, by_bill: DatePrefixIndex, by_legislator: DatePrefixIndex, skipped: int):
+        self.by_bill = by_bill
+        self.by_legislator = by_legislator
+        self.skipped = skipped
+
+    @classmethod
+    def build(
+        cls,
+        votes: dict[int, Votes],
+        vote_results: Union[VoteResultsTable, dict[int, VoteResults], Iterable[VoteResults]]
+    ) -> 'VoteTimeIndex':
+        """
+        Sorts the vote results of dated votes by date and builds both indexes.
+
+        Args:
+            votes (dict[int, Votes]): Dictionary of votes keyed by vote ID, with their dates.
+            vote_results (VoteResultsTable | dict[int, VoteResults] | Iterable[VoteResults]): A columnar
+                table, a dictionary of vote results keyed by result ID, or any iterable of vote results.
+
+        Returns:
+            VoteTimeIndex: The indexes.
+        """
+        vote_dates = {vote.id: vote.date.toordinal() for vote in votes.values() if vote.date is not None}
+        legislator_ids, vote_ids, vote_types = list(zip(*iter_vote_result_columns(vote_results))) or ((), (), ())
+        dated = list(map(vote_dates.__contains__, vote_ids))
+        skipped = len(dated) - sum(dated)
+        legislator_ids = list(compress(legislator_ids, dated))
+        vote_ids = list(compress(vote_ids, dated))
+        vote_types = array('b', compress(vote_types, dated))
+        dates = array('q', map(vote_dates.__getitem__, vote_ids))
+        bill_ids = list(map({vote.id: vote.bill_id for vote in votes.values()}.__getitem__, vote_ids))
+
+        # A stable sort keeps vote results of the same day in file order
+        order = sorted(range(len(dates)), key=dates.__getitem__)
+        dates = array('q', map(dates.__getitem__, order))
+        vote_types = array('b', map(vote_types.__getitem__, order))
+        return cls(
+            DatePrefixIndex(list(map(bill_ids.__getitem__, order)), dates, vote_types),
+            DatePrefixIndex(list(map(legislator_ids.__getitem__, order)), dates, vote_types),
+            skipped,
+        )
+
+    def bill_vote_counts(
+        self,
+        bill_id: int,
+        start: Optional[datetime.date] = None,
+        end: Optional[datetime.date] = None
+    ) -> tuple[int, int]:
+        """
+        Counts the supporters and opposers of a bill on the votes held between two dates.
+
+        Args:
+            bill_id (int): The bill ID.
+            start (datetime.date | None): The first day of the window (inclusive), or None for no lower bound.
+            end (datetime.date | None): The last day of the window (inclusive), or None for no upper bound.
+
+        Returns:
+            tuple[int, int]: The `(supporter_count, opposer_count)` of the bill in the window.
+        """
+        return self.by_bill.counts(bill_id, start, end)
+
+    def legislator_vote_counts(
+        self,
+        legislator_id: int,
+        start: Optional[datetime.date] = None,
+        end: Optional[datetime.date] = None
+    ) -> tuple[int, int]:
+        """
+        Counts the bills a legislator supported and opposed on the votes held between two dates.
+
+        Args:
+            legislator_id (int): The legislator ID.
+            start (datetime.date | None): The first day of the window (inclusive), or None for no lower bound.
+            end (datetime.date | None): The last day of the window (inclusive), or None for no upper bound.
+
+        Returns:
+            tuple[int, int]: The `(num_supported_bills, num_opposed_bills)` of the legislator in the window.
+        """
+        return self.by_legislator.counts(legislator_id, start, end)
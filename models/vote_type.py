@@ -2,11 +2,14 @@
 a legislator can cast in a legislative process. The enum includes support for
 'FOR' and 'AGAINST' vote types, each with a corresponding integer value
 used in vote result calculations or storage.
+
+`VoteType` is an `IntEnum`, so its members are small ints: they compare equal to the raw
+values found in CSV files and packed arrays, and can be stored in them directly.
 """
-from enum import Enum
+from enum import IntEnum
 
 
-class VoteType(Enum):
+class VoteType(IntEnum):
     """
     Enumeration representing the possible types of votes a legislator can cast.
 
@@ -1,12 +1,15 @@
 """Module to define the Votes class for representing votes on legislative bills.
 
 This module contains the `Votes` class, which represents a vote associated with a
-specific bill, including the vote's identifier and the identifier of the bill being voted on.
+specific bill, including the vote's identifier, the identifier of the bill being voted on
+and, when `votes.csv` has a `date` column, the day the vote was held.
 """
+import datetime
 from dataclasses import dataclass
+from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Votes:
     """
     Represents a vote associated with a legislative bill.
@@ -14,9 +17,12 @@ class Votes:
     Attributes:
         id (int): The unique identifier for the vote.
         bill_id (int): The unique identifier for the bill being voted on.
+        date (datetime.date | None): The day the vote was held (ISO 8601 in the CSV file), or None
+            if it is unknown.
 
     Example:
-        vote = Votes(id=1, bill_id=1001)
+        vote = Votes(id=1, bill_id=1001, date=datetime.date(2021, 11, 19))
     """
     id: int  # pylint: disable=invalid-name
     bill_id: int
+    date: Optional[datetime.date] = None
@@ -0,0 +1,285 @@
+"""
+This script produces both reports (bills and legislators) in a single run.
+
+Running `bills_with_count.py` and `legislator_with_count.py` one after the other parses
+`legislators.csv` and `vote_results.csv` twice and scans the vote results twice. This pipeline
+parses every input once and counts bill and legislator votes in one fused pass.
+
+With `--engine query`, the counts are declared as reports of the `utils.query_engine` engine,
+which also computes the votes received by the bills of each sponsor in the same scan and writes
+them to a third output file.
+
+With `--backend sqlite`, the input files are instead bulk-loaded into a SQLite database (only the
+files changed since the previous run are loaded again) and both reports are computed with SQL
+`GROUP BY` queries and streamed to the output files.
+
+Steps:
+    1. Reads data from input CSV files for bills, legislators and votes concurrently; vote results are
+       streamed, and only the columns the counts need are converted.
+    2. Sets the `primary_sponsor` field of each bill using the sponsor's name.
+    3. Counts supporters/opposers per bill and supported/opposed bills per legislator in one pass.
+    4. Writes both output CSV files.
+
+Input:
+    - input/bills.csv
+    - input/legislators.csv
+    - input/vote_results.csv
+    - input/votes.csv
+
+Output:
+    - output/bills.csv: Each bill with updated sponsor and vote count information.
+    - output/legislators-support-oppose-count.csv: Legislators with updated support and opposition counts.
+    - output/sponsors-support-oppose-count.csv: With `--engine query`, the bills and votes of each sponsor.
+    - output/<ranking>.csv: With `--top K`, the top K bills or legislators of each ranking.
+
+Usage:
+    python pipeline.py [--input-dir input] [--output-dir output] [--engine {python,numpy,query}] [--workers N]
+    [--checkpoint PATH] [--no-cache] [--gzip] [--report PATH] [--backend {memory,sqlite}] [--database PATH]
+    [--loader {serial,thread,process}] [--lazy] [--top K]
+
+With `--lazy`, the bills and legislators tables are memory-mapped `LazyTable`s: only their IDs are
+parsed up front, sponsor names are assigned column-wise, and rows are converted as they are accessed
+or written. This cuts the load time and memory of wide tables; the binary cache is not used for them.
+
+With `--top K`, the K most supported, most opposed, highest support ratio and widest margin bills, and
+the K most supportive, most opposing and most contrarian legislators, are also written to one small
+CSV file per ranking (e.g. `most-supported-bills.csv`). They are kept in bounded heaps filled while
+the reports are written, so no report is sorted or read again.
+"""
+import argparse
+import os
+from dataclasses import dataclass
+from typing import Iterable, Optional, Union
+
+from handlers import (
+    BILL_VOTE_COUNTS,
+    LEGISLATOR_VOTE_COUNTS,
+    SPONSOR_VOTE_COUNTS,
+    apply_report_counts,
+    apply_vote_tally,
+    assign_bill_primary_sponsors,
+    assign_bill_vote_counts_vectorized,
+    assign_legislator_vote_counts_vectorized,
+    assign_vote_counts,
+    assign_vote_counts_incremental,
+    bill_rankings,
+    build_report_engine,
+    iter_bills_with_counts_sql,
+    iter_legislators_with_counts_sql,
+    iter_sponsor_vote_counts,
+    legislator_rankings,
+    run_vote_reports,
+    tally_vote_results_parallel,
+    write_ranking_reports,
+)
+from models import VOTE_RESULT_COLUMNS, Bills, Legislators, SponsorVoteCounts, VoteResults, VoteResultsTable, Votes
+from utils import (
+    DEFAULT_DATABASE_PATH,
+    StageRecorder,
+    LazyTable,
+    TableLoad,
+    TopK,
+    add_pipeline_arguments,
+    check_pipeline_arguments,
+    find_input_file,
+    iter_csv_dataclasses,
+    load_csvs_into_sqlite,
+    load_tables,
+    open_sqlite_store,
+    write_dataclasses_to_csv,
+)
+
+BILLS_OUTPUT = 'bills.csv'
+LEGISLATORS_OUTPUT = 'legislators-support-oppose-count.csv'
+SPONSORS_OUTPUT = 'sponsors-support-oppose-count.csv'
+
+
+@dataclass
+class PipelineOptions:  # pylint: disable=too-many-instance-attributes
+    """
+    Represents the tuning options of a pipeline run.
+
+    Attributes:
+        engine (str): `python` for the fused single-pass handler, `numpy` for the vectorized handlers
+            over a columnar vote results table, or `query` for the declared reports of `handlers.report_handler`
+            (which also writes the sponsors report).
+        workers (int): With the python engine, the number of processes counting shards of the vote results.
+        checkpoint_path (str | None): With the python engine, a checkpoint file used to only count the
+            vote results appended since the previous run.
+        use_cache (bool): Whether to reuse the binary cache of the parsed bills, legislators and votes tables.
+        compress (bool): Whether to write gzip-compressed outputs (with a `.gz` suffix).
+        backend (str): `memory` to count with the handlers above, or `sqlite` to count with SQL queries
+            over a database loaded from the input files (the engine and counting options are then ignored).
+        database_path (str): With the sqlite backend, the path to the database file.
+        loader (str): How the bills, legislators and votes tables are loaded: `serial`, `thread` or
+            `process` (see `utils.load_tables`).
+        lazy (bool): Whether to load the bills and legislators tables as `utils.LazyTable`s, converting their
+            rows only when they are accessed.
+        top (int | None): If given, the number of bills and legislators kept by each ranking report.
+    """
+    engine: str = 'python'
+    workers: int = 1
+    checkpoint_path: Optional[str] = None
+    use_cache: bool = True
+    compress: bool = False
+    backend: str = 'memory'
+    database_path: str = DEFAULT_DATABASE_PATH
+    loader: str = 'serial'
+    lazy: bool = False
+    top: Optional[int] = None
+
+
+def _load_tables(
+    input_dir: str,
+    options: PipelineOptions,
+    recorder: StageRecorder
+) -> tuple[dict[int, Bills], dict[int, Legislators], dict[int, Votes]]:
+    """Loads the bills, legislators and votes tables (or indexes the lazy ones), one stage per table."""
+    eager = (('votes', Votes),) if options.lazy else (('bills', Bills), ('legislators', Legislators), ('votes', Votes))
+    tables = load_tables(
+        {name: TableLoad(find_input_file(input_dir, name), cls) for name, cls in eager},
+        executor=options.loader, use_cache=options.use_cache, recorder=recorder,
+    )
+    if options.lazy:
+        for name, cls in (('bills', Bills), ('legislators', Legislators)):
+            with recorder.stage(f'load:{name}') as stage:
+                tables[name] = LazyTable.from_file(find_input_file(input_dir, name), cls)
+                stage.rows = len(tables[name])
+    return tables['bills'], tables['legislators'], tables['votes']
+
+
+def _table_rows(table: Union[dict, LazyTable]) -> Iterable:
+    """Returns the rows of a table to write, without caching the instances a lazy table builds for them."""
+    return table.iter_rows() if isinstance(table, LazyTable) else table.values()
+
+
+def _rankings(options: PipelineOptions) -> tuple[Optional[TopK], Optional[TopK]]:
+    """Returns the empty heaps of the bill and legislator rankings, or Nones without `top`."""
+    if options.top is None:
+        return None, None
+    return bill_rankings(options.top), legislator_rankings(options.top)
+
+
+def _ranked(rows: Iterable, top_k: Optional[TopK]) -> Iterable:
+    """Passes rows through the heaps of a ranking report, if any, as they are written."""
+    return rows if top_k is None else top_k.feed(rows)
+
+
+def _write_rankings(output_dir: str, rankings: tuple[Optional[TopK], Optional[TopK]], suffix: str,
+                    recorder: StageRecorder):
+    """Writes the ranking reports filled while the bill and legislator reports were written."""
+    if rankings[0] is not None:
+        with recorder.stage('write:rankings', rows=rankings[0].rows + rankings[1].rows):
+            write_ranking_reports(output_dir, *rankings, suffix=suffix)
+
+
+def _run_sqlite(input_dir: str, output_dir: str, options: PipelineOptions, recorder: StageRecorder):
+    """Loads the input files into the SQLite store and streams both reports out of it."""
+    connection = open_sqlite_store(options.database_path)
+    bill_ranks, legislator_ranks = rankings = _rankings(options)
+    try:
+        with recorder.stage('load:sqlite'):
+            load_csvs_into_sqlite(connection, input_dir, force=not options.use_cache)
+        suffix = '.gz' if options.compress else ''
+        with recorder.stage('write:bills') as stage:
+            write_dataclasses_to_csv(os.path.join(output_dir, BILLS_OUTPUT + suffix),
+                                     _ranked(stage.count(iter_bills_with_counts_sql(connection)), bill_ranks), Bills)
+        with recorder.stage('write:legislators') as stage:
+            write_dataclasses_to_csv(os.path.join(output_dir, LEGISLATORS_OUTPUT + suffix),
+                                     _ranked(stage.count(iter_legislators_with_counts_sql(connection)),
+                                             legislator_ranks), Legislators)
+    finally:
+        connection.close()
+    _write_rankings(output_dir, rankings, suffix, recorder)
+
+
+def run_pipeline(
+    input_dir: str = 'input',
+    output_dir: str = 'output',
+    options: Optional[PipelineOptions] = None,
+    recorder: Optional[StageRecorder] = None
+):
+    """
+    Reads the four input tables once and writes the bill and legislator reports.
+
+    Args:
+        input_dir (str): Directory containing `bills.csv`, `legislators.csv`, `votes.csv` and `vote_results.csv`.
+        output_dir (str): Directory where both output CSV files are written.
+        options (PipelineOptions | None): How to count the votes (default: `PipelineOptions()`).
+        recorder (StageRecorder | None): Records the measures of each stage, if given.
+    """
+    options = options or PipelineOptions()
+    recorder = recorder or StageRecorder(enabled=False)
+    if options.backend == 'sqlite':
+        _run_sqlite(input_dir, output_dir, options, recorder)
+        return
+    bills, legislators, votes = _load_tables(input_dir, options, recorder)
+    vote_results_path = find_input_file(input_dir, 'vote_results')
+
+    # 1. Find primary sponsor
+    with recorder.stage('assign_bill_primary_sponsors', rows=len(bills)):
+        assign_bill_primary_sponsors(bills, legislators)
+
+    # 2. Count bill and legislator votes over a single read of the vote results
+    sponsor_counts = None
+    with recorder.stage('assign_vote_counts') as stage:
+        if options.engine == 'query':
+            vote_results = iter_csv_dataclasses(filepath=vote_results_path, cls=VoteResults, delimiter=',',
+                                                columns=VOTE_RESULT_COLUMNS)
+            counts = run_vote_reports(build_report_engine(votes, bills), stage.count(vote_results),
+                                      BILL_VOTE_COUNTS, LEGISLATOR_VOTE_COUNTS, SPONSOR_VOTE_COUNTS)
+            apply_report_counts(bills, counts, BILL_VOTE_COUNTS)
+            apply_report_counts(legislators, counts, LEGISLATOR_VOTE_COUNTS)
+            sponsor_counts = list(iter_sponsor_vote_counts(counts, bills, legislators))
+        elif options.engine == 'numpy':
+            vote_results = VoteResultsTable.from_rows(
+                iter_csv_dataclasses(filepath=vote_results_path, cls=VoteResults, delimiter=',', as_tuples=True)
+            )
+            stage.rows = len(vote_results)
+            assign_bill_vote_counts_vectorized(bills, votes, vote_results)
+            assign_legislator_vote_counts_vectorized(legislators, vote_results)
+        elif options.checkpoint_path:
+            stage.rows = assign_vote_counts_incremental(
+                vote_results_path, options.checkpoint_path, bills=bills, votes=votes, legislators=legislators
+            )
+        elif options.workers > 1:
+            tally = tally_vote_results_parallel(vote_results_path, votes=votes, delimiter=',', workers=options.workers)
+            apply_vote_tally(tally, bills=bills, legislators=legislators)
+        else:
+            vote_results = iter_csv_dataclasses(filepath=vote_results_path, cls=VoteResults, delimiter=',',
+                                                columns=VOTE_RESULT_COLUMNS)
+            assign_vote_counts(bills, legislators, votes, stage.count(vote_results))
+
+    # 3. Write both results to CSV files
+    suffix = '.gz' if options.compress else ''
+    rankings = _rankings(options)
+    with recorder.stage('write:bills', rows=len(bills)):
+        write_dataclasses_to_csv(os.path.join(output_dir, BILLS_OUTPUT + suffix),
+                                 _ranked(_table_rows(bills), rankings[0]), Bills)
+    with recorder.stage('write:legislators', rows=len(legislators)):
+        write_dataclasses_to_csv(os.path.join(output_dir, LEGISLATORS_OUTPUT + suffix),
+                                 _ranked(_table_rows(legislators), rankings[1]), Legislators)
+    if sponsor_counts is not None:
+        with recorder.stage('write:sponsors', rows=len(sponsor_counts)):
+            write_dataclasses_to_csv(os.path.join(output_dir, SPONSORS_OUTPUT + suffix), sponsor_counts,
+                                     SponsorVoteCounts)
+    _write_rankings(output_dir, rankings, suffix, recorder)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_pipeline_arguments(parser, 'input-dir')
+    parser.add_argument('--output-dir', default='output', help="Directory for the output CSV files (default: output).")
+    add_pipeline_arguments(parser, 'engine', 'workers', 'checkpoint', 'no-cache', 'gzip', 'report', 'loader', 'backend',
+                           'database', 'lazy', 'top', engines=('python', 'numpy', 'query'))
+    args = parser.parse_args()
+    check_pipeline_arguments(parser, args)
+
+    run_recorder = StageRecorder(enabled=args.report is not None)
+    run_pipeline(input_dir=args.input_dir, output_dir=args.output_dir, options=PipelineOptions(
+        engine=args.engine, workers=args.workers, checkpoint_path=args.checkpoint, use_cache=not args.no_cache,
+        compress=args.gzip, backend=args.backend, database_path=args.database,
+        loader=args.loader, lazy=args.lazy, top=args.top,
+    ), recorder=run_recorder)
+    if args.report:
+        run_recorder.write_report(args.report)
@@ -0,0 +1,6 @@
+"""Docstring for the __init__.py module.
+A local HTTP query service over the bills, legislators and vote results of an input directory.
+Run it with `python -m service --input-dir input --port 8080`.
+"""
+from .index import DatasetIndex, input_state
+from .server import QueryService
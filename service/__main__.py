@@ -0,0 +1,35 @@
+"""
+This script runs the query service over the input files of a directory.
+
+Usage:
+    python -m service [--input-dir input] [--host 127.0.0.1] [--port 8080] [--reload-interval 2.0] [--no-cache]
+
+Example:
+    curl http://127.0.0.1:8080/bills/2952375
+    curl http://127.0.0.1:8080/legislators/904789/votes
+"""
+import argparse
+import asyncio
+import logging
+
+from utils import add_pipeline_arguments
+
+from .server import DEFAULT_RELOAD_INTERVAL, QueryService
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_pipeline_arguments(parser, 'input-dir')
+    parser.add_argument('--host', default='127.0.0.1', help="Address to listen on (default: 127.0.0.1).")
+    parser.add_argument('--port', type=int, default=8080, help="Port to listen on (default: 8080).")
+    parser.add_argument('--reload-interval', type=float, default=DEFAULT_RELOAD_INTERVAL,
+                        help=f"Seconds between checks of the input files, 0 to never reload "
+                             f"(default: {DEFAULT_RELOAD_INTERVAL}).")
+    add_pipeline_arguments(parser, 'no-cache')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    service = QueryService(args.input_dir, reload_interval=args.reload_interval, use_cache=not args.no_cache)
+    try:
+        asyncio.run(service.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
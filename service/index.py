@@ -0,0 +1,138 @@
+"""Docstring for the index.py module.
+This module builds the immutable, fully indexed snapshot of a dataset served by the query service.
+
+A `DatasetIndex` loads the four input tables through the regular models and handlers (primary
+sponsors and vote counts are computed exactly as in `pipeline.py`) and keeps hash indexes on top
+of them:
+    - bills by bill id and legislators by legislator id (the parsed tables themselves);
+    - bill ids by sponsor id;
+    - the vote results of each bill and of each legislator, through a `VoteIndex`.
+
+A snapshot is never modified once built. Reloading builds a new snapshot and swaps the reference,
+so readers always see either the old or the new dataset, never a mix of both.
+Example:
+>>> index = DatasetIndex.load("input")
+>>> index.bills[2952375].supporter_count
+"""
+import functools
+import os
+from dataclasses import asdict, dataclass
+from typing import Iterable, Optional
+
+from handlers import assign_bill_primary_sponsors, assign_vote_counts
+from models import Bills, Legislators, VoteIndex, VoteResults, VoteResultsTable, Votes, VoteType
+from utils import find_input_file, iter_csv_dataclasses, parse_csv_to_dataclass_dict_cached
+
+INPUT_TABLES = ('bills', 'legislators', 'votes', 'vote_results')
+_VOTE_TYPE_NAMES = {member.value: member.name for member in VoteType}
+
+FileState = tuple[tuple[str, int, int], ...]
+
+
+def input_state(input_dir: str) -> FileState:
+    """
+    Returns the identity of the input files, used to detect changes.
+
+    Args:
+        input_dir (str): The directory holding the input CSV files.
+
+    Returns:
+        tuple: The `(name, mtime_ns, size)` of each input file.
+    """
+    state = []
+    for name in INPUT_TABLES:
+        filepath = find_input_file(input_dir, name)
+        stat = os.stat(filepath)
+        state.append((os.path.basename(filepath), stat.st_mtime_ns, stat.st_size))
+    return tuple(state)
+
+
+@dataclass(frozen=True)
+class DatasetIndex:
+    """
+    Represents an immutable snapshot of a dataset with its lookup indexes.
+
+    Attributes:
+        bills (dict[int, Bills]): Bills, with their primary sponsor and vote counts, keyed by bill ID.
+        legislators (dict[int, Legislators]): Legislators, with their vote counts, keyed by legislator ID.
+        votes (dict[int, Votes]): Votes keyed by vote ID.
+        vote_index (VoteIndex): The vote results, indexed by bill and by legislator.
+        bills_by_sponsor (dict[int, list[int]]): The IDs of the bills sponsored by each legislator.
+        state (tuple): The `input_state` of the files the snapshot was built from.
+    """
+    bills: dict[int, Bills]
+    legislators: dict[int, Legislators]
+    votes: dict[int, Votes]
+    vote_index: VoteIndex
+    bills_by_sponsor: dict[int, list[int]]
+    state: FileState
+
+    @classmethod
+    def load(cls, input_dir: str, use_cache: bool = True) -> 'DatasetIndex':
+        """
+        Loads the input tables of a directory and builds every index.
+
+        Args:
+            input_dir (str): The directory holding the input CSV files.
+            use_cache (bool): Whether to reuse the binary cache of the parsed reference tables.
+
+        Returns:
+            DatasetIndex: The new snapshot.
+        """
+        state = input_state(input_dir)
+        load_table = functools.partial(parse_csv_to_dataclass_dict_cached, delimiter=',', enabled=use_cache)
+        bills = load_table(filepath=find_input_file(input_dir, 'bills'), cls=Bills)
+        legislators = load_table(filepath=find_input_file(input_dir, 'legislators'), cls=Legislators)
+        votes = load_table(filepath=find_input_file(input_dir, 'votes'), cls=Votes)
+        vote_results = VoteResultsTable.from_rows(iter_csv_dataclasses(
+            find_input_file(input_dir, 'vote_results'), VoteResults, ',', as_tuples=True
+        ))
+
+        assign_bill_primary_sponsors(bills, legislators)
+        assign_vote_counts(bills, legislators, votes, vote_results)
+
+        bills_by_sponsor: dict[int, list[int]] = {}
+        for bill in bills.values():
+            bills_by_sponsor.setdefault(bill.sponsor_id, []).append(bill.id)
+        return cls(bills, legislators, votes, VoteIndex.build(votes, vote_results), bills_by_sponsor, state)
+
+    def bill(self, bill_id: int) -> Optional[dict]:
+        """Returns the fields of a bill, or None if it doesn't exist."""
+        bill = self.bills.get(bill_id)
+        if bill is None:
+            return None
+        return asdict(bill)
+
+    def legislator(self, legislator_id: int) -> Optional[dict]:
+        """Returns the fields of a legislator and the IDs of the bills they sponsor, or None."""
+        legislator = self.legislators.get(legislator_id)
+        if legislator is None:
+            return None
+        return {**asdict(legislator), 'sponsored_bill_ids': self.bills_by_sponsor.get(legislator_id, [])}
+
+    def sponsored_bills(self, legislator_id: int) -> Optional[list[dict]]:
+        """Returns the bills sponsored by a legislator, or None if the legislator doesn't exist."""
+        if legislator_id not in self.legislators:
+            return None
+        return [asdict(self.bills[bill_id]) for bill_id in self.bills_by_sponsor.get(legislator_id, [])]
+
+    def _votes(self, results: Iterable[tuple[int, int, int]]) -> list[dict]:
+        """Describes `(legislator_id, vote_id, vote_type)` triples."""
+        bill_id_of_vote = self.vote_index.bill_id_of_vote
+        return [
+            {'legislator_id': legislator_id, 'vote_id': vote_id, 'bill_id': bill_id_of_vote(vote_id),
+             'vote_type': _VOTE_TYPE_NAMES.get(vote_type, vote_type)}
+            for legislator_id, vote_id, vote_type in results
+        ]
+
+    def legislator_votes(self, legislator_id: int) -> Optional[list[dict]]:
+        """Returns the votes cast by a legislator, in file order, or None if the legislator doesn't exist."""
+        if legislator_id not in self.legislators:
+            return None
+        return self._votes(self.vote_index.results_for_legislator(legislator_id))
+
+    def bill_votes(self, bill_id: int) -> Optional[list[dict]]:
+        """Returns the vote results of every vote held on a bill, or None if the bill doesn't exist."""
+        if bill_id not in self.bills:
+            return None
+        return self._votes(self.vote_index.results_for_bill(bill_id))
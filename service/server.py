@@ -0,0 +1,228 @@
+"""Docstring for the server.py module.
+This module provides a small asyncio HTTP/1.1 server answering lookups over a `DatasetIndex`.
+
+Routes (GET only, JSON responses):
+    - `/bills/{id}`: a bill, with its primary sponsor and vote counts.
+    - `/bills/{id}/votes`: the vote results of every vote held on a bill.
+    - `/legislators/{id}`: a legislator, with their vote counts and the IDs of the bills they sponsor.
+    - `/legislators/{id}/votes`: the votes cast by a legislator.
+    - `/legislators/{id}/bills`: the bills sponsored by a legislator.
+    - `/health`: the state of the service.
+
+Every lookup is a dict access on the current snapshot. A background task polls the modification
+time and size of the input files; when they change, a new snapshot is built in a worker thread and
+swapped in with a single assignment, while the old one keeps serving requests. If the new snapshot
+can't be built (e.g. a file is being rewritten or holds a malformed row), the old one is kept and
+the load is retried on the next change.
+Example:
+>>> service = QueryService("input")
+>>> asyncio.run(service.serve_forever("127.0.0.1", 8080))
+"""
+import asyncio
+import json
+import logging
+import re
+import time
+from typing import Any, Callable, Optional
+
+from .index import DatasetIndex, input_state
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RELOAD_INTERVAL = 2.0
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+_MAX_HEADERS = 100
+# Number of encoded responses kept per snapshot; the cache is dropped when it is full
+RESPONSE_CACHE_SIZE = 100_000
+
+_ROUTES: list[tuple[re.Pattern, Callable[[DatasetIndex, int], Any]]] = [
+    (re.compile(r'/bills/(\d+)'), DatasetIndex.bill),
+    (re.compile(r'/bills/(\d+)/votes'), DatasetIndex.bill_votes),
+    (re.compile(r'/legislators/(\d+)'), DatasetIndex.legislator),
+    (re.compile(r'/legislators/(\d+)/votes'), DatasetIndex.legislator_votes),
+    (re.compile(r'/legislators/(\d+)/bills'), DatasetIndex.sponsored_bills),
+]
+
+
+class QueryService:  # pylint: disable=too-many-instance-attributes
+    """
+    Represents the query service over the input files of a directory.
+
+    Attributes:
+        input_dir (str): The directory holding the input CSV files.
+        reload_interval (float): Seconds between two checks of the input files; 0 disables reloading.
+        use_cache (bool): Whether to reuse the binary cache of the parsed reference tables.
+        index (DatasetIndex): The snapshot currently served.
+        loaded_at (float): The time the current snapshot was swapped in (`time.time()`).
+    """
+
+    def __init__(self, input_dir: str, reload_interval: float = DEFAULT_RELOAD_INTERVAL, use_cache: bool = True):
+        self.input_dir = input_dir
+        self.reload_interval = reload_interval
+        self.use_cache = use_cache
+        self.index = DatasetIndex.load(input_dir, use_cache)
+        self.loaded_at = time.time()
+        self._responses: tuple[DatasetIndex, dict[str, tuple[int, bytes]]] = (self.index, {})
+        self._watcher: Optional[asyncio.Task] = None
+        # The input state a reload last failed on, not retried until the files change again
+        self._failed_state = None
+
+    def query(self, path: str) -> tuple[int, Any]:
+        """
+        Answers a request path from the current snapshot.
+
+        Args:
+            path (str): The request target, e.g. `/bills/2952375`. Any query string is ignored.
+
+        Returns:
+            tuple[int, Any]: The HTTP status and the JSON-serializable payload.
+        """
+        path = path.split('?', 1)[0].rstrip('/')
+        index = self.index  # A single read, so the whole answer comes from one snapshot
+        if path == '/health':
+            return 200, {'status': 'ok', 'loaded_at': self.loaded_at,
+                         'bills': len(index.bills), 'legislators': len(index.legislators),
+                         'vote_results': len(index.vote_index.vote_results)}
+        for pattern, lookup in _ROUTES:
+            match = pattern.fullmatch(path)
+            if match:
+                payload = lookup(index, int(match.group(1)))
+                if payload is None:
+                    return 404, {'error': f"{path} not found"}
+                return 200, payload
+        return 404, {'error': f"unknown route {path}"}
+
+    def respond(self, path: str) -> tuple[int, bytes]:
+        """
+        Answers a request path with an encoded JSON body.
+
+        Snapshots are immutable, so encoded bodies are cached per snapshot: large answers such as
+        the votes of a legislator are only serialized once.
+
+        Args:
+            path (str): The request target.
+
+        Returns:
+            tuple[int, bytes]: The HTTP status and the JSON body.
+        """
+        index, responses = self._responses
+        if index is not self.index:
+            index, responses = self.index, {}
+            self._responses = (index, responses)
+        response = responses.get(path)
+        if response is None:
+            status, payload = self.query(path)
+            response = status, json.dumps(payload).encode()
+            if len(responses) >= RESPONSE_CACHE_SIZE:
+                responses.clear()
+            responses[path] = response
+        return response
+
+    async def reload_if_changed(self) -> bool:
+        """
+        Rebuilds the snapshot in a worker thread if the input files changed, and swaps it in.
+
+        If the rebuild fails, whatever the error, the current snapshot is kept and the files are not
+        loaded again until they change once more.
+
+        Returns:
+            bool: True if a new snapshot was swapped in.
+        """
+        try:
+            state = input_state(self.input_dir)
+        except OSError:
+            return False  # A file is being replaced; check again later
+        if state in (self.index.state, self._failed_state):
+            return False
+        try:
+            index = await asyncio.get_running_loop().run_in_executor(
+                None, DatasetIndex.load, self.input_dir, self.use_cache
+            )
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            self._failed_state = state
+            logger.warning("Keeping the current snapshot, reloading %s failed: %r", self.input_dir, error)
+            return False
+        self.index, self.loaded_at = index, time.time()
+        logger.info("Reloaded %s", self.input_dir)
+        return True
+
+    async def _watch(self, server: asyncio.Server):
+        """Checks the input files for changes every `reload_interval` seconds, while the server is open."""
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            if not server.is_serving():
+                break
+            try:
+                await self.reload_if_changed()
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Checking %s for changes failed", self.input_dir)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serves the requests of one connection, keeping it open between requests when allowed."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                for _ in range(_MAX_HEADERS):
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip().lower()
+                if int(headers.get('content-length', 0) or 0):
+                    await reader.readexactly(int(headers['content-length']))
+
+                parts = request_line.decode('latin-1').split()
+                if len(parts) != 3:
+                    status, body = 400, b'{"error": "malformed request line"}'
+                elif parts[0] not in ('GET', 'HEAD'):
+                    status, body = 405, json.dumps({'error': f"method {parts[0]} not allowed"}).encode()
+                else:
+                    status, body = self.respond(parts[1])
+
+                keep_alive = len(parts) == 3 and (
+                    headers.get('connection') == 'keep-alive' if parts[2] == 'HTTP/1.0'
+                    else headers.get('connection') != 'close'
+                )
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                    .encode() + (body if parts[:1] != ['HEAD'] else b'')
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8080) -> asyncio.Server:
+        """
+        Starts listening and, if enabled, watching the input files.
+
+        Args:
+            host (str): The address to listen on.
+            port (int): The port to listen on; 0 picks a free port.
+
+        Returns:
+            asyncio.Server: The listening server.
+        """
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        if self.reload_interval > 0:
+            self._watcher = asyncio.create_task(self._watch(server))
+        return server
+
+    async def serve_forever(self, host: str = '127.0.0.1', port: int = 8080):
+        """
+        Serves requests until cancelled.
+
+        Args:
+            host (str): The address to listen on.
+            port (int): The port to listen on.
+        """
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
@@ -0,0 +1,130 @@
+"""
+This module contains test cases for the query service in `service`.
+
+Test functions include:
+- `test_query_routes`: Tests the answers of each route, including unknown IDs and routes.
+- `test_http_keep_alive`: Tests several requests over one HTTP connection.
+- `test_reload_swaps_snapshot`: Tests that changed input files are picked up atomically.
+- `test_failed_reload_waits_for_next_change`: Tests that a failed reload, whatever its error, is only retried on change.
+"""
+import asyncio
+import json
+import os
+
+from service import DatasetIndex, QueryService
+
+
+def test_query_routes(input_dir):
+    """
+    Test case for every route over a small dataset.
+
+    Simulates:
+    - Bill 101 (sponsored by Alice) and its votes, bill 102 (unknown sponsor), Bob's votes and missing IDs.
+    """
+    service = QueryService(str(input_dir), reload_interval=0, use_cache=False)
+
+    assert service.query('/bills/101') == (200, {
+        'id': 101, 'title': "Education Reform Act", 'sponsor_id': 1, 'primary_sponsor': "Alice",
+        'supporter_count': 1, 'opposer_count': 1,
+    })
+    assert service.query('/bills/102')[1]['primary_sponsor'] == "Unknown"
+    assert service.query('/legislators/1')[1]['sponsored_bill_ids'] == [101]
+    assert service.query('/legislators/2/votes') == (200, [
+        {'legislator_id': 2, 'vote_id': 201, 'bill_id': 101, 'vote_type': 'AGAINST'},
+        {'legislator_id': 2, 'vote_id': 202, 'bill_id': 102, 'vote_type': 'FOR'},
+    ])
+    assert [vote['legislator_id'] for vote in service.query('/bills/101/votes')[1]] == [1, 2]
+    assert [bill['id'] for bill in service.query('/legislators/1/bills')[1]] == [101]
+    assert service.query('/bills/999')[0] == 404
+    assert service.query('/legislators/3/votes')[0] == 404
+    assert service.query('/unknown')[0] == 404
+
+
+def test_http_keep_alive(input_dir):
+    """
+    Test case for an HTTP client sending two requests over one connection.
+
+    Simulates:
+    - A GET of bill 101 followed by a GET of a missing legislator.
+    """
+    service = QueryService(str(input_dir), reload_interval=0, use_cache=False)
+
+    async def exchange():
+        server = await service.start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        responses = []
+        for path in ('/bills/101', '/legislators/9'):
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+            status = (await reader.readline()).split()[1]
+            headers = {}
+            while (line := await reader.readline()) != b'\r\n':
+                name, _, value = line.decode().partition(':')
+                headers[name.lower()] = value.strip()
+            body = await reader.readexactly(int(headers['content-length']))
+            responses.append((int(status), json.loads(body)))
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return responses
+
+    responses = asyncio.run(exchange())
+
+    assert responses[0] == (200, service.query('/bills/101')[1])
+    assert responses[1][0] == 404
+
+
+def test_reload_swaps_snapshot(input_dir):
+    """
+    Test case where a vote result is appended while the service is running.
+
+    Simulates:
+    - Alice voting for bill 102, then a failed reload of a corrupted file keeping the last snapshot.
+    """
+    service = QueryService(str(input_dir), reload_interval=0, use_cache=False)
+    assert service.query('/bills/102')[1]['supporter_count'] == 1
+    assert not asyncio.run(service.reload_if_changed())
+
+    with open(input_dir / "vote_results.csv", "a", encoding="utf-8") as file:
+        file.write("4,1,202,1\n")
+    assert asyncio.run(service.reload_if_changed())
+    assert service.query('/bills/102')[1]['supporter_count'] == 2
+    assert service.respond('/bills/102')[1] == json.dumps(service.query('/bills/102')[1]).encode()
+
+    with open(input_dir / "vote_results.csv", "a", encoding="utf-8") as file:
+        file.write("5,1,202,not-a-vote-type\n")
+    os.utime(input_dir / "vote_results.csv", ns=(0, 0))
+    assert not asyncio.run(service.reload_if_changed())
+    assert service.query('/bills/102')[1]['supporter_count'] == 2
+
+
+def test_failed_reload_waits_for_next_change(input_dir, monkeypatch):
+    """
+    Test case where the input files are changed to a state that can't be loaded, then fixed.
+
+    Simulates:
+    - A short row appended to legislators.csv, two polls of the unchanged broken files, an unexpected
+      error while loading, and the files fixed again.
+    """
+    service = QueryService(str(input_dir), reload_interval=0, use_cache=False)
+    loads = []
+    load = DatasetIndex.load
+    monkeypatch.setattr(DatasetIndex, "load", lambda *args: loads.append(args) or load(*args))
+
+    legislators = (input_dir / "legislators.csv").read_text(encoding="utf-8")
+    (input_dir / "legislators.csv").write_text(legislators + "999\n", encoding="utf-8")
+    assert not asyncio.run(service.reload_if_changed())
+    assert not asyncio.run(service.reload_if_changed())
+    assert len(loads) == 1
+
+    def fail(*_):
+        raise RuntimeError("unexpected")
+
+    monkeypatch.setattr(DatasetIndex, "load", fail)
+    (input_dir / "legislators.csv").write_text(legislators + "3,Carol\n", encoding="utf-8")
+    assert not asyncio.run(service.reload_if_changed())
+
+    monkeypatch.setattr(DatasetIndex, "load", load)
+    os.utime(input_dir / "legislators.csv", ns=(0, 0))
+    assert asyncio.run(service.reload_if_changed())
+    assert service.query('/legislators/3')[0] == 200
@@ -1,4 +1,16 @@
 """Docstring for the __init__.py module.
 """
-from .csv_reader import parse_csv_to_dataclass_dict
-from .csv_writer import write_objects_to_csv
+from .csv_reader import iter_csv_dataclasses, parse_csv_to_dataclass_dict, project_dataclass, warm_converter_plan
+from .csv_writer import write_dataclasses_to_csv, write_objects_to_csv
+from .csv_shards import iter_csv_shard, split_csv_into_shards
+from .checkpoint_store import VoteCountCheckpoint, fingerprint_prefix, load_checkpoint, prefix_digest, save_checkpoint
+from .table_cache import evict_cache, parse_csv_to_dataclass_dict_cached
+from .instrumentation import StageMetrics, StageRecorder
+from .sqlite_store import DEFAULT_DATABASE_PATH, SQLITE_TABLES, load_csvs_into_sqlite, open_sqlite_store
+from .table_loader import EXECUTORS, TableLoad, load_tables
+from .query_engine import Aggregate, Join, QueryEngine, QueryPlan
+from .input_formats import InputFormat, detect_input_format, find_input_file, open_input_text
+from .spill_store import DEFAULT_MEMORY_BUDGET, DEFAULT_PARTITIONS, SpillPartitions
+from .lazy_table import LazyTable
+from .top_k import Ranking, TopK
+from .cli import ENGINES, add_pipeline_arguments, check_pipeline_arguments, positive_int
@@ -0,0 +1,159 @@
+"""Docstring for the checkpoint_store.py module.
+This module persists the state of an incremental aggregation over an append-only CSV file.
+
+A `VoteCountCheckpoint` records how much of the file has already been consumed (byte offset
+and row count), a SHA-256 fingerprint of that whole prefix, and the per-bill and per-legislator
+counts aggregated so far. It is stored as JSON and written atomically, so an interrupted run
+never leaves a half-written checkpoint behind.
+
+Checking the prefix reads it once; the digest it leaves can be extended with the appended bytes
+to fingerprint the next checkpoint, so the history is hashed once per run.
+Example:
+>>> checkpoint = load_checkpoint("output/vote_counts.checkpoint.json")
+>>> if checkpoint is None or not checkpoint.matches("input/vote_results.csv"):
+...     ...  # full rebuild
+"""
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass
+from typing import Any, Optional
+
+# Size of the blocks read while hashing a prefix
+FINGERPRINT_CHUNK = 1024 ** 2
+
+
+def prefix_digest(filepath: str, end: int, digest: Optional[Any] = None, start: int = 0) -> Any:
+    """
+    Feeds bytes `start` to `end` of a file to a SHA-256 digest, reading them in `FINGERPRINT_CHUNK` blocks.
+
+    Args:
+        filepath (str): The path to the file.
+        end (int): The offset after the last byte to hash.
+        digest (hashlib._Hash | None): A digest of the bytes before `start` to extend, or None to start a new one.
+        start (int): The offset of the first byte to hash.
+
+    Returns:
+        hashlib._Hash: The extended digest.
+    """
+    digest = digest or hashlib.sha256()
+    with open(filepath, 'rb') as file:
+        file.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = file.read(min(remaining, FINGERPRINT_CHUNK))
+            if not chunk:
+                break
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest
+
+
+def fingerprint_prefix(filepath: str, offset: int) -> str:
+    """
+    Hashes the first `offset` bytes of a file.
+
+    Every byte is hashed, so rewriting any consumed row, including one in the middle of a long
+    history, is detected.
+
+    Args:
+        filepath (str): The path to the file.
+        offset (int): The length of the prefix.
+
+    Returns:
+        str: The hex digest of the prefix fingerprint.
+    """
+    return prefix_digest(filepath, offset).hexdigest()
+
+
+@dataclass
+class VoteCountCheckpoint:
+    """
+    Represents the persisted state of an incremental vote count.
+
+    Attributes:
+        offset (int): Byte offset of the end of the last consumed row.
+        row_count (int): Number of vote result rows consumed so far.
+        prefix_fingerprint (str): Fingerprint of the first `offset` bytes, see `fingerprint_prefix`.
+        votes_fingerprint (str | None): Fingerprint of the vote -> bill mapping used for the bill counts.
+        bill_counts (dict[int, list[int]] | None): `[supporter_count, opposer_count]` keyed by bill ID,
+            or None if bills were not counted.
+        legislator_counts (dict[int, list[int]] | None): `[num_supported_bills, num_opposed_bills]` keyed
+            by legislator ID, or None if legislators were not counted.
+    """
+    offset: int
+    row_count: int
+    prefix_fingerprint: str
+    votes_fingerprint: Optional[str] = None
+    bill_counts: Optional[dict[int, list[int]]] = None
+    legislator_counts: Optional[dict[int, list[int]]] = None
+
+    def matches(self, filepath: str) -> bool:
+        """
+        Checks that the consumed prefix of the file is unchanged.
+
+        Args:
+            filepath (str): The path to the append-only file.
+
+        Returns:
+            bool: False if the file shrank or its prefix fingerprint changed.
+        """
+        return self.verify_prefix(filepath) is not None
+
+    def verify_prefix(self, filepath: str) -> Optional[Any]:
+        """
+        Hashes the consumed prefix of the file and checks it against the fingerprint.
+
+        Args:
+            filepath (str): The path to the append-only file.
+
+        Returns:
+            hashlib._Hash | None: The digest of the prefix, to extend with the bytes appended after it
+            (see `prefix_digest`), or None if the file shrank or its prefix changed.
+        """
+        if os.path.getsize(filepath) < self.offset:
+            return None
+        digest = prefix_digest(filepath, self.offset)
+        return digest if digest.hexdigest() == self.prefix_fingerprint else None
+
+
+def _int_keys(counts: Optional[dict]) -> Optional[dict[int, list[int]]]:
+    """Converts the string keys produced by JSON back into integer ids."""
+    if counts is None:
+        return None
+    return {int(key): value for key, value in counts.items()}
+
+
+def load_checkpoint(path: str) -> Optional[VoteCountCheckpoint]:
+    """
+    Loads a checkpoint from disk.
+
+    Args:
+        path (str): The path to the checkpoint JSON file.
+
+    Returns:
+        VoteCountCheckpoint | None: The checkpoint, or None if the file doesn't exist or can't be read.
+    """
+    try:
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+        data['bill_counts'] = _int_keys(data.get('bill_counts'))
+        data['legislator_counts'] = _int_keys(data.get('legislator_counts'))
+        return VoteCountCheckpoint(**data)
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def save_checkpoint(path: str, checkpoint: VoteCountCheckpoint):
+    """
+    Atomically writes a checkpoint to disk.
+
+    Args:
+        path (str): The path to the checkpoint JSON file.
+        checkpoint (VoteCountCheckpoint): The checkpoint to write.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile('w', dir=directory, suffix='.tmp', delete=False, encoding='utf-8') as file:
+        json.dump(asdict(checkpoint), file)
+    os.replace(file.name, path)
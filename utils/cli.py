@@ -0,0 +1,105 @@
+"""Docstring for the cli.py module.
+This module declares the command-line options shared by the scripts of this repository.
+
+`bills_with_count.py`, `legislator_with_count.py`, `pipeline.py`, `vote_lookup.py`,
+`legislator_similarity.py`, `python -m service` and `python -m batch` accept overlapping subsets
+of the same options. `add_pipeline_arguments` adds the named options with a single spelling, help
+text and default, and `check_pipeline_arguments` rejects the combinations the counting engines
+don't support.
+
+Example:
+>>> parser = argparse.ArgumentParser()
+>>> add_pipeline_arguments(parser, 'engine', 'workers', 'checkpoint', 'no-cache')
+>>> args = parser.parse_args(['--workers', '4'])
+>>> check_pipeline_arguments(parser, args)
+"""
+import argparse
+from typing import Any, Sequence
+
+from .sqlite_store import DEFAULT_DATABASE_PATH
+from .table_loader import EXECUTORS
+
+ENGINES = ('python', 'numpy')
+
+
+def positive_int(value: str) -> int:
+    """
+    Parses a command-line integer that must be at least 1.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not an integer or is less than 1.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+_ARGUMENTS: dict[str, dict[str, Any]] = {
+    'input-dir': {'default': 'input', 'help': "Directory with the input CSV files (default: input)."},
+    'engine': {'default': 'python', 'help': "Vote counting engine to use (default: python)."},
+    'workers': {'type': positive_int, 'default': 1,
+                'help': "Number of processes counting vote results with the python engine (default: 1)."},
+    'checkpoint': {'metavar': 'PATH',
+                   'help': "Checkpoint file enabling incremental counting of appended vote results."},
+    'no-cache': {'action': 'store_true', 'help': "Always parse the input CSV files."},
+    'gzip': {'action': 'store_true', 'help': "Write gzip-compressed output files."},
+    'report': {'metavar': 'PATH', 'help': "Write a JSON report with the measures of each stage."},
+    'loader': {'choices': EXECUTORS, 'default': 'serial',
+               'help': "How the bills, legislators and votes tables are loaded (default: serial)."},
+    'backend': {'choices': ('memory', 'sqlite'), 'default': 'memory',
+                'help': "Where the tables are joined and counted (default: memory)."},
+    'database': {'default': DEFAULT_DATABASE_PATH,
+                 'help': f"SQLite database used by the sqlite backend (default: {DEFAULT_DATABASE_PATH})."},
+    'lazy': {'action': 'store_true',
+             'help': "Convert the rows of the bills and legislators tables only when they are accessed."},
+    'top': {'type': positive_int, 'metavar': 'K',
+            'help': "Also write the top K bills and legislators of each ranking report."},
+}
+
+
+def add_pipeline_arguments(parser: argparse.ArgumentParser, *names: str, engines: Sequence[str] = ENGINES):
+    """
+    Adds shared options to a parser, in the given order.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser of a script.
+        *names (str): The options to add, without their leading `--`: `input-dir`, `engine`, `workers`,
+            `checkpoint`, `no-cache`, `gzip`, `report`, `loader`, `backend`, `database`, `lazy` or `top`.
+        engines (Sequence[str]): The choices of `--engine`.
+
+    Raises:
+        ValueError: If a name is not a shared option.
+    """
+    unknown = [name for name in names if name not in _ARGUMENTS]
+    if unknown:
+        raise ValueError(f"Unknown pipeline arguments {unknown}")
+    for name in names:
+        options = dict(_ARGUMENTS[name])
+        if name == 'engine':
+            options['choices'] = tuple(engines)
+        parser.add_argument(f'--{name}', **options)
+
+
+def check_pipeline_arguments(parser: argparse.ArgumentParser, args: argparse.Namespace):
+    """
+    Exits with a usage error if the parsed options combine counting options that don't work together.
+
+    Options the script doesn't declare are read as their defaults.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser the options were parsed with, used to report the error.
+        args (argparse.Namespace): The parsed options.
+    """
+    engine = getattr(args, 'engine', 'python')
+    workers = getattr(args, 'workers', 1)
+    checkpoint = getattr(args, 'checkpoint', None)
+    if getattr(args, 'backend', 'memory') == 'sqlite' and (workers > 1 or engine != 'python' or checkpoint):
+        parser.error("--backend sqlite does not support --engine, --workers or --checkpoint")
+    if workers > 1 and engine != 'python':
+        parser.error("--workers is only supported with the python engine")
+    if checkpoint and (workers > 1 or engine != 'python'):
+        parser.error("--checkpoint is only supported with the python engine and a single worker")
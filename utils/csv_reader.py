@@ -1,9 +1,20 @@
 """ Docstring for the csv_reader.py module.
-This module provides a utility function for parsing CSV files into lists of dataclass instances.
+This module provides utility functions for parsing CSV files into dataclass instances.
 
 It is particularly useful for reading structured data from CSV files and automatically mapping
 that data into typed Python dataclasses, with basic support for type conversion of standard
-primitive types (int, float, bool, str).
+primitive types (int, float, bool, str), ISO 8601 dates and datetimes, and `Optional` fields,
+whose empty cells become None. Files may be compressed (gzip, bz2, xz) or JSON Lines, which are
+detected and decoded on the fly by `utils.input_formats`.
+
+Two entry points are available:
+    - `parse_csv_to_dataclass_dict` loads the whole file into a dict keyed by the `id` field.
+    - `iter_csv_dataclasses` streams the file, yielding one instance (or one plain tuple of
+      converted values) at a time, so tables that are never looked up by id can be processed
+      in constant memory.
+
+Both accept a column projection: only the listed fields are converted and stored, in instances of
+a dataclass built by `project_dataclass` with just those fields.
 Example:
 >>> @dataclass
 ... class Person:
@@ -14,16 +25,337 @@ Example:
 >>> people = parse_csv_to_dataclass_dict("people.csv", Person, delimiter=",")
 >>> print(people[0].name)
 John Doe
+>>> for person in iter_csv_dataclasses("people.csv", Person, delimiter=","):
+...     print(person.name)
+John Doe
 """
-import csv
+import datetime
 import enum
-from dataclasses import fields, is_dataclass
-from typing import Type, TypeVar
+import functools
+import os
+import typing
+from dataclasses import MISSING, dataclass, field, fields, is_dataclass, make_dataclass
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence, Type, TypeVar, Union
+
+from .input_formats import detect_input_format, iter_input_rows, open_input_text
 
 T = TypeVar('T')
 
 
-def parse_csv_to_dataclass_dict(filepath: str, cls: Type[T], delimiter: str) -> dict[int, T]:
+def _parse_bool(value: str) -> bool:
+    """Converts a CSV cell to `bool`, accepting 'true', '1' or 'yes' (case-insensitive) as True."""
+    return value.lower() in ('true', '1', 'yes')
+
+
+def _enum_converter(enum_cls: Type[enum.Enum]) -> Callable[[str], enum.Enum]:
+    """
+    Builds a converter for an enum field, resolving the member lookup ahead of time.
+
+    Args:
+        enum_cls (Type[enum.Enum]): The enum type declared by the dataclass field.
+
+    Returns:
+        Callable[[str], enum.Enum]: A function mapping the integer value of a cell to its enum member.
+    """
+    members = {member.value: member for member in enum_cls}
+
+    def convert(value: str) -> enum.Enum:
+        try:
+            return members[int(value)]
+        except KeyError:
+            raise ValueError(f"{value!r} is not a valid {enum_cls.__name__}") from None
+
+    return convert
+
+
+def _unwrap_optional(field_type: Any) -> tuple[Any, bool]:
+    """
+    Splits an `Optional[X]` annotation into `X` and whether it was optional.
+
+    Args:
+        field_type (Any): The type annotation of a dataclass field.
+
+    Returns:
+        tuple[Any, bool]: The annotation without `None`, and True if `None` was allowed.
+    """
+    if typing.get_origin(field_type) is Union:
+        args = [arg for arg in typing.get_args(field_type) if arg is not type(None)]
+        if len(args) == 1 and len(typing.get_args(field_type)) == 2:
+            return args[0], True
+    return field_type, False
+
+
+def _optional_converter(convert: Callable[[str], Any]) -> Callable[[str], Any]:
+    """Wraps a converter so that empty cells become None."""
+
+    def convert_optional(value: str) -> Any:
+        return convert(value) if value else None
+
+    return convert_optional
+
+
+_CONVERTERS: dict[Any, Callable[[str], Any]] = {
+    int: int,
+    float: float,
+    bool: _parse_bool,
+    datetime.date: datetime.date.fromisoformat,
+    datetime.datetime: datetime.datetime.fromisoformat,
+}
+
+
+def _field_converter(field_type: Any) -> Callable[[str], Any]:
+    """
+    Returns the callable used to convert a raw CSV cell into the declared field type.
+
+    Args:
+        field_type (Any): The type annotation of the dataclass field.
+
+    Returns:
+        Callable[[str], Any]: The converter; unknown types keep the raw string.
+    """
+    field_type, optional = _unwrap_optional(field_type)
+    if optional:
+        return _optional_converter(_field_converter(field_type))
+    if isinstance(field_type, type) and issubclass(field_type, enum.Enum):
+        return _enum_converter(field_type)
+    return _CONVERTERS.get(field_type, str)
+
+
+@dataclass(frozen=True)
+class _ConverterPlan:
+    """
+    Precompiled conversion steps for one (dataclass, CSV header) pair.
+
+    Attributes:
+        cls (type): The dataclass the plan builds.
+        names (tuple[str, ...]): The dataclass fields present in the header, in field order.
+        types (tuple[Any, ...]): The declared type of each field in `names`.
+        columns (tuple[tuple[int, Callable], ...]): The CSV column index and converter of each field.
+        positional (bool): Whether `names` is a prefix of the dataclass fields, allowing
+            instances to be built with positional arguments.
+    """
+    cls: type
+    names: tuple[str, ...]
+    types: tuple[Any, ...]
+    columns: tuple[tuple[int, Callable[[str], Any]], ...]
+    positional: bool
+
+    def convert(self, row: list[str]) -> list[Any]:
+        """
+        Converts the cells of a CSV row into the values of the planned fields.
+
+        Args:
+            row (list[str]): The CSV row as returned by `csv.reader`.
+
+        Returns:
+            list[Any]: The converted values, in the same order as `names`.
+        """
+        try:
+            return [convert(row[index]) for index, convert in self.columns]
+        except Exception:  # pylint: disable=broad-exception-caught
+            self._raise_conversion_error(row)
+            raise
+
+    def build(self, values: list[Any]) -> Any:
+        """
+        Instantiates the dataclass from values produced by `convert`.
+
+        Args:
+            values (list[Any]): The converted values, in the same order as `names`.
+
+        Returns:
+            Any: The dataclass instance.
+        """
+        if self.positional:
+            return self.cls(*values)
+        return self.cls(**dict(zip(self.names, values)))
+
+    def iter_converted(self, rows: Iterable[list[str]], as_tuples: bool = False) -> Iterator[Any]:
+        """
+        Converts CSV rows one at a time, skipping blank lines.
+
+        Args:
+            rows (Iterable[list[str]]): The CSV rows following the header the plan was built from.
+            as_tuples (bool): If True, yields plain tuples of the converted values instead of instances.
+
+        Yields:
+            Any: A dataclass instance, or a tuple of values, for each non-blank row.
+        """
+        convert = self.convert
+        for row in rows:
+            if not row:
+                continue
+            if as_tuples:
+                yield tuple(convert(row))
+            else:
+                yield self.build(convert(row))
+
+    def _raise_conversion_error(self, row: list[str]):
+        """Re-runs the conversion cell by cell to report which field is missing or could not be converted."""
+        for name, field_type, (index, convert) in zip(self.names, self.types, self.columns):
+            if index >= len(row):
+                raise ValueError(f"missing value for {name!r}")
+            try:
+                convert(row[index])
+            except Exception as e:
+                raise ValueError(f"Error converting field '{name}' to {field_type}: {e}") from e
+
+
+def _rebuild_projected(cls: type, columns: tuple[str, ...], values: tuple) -> Any:
+    """Unpickles an instance of a projected dataclass, projecting `cls` again in this process if needed."""
+    return _project_dataclass(cls, columns)(**dict(zip(columns, values)))
+
+
+@functools.lru_cache(maxsize=None)
+def _project_dataclass(cls: type, columns: tuple[str, ...]) -> type:
+    """Builds (once per dataclass and columns) the dataclass holding only `columns`, with their defaults."""
+    cls_fields = {f.name: f for f in fields(cls)}
+    unknown = [column for column in columns if column not in cls_fields]
+    if unknown:
+        raise ValueError(f"{cls.__name__} has no fields {unknown}")
+    required = [cls_fields[column].default is MISSING and cls_fields[column].default_factory is MISSING
+                for column in columns]
+    specs = []
+    for position, column in enumerate(columns):
+        original = cls_fields[column]
+        # A default followed by a required field can't be positional; such fields become keyword-only
+        kw_only = not required[position] and any(required[position + 1:])
+        spec = field(  # pylint: disable=invalid-field-call
+            default=original.default, default_factory=original.default_factory, kw_only=kw_only
+        )
+        specs.append((column, original.type, spec))
+
+    def reduce(row) -> tuple:
+        # Generated classes can't be looked up by name, so their instances are pickled by projection instead
+        return _rebuild_projected, (cls, columns, tuple(getattr(row, column) for column in columns))
+
+    projected = make_dataclass(f"{cls.__name__}__{'__'.join(columns)}", specs, slots=True,
+                               namespace={'__reduce__': reduce})
+    projected.__module__ = __name__
+    return projected
+
+
+def project_dataclass(cls: type, columns: Optional[Sequence[str]]) -> type:
+    """
+    Returns a dataclass with only the given fields of `cls`, in the given order.
+
+    The same class is returned for the same dataclass and columns, so it can be used as a cache key.
+
+    Args:
+        cls (type): The dataclass to project.
+        columns (Sequence[str] | None): The names of the fields to keep; None keeps `cls` as is.
+
+    Returns:
+        type: The projected dataclass, or `cls` when `columns` is None.
+
+    Raises:
+        ValueError: If `cls` is not a dataclass or has no field with one of the names.
+    """
+    if not is_dataclass(cls):
+        raise ValueError(f"{cls} must be a dataclass type")
+    if columns is None:
+        return cls
+    return _project_dataclass(cls, tuple(columns))
+
+
+@functools.lru_cache(maxsize=None)
+def _build_converter_plan(cls: type, header: tuple[str, ...]) -> _ConverterPlan:
+    """
+    Builds (once per dataclass and header) the plan used to convert CSV rows.
+
+    Args:
+        cls (type): The dataclass type to instantiate from each CSV row.
+        header (tuple[str, ...]): The column names found in the first line of the CSV file.
+
+    Returns:
+        _ConverterPlan: The cached conversion plan.
+    """
+    header_index = {name: index for index, name in enumerate(header)}
+    cls_fields = [f for f in fields(cls) if f.name in header_index]
+    names = tuple(f.name for f in cls_fields)
+    return _ConverterPlan(
+        cls=cls,
+        names=names,
+        types=tuple(f.type for f in cls_fields),
+        columns=tuple((header_index[f.name], _field_converter(f.type)) for f in cls_fields),
+        positional=names == tuple(f.name for f in fields(cls) if not f.kw_only)[:len(names)],
+    )
+
+
+def warm_converter_plan(
+    filepath: str,
+    cls: type,
+    delimiter: str,
+    columns: Optional[Sequence[str]] = None
+):
+    """
+    Reads the header of a file and builds its conversion plan ahead of the first parse.
+
+    Plans are cached per process, so a long-lived worker that parses many files sharing a header
+    (e.g. the same table of many datasets) resolves the converters of its fields once. Missing or
+    empty files are skipped.
+
+    Args:
+        filepath (str): The path to the file, in any format read by `iter_csv_dataclasses`.
+        cls (type): The dataclass type describing the columns of each row.
+        delimiter (str): The delimiter used in the CSV file.
+        columns (Sequence[str] | None): The projection the file will be parsed with, if any.
+    """
+    cls = project_dataclass(cls, columns)
+    if not os.path.exists(filepath):
+        return
+    input_format = detect_input_format(filepath)
+    with open_input_text(filepath, input_format) as textfile:
+        header = next(iter_input_rows(textfile, input_format, delimiter), None)
+    if header is not None:
+        _build_converter_plan(cls, tuple(header))
+
+
+def iter_csv_dataclasses(
+    filepath: str,
+    cls: Type[T],
+    delimiter: str,
+    as_tuples: bool = False,
+    columns: Optional[Sequence[str]] = None
+) -> Iterator[Union[T, tuple]]:
+    """
+    Lazily parses a CSV file, yielding one converted row at a time.
+
+    Type conversion follows the same rules as `parse_csv_to_dataclass_dict`. Only one row is
+    held in memory at any time, which makes this suitable for very large tables such as
+    `vote_results.csv` that are only ever iterated over. Compressed files and JSON Lines files
+    are decoded on the fly (see `utils.input_formats`).
+
+    Args:
+        filepath (str): The path to the CSV file to read, optionally gzip, bz2 or xz compressed, or
+            to a JSON Lines file.
+        cls (Type[T]): The dataclass type describing the columns of each CSV row.
+        delimiter (str): The delimiter used in the CSV file (e.g., ',', ';', '\t').
+        as_tuples (bool): If True, yields plain tuples of the converted values in the
+            dataclass field order instead of dataclass instances.
+        columns (Sequence[str] | None): If given, only these fields are converted, and rows are
+            instances of `project_dataclass(cls, columns)` (or tuples in the order of `columns`).
+
+    Yields:
+        T | tuple: A dataclass instance, or a tuple of values, for each CSV row.
+    """
+    cls = project_dataclass(cls, columns)
+
+    input_format = detect_input_format(filepath)
+    with open_input_text(filepath, input_format) as textfile:
+        reader = iter_input_rows(textfile, input_format, delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        yield from _build_converter_plan(cls, tuple(header)).iter_converted(reader, as_tuples)
+
+
+def parse_csv_to_dataclass_dict(
+    filepath: str,
+    cls: Type[T],
+    delimiter: str,
+    columns: Optional[Sequence[str]] = None
+) -> dict[int, T]:
     """
     Parses a CSV file into a list of instances of the given dataclass.
 
@@ -32,44 +364,23 @@ def parse_csv_to_dataclass_dict(filepath: str, cls: Type[T], delimiter: str) ->
 
     The function supports basic type conversion for `int`, `float`, `bool`, and `str`.
     Boolean fields are considered `True` if the value is one of: 'true', '1', or 'yes'
-    (case-insensitive); otherwise, they are `False`.
+    (case-insensitive); otherwise, they are `False`. The conversion plan is resolved once per
+    dataclass and CSV header and then reused, so repeated loads of the same table don't pay
+    for type dispatch again.
 
     Args:
         filepath (str): The path to the CSV file to read.
         cls (Type[T]): The dataclass type to instantiate from each CSV row.
         delimiter (str): The delimiter used in the CSV file (e.g., ',', ';', '\t').
+        columns (Sequence[str] | None): If given, only these fields (which must include `id`) are
+            converted and stored, in instances of `project_dataclass(cls, columns)`.
 
     Returns:
         dict[int, T]: A dict of dataclass instances created from the CSV data.
     """
-    if not is_dataclass(cls):
-        raise ValueError(f"{cls} must be a dataclass type")
-
-    with open(filepath, newline='', encoding='utf-8') as csvfile:
-        reader = csv.DictReader(csvfile, delimiter=delimiter)
-        result = {}
-        cls_fields = {f.name: f.type for f in fields(cls)}
-
-        for row in reader:
-            kwargs = {}
-            for key, value in row.items():
-                if key in cls_fields:
-                    field_type = cls_fields[key]
-                    try:
-                        if isinstance(field_type, type) and issubclass(field_type, enum.Enum):
-                            kwargs[key] = field_type(int(value))
-                        elif field_type == int:
-                            kwargs[key] = int(value)
-                        elif field_type == float:
-                            kwargs[key] = float(value)
-                        elif field_type == bool:
-                            kwargs[key] = value.lower() in ('true', '1', 'yes')
-                        else:
-                            kwargs[key] = value
-                    except Exception as e:
-                        raise ValueError(f"Error converting field '{key}' to {field_type}: {e}") from e
-            cls_object = cls(**kwargs)
-            if not hasattr(cls_object, 'id'):
-                raise ValueError(f"Dataclass {cls.__name__} must have an 'id' field to use as key")
-            result[cls_object.id] = cls_object
-        return result
+    result = {}
+    for cls_object in iter_csv_dataclasses(filepath, cls, delimiter, columns=columns):
+        if not hasattr(cls_object, 'id'):
+            raise ValueError(f"Dataclass {cls.__name__} must have an 'id' field to use as key")
+        result[cls_object.id] = cls_object
+    return result
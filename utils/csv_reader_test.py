@@ -0,0 +1,159 @@
+"""
+This module contains test cases for the CSV reading helpers in `utils.csv_reader`.
+
+Test functions include:
+- `test_parse_csv_to_dataclass_dict`: Tests that rows are converted and keyed by id.
+- `test_iter_csv_dataclasses`: Tests that rows are streamed as dataclass instances.
+- `test_iter_csv_dataclasses_as_tuples`: Tests that rows can be streamed as plain tuples.
+- `test_partial_columns_use_defaults`: Tests that absent optional columns keep their defaults.
+- `test_invalid_value_raises`: Tests that conversion errors and missing cells are reported as `ValueError`.
+- `test_column_projection`: Tests that only the projected columns are converted and stored.
+- `test_optional_date_column`: Tests ISO dates, empty cells and a missing `date` column.
+"""
+import datetime
+import pickle
+import types
+
+import pytest
+
+from models import Legislators, VoteResults, Votes, VoteType
+from utils import iter_csv_dataclasses, parse_csv_to_dataclass_dict, project_dataclass
+
+VOTE_RESULTS_CSV = "id,legislator_id,vote_id,vote_type\n1,10,100,1\n2,11,100,2\n"
+
+
+def test_parse_csv_to_dataclass_dict(tmp_path):
+    """
+    Test case for loading a CSV file into a dictionary keyed by the `id` field.
+
+    Simulates:
+    - Two vote results, one FOR and one AGAINST.
+    """
+    path = tmp_path / "vote_results.csv"
+    path.write_text(VOTE_RESULTS_CSV, encoding="utf-8")
+
+    vote_results = parse_csv_to_dataclass_dict(str(path), VoteResults, delimiter=",")
+
+    assert vote_results == {
+        1: VoteResults(id=1, legislator_id=10, vote_id=100, vote_type=VoteType.FOR),
+        2: VoteResults(id=2, legislator_id=11, vote_id=100, vote_type=VoteType.AGAINST),
+    }
+
+
+def test_iter_csv_dataclasses(tmp_path):
+    """
+    Test case for streaming a CSV file one dataclass instance at a time.
+
+    Simulates:
+    - Two vote results read lazily through a generator.
+    """
+    path = tmp_path / "vote_results.csv"
+    path.write_text(VOTE_RESULTS_CSV, encoding="utf-8")
+
+    rows = iter_csv_dataclasses(str(path), VoteResults, delimiter=",")
+
+    assert isinstance(rows, types.GeneratorType)
+    assert list(rows) == [
+        VoteResults(id=1, legislator_id=10, vote_id=100, vote_type=VoteType.FOR),
+        VoteResults(id=2, legislator_id=11, vote_id=100, vote_type=VoteType.AGAINST),
+    ]
+
+
+def test_iter_csv_dataclasses_as_tuples(tmp_path):
+    """
+    Test case for streaming a CSV file as plain tuples in dataclass field order.
+
+    Simulates:
+    - Two vote results whose CSV columns are in a different order than the dataclass fields.
+    """
+    path = tmp_path / "vote_results.csv"
+    path.write_text("vote_type,vote_id,legislator_id,id\n1,100,10,1\n2,100,11,2\n", encoding="utf-8")
+
+    rows = list(iter_csv_dataclasses(str(path), VoteResults, delimiter=",", as_tuples=True))
+
+    assert rows == [(1, 10, 100, VoteType.FOR), (2, 11, 100, VoteType.AGAINST)]
+
+
+def test_partial_columns_use_defaults(tmp_path):
+    """
+    Test case where the CSV skips a defaulted field that precedes another present column.
+
+    Simulates:
+    - A legislator file with an opposed count but no supported count column.
+    """
+    path = tmp_path / "legislators.csv"
+    path.write_text("id,name,num_opposed_bills,party\n1,Alice,3,D\n", encoding="utf-8")
+
+    legislators = parse_csv_to_dataclass_dict(str(path), Legislators, delimiter=",")
+
+    assert legislators == {1: Legislators(id=1, name="Alice", num_supported_bills=0, num_opposed_bills=3)}
+
+
+def test_invalid_value_raises(tmp_path):
+    """
+    Test case where a cell can't be converted to the declared field type.
+
+    Simulates:
+    - A vote result whose `legislator_id` is not an integer, and a legislator row without a `name` cell.
+    """
+    path = tmp_path / "vote_results.csv"
+    path.write_text("id,legislator_id,vote_id,vote_type\n1,abc,100,1\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="legislator_id"):
+        parse_csv_to_dataclass_dict(str(path), VoteResults, delimiter=",")
+
+    path.write_text("id,name\n1,Alice\n2\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="missing value for 'name'"):
+        parse_csv_to_dataclass_dict(str(path), Legislators, delimiter=",")
+
+
+def test_column_projection(tmp_path):
+    """
+    Test case for streaming and loading vote results with a column projection.
+
+    Simulates:
+    - A counter that only needs `legislator_id` and `vote_type`, a lookup keyed by `id`, a defaulted
+      count projected before `id`, and an unknown column.
+    """
+    path = tmp_path / "vote_results.csv"
+    path.write_text(VOTE_RESULTS_CSV, encoding="utf-8")
+
+    rows = list(iter_csv_dataclasses(str(path), VoteResults, delimiter=",", columns=('legislator_id', 'vote_type')))
+    tuples = list(iter_csv_dataclasses(str(path), VoteResults, ",", as_tuples=True, columns=('vote_type', 'id')))
+    by_id = parse_csv_to_dataclass_dict(str(path), VoteResults, ",", columns=('id', 'vote_id'))
+
+    projected = project_dataclass(VoteResults, ('legislator_id', 'vote_type'))
+    assert rows == [projected(10, VoteType.FOR), projected(11, VoteType.AGAINST)]
+    assert not hasattr(rows[0], 'vote_id')
+    assert tuples == [(VoteType.FOR, 1), (VoteType.AGAINST, 2)]
+    assert by_id[2].vote_id == 100 and not hasattr(by_id[2], 'legislator_id')
+    assert pickle.loads(pickle.dumps(rows)) == rows
+    assert project_dataclass(VoteResults, None) is VoteResults
+    counts = project_dataclass(Legislators, ('num_supported_bills', 'id'))
+    assert counts(id=1).num_supported_bills == 0
+    assert pickle.loads(pickle.dumps(counts(id=1))) == counts(id=1)
+    with pytest.raises(ValueError):
+        project_dataclass(VoteResults, ('id', 'party'))
+
+
+def test_optional_date_column(tmp_path):
+    """
+    Test case for the optional `date` field of votes.
+
+    Simulates:
+    - A dated vote, a vote with an empty date cell, an invalid date, and a votes.csv without a `date` column.
+    """
+    path = tmp_path / "votes.csv"
+    path.write_text("id,bill_id,date\n1,100,2021-11-19\n2,100,\n", encoding="utf-8")
+    undated = tmp_path / "undated_votes.csv"
+    undated.write_text("id,bill_id\n3,101\n", encoding="utf-8")
+    invalid = tmp_path / "invalid_votes.csv"
+    invalid.write_text("id,bill_id,date\n4,101,19/11/2021\n", encoding="utf-8")
+
+    assert parse_csv_to_dataclass_dict(str(path), Votes, delimiter=",") == {
+        1: Votes(id=1, bill_id=100, date=datetime.date(2021, 11, 19)),
+        2: Votes(id=2, bill_id=100, date=None),
+    }
+    assert parse_csv_to_dataclass_dict(str(undated), Votes, delimiter=",") == {3: Votes(id=3, bill_id=101)}
+    with pytest.raises(ValueError, match="date"):
+        parse_csv_to_dataclass_dict(str(invalid), Votes, delimiter=",")
@@ -0,0 +1,125 @@
+"""Docstring for the csv_shards.py module.
+This module provides helpers to split a CSV file into byte-range shards and parse each shard
+independently, so large files can be processed by several worker processes in parallel.
+
+Shard boundaries are aligned to line boundaries, so every data row belongs to exactly one shard.
+Rows containing quoted line breaks are not supported, since a shard boundary could fall inside them.
+Compressed and JSON Lines files can't be split by byte offsets either: callers check
+`detect_input_format(filepath).seekable` and read such files with `iter_csv_dataclasses` instead.
+Example:
+>>> shards = split_csv_into_shards("vote_results.csv", num_shards=4)
+>>> for shard in shards:
+...     for vote_result in iter_csv_shard("vote_results.csv", VoteResults, ",", shard):
+...         ...
+"""
+import csv
+import os
+from dataclasses import is_dataclass
+from typing import BinaryIO, Iterator, Type, TypeVar, Union
+
+from .csv_reader import _build_converter_plan  # pylint: disable=protected-access
+from .input_formats import detect_input_format
+
+T = TypeVar('T')
+
+Shard = tuple[int, int]
+
+
+def _read_header(csvfile: BinaryIO, delimiter: str) -> tuple[tuple[str, ...], int]:
+    """
+    Reads the header line of a CSV file opened in binary mode.
+
+    Args:
+        csvfile (BinaryIO): The file, positioned at its start.
+        delimiter (str): The delimiter used in the CSV file.
+
+    Returns:
+        tuple[tuple[str, ...], int]: The column names and the byte offset of the first data row.
+    """
+    line = csvfile.readline()
+    header = next(csv.reader([line.decode('utf-8')], delimiter=delimiter), [])
+    return tuple(header), csvfile.tell()
+
+
+def split_csv_into_shards(filepath: str, num_shards: int) -> list[Shard]:
+    """
+    Splits the data rows of a CSV file into contiguous byte ranges aligned to line boundaries.
+
+    Args:
+        filepath (str): The path to the CSV file.
+        num_shards (int): The desired number of shards. Fewer shards are returned for small files.
+
+    Returns:
+        list[tuple[int, int]]: The `(start, end)` byte offsets of each shard, in file order.
+
+    Raises:
+        ValueError: If `num_shards` is less than 1, or the file is compressed or not a CSV file.
+    """
+    if num_shards < 1:
+        raise ValueError("num_shards must be at least 1")
+    if not detect_input_format(filepath).seekable:
+        raise ValueError(f"{filepath} is compressed or not a CSV file and can't be split into shards")
+
+    size = os.path.getsize(filepath)
+    with open(filepath, 'rb') as csvfile:
+        csvfile.readline()
+        data_start = csvfile.tell()
+        boundaries = [data_start]
+        for i in range(1, num_shards):
+            target = data_start + (size - data_start) * i // num_shards
+            if target <= boundaries[-1]:
+                continue
+            # Move to the start of the first line beginning at or after `target`
+            csvfile.seek(target - 1)
+            csvfile.readline()
+            boundary = csvfile.tell()
+            if boundaries[-1] < boundary < size:
+                boundaries.append(boundary)
+    boundaries.append(size)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if start < end]
+
+
+def _iter_lines(csvfile: BinaryIO, start: int, end: int) -> Iterator[str]:
+    """Yields the decoded lines that begin in the byte range `[start, end)` of the file."""
+    csvfile.seek(start)
+    position = start
+    while position < end:
+        line = csvfile.readline()
+        if not line:
+            break
+        position += len(line)
+        yield line.decode('utf-8')
+
+
+def iter_csv_shard(
+    filepath: str,
+    cls: Type[T],
+    delimiter: str,
+    shard: Shard,
+    as_tuples: bool = False
+) -> Iterator[Union[T, tuple]]:
+    """
+    Lazily parses the rows of a single shard of a CSV file.
+
+    Type conversion follows the same rules, and reuses the same cached conversion plans,
+    as `iter_csv_dataclasses`. The header is always read from the start of the file.
+
+    Args:
+        filepath (str): The path to the CSV file to read.
+        cls (Type[T]): The dataclass type describing the columns of each CSV row.
+        delimiter (str): The delimiter used in the CSV file (e.g., ',', ';', '\t').
+        shard (tuple[int, int]): The `(start, end)` byte range returned by `split_csv_into_shards`.
+        as_tuples (bool): If True, yields plain tuples of the converted values in the
+            dataclass field order instead of dataclass instances.
+
+    Yields:
+        T | tuple: A dataclass instance, or a tuple of values, for each CSV row in the shard.
+    """
+    if not is_dataclass(cls):
+        raise ValueError(f"{cls} must be a dataclass type")
+
+    with open(filepath, 'rb') as csvfile:
+        header, data_start = _read_header(csvfile, delimiter)
+        start, end = shard
+        rows = csv.reader(_iter_lines(csvfile, max(start, data_start), end), delimiter=delimiter)
+        yield from _build_converter_plan(cls, header).iter_converted(rows, as_tuples)
@@ -1,20 +1,31 @@
 """This module provides functionality to serialize a list of Python objects (e.g., dataclass instances)
-to a CSV file using the standard `csv` module."""
+to a CSV file using the standard `csv` module.
+
+`write_dataclasses_to_csv` is the streaming variant: it consumes any iterator lazily, writes rows
+in buffered chunks, can gzip the output, and writes to a temporary file that is atomically renamed
+once complete, so readers never see a partial file."""
 import csv
-from typing import Iterable
+import gzip
+import os
+import uuid
+from dataclasses import fields, is_dataclass
+from itertools import islice
+from typing import Iterable, Optional
+
+DEFAULT_CHUNK_SIZE = 10_000
 
 
 def write_objects_to_csv(filename: str, objects: Iterable):
     """
     Writes a list of objects (typically dataclass instances) to a CSV file.
 
-    Each object's attributes are extracted using `vars()` and written as a row in the CSV file.
-    All objects must have the same attributes (i.e., same set of keys from `vars()`).
+    For dataclass instances, the columns are the dataclass fields, in declaration order, which
+    also works for slotted dataclasses that have no `__dict__`. Other objects are serialized
+    from their attributes using `vars()`. All objects must have the same attributes.
 
     Args:
         filename (str): The path to the CSV file to write.
-        objects (Iterable): A list, tuple, or dict_values of objects (e.g., dataclass instances)
-            that support attribute access via `__dict__`.
+        objects (Iterable): A list, tuple, or dict_values of objects (e.g., dataclass instances).
     """
     # Convert to list in case it's dict_values or other iterable
     obj_list = list(objects)
@@ -22,17 +33,66 @@ def write_objects_to_csv(filename: str, objects: Iterable):
     if not obj_list:
         raise ValueError("The objects list can't be empty.")
 
-    # Convert each object to a dictionary
-    try:
-        rows = [vars(obj) for obj in obj_list]
-    except TypeError as e:
-        raise ValueError("Objects must be class instances with __dict__ or use a dataclass") from e
-
-    # Extract headers from first row
-    fieldnames = rows[0].keys()
+    # Extract headers from the dataclass schema, or from the attributes of the first object
+    first = obj_list[0]
+    if is_dataclass(first):
+        fieldnames = [f.name for f in fields(first)]
+    else:
+        try:
+            fieldnames = list(vars(first))
+        except TypeError as e:
+            raise ValueError("Objects must be class instances with __dict__ or use a dataclass") from e
 
     # Write to CSV
     with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+        writer = csv.writer(csvfile)
+        writer.writerow(fieldnames)
+        writer.writerows([getattr(obj, name) for name in fieldnames] for obj in obj_list)
+
+
+def write_dataclasses_to_csv(  # pylint: disable=too-many-arguments
+    filename: str,
+    objects: Iterable,
+    cls: type,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    compress: Optional[bool] = None
+):
+    """
+    Streams dataclass instances to a CSV file, atomically replacing any previous file.
+
+    The header comes from the fields of `cls`, so an empty iterable produces a header-only file.
+    Objects are consumed lazily and written `chunk_size` rows at a time, so memory use doesn't
+    depend on the number of rows.
+
+    Args:
+        filename (str): The path to the CSV file to write.
+        objects (Iterable): Any iterable of instances of `cls`; it is consumed once.
+        cls (type): The dataclass type of the objects.
+        chunk_size (int): Number of rows buffered before each write.
+        compress (bool | None): Whether to gzip the output. By default, compresses when `filename`
+            ends with `.gz`.
+    """
+    if not is_dataclass(cls):
+        raise ValueError(f"{cls} must be a dataclass type")
+    if compress is None:
+        compress = filename.endswith('.gz')
+
+    fieldnames = [f.name for f in fields(cls)]
+    rows = ([getattr(obj, name) for name in fieldnames] for obj in objects)
+
+    # The temporary file lives next to the target, so the final rename stays on the same filesystem
+    directory, basename = os.path.split(os.path.abspath(filename))
+    temp_path = os.path.join(directory, f".{basename}.{uuid.uuid4().hex}.tmp")
+    opener = gzip.open if compress else open
+    try:
+        with opener(temp_path, 'xt', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(fieldnames)
+            while chunk := list(islice(rows, chunk_size)):
+                writer.writerows(chunk)
+        os.replace(temp_path, filename)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
@@ -0,0 +1,99 @@
+"""
+This module contains test cases for the CSV writers in `utils.csv_writer`.
+
+Test functions include:
+- `test_write_objects_to_csv_slotted`: Tests that slotted dataclasses are written from their fields.
+- `test_write_dataclasses_streams_generator`: Tests that a generator is written across several chunks.
+- `test_write_dataclasses_empty_writes_header`: Tests that an empty input writes a header-only file.
+- `test_write_dataclasses_gzip`: Tests gzip-compressed output.
+- `test_write_dataclasses_failure_keeps_previous_file`: Tests that a failed write leaves no partial file.
+"""
+import gzip
+
+import pytest
+
+from models import Legislators
+from utils import write_dataclasses_to_csv, write_objects_to_csv
+
+HEADER = "id,name,num_supported_bills,num_opposed_bills\n"
+
+
+def test_write_objects_to_csv_slotted(tmp_path):
+    """
+    Test case for writing slotted dataclass instances, which have no `__dict__`.
+
+    Simulates:
+    - Alice with one supported bill.
+    """
+    path = tmp_path / "legislators.csv"
+
+    write_objects_to_csv(str(path), [Legislators(id=1, name="Alice", num_supported_bills=1)])
+
+    assert path.read_text(encoding="utf-8") == HEADER + "1,Alice,1,0\n"
+
+
+def test_write_dataclasses_streams_generator(tmp_path):
+    """
+    Test case for streaming a generator of instances in chunks smaller than the input.
+
+    Simulates:
+    - 25 legislators written with a chunk size of 10.
+    """
+    path = tmp_path / "legislators.csv"
+
+    write_dataclasses_to_csv(str(path), (Legislators(id=i, name=f"L{i}") for i in range(25)), Legislators,
+                             chunk_size=10)
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 26
+    assert lines[-1] == "24,L24,0,0"
+
+
+def test_write_dataclasses_empty_writes_header(tmp_path):
+    """
+    Test case where there is nothing to write.
+
+    Simulates:
+    - An empty list of legislators.
+    """
+    path = tmp_path / "legislators.csv"
+
+    write_dataclasses_to_csv(str(path), [], Legislators)
+
+    assert path.read_text(encoding="utf-8") == HEADER
+
+
+def test_write_dataclasses_gzip(tmp_path):
+    """
+    Test case for gzip-compressed output, selected from the file extension.
+
+    Simulates:
+    - One legislator written to a `.csv.gz` file.
+    """
+    path = tmp_path / "legislators.csv.gz"
+
+    write_dataclasses_to_csv(str(path), [Legislators(id=1, name="Alice")], Legislators)
+
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        assert file.read() == HEADER + "1,Alice,0,0\n"
+
+
+def test_write_dataclasses_failure_keeps_previous_file(tmp_path):
+    """
+    Test case where the input fails halfway through the write.
+
+    Simulates:
+    - A generator raising after its first legislator, over an existing output file.
+    """
+    path = tmp_path / "legislators.csv"
+    path.write_text("previous\n", encoding="utf-8")
+
+    def failing():
+        yield Legislators(id=1, name="Alice")
+        raise RuntimeError("input failed")
+
+    with pytest.raises(RuntimeError):
+        write_dataclasses_to_csv(str(path), failing(), Legislators)
+
+    assert path.read_text(encoding="utf-8") == "previous\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["legislators.csv"]
@@ -0,0 +1,170 @@
+"""Docstring for the input_formats.py module.
+This module detects the format and compression of input files and decodes them on the fly.
+
+Input tables may be delivered as CSV or JSON Lines (one JSON object per line, keyed by column
+name), either plain or compressed with gzip, bz2 or xz. The compression is detected from the
+magic bytes at the start of the file, whatever its name; the format from the extension left once
+the compression suffix is removed (`.csv`, `.tsv`, `.jsonl`, `.ndjson`), or else from the first
+character of the decoded content. Compressed files are decompressed through a buffered stream
+while they are read, so they never have to be written to disk decompressed first.
+
+`iter_input_rows` yields the rows of either format as lists of cells, header first, so that the
+same conversion plans of `utils.csv_reader` turn them into dataclass instances or tuples.
+"""
+import bz2
+import csv
+import gzip
+import io
+import json
+import lzma
+import os
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional, TextIO
+
+READ_BUFFER_SIZE = 1 << 20
+
+# Compression name -> (magic bytes, file suffix, opener of a binary stream)
+COMPRESSIONS = {
+    'gzip': (b'\x1f\x8b', '.gz', gzip.open),
+    'bz2': (b'BZh', '.bz2', bz2.open),
+    'xz': (b'\xfd7zXZ\x00', '.xz', lzma.open),
+}
+FORMAT_SUFFIXES = {'.csv': 'csv', '.tsv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+# Suffixes tried by `find_input_file`, in order of preference
+INPUT_SUFFIXES = tuple(
+    f'{suffix}{compression}' for suffix in ('.csv', '.jsonl')
+    for compression in ('', *(suffix for _, suffix, _ in COMPRESSIONS.values()))
+)
+
+
+@dataclass(frozen=True)
+class InputFormat:
+    """
+    Represents how an input file is encoded.
+
+    Attributes:
+        kind (str): `csv` or `jsonl`.
+        compression (str | None): `gzip`, `bz2`, `xz`, or None for an uncompressed file.
+    """
+    kind: str
+    compression: Optional[str] = None
+
+    @property
+    def seekable(self) -> bool:
+        """Whether byte offsets in the file are offsets in the CSV text (used by shards and checkpoints)."""
+        return self.kind == 'csv' and self.compression is None
+
+
+def _detect_compression(filepath: str) -> Optional[str]:
+    """Returns the compression whose magic bytes start the file, or None."""
+    with open(filepath, 'rb') as file:
+        head = file.read(max(len(magic) for magic, _, _ in COMPRESSIONS.values()))
+    for name, (magic, _, _) in COMPRESSIONS.items():
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def _open_binary(filepath: str, compression: Optional[str]) -> io.BufferedIOBase:
+    """Opens a file as a buffered stream of decompressed bytes."""
+    if compression is None:
+        return open(filepath, 'rb', buffering=READ_BUFFER_SIZE)  # pylint: disable=consider-using-with
+    return io.BufferedReader(COMPRESSIONS[compression][2](filepath, 'rb'), buffer_size=READ_BUFFER_SIZE)
+
+
+def detect_input_format(filepath: str) -> InputFormat:
+    """
+    Detects the format and compression of an input file.
+
+    Args:
+        filepath (str): The path to the file.
+
+    Returns:
+        InputFormat: The format and compression of the file.
+    """
+    compression = _detect_compression(filepath)
+    stem, suffix = os.path.splitext(filepath.lower())
+    if any(suffix == compression_suffix for _, compression_suffix, _ in COMPRESSIONS.values()):
+        suffix = os.path.splitext(stem)[1]
+    kind = FORMAT_SUFFIXES.get(suffix)
+    if kind is None:
+        with _open_binary(filepath, compression) as stream:
+            kind = 'jsonl' if stream.peek(64)[:64].lstrip().startswith(b'{') else 'csv'
+    return InputFormat(kind, compression)
+
+
+def open_input_text(filepath: str, input_format: Optional[InputFormat] = None) -> TextIO:
+    """
+    Opens an input file as UTF-8 text, decompressing it on the fly.
+
+    Args:
+        filepath (str): The path to the file.
+        input_format (InputFormat | None): The format of the file, detected if not given.
+
+    Returns:
+        TextIO: The decoded text, with newlines left untranslated for the `csv` module.
+    """
+    input_format = input_format or detect_input_format(filepath)
+    return io.TextIOWrapper(_open_binary(filepath, input_format.compression), encoding='utf-8', newline='')
+
+
+def _json_cell(value: Any) -> str:
+    """Formats a JSON value as the CSV cell the converters expect."""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def _iter_json_rows(textfile: TextIO) -> Iterator[list[str]]:
+    """Yields the keys of the first JSON object as the header, then the cells of every object."""
+    header = None
+    for line_number, line in enumerate(textfile, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {line_number}: {e}") from e
+        if header is None:
+            header = list(record)
+            yield header
+        yield [_json_cell(record.get(name)) for name in header]
+
+
+def iter_input_rows(textfile: TextIO, input_format: InputFormat, delimiter: str) -> Iterator[list[str]]:
+    """
+    Yields the rows of an opened input file as lists of cells, starting with the header.
+
+    Args:
+        textfile (TextIO): The file returned by `open_input_text`.
+        input_format (InputFormat): The format of the file.
+        delimiter (str): The delimiter of CSV files; unused for JSON Lines.
+
+    Yields:
+        list[str]: The header, then each row. JSON Lines files take their header from the keys of the
+            first object; missing keys and nulls become empty cells.
+    """
+    if input_format.kind == 'jsonl':
+        return _iter_json_rows(textfile)
+    return csv.reader(textfile, delimiter=delimiter)
+
+
+def find_input_file(directory: str, name: str) -> str:
+    """
+    Finds the file of an input table, whatever its format and compression.
+
+    Args:
+        directory (str): The input directory.
+        name (str): The table name, e.g. `vote_results`.
+
+    Returns:
+        str: The first existing path among `name.csv`, `name.csv.gz`, `name.csv.bz2`, `name.csv.xz`,
+            `name.jsonl` and its compressed variants; `name.csv` if none exists.
+    """
+    for suffix in INPUT_SUFFIXES:
+        path = os.path.join(directory, name + suffix)
+        if os.path.exists(path):
+            return path
+    return os.path.join(directory, name + '.csv')
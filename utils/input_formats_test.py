@@ -0,0 +1,86 @@
+"""
+This module contains test cases for the compressed and JSON Lines input readers in `utils.input_formats`.
+
+Test functions include:
+- `test_every_format_reads_the_same_rows`: Tests CSV and JSON Lines, plain and compressed, named or sniffed.
+- `test_find_input_file_and_shards`: Tests the lookup of an input table and the refusal to shard it.
+"""
+import bz2
+import gzip
+import json
+import lzma
+
+import pytest
+
+from models import Votes, VoteResults, VoteResultsTable
+from utils import (
+    InputFormat,
+    detect_input_format,
+    find_input_file,
+    iter_csv_dataclasses,
+    parse_csv_to_dataclass_dict,
+    split_csv_into_shards,
+)
+
+CSV_TEXT = "id,legislator_id,vote_id,vote_type\n1,10,100,1\n2,11,100,2\n3,10,101,2\n"
+JSONL_TEXT = "".join(json.dumps(record) + "\n" for record in (
+    {"id": 1, "legislator_id": 10, "vote_id": 100, "vote_type": 1},
+    {"id": 2, "legislator_id": 11, "vote_id": 100, "vote_type": 2},
+    {"id": 3, "legislator_id": 10, "vote_id": 101, "vote_type": 2, "comment": "ignored"},
+))
+
+
+def test_every_format_reads_the_same_rows(tmp_path):
+    """
+    Test case reading the same vote results from every supported encoding.
+
+    Simulates:
+    - CSV and JSON Lines files, uncompressed and gzip/bz2/xz compressed, a gzip file without a `.gz`
+      suffix, a JSON Lines file without extension, and a JSON vote with a null date.
+    """
+    files = {
+        "vote_results.csv": (CSV_TEXT.encode(), InputFormat('csv')),
+        "vote_results.csv.gz": (gzip.compress(CSV_TEXT.encode()), InputFormat('csv', 'gzip')),
+        "vote_results.csv.bz2": (bz2.compress(CSV_TEXT.encode()), InputFormat('csv', 'bz2')),
+        "vote_results.csv.xz": (lzma.compress(CSV_TEXT.encode()), InputFormat('csv', 'xz')),
+        "renamed.csv": (gzip.compress(CSV_TEXT.encode()), InputFormat('csv', 'gzip')),
+        "vote_results.jsonl": (JSONL_TEXT.encode(), InputFormat('jsonl')),
+        "vote_results.jsonl.xz": (lzma.compress(JSONL_TEXT.encode()), InputFormat('jsonl', 'xz')),
+        "vote_results": (gzip.compress(JSONL_TEXT.encode()), InputFormat('jsonl', 'gzip')),
+    }
+    expected = list(iter_csv_dataclasses(_write(tmp_path / "expected.csv", CSV_TEXT.encode()), VoteResults, ","))
+
+    for name, (content, input_format) in files.items():
+        path = _write(tmp_path / name, content)
+        assert detect_input_format(path) == input_format
+        assert list(iter_csv_dataclasses(path, VoteResults, ",")) == expected
+        table = VoteResultsTable.from_rows(iter_csv_dataclasses(path, VoteResults, ",", as_tuples=True))
+        assert list(table.columns()) == [(10, 100, 1), (11, 100, 2), (10, 101, 2)]
+
+    votes_path = _write(tmp_path / "votes.jsonl", b'{"id": 7, "bill_id": 70, "date": null}\n'
+                                                  b'{"id": 8, "bill_id": 70, "date": "2021-11-19"}\n')
+    assert parse_csv_to_dataclass_dict(votes_path, Votes, ",")[7] == Votes(id=7, bill_id=70)
+    broken_path = _write(tmp_path / "broken.jsonl", b'{"id": 1, "bill_id": 10}\n{"id": \n')
+    with pytest.raises(ValueError, match="line 2"):
+        list(iter_csv_dataclasses(broken_path, Votes, ","))
+
+
+def test_find_input_file_and_shards(tmp_path):
+    """
+    Test case for finding the file of a table and for splitting compressed files.
+
+    Simulates:
+    - A directory with only a compressed vote results file, and a missing votes table.
+    """
+    path = _write(tmp_path / "vote_results.csv.gz", gzip.compress(CSV_TEXT.encode()))
+
+    assert find_input_file(str(tmp_path), "vote_results") == path
+    assert find_input_file(str(tmp_path), "votes") == str(tmp_path / "votes.csv")
+    with pytest.raises(ValueError, match="compressed"):
+        split_csv_into_shards(path, num_shards=2)
+
+
+def _write(path, content):
+    """Writes bytes to a path and returns the path as a string."""
+    path.write_bytes(content)
+    return str(path)
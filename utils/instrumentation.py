@@ -0,0 +1,250 @@
+"""Docstring for the instrumentation.py module.
+This module records per-stage measures of a run (loading each table, joining, counting, writing).
+
+A `StageRecorder` hands out stages through a context manager or a decorator. For each stage it
+records the wall time, the CPU time, the number of rows processed, the throughput in rows/s and
+the peak memory traced by `tracemalloc` while the stage ran. The measures can be written as a
+JSON run report.
+
+A disabled recorder hands out a single shared no-op stage, so instrumented code pays one method
+call per stage and nothing per row.
+Example:
+>>> recorder = StageRecorder(enabled=True)
+>>> with recorder.stage("load:bills") as stage:
+...     bills = parse_csv_to_dataclass_dict("input/bills.csv", Bills, ",")
+...     stage.rows = len(bills)
+>>> recorder.write_report("output/run-report.json")
+"""
+import functools
+import json
+import os
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+@dataclass
+class StageMetrics:
+    """
+    Represents the measures of one stage of a run.
+
+    Attributes:
+        name (str): The name of the stage.
+        wall_seconds (float): The elapsed wall-clock time.
+        cpu_seconds (float): The CPU time of the current process (child processes are not included).
+        rows (int | None): The number of rows processed, if known.
+        rows_per_second (float | None): `rows` divided by `wall_seconds`, if the rows are known.
+        peak_memory_bytes (int | None): The peak memory traced by `tracemalloc` during the stage, or
+            None if memory tracing is off. Tracing starts with the outermost stage, so this is the
+            peak of the memory allocated since then and still alive.
+    """
+    name: str
+    wall_seconds: float
+    cpu_seconds: float
+    rows: Optional[int] = None
+    rows_per_second: Optional[float] = None
+    peak_memory_bytes: Optional[int] = None
+
+
+class Stage:
+    """
+    Represents a running stage. Set `rows` (or wrap the rows with `count`) to report the rows processed.
+    """
+    __slots__ = ('name', 'rows', '_recorder', '_wall_start', '_cpu_start')
+
+    def __init__(self, recorder: 'StageRecorder', name: str, rows: Optional[int]):
+        self.name = name
+        self.rows = rows
+        self._recorder = recorder
+        self._wall_start = 0.0
+        self._cpu_start = 0.0
+
+    def count(self, rows: Iterable[T]) -> Iterator[T]:
+        """
+        Wraps an iterable so that every item it yields is counted as a processed row of this stage.
+
+        Args:
+            rows (Iterable[T]): The rows consumed by the stage.
+
+        Yields:
+            T: The same rows.
+        """
+        self.rows = self.rows or 0
+        for row in rows:
+            self.rows += 1
+            yield row
+
+    def __enter__(self) -> 'Stage':
+        self._recorder._enter()  # pylint: disable=protected-access
+        self._cpu_start = time.process_time()
+        self._wall_start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        wall_seconds = time.perf_counter() - self._wall_start
+        cpu_seconds = time.process_time() - self._cpu_start
+        self._recorder._exit(self, wall_seconds, cpu_seconds)  # pylint: disable=protected-access
+
+
+class _DisabledStage:
+    """A shared stage that measures nothing, handed out by disabled recorders."""
+    __slots__ = ('rows',)
+
+    def __init__(self):
+        self.rows = None
+
+    @staticmethod
+    def count(rows: Iterable[T]) -> Iterable[T]:
+        """Returns the rows unchanged."""
+        return rows
+
+    def __enter__(self) -> '_DisabledStage':
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_DISABLED_STAGE = _DisabledStage()
+
+
+class StageRecorder:
+    """
+    Records the measures of the stages of a run.
+
+    Attributes:
+        enabled (bool): Whether stages are measured at all.
+        trace_memory (bool): Whether the peak memory of each stage is traced with `tracemalloc`.
+            Tracing slows down allocation-heavy code, so the reported times are higher with it.
+        stages (list[StageMetrics]): The measures of the finished stages, in the order they finished.
+    """
+
+    def __init__(self, enabled: bool = True, trace_memory: bool = True):
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.stages: list[StageMetrics] = []
+        self._peaks: list[int] = []  # Running peak memory of each active stage, innermost last
+        self._started_tracing = False
+        self._wall_seconds = 0.0
+        self._cpu_seconds = 0.0
+
+    def stage(self, name: str, rows: Optional[int] = None):
+        """
+        Returns a context manager measuring the code it wraps as one stage.
+
+        Args:
+            name (str): The name of the stage, e.g. `load:bills`.
+            rows (int | None): The number of rows processed, if known upfront.
+
+        Returns:
+            Stage: The stage, which is also the value bound by `with ... as stage`.
+        """
+        if not self.enabled:
+            return _DISABLED_STAGE
+        return Stage(self, name, rows)
+
+    def instrument(self, name: str, rows: Optional[Callable[..., int]] = None) -> Callable:
+        """
+        Returns a decorator measuring each call of a function as one stage.
+
+        Args:
+            name (str): The name of the stage.
+            rows (Callable[..., int] | None): Called with the arguments of the function to get the
+                number of rows it processes.
+
+        Returns:
+            Callable: The decorator.
+        """
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs) -> Any:
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.stage(name, rows(*args, **kwargs) if rows else None):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _enter(self):
+        """Starts memory tracing for a stage, keeping the peak reached so far by the enclosing stage."""
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        self._peaks.append(0)
+
+    def _exit(self, stage: Stage, wall_seconds: float, cpu_seconds: float):
+        """Records the measures of a finished stage."""
+        peak = self._peaks.pop()
+        if self.trace_memory:
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            elif self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+        self._append(stage, wall_seconds, cpu_seconds, peak if self.trace_memory else None)
+
+    def record(self, name: str, wall_seconds: float, cpu_seconds: float, rows: Optional[int] = None):
+        """
+        Records a stage measured elsewhere, e.g. in a worker thread or process, without a memory peak.
+
+        Stages recorded while another stage runs are nested in it, like the stages it wraps.
+
+        Args:
+            name (str): The name of the stage.
+            wall_seconds (float): The elapsed wall-clock time.
+            cpu_seconds (float): The CPU time spent on the stage.
+            rows (int | None): The number of rows processed, if known.
+        """
+        if self.enabled:
+            self._append(Stage(self, name, rows), wall_seconds, cpu_seconds, None)
+
+    def _append(self, stage: Stage, wall_seconds: float, cpu_seconds: float, peak: Optional[int]):
+        """Adds the measures of a stage, counting top-level stages in the run totals."""
+        if not self._peaks:
+            self._wall_seconds += wall_seconds
+            self._cpu_seconds += cpu_seconds
+        self.stages.append(StageMetrics(
+            name=stage.name,
+            wall_seconds=round(wall_seconds, 6),
+            cpu_seconds=round(cpu_seconds, 6),
+            rows=stage.rows,
+            rows_per_second=round(stage.rows / wall_seconds, 1) if stage.rows is not None and wall_seconds else None,
+            peak_memory_bytes=peak,
+        ))
+
+    def report(self) -> dict:
+        """
+        Builds the run report.
+
+        Returns:
+            dict: The measures of each stage, and the wall and CPU times summed over the top-level stages.
+        """
+        return {
+            'trace_memory': self.trace_memory,
+            'wall_seconds': round(self._wall_seconds, 6),
+            'cpu_seconds': round(self._cpu_seconds, 6),
+            'stages': [asdict(stage) for stage in self.stages],
+        }
+
+    def write_report(self, path: str):
+        """
+        Writes the run report as JSON. Does nothing if the recorder is disabled.
+
+        Args:
+            path (str): The path to the JSON file.
+        """
+        if not self.enabled:
+            return
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.report(), file, indent=2)
@@ -0,0 +1,76 @@
+"""
+This module contains test cases for the stage recorder in `utils.instrumentation`.
+
+Test functions include:
+- `test_stage_records_rows_and_memory`: Tests the measures recorded for nested stages.
+- `test_instrument_decorator`: Tests a function measured through the decorator.
+- `test_disabled_recorder`: Tests that a disabled recorder measures nothing and passes rows through.
+"""
+import json
+import tracemalloc
+
+from utils import StageRecorder
+
+
+def test_stage_records_rows_and_memory(tmp_path):
+    """
+    Test case for an outer stage wrapping an inner stage that allocates memory.
+
+    Simulates:
+    - An inner stage counting 1000 rows while allocating about 1 MB, and the report written to disk.
+    """
+    recorder = StageRecorder()
+
+    with recorder.stage('outer', rows=1):
+        with recorder.stage('inner') as stage:
+            buffers = [bytes(1000) for _ in stage.count(range(1000))]
+        del buffers
+
+    inner, outer = recorder.stages[0], recorder.stages[1]
+    assert (inner.name, inner.rows) == ('inner', 1000)
+    assert inner.rows_per_second > 0
+    assert inner.peak_memory_bytes >= 1_000_000
+    assert outer.peak_memory_bytes >= inner.peak_memory_bytes
+    assert not tracemalloc.is_tracing()
+
+    recorder.write_report(str(tmp_path / "report.json"))
+    report = json.loads((tmp_path / "report.json").read_text(encoding="utf-8"))
+    assert [stage['name'] for stage in report['stages']] == ['inner', 'outer']
+    assert report['wall_seconds'] == outer.wall_seconds
+
+
+def test_instrument_decorator():
+    """
+    Test case for the decorator, counting rows from the arguments of the function.
+
+    Simulates:
+    - A function summing a list of 3 numbers.
+    """
+    recorder = StageRecorder(trace_memory=False)
+
+    @recorder.instrument('sum', rows=len)
+    def total(numbers):
+        return sum(numbers)
+
+    assert total([1, 2, 3]) == 6
+    assert recorder.stages[0].name == 'sum'
+    assert recorder.stages[0].rows == 3
+    assert recorder.stages[0].peak_memory_bytes is None
+
+
+def test_disabled_recorder(tmp_path):
+    """
+    Test case for a recorder that is turned off.
+
+    Simulates:
+    - A stage over a list of rows, and a report that must not be written.
+    """
+    recorder = StageRecorder(enabled=False)
+    rows = [1, 2, 3]
+
+    with recorder.stage('load') as stage:
+        assert stage.count(rows) is rows
+
+    recorder.write_report(str(tmp_path / "report.json"))
+    assert not recorder.stages
+    assert not (tmp_path / "report.json").exists()
@@ -0,0 +1,349 @@
+"""Docstring for the lazy_table.py module.
+This module provides a table that builds dataclass instances only when they are accessed.
+
+`parse_csv_to_dataclass_dict` converts every cell of every row and builds one instance per row up
+front, including long strings such as bill titles that most reports never read. `LazyTable.from_file`
+instead reads the file once, converting only the key column, to index the byte offset of every row
+by its key, and memory-maps the file:
+    - `table[key]` parses and converts one row and caches its instance, so the updates the handlers
+      make to it persist and later lookups return the same instance.
+    - `iter_columns(*names)` yields a few columns of every row, converting only those cells, without
+      building instances.
+    - `set_column(name, values)` assigns one field of many rows without building their instances; the
+      values are applied when an instance is built.
+    - `iter_rows()` yields every row as an instance, for writing, without caching the ones it builds.
+
+`iter_columns` and `iter_rows` read the file sequentially when every key is unique, and seek to
+each row otherwise. String fields are interned with `sys.intern`, so a name repeated across rows,
+or a row materialized again, is stored once. Compressed and JSON Lines files have no byte offsets
+into their rows, so their rows are kept in memory as lists of raw cells instead, still converted
+only when accessed.
+
+A table is a read-only `Mapping` of its keys, so it can be passed to the handlers in place of the
+dict of a reference table. Like that dict, a key listed twice keeps the position of its first row
+and the values of its last one.
+Example:
+>>> legislators = LazyTable.from_file('input/legislators.csv', Legislators)
+>>> legislators[412211].name
+'Rep. John Yarmuth (D-KY-3)'
+>>> legislators.materialized
+1
+"""
+import csv
+import dataclasses
+import functools
+import mmap
+import os
+import sys
+from array import array
+from typing import Any, Callable, Iterator, Mapping, Optional, Union
+
+# pylint: disable-next=protected-access
+from .csv_reader import _ConverterPlan, _build_converter_plan, _field_converter, _unwrap_optional
+from .csv_reader import project_dataclass
+from .input_formats import detect_input_format, iter_input_rows, open_input_text
+
+
+@functools.lru_cache(maxsize=None)
+def _column_plan(cls: type, header: tuple[str, ...], names: Optional[tuple[str, ...]]):
+    """Returns (once per dataclass, header and fields) the conversion plan of the fields, or of every field
+    for None, and the positions of its strings."""
+    plan = _build_converter_plan(project_dataclass(cls, names), header)
+    interned = tuple(index for index, field_type in enumerate(plan.types) if _unwrap_optional(field_type)[0] is str)
+    return plan, interned
+
+
+def _convert(cells: list[str], plan: _ConverterPlan, interned: tuple[int, ...]) -> list[Any]:
+    """Converts the cells of a row planned by `_column_plan`, interning strings."""
+    values = plan.convert(cells)
+    for index in interned:
+        if values[index] is not None:
+            values[index] = sys.intern(values[index])
+    return values
+
+
+def _field_default(field: dataclasses.Field) -> Any:
+    """Returns the default value of a dataclass field."""
+    if field.default_factory is not dataclasses.MISSING:
+        return field.default_factory()
+    return field.default
+
+
+def _parse_row(text: str, delimiter: str) -> list[str]:
+    """Parses the text of a single CSV row, which may hold quoted line breaks."""
+    return next(csv.reader([text.rstrip('\r\n')], delimiter=delimiter))
+
+
+def _is_blank(cells: list[str]) -> bool:
+    """Returns whether a parsed row holds nothing but whitespace; such rows are skipped by every source."""
+    return not any(cell.strip() for cell in cells)
+
+
+def _read_record(mapped: mmap.mmap) -> bytes:
+    """Reads the next CSV record, which spans several lines when a quoted field holds line breaks."""
+    record = mapped.readline()
+    while record.count(b'"') % 2:
+        # An odd number of quotes leaves a quoted field open across the line break
+        continuation = mapped.readline()
+        if not continuation:
+            break
+        record += continuation
+    return record
+
+
+class _MappedRows:
+    """
+    Represents the rows of a memory-mapped CSV file, by the byte offset where each one starts.
+
+    Attributes:
+        count (int): The number of rows.
+    """
+
+    def __init__(self, filepath: str, delimiter: str):
+        with open(filepath, 'rb') as file:
+            self._mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._filepath = filepath
+        self._delimiter = delimiter
+        self._offsets = array('q')
+        self.count = 0
+
+    def header(self) -> tuple[str, ...]:
+        """Reads the header; call before `index`."""
+        return tuple(_parse_row(_read_record(self._mapped).decode('utf-8'), self._delimiter))
+
+    def index(self, key_index: int, convert_key: Callable[[str], Any]) -> dict[Any, int]:
+        """Reads the rows after the header once, converting only their key, and returns the row number of each key."""
+        rows: dict[Any, int] = {}
+        separator = self._delimiter.encode()
+        start = self._mapped.tell()
+        for record in iter(lambda: _read_record(self._mapped), b''):
+            cells = record.rstrip(b'\r\n').split(separator, key_index + 1)
+            if (len(cells) > key_index and cells[key_index].strip()
+                    and not any(b'"' in cell for cell in cells[:key_index + 1])):
+                # Quotes past the key cell (e.g. in titles) don't change where it starts and ends, and a
+                # row with a key is never blank
+                cell = cells[key_index].decode('utf-8')
+            else:
+                parsed = _parse_row(record.decode('utf-8'), self._delimiter)
+                cell = None if _is_blank(parsed) else parsed[key_index]
+            if cell is not None:
+                rows[convert_key(cell)] = len(self._offsets)
+                self._offsets.append(start)
+            start = self._mapped.tell()
+        self.count = len(self._offsets)
+        self._offsets.append(start)
+        return rows
+
+    def cells(self, row: int) -> list[str]:
+        """Parses the cells of a row number."""
+        return _parse_row(self._mapped[self._offsets[row]:self._offsets[row + 1]].decode('utf-8'), self._delimiter)
+
+    def scan(self) -> Iterator[list[str]]:
+        """Yields the cells of every row in file order."""
+        with open(self._filepath, newline='', encoding='utf-8') as file:
+            reader = csv.reader(file, delimiter=self._delimiter)
+            next(reader, None)
+            for cells in reader:
+                if not _is_blank(cells):
+                    yield cells
+
+
+class _RawRows:
+    """
+    Represents rows kept in memory as lists of raw cells, for files without meaningful byte offsets.
+
+    Attributes:
+        count (int): The number of rows.
+    """
+
+    def __init__(self, rows: list[list[str]]):
+        self._rows = rows
+        self.count = len(rows)
+
+    def cells(self, row: int) -> list[str]:
+        """Returns the cells of a row number."""
+        return self._rows[row]
+
+    def scan(self) -> Iterator[list[str]]:
+        """Yields the cells of every row in file order."""
+        return iter(self._rows)
+
+
+class LazyTable(Mapping):
+    """
+    Represents a table whose rows are converted to dataclass instances on access, keyed by one field.
+
+    Attributes:
+        cls (type): The dataclass type of each row.
+        header (tuple[str, ...]): The column names of the file.
+    """
+
+    def __init__(
+        self,
+        cls: type,
+        header: tuple[str, ...],
+        rows: dict[Any, int],
+        source: Union[_MappedRows, _RawRows]
+    ):
+        """
+        Creates a table over indexed rows; use `from_file` to read one from a file.
+
+        Args:
+            cls (type): The dataclass type of each row.
+            header (tuple[str, ...]): The column names of the rows.
+            rows (dict[Any, int]): The row number of each key, in table order.
+            source (_MappedRows | _RawRows): The raw cells of the rows.
+        """
+        self.cls = cls
+        self.header = header
+        self._rows = rows
+        self._source = source
+        self._cache: dict[Any, Any] = {}
+        self._overrides: dict[str, dict[Any, Any]] = {}
+
+    @classmethod
+    def from_file(cls, filepath: str, row_cls: type, delimiter: str = ',', key: str = 'id') -> 'LazyTable':
+        """
+        Indexes the rows of a file by key, converting nothing else.
+
+        Args:
+            filepath (str): The path to the CSV file, optionally compressed, or to a JSON Lines file.
+            row_cls (type): The dataclass type of each row.
+            delimiter (str): The delimiter used in the CSV file.
+            key (str): The field identifying each row.
+
+        Returns:
+            LazyTable: The table. Plain CSV files are memory-mapped; other files keep their raw rows in memory.
+
+        Raises:
+            ValueError: If `row_cls` is not a dataclass, or has no `key` field or the file no `key` column.
+        """
+        key_field = {field.name: field for field in dataclasses.fields(project_dataclass(row_cls, None))}.get(key)
+        if key_field is None:
+            raise ValueError(f"Dataclass {row_cls.__name__} must have a {key!r} field to use as key")
+        convert_key = _field_converter(key_field.type)
+
+        input_format = detect_input_format(filepath)
+        if input_format.seekable and os.path.getsize(filepath):
+            source = _MappedRows(filepath, delimiter)
+            header = source.header()
+            if key not in header:
+                raise ValueError(f"{filepath} has no {key!r} column")
+            return cls(row_cls, header, source.index(header.index(key), convert_key), source)
+
+        with open_input_text(filepath, input_format) as textfile:
+            reader = iter_input_rows(textfile, input_format, delimiter)
+            header = tuple(next(reader, ()))
+            raw_rows = [row for row in reader if not _is_blank(row)]
+        if header and key not in header:
+            raise ValueError(f"{filepath} has no {key!r} column")
+        rows = {convert_key(row[header.index(key)]): index for index, row in enumerate(raw_rows)}
+        return cls(row_cls, header, rows, _RawRows(raw_rows))
+
+    @property
+    def materialized(self) -> int:
+        """The number of rows whose instance was built and cached."""
+        return len(self._cache)
+
+    def __getitem__(self, key: Any) -> Any:
+        instance = self._cache.get(key)
+        if instance is None:
+            instance = self._cache[key] = self._build(key, self._source.cells(self._rows[key]))
+        return instance
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._rows
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _iter_cells(self) -> Iterator[tuple[Any, list[str]]]:
+        """Yields the key and raw cells of every row in table order, scanning the rows when keys are unique."""
+        if len(self._rows) == self._source.count:
+            # Without a repeated key, table order is file order
+            return zip(self._rows, self._source.scan())
+        return ((key, self._source.cells(row)) for key, row in self._rows.items())
+
+    def _build(self, key: Any, cells: list[str]) -> Any:
+        """Builds the instance of a row, with the values assigned by `set_column`."""
+        plan, interned = _column_plan(self.cls, self.header, None)
+        instance = plan.build(_convert(cells, plan, interned))
+        for name, values in self._overrides.items():
+            if key in values:
+                setattr(instance, name, values[key])
+        return instance
+
+    def iter_columns(self, *names: str) -> Iterator[tuple]:
+        """
+        Yields the values of some fields of every row, in table order, without building instances.
+
+        Rows already materialized yield the values of their instance, including updates made to it.
+
+        Args:
+            *names (str): The fields to read, e.g. `'id', 'sponsor_id'`.
+
+        Yields:
+            tuple: The values of the fields of each row, in the order of `names`.
+
+        Raises:
+            ValueError: If a name is not a field of the dataclass.
+        """
+        project_dataclass(self.cls, names)
+        read = tuple(name for name in names if name in self.header)
+        plan, interned = _column_plan(self.cls, self.header, read)
+        defaults = {field.name: _field_default(field) for field in dataclasses.fields(self.cls) if field.name in names}
+        overrides = {name: self._overrides.get(name, {}) for name in names}
+        direct = read == names and not any(overrides.values())
+        for key, cells in self._iter_cells():
+            instance = self._cache.get(key)
+            if instance is not None:
+                yield tuple(getattr(instance, name) for name in names)
+            elif direct:
+                yield tuple(_convert(cells, plan, interned))
+            else:
+                values = dict(zip(read, _convert(cells, plan, interned)))
+                yield tuple(
+                    overrides[name][key] if key in overrides[name] else values.get(name, defaults[name])
+                    for name in names
+                )
+
+    def column(self, name: str) -> Iterator[Any]:
+        """Yields the values of one field of every row, in table order (see `iter_columns`)."""
+        for (value,) in self.iter_columns(name):
+            yield value
+
+    def set_column(self, name: str, values: Mapping[Any, Any]):
+        """
+        Assigns a field of many rows without building their instances.
+
+        Args:
+            name (str): The field to assign.
+            values (Mapping[Any, Any]): The new value of the field, by key.
+
+        Raises:
+            ValueError: If the name is not a field of the dataclass.
+            KeyError: If a key is not in the table.
+        """
+        project_dataclass(self.cls, (name,))
+        for key in values:
+            if key not in self._rows:
+                raise KeyError(key)
+        self._overrides.setdefault(name, {}).update(values)
+        for key, value in values.items():
+            instance = self._cache.get(key)
+            if instance is not None:
+                setattr(instance, name, value)
+
+    def iter_rows(self) -> Iterator[Any]:
+        """
+        Yields the instance of every row, in table order, caching none of those built.
+
+        Unlike `values()`, which caches every instance, this keeps memory bounded while writing a table
+        out; updates made to the instances of rows not materialized before are not kept.
+        """
+        for key, cells in self._iter_cells():
+            instance = self._cache.get(key)
+            yield instance if instance is not None else self._build(key, cells)
@@ -0,0 +1,119 @@
+"""
+This module contains test cases for `utils.LazyTable`, which converts the rows of a table only when they are accessed.
+
+Test functions include:
+- `test_lazy_table_matches_eager_dict`: Tests lookups and iteration against `parse_csv_to_dataclass_dict`.
+- `test_primary_sponsors_are_assigned_column_wise`: Tests `assign_bill_primary_sponsors` without building bills.
+- `test_compressed_file_keeps_raw_rows`: Tests the in-memory fallback for files without byte offsets.
+- `test_whitespace_only_line_is_skipped`: Tests that indexing and scanning skip the same blank rows.
+"""
+import gzip
+
+import pytest
+
+from handlers import assign_bill_primary_sponsors
+from models import Bills, Legislators
+from utils import LazyTable, parse_csv_to_dataclass_dict
+
+BILLS_TEXT = (
+    "id,title,sponsor_id\n"
+    "101,\"Education Reform Act, part 1\",1\n"
+    "102,\"Healthcare Reform Act\nwith a line break\",2\n"
+    "\n"
+    "103,Tax Act,9\n"
+    "101,\"Education Reform Act, \"\"amended\"\"\",3\n"
+)
+LEGISLATORS_TEXT = "id,name\n1,Alice\n2,Bob\n3,Alice\n"
+
+
+@pytest.fixture(name="input_dir")
+def fixture_input_dir(tmp_path):
+    """Writes bills with quoted titles, a blank line and a repeated ID, and legislators sharing a name."""
+    (tmp_path / "bills.csv").write_text(BILLS_TEXT, encoding="utf-8")
+    (tmp_path / "legislators.csv").write_text(LEGISLATORS_TEXT, encoding="utf-8")
+    return tmp_path
+
+
+def test_lazy_table_matches_eager_dict(input_dir):
+    """
+    Test case where a lazy table is read like the dict of the same file.
+
+    Simulates:
+    - Lookups of a few bills, then iterations over every row, and two legislators named Alice.
+    """
+    expected = parse_csv_to_dataclass_dict(str(input_dir / "bills.csv"), Bills, ",")
+    bills = LazyTable.from_file(str(input_dir / "bills.csv"), Bills)
+
+    assert list(bills) == list(expected)
+    assert 999 not in bills and 103 in bills
+    assert bills.materialized == 0
+    assert bills[101] == expected[101] and bills[101] is bills[101]
+    assert bills[102].title == "Healthcare Reform Act\nwith a line break"
+    assert bills.materialized == 2
+    assert list(bills.column('sponsor_id')) == [3, 2, 9]
+    assert list(bills.iter_rows()) == list(expected.values())
+    assert bills.materialized == 2
+
+    legislators = LazyTable.from_file(str(input_dir / "legislators.csv"), Legislators)
+    assert legislators[1].name is legislators[3].name
+    with pytest.raises(ValueError):
+        list(bills.iter_columns('id', 'unknown'))
+
+
+def test_primary_sponsors_are_assigned_column_wise(input_dir):
+    """
+    Test case where the sponsors of lazy bills are assigned before and after a bill is materialized.
+
+    Simulates:
+    - Bill 102 looked up and updated first, the sponsors assigned, then the bills written out.
+    """
+    expected = parse_csv_to_dataclass_dict(str(input_dir / "bills.csv"), Bills, ",")
+    assign_bill_primary_sponsors(expected, parse_csv_to_dataclass_dict(str(input_dir / "legislators.csv"),
+                                                                       Legislators, ","))
+    expected[102].supporter_count = 4
+    bills = LazyTable.from_file(str(input_dir / "bills.csv"), Bills)
+    legislators = LazyTable.from_file(str(input_dir / "legislators.csv"), Legislators)
+
+    bills[102].supporter_count = 4
+    assign_bill_primary_sponsors(bills, legislators)
+
+    assert bills.materialized == 1
+    assert legislators.materialized == 2
+    assert list(bills.iter_columns('id', 'primary_sponsor')) == [(101, "Alice"), (102, "Bob"), (103, "Unknown")]
+    assert list(bills.iter_rows()) == list(expected.values())
+    with pytest.raises(KeyError):
+        bills.set_column('primary_sponsor', {999: "Nobody"})
+
+
+def test_compressed_file_keeps_raw_rows(input_dir):
+    """
+    Test case where the bills file is gzip-compressed, so its rows can't be memory-mapped.
+
+    Simulates:
+    - The same bills read from `bills.csv.gz`.
+    """
+    (input_dir / "bills.csv.gz").write_bytes(gzip.compress(BILLS_TEXT.encode()))
+    expected = parse_csv_to_dataclass_dict(str(input_dir / "bills.csv"), Bills, ",")
+
+    bills = LazyTable.from_file(str(input_dir / "bills.csv.gz"), Bills)
+
+    assert bills[103] == expected[103]
+    assert list(bills.iter_rows()) == list(expected.values())
+
+
+def test_whitespace_only_line_is_skipped(tmp_path):
+    """
+    Test case where a line holding only spaces sits between rows with unique keys.
+
+    Simulates:
+    - Three legislators with a whitespace-only line after Alice, read plain and gzip-compressed.
+    """
+    text = "id,name\n1,Alice\n   \n2,Bob\n3,Carol\n"
+    (tmp_path / "legislators.csv").write_text(text, encoding="utf-8")
+    (tmp_path / "legislators.csv.gz").write_bytes(gzip.compress(text.encode()))
+
+    for name in ("legislators.csv", "legislators.csv.gz"):
+        legislators = LazyTable.from_file(str(tmp_path / name), Legislators)
+
+        assert list(legislators.iter_columns('id', 'name')) == [(1, "Alice"), (2, "Bob"), (3, "Carol")]
+        assert [legislator.name for legislator in legislators.iter_rows()] == ["Alice", "Bob", "Carol"]
@@ -0,0 +1,244 @@
+"""Docstring for the query_engine.py module.
+This module provides a small declarative engine for grouped counts over a scanned table with hash joins.
+
+A report is declared as `Aggregate`s, such as "count the vote results grouped by `votes.bill_id`
+where `vote_type` is FOR", instead of a hand-written loop with its own scan. Columns of other
+tables are reached through `Join`s: `votes.bill_id` reads `bill_id` from the row of the `votes`
+table whose key is the scanned `vote_id`, and joins can be chained (`bills.sponsor_id` through
+`votes.bill_id`). `QueryEngine.run` plans all the aggregates it is given together:
+    - Every chain of joins starting from the same join is collapsed into one hash lookup from the
+      scanned key to the joined columns the aggregates read. Lookups are built on first use and kept
+      by the engine, so later runs, and other reports reading the same columns, reuse them.
+    - Aggregates grouping by the same column and filtering on the same columns share one counter
+      keyed by the group and filter values: the FOR and AGAINST counts of a bill are a single counter.
+    - Every counter is updated in a single scan of the rows, so a report grouped by another column
+      costs one more counter increment per row rather than another pass over the data.
+
+Example:
+>>> engine = QueryEngine([Join('votes', on='vote_id', table=votes)])
+>>> counts = engine.run(iter_vote_result_columns(vote_results), VOTE_RESULT_COLUMNS, [
+...     Aggregate('supporter_count', group_by='votes.bill_id', where=(('vote_type', VoteType.FOR),)),
+...     Aggregate('opposer_count', group_by='votes.bill_id', where=(('vote_type', VoteType.AGAINST),)),
+... ])
+>>> counts['supporter_count'][2952375]
+"""
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Sequence
+
+
+def _filter_counts(counter: dict, values: tuple) -> dict[Any, int]:
+    """Sums the counts of a grouping set whose filter values are `values`, by group value."""
+    if not values:
+        return counter
+    counts: dict[Any, int] = {}
+    for (group, *filters), count in counter.items():
+        if tuple(filters) == values:
+            counts[group] = counts.get(group, 0) + count
+    return counts
+
+
+@dataclass(frozen=True)
+class Join:
+    """
+    Represents a lookup table reachable from the scanned rows.
+
+    Attributes:
+        name (str): The prefix of the table's columns in queries, e.g. `votes` for `votes.bill_id`.
+        on (str): The column holding the key of `table`: a scanned column, or a column of another join.
+        table (dict[Any, Any]): The lookup table; the columns of its rows are read with `getattr`.
+    """
+    name: str
+    on: str
+    table: dict[Any, Any]
+
+
+@dataclass(frozen=True)
+class Aggregate:
+    """
+    Represents a count of the scanned rows, grouped by one column.
+
+    Attributes:
+        name (str): The name of the counts in the result of `QueryEngine.run`.
+        group_by (str): The column to group by, scanned or joined.
+        where (tuple[tuple[str, Any], ...]): The `(column, value)` equalities the counted rows must meet.
+    """
+    name: str
+    group_by: str
+    where: tuple[tuple[str, Any], ...] = ()
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    """
+    Represents how a set of aggregates is computed in a single scan.
+
+    Attributes:
+        lookups (tuple[tuple[int, dict], ...]): The position of the scanned key of each hash lookup, and the
+            lookup, which maps the key to a tuple of joined values appended to the row.
+        grouping_sets (tuple[tuple[str, ...], ...]): The columns of each counter: the group column, then the
+            filter columns.
+        getters (tuple[Callable, ...]): The function extracting the counter key of each grouping set from a row.
+        outputs (dict[str, tuple[int, tuple]]): The grouping set and filter values of each aggregate, by name.
+    """
+    lookups: tuple[tuple[int, dict], ...]
+    grouping_sets: tuple[tuple[str, ...], ...]
+    getters: tuple[Callable, ...]
+    outputs: dict[str, tuple[int, tuple]]
+
+
+class QueryEngine:
+    """
+    Represents a set of joins, the hash lookups built over them, and the planner running aggregates.
+
+    Attributes:
+        joins (dict[str, Join]): The joins by name.
+        lookups_built (int): The number of hash lookups built so far.
+    """
+
+    def __init__(self, joins: Iterable[Join] = ()):
+        self.joins = {join.name: join for join in joins}
+        self.lookups_built = 0
+        self._lookups: dict[tuple[str, tuple[str, ...]], dict] = {}
+
+    def _chain(self, column: str) -> list[Join]:
+        """
+        Returns the joins followed to read a column, starting from the one keyed by a scanned column.
+
+        Raises:
+            ValueError: If the column names an unknown join.
+        """
+        chain = []
+        while '.' in column:
+            join = self.joins.get(column.partition('.')[0])
+            if join is None:
+                raise ValueError(f"Unknown join in column {column!r}, expected one of {sorted(self.joins)}")
+            chain.append(join)
+            column = join.on
+        return chain[::-1]
+
+    def _value(self, column: str, key: Any) -> Any:
+        """Reads a joined column from the scanned key of its first join; raises `KeyError` on a missing row."""
+        if '.' not in column:
+            return key
+        name, _, attribute = column.partition('.')
+        join = self.joins[name]
+        return getattr(join.table[self._value(join.on, key)], attribute)
+
+    def _lookup(self, root: Join, columns: tuple[str, ...]) -> dict:
+        """
+        Returns the hash lookup from the keys of `root` to the values of joined columns, building it once.
+
+        Keys whose chain of joins reaches a missing row are left out, so scanning them raises `KeyError`.
+        """
+        lookup = self._lookups.get((root.name, columns))
+        if lookup is None:
+            lookup = {}
+            for key in root.table:
+                try:
+                    lookup[key] = tuple(self._value(column, key) for column in columns)
+                except KeyError:
+                    continue
+            self._lookups[root.name, columns] = lookup
+            self.lookups_built += 1
+        return lookup
+
+    def _plan_lookups(
+        self,
+        columns: Sequence[str],
+        grouping_sets: list[tuple[str, ...]]
+    ) -> tuple[list[tuple[int, dict]], dict[str, int]]:
+        """
+        Plans one hash lookup per first join of the joined columns read by the grouping sets.
+
+        Returns:
+            tuple[list[tuple[int, dict]], dict[str, int]]: The lookups, and the position of every scanned
+                and joined column in the rows extended with the joined values.
+        """
+        joined: dict[str, list[str]] = {}
+        for column in dict.fromkeys(column for grouping_set in grouping_sets for column in grouping_set):
+            chain = self._chain(column)
+            if chain:
+                joined.setdefault(chain[0].name, []).append(column)
+            elif column not in columns:
+                raise ValueError(f"Unknown column {column!r}, expected one of {list(columns)}")
+
+        positions = {column: index for index, column in enumerate(columns)}
+        lookups = []
+        for name, joined_columns in joined.items():
+            root = self.joins[name]
+            if root.on not in positions:
+                raise ValueError(f"Unknown column {root.on!r} in join {name!r}, expected one of {list(columns)}")
+            lookups.append((positions[root.on], self._lookup(root, tuple(joined_columns))))
+            for column in joined_columns:
+                positions[column] = len(positions)
+        return lookups, positions
+
+    def plan(self, columns: Sequence[str], aggregates: Iterable[Aggregate]) -> QueryPlan:
+        """
+        Plans the lookups and counters computing the aggregates over rows with the given columns.
+
+        Args:
+            columns (Sequence[str]): The names of the scanned columns, in row order.
+            aggregates (Iterable[Aggregate]): The aggregates to compute.
+
+        Returns:
+            QueryPlan: The plan run by `run`.
+
+        Raises:
+            ValueError: If an aggregate reads an unknown column or join, or two aggregates share a name.
+        """
+        aggregates = list(aggregates)
+        if len({aggregate.name for aggregate in aggregates}) != len(aggregates):
+            raise ValueError("Aggregate names must be unique")
+        grouping_sets = list(dict.fromkeys(
+            (aggregate.group_by, *sorted(column for column, _ in aggregate.where)) for aggregate in aggregates
+        ))
+
+        lookups, positions = self._plan_lookups(columns, grouping_sets)
+
+        outputs = {}
+        for aggregate in aggregates:
+            where = dict(aggregate.where)
+            grouping_set = (aggregate.group_by, *sorted(where))
+            outputs[aggregate.name] = (grouping_sets.index(grouping_set), tuple(where[key] for key in sorted(where)))
+        return QueryPlan(
+            lookups=tuple(lookups),
+            grouping_sets=tuple(grouping_sets),
+            getters=tuple(itemgetter(*(positions[column] for column in grouping_set))
+                          for grouping_set in grouping_sets),
+            outputs=outputs,
+        )
+
+    def run(
+        self,
+        rows: Iterable[tuple],
+        columns: Sequence[str],
+        aggregates: Iterable[Aggregate]
+    ) -> dict[str, dict[Any, int]]:
+        """
+        Computes every aggregate in a single scan of the rows.
+
+        Args:
+            rows (Iterable[tuple]): The scanned rows, consumed once.
+            columns (Sequence[str]): The names of the scanned columns, in row order.
+            aggregates (Iterable[Aggregate]): The aggregates to compute.
+
+        Returns:
+            dict[str, dict[Any, int]]: The counts of each aggregate by name, keyed by group value; groups
+                without a matching row are absent.
+
+        Raises:
+            KeyError: If a row references a missing row of a joined table.
+            ValueError: If an aggregate reads an unknown column or join.
+        """
+        plan = self.plan(columns, aggregates)
+        counters: list[dict] = [{} for _ in plan.grouping_sets]
+        counted = list(zip(counters, plan.getters))
+        for row in rows:
+            for position, lookup in plan.lookups:
+                row = row + lookup[row[position]]
+            for counter, getter in counted:
+                key = getter(row)
+                counter[key] = counter.get(key, 0) + 1
+        return {name: _filter_counts(counters[index], values) for name, (index, values) in plan.outputs.items()}
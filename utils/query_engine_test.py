@@ -0,0 +1,87 @@
+"""
+This module contains test cases for the declarative query engine in `utils.query_engine`.
+
+Test functions include:
+- `test_run_matches_hand_written_counts`: Tests grouped and filtered counts through a chain of joins.
+- `test_plan_fuses_aggregates_and_reuses_lookups`: Tests the grouping sets and the lookup cache.
+- `test_invalid_queries_raise`: Tests unknown columns, unknown joins and missing joined rows.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from utils import Aggregate, Join, QueryEngine
+
+ROWS = [(1, 10, 'yes'), (2, 10, 'no'), (1, 11, 'yes'), (3, 12, 'yes'), (2, 12, 'yes')]
+COLUMNS = ('person', 'ballot', 'answer')
+
+
+def _engine():
+    """Builds an engine joining ballots to topics and topics to their owner."""
+    ballots = {10: SimpleNamespace(topic=100), 11: SimpleNamespace(topic=101), 12: SimpleNamespace(topic=100)}
+    topics = {100: SimpleNamespace(owner='Ann'), 101: SimpleNamespace(owner='Ben')}
+    return QueryEngine([Join('ballots', on='ballot', table=ballots), Join('topics', on='ballots.topic', table=topics)])
+
+
+def test_run_matches_hand_written_counts():
+    """
+    Test case for counts grouped by a scanned column, a joined column and a column two joins away.
+
+    Simulates:
+    - Five answers to three ballots on two topics, counted with and without a filter.
+    """
+    counts = _engine().run(iter(ROWS), COLUMNS, [
+        Aggregate('yes_by_person', group_by='person', where=(('answer', 'yes'),)),
+        Aggregate('by_topic', group_by='ballots.topic'),
+        Aggregate('yes_by_owner', group_by='topics.owner', where=(('answer', 'yes'),)),
+        Aggregate('no_by_owner', group_by='topics.owner', where=(('answer', 'no'),)),
+    ])
+
+    assert counts['yes_by_person'] == {1: 2, 3: 1, 2: 1}
+    assert counts['by_topic'] == {100: 4, 101: 1}
+    assert counts['yes_by_owner'] == {'Ann': 3, 'Ben': 1}
+    assert counts['no_by_owner'] == {'Ann': 1}
+
+
+def test_plan_fuses_aggregates_and_reuses_lookups():
+    """
+    Test case for the plan of FOR/AGAINST-style aggregate pairs.
+
+    Simulates:
+    - Two pairs of aggregates sharing their grouping sets, then a second report reading the same joined
+      columns, which reuses the lookup built by the first one.
+    """
+    engine = _engine()
+    aggregates = [
+        Aggregate('yes_by_person', group_by='person', where=(('answer', 'yes'),)),
+        Aggregate('no_by_person', group_by='person', where=(('answer', 'no'),)),
+        Aggregate('yes_by_owner', group_by='topics.owner', where=(('answer', 'yes'),)),
+        Aggregate('no_by_owner', group_by='topics.owner', where=(('answer', 'no'),)),
+    ]
+
+    plan = engine.plan(COLUMNS, aggregates)
+    engine.run(iter(ROWS), COLUMNS, aggregates[2:])
+
+    assert plan.grouping_sets == (('person', 'answer'), ('topics.owner', 'answer'))
+    assert plan.outputs['no_by_owner'] == (1, ('no',))
+    assert plan.lookups[0][1] == {10: ('Ann',), 11: ('Ben',), 12: ('Ann',)}
+    assert engine.lookups_built == 1
+
+
+def test_invalid_queries_raise():
+    """
+    Test case for queries that can't be planned or rows that can't be joined.
+
+    Simulates:
+    - An unknown scanned column, an unknown join, duplicate names, and an answer to an unknown ballot.
+    """
+    engine = _engine()
+
+    with pytest.raises(ValueError, match="Unknown column"):
+        engine.plan(COLUMNS, [Aggregate('count', group_by='age')])
+    with pytest.raises(ValueError, match="Unknown join"):
+        engine.plan(COLUMNS, [Aggregate('count', group_by='parties.name')])
+    with pytest.raises(ValueError, match="unique"):
+        engine.plan(COLUMNS, [Aggregate('count', group_by='person'), Aggregate('count', group_by='ballot')])
+    with pytest.raises(KeyError):
+        engine.run(iter([(1, 99, 'yes')]), COLUMNS, [Aggregate('count', group_by='ballots.topic')])
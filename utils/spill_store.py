@@ -0,0 +1,136 @@
+"""Docstring for the spill_store.py module.
+This module provides hash-partitioned spill files for aggregations that may not fit in memory.
+
+An aggregation keeps its state in memory until an estimate of its size exceeds a memory budget;
+it then appends its state to `SpillPartitions`, one CSV file per hash partition of the key, and
+starts again from an empty state. Every row of a key lands in the same partition, so each
+partition can later be read back and aggregated on its own, with about `1 / partitions` of the
+total state in memory at a time. A partition that is still too large can be split again into
+`SpillPartitions` with another `salt`, which spreads its keys with a different hash.
+
+Spill files are written to a temporary directory that is removed when the partitions are closed.
+Example:
+>>> with SpillPartitions('counts', partitions=16) as spill:
+...     spill.write(2952375, (3, 1))
+...     spill.finish()
+...     for row in spill.read(spill.partition(2952375)):
+...         ...
+"""
+import csv
+import os
+import tempfile
+from typing import Iterable, Iterator, Optional, TextIO
+
+DEFAULT_MEMORY_BUDGET = 256 * 1024 ** 2
+DEFAULT_PARTITIONS = 16
+
+
+class SpillPartitions:
+    """
+    Represents append-only CSV spill files, one per hash partition of an integer key.
+
+    Attributes:
+        name (str): The prefix of the spill file names.
+        partitions (int): The number of partitions.
+        salt (int): Mixed into the hash of the keys, so that re-partitioning a partition spreads its keys.
+        partition_rows (list[int]): The number of rows written so far to each partition.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        partitions: int = DEFAULT_PARTITIONS,
+        spill_dir: Optional[str] = None,
+        salt: int = 0
+    ):
+        """
+        Creates the temporary directory of the spill files; the files themselves are created on first write.
+
+        Args:
+            name (str): The prefix of the spill file names.
+            partitions (int): The number of partitions.
+            spill_dir (str | None): Where to create the temporary directory (default: the system temporary directory).
+            salt (int): Mixed into the hash of the keys; 0 partitions keys by their plain hash.
+        """
+        if partitions < 1:
+            raise ValueError("partitions must be at least 1")
+        self.name = name
+        self.partitions = partitions
+        self.salt = salt
+        self.partition_rows = [0] * partitions
+        # pylint: disable-next=consider-using-with
+        self._directory = tempfile.TemporaryDirectory(prefix=f'{name}-', dir=spill_dir)
+        self._files: list[Optional[TextIO]] = [None] * partitions
+        self._writers: list = [None] * partitions
+
+    def __enter__(self) -> 'SpillPartitions':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def rows(self) -> int:
+        """The number of rows written so far."""
+        return sum(self.partition_rows)
+
+    def _path(self, partition: int) -> str:
+        """Returns the path of the spill file of a partition."""
+        return os.path.join(self._directory.name, f'{self.name}-{partition}.csv')
+
+    def partition(self, key: int) -> int:
+        """Returns the partition of a key."""
+        key_hash = hash((self.salt, key)) if self.salt else hash(key)
+        return key_hash % self.partitions
+
+    def write(self, key: int, values: Iterable):
+        """Appends a row holding a key and its values to the partition of the key."""
+        self.append(self.partition(key), (key, *values))
+
+    def append(self, partition: int, row: Iterable):
+        """Appends a row to a given partition, e.g. to write one sorted run per partition."""
+        writer = self._writers[partition]
+        if writer is None:
+            # pylint: disable-next=consider-using-with
+            self._files[partition] = open(self._path(partition), 'a', newline='', encoding='utf-8')
+            writer = self._writers[partition] = csv.writer(self._files[partition])
+        writer.writerow(row)
+        self.partition_rows[partition] += 1
+
+    def add_partition(self) -> int:
+        """
+        Adds an empty partition, e.g. for one more sorted run, and returns its index.
+
+        Keys written afterwards are hashed over the new number of partitions, so only add partitions
+        to spill files that are written with `append`.
+        """
+        self._files.append(None)
+        self._writers.append(None)
+        self.partition_rows.append(0)
+        self.partitions += 1
+        return self.partitions - 1
+
+    def size(self, partition: int) -> int:
+        """Returns the bytes written to the spill file of a partition, once it is finished."""
+        path = self._path(partition)
+        return os.path.getsize(path) if os.path.exists(path) else 0
+
+    def finish(self):
+        """Flushes and closes the spill files so they can be read."""
+        for partition, file in enumerate(self._files):
+            if file is not None:
+                file.close()
+                self._files[partition] = self._writers[partition] = None
+
+    def read(self, partition: int) -> Iterator[list[str]]:
+        """Yields the rows of a partition in the order they were written, as lists of strings."""
+        path = self._path(partition)
+        if not os.path.exists(path):
+            return
+        with open(path, newline='', encoding='utf-8') as file:
+            yield from csv.reader(file)
+
+    def close(self):
+        """Closes and removes every spill file."""
+        self.finish()
+        self._directory.cleanup()
@@ -0,0 +1,164 @@
+"""Docstring for the sqlite_store.py module.
+This module bulk-loads the input CSV files into a local SQLite database.
+
+Each table is parsed with `iter_csv_dataclasses`, so values go through the same type conversion
+and validation as the in-memory path, and inserted with `executemany` inside a single transaction.
+Indexes are created once the rows are in, which is much cheaper than maintaining them row by row.
+
+The database keeps the modification time and size of the CSV file behind each table, so a later
+load only re-imports the tables whose file changed; unchanged tables are queried as they are.
+
+The bills, legislators and votes tables follow the semantics of `parse_csv_to_dataclass_dict`: when
+an ID appears more than once, the last row wins but keeps the position of the first one. Every vote
+result row is kept, as when the vote results are streamed.
+
+Example:
+>>> connection = open_sqlite_store(".cache/legislative.sqlite3")
+>>> load_csvs_into_sqlite(connection, "input")
+['bills', 'legislators', 'votes', 'vote_results']
+"""
+import os
+import sqlite3
+from dataclasses import MISSING, fields
+from typing import Iterable
+
+from models import Bills, Legislators, VoteResults, Votes
+from .csv_reader import iter_csv_dataclasses
+from .input_formats import detect_input_format, find_input_file, iter_input_rows, open_input_text
+
+DEFAULT_DATABASE_PATH = os.path.join('.cache', 'legislative.sqlite3')
+SQLITE_TABLES = {
+    'bills': Bills,
+    'legislators': Legislators,
+    'votes': Votes,
+    'vote_results': VoteResults,
+}
+# Tables keyed by ID, and the indexes created on each table after it is loaded
+_DEDUPLICATED_TABLES = ('bills', 'legislators', 'votes')
+_INDEXES = {
+    'bills': ('CREATE UNIQUE INDEX bills_id ON bills (id)',),
+    'legislators': ('CREATE UNIQUE INDEX legislators_id ON legislators (id)',),
+    'votes': ('CREATE UNIQUE INDEX votes_id ON votes (id)',),
+    'vote_results': (
+        'CREATE INDEX vote_results_vote ON vote_results (vote_id, vote_type)',
+        'CREATE INDEX vote_results_legislator ON vote_results (legislator_id, vote_type)',
+    ),
+}
+
+
+def _table_columns(cls: type) -> list[str]:
+    """Returns the columns stored for a model: its fields without a default value."""
+    return [f.name for f in fields(cls) if f.default is MISSING and f.default_factory is MISSING]
+
+
+def _read_header(filepath: str) -> list[str]:
+    """Returns the column names of an input file: the first line of a CSV file, or the keys of a JSON Lines file."""
+    input_format = detect_input_format(filepath)
+    with open_input_text(filepath, input_format) as textfile:
+        return next(iter_input_rows(textfile, input_format, ','), [])
+
+
+def open_sqlite_store(database_path: str = DEFAULT_DATABASE_PATH) -> sqlite3.Connection:
+    """
+    Opens (and creates, if needed) the SQLite database of the input tables.
+
+    The connection is in autocommit mode, so `load_csvs_into_sqlite` controls its own transaction.
+
+    Args:
+        database_path (str): The path to the database file, or ':memory:'.
+
+    Returns:
+        sqlite3.Connection: The open connection.
+    """
+    if database_path != ':memory:':
+        directory = os.path.dirname(os.path.abspath(database_path))
+        os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(database_path, isolation_level=None)
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS sources (name TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER)'
+    )
+    return connection
+
+
+def _insert_rows(connection: sqlite3.Connection, name: str, filepath: str):
+    """Recreates one table and bulk-inserts the rows of its CSV file, without any index."""
+    cls = SQLITE_TABLES[name]
+    columns = _table_columns(cls)
+    header = _read_header(filepath)
+    missing = [column for column in columns if column not in header]
+    if missing:
+        raise ValueError(f"{filepath} is missing the columns {missing}")
+
+    connection.execute(f'DROP TABLE IF EXISTS {name}')
+    connection.execute(f"CREATE TABLE {name} ({', '.join(columns)})")
+    rows = iter_csv_dataclasses(filepath, cls, delimiter=',', as_tuples=True)
+    # The tuples follow the field order, where fields without a default come first
+    if len([f for f in fields(cls) if f.name in header]) > len(columns):
+        rows = (row[:len(columns)] for row in rows)
+    placeholders = ', '.join('?' * len(columns))
+    connection.executemany(f'INSERT INTO {name} VALUES ({placeholders})', rows)
+
+
+def _deduplicate(connection: sqlite3.Connection, name: str):
+    """Keeps one row per ID, with the values of its last row at the position of its first row."""
+    values = [column for column in _table_columns(SQLITE_TABLES[name]) if column != 'id']
+    connection.execute(f'CREATE INDEX {name}_load ON {name} (id)')
+    if connection.execute(f'SELECT 1 FROM {name} GROUP BY id HAVING COUNT(*) > 1 LIMIT 1').fetchone():
+        connection.execute(
+            f"UPDATE {name} SET ({', '.join(values)}) = ("
+            f"SELECT {', '.join(values)} FROM {name} AS last WHERE last.id = {name}.id "
+            f"ORDER BY last.rowid DESC LIMIT 1"
+            f") WHERE id IN (SELECT id FROM {name} GROUP BY id HAVING COUNT(*) > 1)"
+        )
+        connection.execute(f'DELETE FROM {name} WHERE rowid NOT IN (SELECT MIN(rowid) FROM {name} GROUP BY id)')
+    connection.execute(f'DROP INDEX {name}_load')
+
+
+def load_csvs_into_sqlite(
+    connection: sqlite3.Connection,
+    input_dir: str,
+    tables: Iterable[str] = tuple(SQLITE_TABLES),
+    force: bool = False
+) -> list[str]:
+    """
+    Loads the CSV files of the given tables into the database, skipping tables whose file is unchanged.
+
+    All the tables are reloaded in a single transaction: on any error the database is left as it was.
+
+    Args:
+        connection (sqlite3.Connection): A connection returned by `open_sqlite_store`.
+        input_dir (str): Directory containing `<table>.csv` (or a compressed or JSON Lines variant) for each table.
+        tables (Iterable[str]): Names of the tables to load, among `SQLITE_TABLES`.
+        force (bool): Whether to reload the tables even if their file is unchanged.
+
+    Returns:
+        list[str]: The names of the tables that were (re)loaded.
+    """
+    loaded = {row[0]: tuple(row[1:]) for row in connection.execute('SELECT name, mtime_ns, size FROM sources')}
+    stale = []
+    for name in tables:
+        if name not in SQLITE_TABLES:
+            raise ValueError(f"Unknown table {name!r}")
+        filepath = find_input_file(input_dir, name)
+        stat = os.stat(filepath)
+        if force or loaded.get(name) != (stat.st_mtime_ns, stat.st_size):
+            stale.append((name, filepath, stat))
+    if not stale:
+        return []
+
+    connection.execute('BEGIN')
+    try:
+        for name, filepath, stat in stale:
+            _insert_rows(connection, name, filepath)
+            if name in _DEDUPLICATED_TABLES:
+                _deduplicate(connection, name)
+            for statement in _INDEXES[name]:
+                connection.execute(statement)
+            connection.execute('INSERT OR REPLACE INTO sources VALUES (?, ?, ?)',
+                               (name, stat.st_mtime_ns, stat.st_size))
+        connection.execute('COMMIT')
+    except BaseException:
+        connection.execute('ROLLBACK')
+        raise
+    connection.execute('ANALYZE')
+    return [name for name, _, _ in stale]
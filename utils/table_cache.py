@@ -0,0 +1,229 @@
+"""Docstring for the table_cache.py module.
+This module provides a binary cache for tables parsed by `parse_csv_to_dataclass_dict`.
+
+After a CSV file is parsed, its typed columns are written to a compact binary file in a cache
+directory. The cache file is keyed on the CSV path, modification time, size, delimiter and the
+dataclass schema, so any change to the input or to the model invalidates it. Later loads map the
+cache file into memory with `mmap` and rebuild the instances without any CSV tokenizing or type
+conversion. Old cache files are evicted in least-recently-used order once the cache directory
+exceeds its size budget.
+
+Cache file layout:
+    - 8 bytes: the `MAGIC` marker.
+    - 4 bytes: the length of the JSON header (little-endian unsigned int).
+    - The JSON header: row count and, for each column, its name, kind, byte offset and length.
+    - The column data, each column aligned to 8 bytes. Numeric columns are packed arrays;
+      string columns are an array of `rows` end offsets followed by a UTF-8 blob.
+Example:
+>>> bills = parse_csv_to_dataclass_dict_cached("input/bills.csv", Bills, delimiter=",")
+"""
+import datetime
+import enum
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from dataclasses import fields, is_dataclass
+from typing import Any, Optional, Sequence, Type, TypeVar
+
+from .csv_reader import _unwrap_optional, parse_csv_to_dataclass_dict, project_dataclass
+
+T = TypeVar('T')
+
+MAGIC = b'LDCTBL01'
+DEFAULT_CACHE_DIR = os.path.join('.cache', 'tables')
+DEFAULT_MAX_CACHE_BYTES = 1024 ** 3
+_HEADER_LENGTH = struct.Struct('<I')
+_CACHE_SUFFIX = '.tbl'
+
+_COLUMN_KINDS = {bool: 'b', int: 'q', float: 'd', str: 's'}
+
+
+def _column_kind(field_type: Any) -> Optional[str]:
+    """
+    Returns the storage kind of a field type, or None if it can't be cached.
+
+    Kinds are `array` typecodes ('q' for integers and enums, 'd' for floats, 'b' for booleans),
+    's' for strings, or 'D' for dates and optional dates, stored as `array('q')` ordinals with 0
+    for None.
+    """
+    if _unwrap_optional(field_type)[0] == datetime.date:
+        return 'D'
+    if isinstance(field_type, type) and issubclass(field_type, enum.Enum):
+        return 'q'
+    return _COLUMN_KINDS.get(field_type)
+
+
+def _cache_key(filepath: str, cls: type, delimiter: str) -> str:
+    """Builds the cache key from the file identity and the dataclass schema."""
+    stat = os.stat(filepath)
+    identity = [
+        MAGIC.decode(), os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size, delimiter,
+        f"{cls.__module__}.{cls.__qualname__}", [(f.name, repr(f.type)) for f in fields(cls)],
+    ]
+    return hashlib.sha256(json.dumps(identity).encode()).hexdigest()
+
+
+def _encode_column(kind: str, values: list) -> bytes:
+    """Packs the values of one column into bytes."""
+    if kind == 'D':
+        return array('q', [0 if value is None else value.toordinal() for value in values]).tobytes()
+    if kind != 's':
+        return array(kind, values).tobytes()
+    blob = bytearray()
+    ends = array('q')
+    for value in values:
+        blob += value.encode('utf-8')
+        ends.append(len(blob))
+    return ends.tobytes() + bytes(blob)
+
+
+def _decode_column(kind: str, view: memoryview, rows: int) -> list:
+    """Unpacks the values of one column from a memory-mapped view."""
+    if kind == 'D':
+        with view.cast('q') as values:
+            return [datetime.date.fromordinal(value) if value else None for value in values]
+    if kind != 's':
+        with view.cast(kind) as values:
+            return values.tolist()
+    ends_size = rows * 8
+    with view[:ends_size].cast('q') as ends_view:
+        ends = ends_view.tolist()
+    with view[ends_size:] as blob:
+        values, start = [], 0
+        for end in ends:
+            values.append(str(blob[start:end], 'utf-8'))
+            start = end
+        return values
+
+
+def _write_cache_file(path: str, cls: type, objects: list):
+    """Writes the columns of the given instances to a cache file, atomically."""
+    columns, chunks, offset = [], [], 0
+    for field in fields(cls):
+        kind = _column_kind(field.type)
+        values = [getattr(obj, field.name) for obj in objects]
+        if isinstance(field.type, type) and issubclass(field.type, enum.Enum):
+            values = [value.value for value in values]
+        data = _encode_column(kind, values)
+        padding = -len(data) % 8
+        columns.append({'name': field.name, 'kind': kind, 'offset': offset, 'length': len(data)})
+        chunks.append(data + b'\0' * padding)
+        offset += len(data) + padding
+
+    header = json.dumps({'rows': len(objects), 'columns': columns}).encode()
+    header += b' ' * (-(len(MAGIC) + _HEADER_LENGTH.size + len(header)) % 8)
+    directory = os.path.dirname(path)
+    with tempfile.NamedTemporaryFile('wb', dir=directory, suffix='.tmp', delete=False) as file:
+        file.write(MAGIC + _HEADER_LENGTH.pack(len(header)) + header)
+        for chunk in chunks:
+            file.write(chunk)
+    os.replace(file.name, path)
+
+
+def _read_cache_file(path: str, cls: Type[T]) -> dict[int, T]:
+    """Rebuilds the instances stored in a cache file through a read-only memory map."""
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with memoryview(mapped) as view:
+            if view[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not a table cache file")
+            (header_length,) = _HEADER_LENGTH.unpack_from(view, len(MAGIC))
+            data_start = len(MAGIC) + _HEADER_LENGTH.size + header_length
+            header = json.loads(bytes(view[len(MAGIC) + _HEADER_LENGTH.size:data_start]))
+            names = [column['name'] for column in header['columns']]
+            columns = []
+            for column in header['columns']:
+                start = data_start + column['offset']
+                with view[start:start + column['length']] as column_view:
+                    columns.append(_decode_column(column['kind'], column_view, header['rows']))
+
+    for field, column in zip(fields(cls), columns):
+        if isinstance(field.type, type) and issubclass(field.type, enum.Enum):
+            members = {member.value: member for member in field.type}
+            column[:] = [members[value] for value in column]
+        elif field.type == bool:
+            column[:] = [bool(value) for value in column]
+    # Keywords, since the fields of projected dataclasses may be keyword-only
+    return {obj.id: obj for obj in (cls(**dict(zip(names, values))) for values in zip(*columns))}
+
+
+def evict_cache(cache_dir: str, max_cache_bytes: int, keep: Optional[str] = None):
+    """
+    Deletes the least recently used cache files until the directory fits in its size budget.
+
+    Args:
+        cache_dir (str): The cache directory.
+        max_cache_bytes (int): The size budget of the directory, in bytes.
+        keep (str | None): A cache file that must not be evicted (e.g. the one just written).
+    """
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(_CACHE_SUFFIX):
+            path = os.path.join(cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:  # Evicted meanwhile by another process sharing the cache
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_cache_bytes:
+            break
+        if path != keep:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+def parse_csv_to_dataclass_dict_cached(  # pylint: disable=too-many-arguments
+    filepath: str,
+    cls: Type[T],
+    delimiter: str,
+    *,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    max_cache_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+    enabled: bool = True,
+    columns: Optional[Sequence[str]] = None
+) -> dict[int, T]:
+    """
+    Parses a CSV file like `parse_csv_to_dataclass_dict`, reusing a binary cache of earlier parses.
+
+    Dataclasses with fields that can't be stored in the cache (anything other than `int`, `float`,
+    `bool`, `str`, integer enums and optional dates) are always parsed from the CSV file.
+
+    Args:
+        filepath (str): The path to the CSV file to read.
+        cls (Type[T]): The dataclass type to instantiate from each CSV row.
+        delimiter (str): The delimiter used in the CSV file (e.g., ',', ';', '\t').
+        cache_dir (str): The directory holding the cache files.
+        max_cache_bytes (int): The size budget of the cache directory, in bytes.
+        enabled (bool): If False, bypasses the cache entirely.
+        columns (Sequence[str] | None): If given, only these fields (which must include `id`) are
+            parsed and cached, as for `parse_csv_to_dataclass_dict`.
+
+    Returns:
+        dict[int, T]: A dict of dataclass instances created from the CSV data.
+    """
+    cls = project_dataclass(cls, columns)
+    if not enabled or not is_dataclass(cls) or any(_column_kind(f.type) is None for f in fields(cls)):
+        return parse_csv_to_dataclass_dict(filepath, cls, delimiter)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_path = os.path.join(cache_dir, _cache_key(filepath, cls, delimiter) + _CACHE_SUFFIX)
+    try:
+        result = _read_cache_file(cache_path, cls)
+        os.utime(cache_path)  # Marks the file as recently used for the LRU eviction
+        return result
+    except (OSError, ValueError, KeyError, TypeError, struct.error):
+        pass
+
+    result = parse_csv_to_dataclass_dict(filepath, cls, delimiter)
+    _write_cache_file(cache_path, cls, list(result.values()))
+    evict_cache(cache_dir, max_cache_bytes, keep=cache_path)
+    return result
@@ -0,0 +1,113 @@
+"""
+This module contains test cases for the binary table cache in `utils.table_cache`.
+
+Test functions include:
+- `test_cache_round_trip`: Tests that a cached load returns the same instances as a CSV parse.
+- `test_projected_table_is_read_from_cache`: Tests that a projection with keyword-only fields is served by the cache.
+- `test_cache_invalidated_when_file_changes`: Tests that editing the CSV file bypasses the stale cache.
+- `test_cache_disabled`: Tests that the opt-out flag never writes cache files.
+- `test_evict_cache_removes_least_recently_used`: Tests the size-bounded LRU eviction.
+"""
+import os
+
+from models import Bills, Legislators, VoteResults, Votes
+from utils import evict_cache, parse_csv_to_dataclass_dict, parse_csv_to_dataclass_dict_cached, table_cache
+
+
+def _write(path, text):
+    """Writes text to a path and returns the path as a string."""
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_cache_round_trip(tmp_path):
+    """
+    Test case for loading bills and vote results twice, the second time from the cache.
+
+    Simulates:
+    - Bills with non-ASCII titles, vote results with enum values and votes with optional dates.
+    """
+    cache_dir = str(tmp_path / "cache")
+    bills_path = _write(tmp_path / "bills.csv", "id,title,sponsor_id\n1,Lei de Educação,10\n2,,11\n")
+    results_path = _write(tmp_path / "vote_results.csv", "id,legislator_id,vote_id,vote_type\n1,10,100,1\n2,11,100,2\n")
+    votes_path = _write(tmp_path / "votes.csv", "id,bill_id,date\n100,1,2021-11-19\n101,2,\n")
+
+    for path, cls in ((bills_path, Bills), (results_path, VoteResults), (votes_path, Votes)):
+        parsed = parse_csv_to_dataclass_dict_cached(path, cls, ",", cache_dir=cache_dir)
+        cached = parse_csv_to_dataclass_dict_cached(path, cls, ",", cache_dir=cache_dir)
+        assert cached == parsed == parse_csv_to_dataclass_dict(path, cls, ",")
+
+    assert len(os.listdir(cache_dir)) == 3
+
+
+def test_projected_table_is_read_from_cache(tmp_path, monkeypatch):
+    """
+    Test case for a projection whose defaulted field comes before `id`, making it keyword-only.
+
+    Simulates:
+    - The supported bills count and id of two legislators, loaded once from the CSV file and then with
+      CSV parsing disabled.
+    """
+    cache_dir = str(tmp_path / "cache")
+    path = _write(tmp_path / "legislators.csv", "id,name,num_supported_bills\n1,Alice,3\n2,Bob,0\n")
+    columns = ('num_supported_bills', 'id')
+    parsed = parse_csv_to_dataclass_dict_cached(path, Legislators, ",", cache_dir=cache_dir, columns=columns)
+
+    def fail(*_):
+        raise AssertionError("the table was parsed again")
+
+    monkeypatch.setattr(table_cache, "parse_csv_to_dataclass_dict", fail)
+    cached = parse_csv_to_dataclass_dict_cached(path, Legislators, ",", cache_dir=cache_dir, columns=columns)
+
+    assert cached == parsed
+    assert cached[1].num_supported_bills == 3
+
+
+def test_cache_invalidated_when_file_changes(tmp_path):
+    """
+    Test case where the CSV file is rewritten after being cached.
+
+    Simulates:
+    - A bill title corrected after the first load.
+    """
+    cache_dir = str(tmp_path / "cache")
+    path = _write(tmp_path / "bills.csv", "id,title,sponsor_id\n1,Old title,10\n")
+    parse_csv_to_dataclass_dict_cached(path, Bills, ",", cache_dir=cache_dir)
+
+    _write(tmp_path / "bills.csv", "id,title,sponsor_id\n1,New longer title,10\n")
+    bills = parse_csv_to_dataclass_dict_cached(path, Bills, ",", cache_dir=cache_dir)
+
+    assert bills[1].title == "New longer title"
+
+
+def test_cache_disabled(tmp_path):
+    """
+    Test case where the cache is disabled with the opt-out flag.
+
+    Simulates:
+    - A bills file loaded with `enabled=False`.
+    """
+    cache_dir = tmp_path / "cache"
+    path = _write(tmp_path / "bills.csv", "id,title,sponsor_id\n1,Title,10\n")
+
+    bills = parse_csv_to_dataclass_dict_cached(path, Bills, ",", cache_dir=str(cache_dir), enabled=False)
+
+    assert bills[1].title == "Title"
+    assert not cache_dir.exists()
+
+
+def test_evict_cache_removes_least_recently_used(tmp_path):
+    """
+    Test case for evicting cache files once the directory exceeds its size budget.
+
+    Simulates:
+    - Three 100-byte cache files used at different times, with a 250-byte budget.
+    """
+    for age, name in enumerate(("newest", "middle", "oldest")):
+        path = tmp_path / f"{name}.tbl"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, ns=(0, 10 ** 9 * (100 - age)))
+
+    evict_cache(str(tmp_path), max_cache_bytes=250)
+
+    assert sorted(os.listdir(tmp_path)) == ["middle.tbl", "newest.tbl"]
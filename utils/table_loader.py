@@ -0,0 +1,126 @@
+"""Docstring for the table_loader.py module.
+This module loads several independent input tables concurrently.
+
+The bills, legislators and votes tables don't depend on each other, so there is no reason to parse
+them one after the other. `load_tables` schedules one `parse_csv_to_dataclass_dict_cached` call per
+table on an executor:
+    - `thread`: a thread pool. Suited to I/O-bound loads, such as tables read from the binary cache
+      or from slow storage; CSV parsing itself holds the GIL, so parsed tables gain little.
+    - `process`: a process pool. Suited to CPU-bound loads (large CSV files parsed from scratch),
+      at the cost of pickling every loaded table back to the caller.
+    - `serial`: every table in turn, in the calling thread.
+
+Each table can be given a column projection, so the fields its consumer doesn't need are never
+converted or stored (see `project_dataclass`).
+
+Given a `StageRecorder`, every table is recorded as its own `load:<name>` stage. Serial loads are
+measured like any other stage; concurrent loads are timed in their worker (CPU time of that worker
+only, no memory peak) and nested in a `load:tables` stage measuring the whole concurrent load.
+
+Example:
+>>> tables = load_tables({
+...     'bills': TableLoad('input/bills.csv', Bills),
+...     'votes': TableLoad('input/votes.csv', Votes),
+...     'legislators': TableLoad('input/legislators.csv', Legislators, columns=('id', 'name')),
+... }, executor='thread', recorder=recorder)
+>>> tables['bills'][2952375].title
+"""
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from .csv_reader import project_dataclass
+from .instrumentation import StageRecorder
+from .table_cache import parse_csv_to_dataclass_dict_cached
+
+EXECUTORS = ('serial', 'thread', 'process')
+
+
+@dataclass(frozen=True)
+class TableLoad:
+    """
+    Represents one table to load.
+
+    Attributes:
+        filepath (str): The path to the CSV file.
+        cls (type): The dataclass type of each row.
+        columns (tuple[str, ...] | None): The fields to load (including `id`), or None for every field.
+    """
+    filepath: str
+    cls: type
+    columns: Optional[tuple[str, ...]] = None
+
+
+def _load_table(load: TableLoad, delimiter: str, use_cache: bool) -> dict[int, Any]:
+    """Loads one table."""
+    return parse_csv_to_dataclass_dict_cached(
+        load.filepath, load.cls, delimiter, enabled=use_cache, columns=load.columns
+    )
+
+
+def _timed_load_table(load: TableLoad, delimiter: str, use_cache: bool) -> tuple[dict[int, Any], float, float]:
+    """Loads one table, with the wall and CPU seconds it took; runs in the worker threads and processes."""
+    wall_start, cpu_start = time.perf_counter(), time.thread_time()
+    table = _load_table(load, delimiter, use_cache)
+    return table, time.perf_counter() - wall_start, time.thread_time() - cpu_start
+
+
+def _make_executor(executor: str, workers: Optional[int]) -> Optional[Executor]:
+    """Creates the pool of an executor name, or returns None for `serial`."""
+    if executor == 'thread':
+        return ThreadPoolExecutor(max_workers=workers)
+    if executor == 'process':
+        return ProcessPoolExecutor(max_workers=workers)
+    if executor == 'serial':
+        return None
+    raise ValueError(f"Unknown executor {executor!r}, expected one of {EXECUTORS}")
+
+
+def load_tables(  # pylint: disable=too-many-arguments
+    loads: dict[str, TableLoad],
+    *,
+    executor: str = 'serial',
+    workers: Optional[int] = None,
+    delimiter: str = ',',
+    use_cache: bool = True,
+    recorder: Optional[StageRecorder] = None
+) -> dict[str, dict[int, Any]]:
+    """
+    Loads independent tables concurrently, each into a dict keyed by ID.
+
+    Args:
+        loads (dict[str, TableLoad]): The tables to load, by name.
+        executor (str): `thread`, `process` or `serial` (see the module docstring).
+        workers (int | None): The size of the pool (default: one worker per table).
+        delimiter (str): The delimiter used in the CSV files.
+        use_cache (bool): Whether to reuse the binary cache of earlier parses.
+        recorder (StageRecorder | None): Records a `load:<name>` stage per table (see the module docstring).
+
+    Returns:
+        dict[str, dict[int, Any]]: The loaded tables, by name, in the order of `loads`.
+
+    Raises:
+        ValueError: If the executor is unknown or a projection names an unknown field.
+        Exception: The first error raised while loading a table; the other loads are still awaited.
+    """
+    # Projections are checked before any table is loaded
+    for load in loads.values():
+        project_dataclass(load.cls, load.columns)
+
+    recorder = recorder or StageRecorder(enabled=False)
+    pool = _make_executor(executor, workers or len(loads) or None)
+    tables = {}
+    if pool is None:
+        for name, load in loads.items():
+            with recorder.stage(f'load:{name}') as stage:
+                tables[name] = _load_table(load, delimiter, use_cache)
+                stage.rows = len(tables[name])
+        return tables
+    with pool, recorder.stage('load:tables') as stage:
+        futures = {name: pool.submit(_timed_load_table, load, delimiter, use_cache) for name, load in loads.items()}
+        for name, future in futures.items():
+            tables[name], wall_seconds, cpu_seconds = future.result()
+            recorder.record(f'load:{name}', wall_seconds, cpu_seconds, rows=len(tables[name]))
+        stage.rows = sum(len(table) for table in tables.values())
+    return tables
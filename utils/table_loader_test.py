@@ -0,0 +1,86 @@
+"""
+This module contains test cases for the concurrent table loader in `utils.table_loader`.
+
+Test functions include:
+- `test_executors_load_the_same_tables`: Tests that every executor returns the serially loaded tables.
+- `test_projected_vote_results_are_counted`: Tests the handlers over projected vote results.
+- `test_each_table_is_recorded_as_a_stage`: Tests that every loaded table gets its own `load:<name>` stage.
+"""
+import pytest
+
+from handlers import assign_bill_vote_counts, assign_legislator_vote_counts
+from models import Bills, Legislators, VoteResults, Votes
+from utils import StageRecorder, TableLoad, iter_csv_dataclasses, load_tables, parse_csv_to_dataclass_dict
+
+
+@pytest.mark.parametrize("executor", ["serial", "thread", "process"])
+def test_executors_load_the_same_tables(input_dir, executor):
+    """
+    Test case for loading three tables, one of them projected, with each executor.
+
+    Simulates:
+    - Bills, legislators and the `id` and `vote_type` columns of the vote results, loaded without the cache.
+    """
+    loads = {
+        'bills': TableLoad(str(input_dir / "bills.csv"), Bills),
+        'legislators': TableLoad(str(input_dir / "legislators.csv"), Legislators),
+        'vote_results': TableLoad(str(input_dir / "vote_results.csv"), VoteResults, columns=('id', 'vote_type')),
+    }
+
+    tables = load_tables(loads, executor=executor, use_cache=False)
+
+    assert list(tables) == ['bills', 'legislators', 'vote_results']
+    assert tables['bills'] == parse_csv_to_dataclass_dict(str(input_dir / "bills.csv"), Bills, ",")
+    assert tables['legislators'] == parse_csv_to_dataclass_dict(str(input_dir / "legislators.csv"), Legislators, ",")
+    assert tables['vote_results'] == parse_csv_to_dataclass_dict(
+        str(input_dir / "vote_results.csv"), VoteResults, ",", columns=('id', 'vote_type')
+    )
+    with pytest.raises(ValueError):
+        load_tables(loads, executor='fiber')
+
+
+def test_projected_vote_results_are_counted(input_dir):
+    """
+    Test case for counting vote results streamed with only the columns each handler reads.
+
+    Simulates:
+    - Bill counts from `vote_id`/`vote_type` and legislator counts from `legislator_id`/`vote_type`.
+    """
+    tables = load_tables({
+        'bills': TableLoad(str(input_dir / "bills.csv"), Bills),
+        'legislators': TableLoad(str(input_dir / "legislators.csv"), Legislators),
+        'votes': TableLoad(str(input_dir / "votes.csv"), Votes),
+    }, use_cache=False)
+    vote_results_path = str(input_dir / "vote_results.csv")
+
+    assign_bill_vote_counts(tables['bills'], tables['votes'], iter_csv_dataclasses(
+        vote_results_path, VoteResults, ",", columns=('vote_id', 'vote_type')
+    ))
+    assign_legislator_vote_counts(tables['legislators'], iter_csv_dataclasses(
+        vote_results_path, VoteResults, ",", columns=('legislator_id', 'vote_type')
+    ))
+
+    assert [(bill.supporter_count, bill.opposer_count) for bill in tables['bills'].values()] == [(1, 1), (1, 0)]
+    assert [(legislator.num_supported_bills, legislator.num_opposed_bills)
+            for legislator in tables['legislators'].values()] == [(1, 0), (1, 1)]
+
+
+@pytest.mark.parametrize("executor", ["serial", "thread", "process"])
+def test_each_table_is_recorded_as_a_stage(input_dir, executor):
+    """
+    Test case for the stages recorded while loading two tables with each executor.
+
+    Simulates:
+    - Bills and legislators loaded with a recorder that doesn't trace memory.
+    """
+    recorder = StageRecorder(trace_memory=False)
+
+    load_tables({
+        'bills': TableLoad(str(input_dir / "bills.csv"), Bills),
+        'legislators': TableLoad(str(input_dir / "legislators.csv"), Legislators),
+    }, executor=executor, use_cache=False, recorder=recorder)
+
+    stages = {stage.name: stage for stage in recorder.stages}
+    assert (stages['load:bills'].rows, stages['load:legislators'].rows) == (2, 2)
+    assert ('load:tables' in stages) == (executor != 'serial')
+    assert recorder.report()['wall_seconds'] >= stages['load:bills'].wall_seconds
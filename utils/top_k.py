@@ -0,0 +1,98 @@
+"""Docstring for the top_k.py module.
+This module keeps the top rows of several rankings over a stream of rows, in a single pass.
+
+Ranking the bills by supporters means sorting every bill, although a dashboard only shows the top
+100. `TopK` instead keeps one bounded min-heap of `limit` entries per `Ranking`: each row is scored
+by every ranking and replaces the smallest entry of a full heap only if it scores higher, so memory
+stays at `limit` rows per ranking and each row costs O(log limit) per ranking. Only the `limit`
+entries left at the end are sorted.
+
+Rows can be added one by one, or passed through with `feed` while another consumer (e.g. the CSV
+writer of the full report) reads them, so ranking a stream doesn't take another pass over it.
+
+Example:
+>>> top_k = TopK([Ranking('most-supported', lambda bill: bill.supporter_count, limit=10)])
+>>> write_dataclasses_to_csv('output/bills.csv', top_k.feed(bills.values()), Bills)
+>>> top_k.results()['most-supported'][0]
+(412, Bills(id=2952375, ...))
+"""
+import heapq
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+
+@dataclass(frozen=True)
+class Ranking:
+    """
+    Represents a ranking of rows by a score, highest first.
+
+    Attributes:
+        name (str): The name of the ranking, e.g. `most-supported-bills`.
+        score (Callable[[Any], float | None]): Scores a row; rows scored None are left out of the ranking.
+        limit (int): The number of top rows kept.
+    """
+    name: str
+    score: Callable[[Any], Optional[float]]
+    limit: int = 100
+
+
+class TopK:
+    """
+    Represents the bounded heaps of several rankings, filled in a single pass over the rows.
+
+    Attributes:
+        rankings (tuple[Ranking, ...]): The rankings, in the order given.
+        rows (int): The number of rows added so far.
+    """
+
+    def __init__(self, rankings: Sequence[Ranking]):
+        """
+        Creates empty heaps for the rankings.
+
+        Raises:
+            ValueError: If two rankings share a name, or a limit is less than 1.
+        """
+        self.rankings = tuple(rankings)
+        if len({ranking.name for ranking in self.rankings}) != len(self.rankings):
+            raise ValueError("Ranking names must be unique")
+        if any(ranking.limit < 1 for ranking in self.rankings):
+            raise ValueError("Ranking limits must be at least 1")
+        self.rows = 0
+        self._heaps: list[list[tuple]] = [[] for _ in self.rankings]
+
+    def add(self, row: Any):
+        """
+        Scores a row by every ranking and keeps it in the heaps it makes the top of.
+
+        Ties are broken in favor of the row added first, so rankings are deterministic.
+        """
+        # Entries compare on (score, -order); orders are unique, so the rows themselves are never compared
+        order = -self.rows
+        self.rows += 1
+        for ranking, heap in zip(self.rankings, self._heaps):
+            score = ranking.score(row)
+            if score is None:
+                continue
+            if len(heap) < ranking.limit:
+                heapq.heappush(heap, (score, order, row))
+            elif (score, order) > heap[0][:2]:
+                heapq.heapreplace(heap, (score, order, row))
+
+    def feed(self, rows: Iterable[Any]) -> Iterator[Any]:
+        """Adds each row while passing it through, e.g. to a CSV writer."""
+        for row in rows:
+            self.add(row)
+            yield row
+
+    def results(self) -> dict[str, list[tuple[float, Any]]]:
+        """
+        Returns the top rows of every ranking.
+
+        Returns:
+            dict[str, list[tuple[float, Any]]]: The `(score, row)` pairs of each ranking by name, highest
+                score first; rankings with fewer scored rows than their limit hold them all.
+        """
+        return {
+            ranking.name: [(score, row) for score, _, row in sorted(heap, key=lambda entry: entry[:2], reverse=True)]
+            for ranking, heap in zip(self.rankings, self._heaps)
+        }
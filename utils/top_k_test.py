@@ -0,0 +1,52 @@
+"""
+This module contains test cases for `utils.TopK`, which keeps the top rows of several rankings in one pass.
+
+Test functions include:
+- `test_rankings_match_a_full_sort`: Tests every ranking against sorting all the rows.
+- `test_invalid_rankings_raise_value_error`: Tests the validation of ranking names and limits.
+"""
+import random
+
+import pytest
+
+from utils import Ranking, TopK
+
+
+def test_rankings_match_a_full_sort():
+    """
+    Test case where 1000 rows with many tied scores are ranked by three keys, fed through a consumer.
+
+    Simulates:
+    - Rankings by value, by negated value and by an optional score left out for odd rows.
+    """
+    rng = random.Random(7)
+    rows = [{"id": index, "value": rng.randrange(20)} for index in range(1000)]
+    rankings = [
+        Ranking('highest', lambda row: row["value"], limit=10),
+        Ranking('lowest', lambda row: -row["value"], limit=25),
+        Ranking('even-highest', lambda row: row["value"] if row["id"] % 2 == 0 else None, limit=5),
+    ]
+    top_k = TopK(rankings)
+
+    assert [row["id"] for row in top_k.feed(rows)] == list(range(1000))
+
+    results = top_k.results()
+    assert top_k.rows == 1000
+    for ranking in rankings:
+        scored = [(ranking.score(row), row) for row in rows if ranking.score(row) is not None]
+        # A stable sort keeps tied rows in the order they were added
+        expected = sorted(scored, key=lambda entry: entry[0], reverse=True)[:ranking.limit]
+        assert results[ranking.name] == expected
+
+
+def test_invalid_rankings_raise_value_error():
+    """
+    Test case where rankings share a name or keep no rows.
+
+    Simulates:
+    - Two rankings named `top`, then a ranking with a limit of 0.
+    """
+    with pytest.raises(ValueError):
+        TopK([Ranking('top', abs), Ranking('top', abs)])
+    with pytest.raises(ValueError):
+        TopK([Ranking('top', abs, limit=0)])
@@ -0,0 +1,63 @@
+"""
+This script answers vote lookups for one legislator and/or one bill from the input CSV files.
+
+The vote results are loaded into a columnar table and indexed once with a `VoteIndex`, so each
+lookup only reads the vote results it prints.
+
+Lookups:
+    - `--legislator ID`: every vote cast by the legislator.
+    - `--bill ID`: every vote result of every vote held on the bill.
+    - `--legislator ID --bill ID`: how the legislator voted on the bill.
+
+Input:
+    - input/legislators.csv
+    - input/vote_results.csv
+    - input/votes.csv
+
+Output:
+    CSV rows on standard output: `legislator_id,legislator_name,bill_id,vote_id,vote_type`.
+
+Usage:
+    python vote_lookup.py [--input-dir input] [--legislator ID] [--bill ID] [--no-cache]
+"""
+import argparse
+import csv
+import functools
+import sys
+
+from models import Legislators, VoteIndex, VoteResults, VoteResultsTable, Votes, VoteType
+from utils import add_pipeline_arguments, find_input_file, iter_csv_dataclasses, parse_csv_to_dataclass_dict_cached
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_pipeline_arguments(parser, 'input-dir')
+    parser.add_argument('--legislator', type=int, metavar='ID', help="Legislator ID to look up.")
+    parser.add_argument('--bill', type=int, metavar='ID', help="Bill ID to look up.")
+    add_pipeline_arguments(parser, 'no-cache')
+    args = parser.parse_args()
+    if args.legislator is None and args.bill is None:
+        parser.error("at least one of --legislator and --bill is required")
+
+    load_table = functools.partial(parse_csv_to_dataclass_dict_cached, delimiter=',', enabled=not args.no_cache)
+    legislators = load_table(filepath=find_input_file(args.input_dir, 'legislators'), cls=Legislators)
+    votes = load_table(filepath=find_input_file(args.input_dir, 'votes'), cls=Votes)
+    vote_index = VoteIndex.build(votes, VoteResultsTable.from_rows(iter_csv_dataclasses(
+        filepath=find_input_file(args.input_dir, 'vote_results'), cls=VoteResults, delimiter=',', as_tuples=True
+    )))
+
+    if args.legislator is not None and args.bill is not None:
+        results = ((args.legislator, vote_id, vote_type)
+                   for vote_id, vote_type in vote_index.legislator_votes_on_bill(args.legislator, args.bill))
+    elif args.legislator is not None:
+        results = vote_index.results_for_legislator(args.legislator)
+    else:
+        results = vote_index.results_for_bill(args.bill)
+
+    writer = csv.writer(sys.stdout)
+    writer.writerow(['legislator_id', 'legislator_name', 'bill_id', 'vote_id', 'vote_type'])
+    for legislator_id, vote_id, vote_type in results:
+        legislator = legislators.get(legislator_id)
+        writer.writerow([
+            legislator_id, legislator.name if legislator else "Unknown", vote_index.bill_id_of_vote(vote_id),
+            vote_id, VoteType(vote_type).name,
+        ])